@@ -0,0 +1,25 @@
+-- db/migrations/0004_webhook_ingestion.sql
+
+-- ============================================================================
+-- Fast-ack webhook ingestion
+-- Raw payloads are buffered in a Redis Stream and archived here in batches
+-- by WebhookIngestWorker. stream_entry_id makes redelivered entries
+-- idempotent; (channel_id, created_at) serves replay/backfill scans.
+-- ============================================================================
+
+ALTER TABLE whatsapp.webhook_events
+  ADD COLUMN IF NOT EXISTS channel_id      UUID NULL,
+  ADD COLUMN IF NOT EXISTS stream_entry_id VARCHAR(64) NULL;
+
+DO $$ BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint
+    WHERE conname = 'uq_webhook_events_stream_entry_id'
+  ) THEN
+    ALTER TABLE whatsapp.webhook_events
+      ADD CONSTRAINT uq_webhook_events_stream_entry_id UNIQUE (stream_entry_id);
+  END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_webhook_events_channel
+  ON whatsapp.webhook_events (channel_id, created_at);
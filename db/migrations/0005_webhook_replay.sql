@@ -0,0 +1,20 @@
+-- db/migrations/0005_webhook_replay.sql
+
+-- ============================================================================
+-- Webhook replay / backfill
+-- WebhookReplayer walks webhook_events in (created_at, id) keyset order and
+-- stores its progress per named run so an interrupted replay resumes.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_webhook_events_replay
+  ON whatsapp.webhook_events (created_at, id);
+
+CREATE TABLE IF NOT EXISTS whatsapp.webhook_replay_checkpoints (
+  name              VARCHAR(100) PRIMARY KEY,
+  cursor_created_at TIMESTAMPTZ NULL,
+  cursor_id         UUID NULL,
+  processed_count   BIGINT NOT NULL DEFAULT 0,
+  failed_count      BIGINT NOT NULL DEFAULT 0,
+  filters           JSONB NOT NULL DEFAULT '{}'::jsonb,
+  updated_at        TIMESTAMPTZ NOT NULL DEFAULT now()
+);
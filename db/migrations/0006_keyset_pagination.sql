@@ -0,0 +1,19 @@
+-- db/migrations/0006_keyset_pagination.sql
+
+-- ============================================================================
+-- Keyset pagination
+-- List endpoints page on (created_at, id) instead of OFFSET; each index
+-- below turns "rows after the cursor" into a single range scan.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS ix_messages_tenant_created_id
+  ON messages (tenant_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_inbound_channel_created_id
+  ON whatsapp.inbound_messages (tenant_id, channel_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_users_org_created_id
+  ON identity.users (organization_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_org_created_id
+  ON identity.audit_logs (organization_id, created_at DESC, id DESC);
@@ -0,0 +1,176 @@
+-- db/migrations/0007_message_rollups.sql
+
+-- ============================================================================
+-- Hourly message rollups
+-- Analytics and channel stats read pre-aggregated counters keyed by
+-- (tenant, channel, hour, direction, type, status) instead of scanning
+-- messaging.messages.
+--
+-- Maintenance is incremental and contention free:
+--   1. Statement-level triggers on messaging.messages append one aggregated
+--      +1/-1 delta per affected key to message_rollup_deltas (inserts,
+--      status transitions, deletes). A late status update for an old
+--      message lands in that message's original hour.
+--   2. RollupWorker folds deltas into message_hourly_rollups in batches
+--      (DELETE ... RETURNING + upsert in one statement).
+--   3. RollupWorker periodically reconciles recent hours against raw data
+--      and appends correcting deltas for anything the triggers missed
+--      (bulk loads with triggers disabled, manual fixes).
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS messaging.message_hourly_rollups (
+    tenant_id            UUID        NOT NULL,
+    channel_id           UUID        NOT NULL,
+    hour                 TIMESTAMPTZ NOT NULL,
+    direction            TEXT        NOT NULL,
+    message_type         TEXT        NOT NULL,
+    status               TEXT        NOT NULL,
+    message_count        BIGINT      NOT NULL DEFAULT 0,
+    delivered_count      BIGINT      NOT NULL DEFAULT 0,  -- rows with sent_at and delivered_at
+    delivery_seconds_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    last_message_at      TIMESTAMPTZ NULL,
+    updated_at           TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (tenant_id, channel_id, hour, direction, message_type, status)
+);
+
+CREATE INDEX IF NOT EXISTS ix_message_hourly_rollups_tenant_hour
+    ON messaging.message_hourly_rollups (tenant_id, hour);
+
+CREATE TABLE IF NOT EXISTS messaging.message_rollup_deltas (
+    id                   BIGSERIAL   PRIMARY KEY,
+    tenant_id            UUID        NOT NULL,
+    channel_id           UUID        NOT NULL,
+    hour                 TIMESTAMPTZ NOT NULL,
+    direction            TEXT        NOT NULL,
+    message_type         TEXT        NOT NULL,
+    status               TEXT        NOT NULL,
+    message_count        BIGINT      NOT NULL,
+    delivered_count      BIGINT      NOT NULL,
+    delivery_seconds_sum DOUBLE PRECISION NOT NULL,
+    last_message_at      TIMESTAMPTZ NULL,
+    created_at           TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE messaging.message_hourly_rollups ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS tenant_isolation_message_hourly_rollups ON messaging.message_hourly_rollups;
+CREATE POLICY tenant_isolation_message_hourly_rollups ON messaging.message_hourly_rollups
+    USING (tenant_id = jwt_tenant());
+
+-- ----------------------------------------------------------------------------
+-- Delta capture (one INSERT per statement, not per row)
+-- ----------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION messaging.capture_message_rollup_inserts()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO messaging.message_rollup_deltas (
+        tenant_id, channel_id, hour, direction, message_type, status,
+        message_count, delivered_count, delivery_seconds_sum, last_message_at
+    )
+    SELECT
+        tenant_id, channel_id, date_trunc('hour', created_at),
+        direction::text, message_type::text, status::text,
+        COUNT(*),
+        COUNT(*) FILTER (WHERE delivered_at IS NOT NULL AND sent_at IS NOT NULL),
+        COALESCE(SUM(EXTRACT(EPOCH FROM delivered_at - sent_at)), 0),
+        MAX(created_at)
+    FROM new_rows
+    GROUP BY 1, 2, 3, 4, 5, 6;
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION messaging.capture_message_rollup_deletes()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO messaging.message_rollup_deltas (
+        tenant_id, channel_id, hour, direction, message_type, status,
+        message_count, delivered_count, delivery_seconds_sum, last_message_at
+    )
+    SELECT
+        tenant_id, channel_id, date_trunc('hour', created_at),
+        direction::text, message_type::text, status::text,
+        -COUNT(*),
+        -COUNT(*) FILTER (WHERE delivered_at IS NOT NULL AND sent_at IS NOT NULL),
+        -COALESCE(SUM(EXTRACT(EPOCH FROM delivered_at - sent_at)), 0),
+        NULL
+    FROM old_rows
+    GROUP BY 1, 2, 3, 4, 5, 6;
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION messaging.capture_message_rollup_updates()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Only rows whose rollup key or delivery timing changed produce deltas
+    WITH changed AS (
+        SELECT n.id
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE (o.channel_id, o.direction, o.message_type, o.status, o.created_at, o.sent_at, o.delivered_at)
+              IS DISTINCT FROM
+              (n.channel_id, n.direction, n.message_type, n.status, n.created_at, n.sent_at, n.delivered_at)
+    ),
+    d AS (
+        SELECT
+            n.tenant_id, n.channel_id, date_trunc('hour', n.created_at) AS hour,
+            n.direction::text AS direction, n.message_type::text AS message_type,
+            n.status::text AS status, 1 AS sign,
+            (n.delivered_at IS NOT NULL AND n.sent_at IS NOT NULL)::int AS delivered,
+            COALESCE(EXTRACT(EPOCH FROM n.delivered_at - n.sent_at), 0) AS delivery_seconds,
+            n.created_at AS last_message_at
+        FROM new_rows n
+        WHERE n.id IN (SELECT id FROM changed)
+        UNION ALL
+        SELECT
+            o.tenant_id, o.channel_id, date_trunc('hour', o.created_at),
+            o.direction::text, o.message_type::text,
+            o.status::text, -1,
+            (o.delivered_at IS NOT NULL AND o.sent_at IS NOT NULL)::int,
+            COALESCE(EXTRACT(EPOCH FROM o.delivered_at - o.sent_at), 0),
+            NULL
+        FROM old_rows o
+        WHERE o.id IN (SELECT id FROM changed)
+    )
+    INSERT INTO messaging.message_rollup_deltas (
+        tenant_id, channel_id, hour, direction, message_type, status,
+        message_count, delivered_count, delivery_seconds_sum, last_message_at
+    )
+    SELECT
+        tenant_id, channel_id, hour, direction, message_type, status,
+        SUM(sign), SUM(sign * delivered), SUM(sign * delivery_seconds), MAX(last_message_at)
+    FROM d
+    GROUP BY tenant_id, channel_id, hour, direction, message_type, status
+    HAVING SUM(sign) <> 0 OR SUM(sign * delivered) <> 0 OR SUM(sign * delivery_seconds) <> 0;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS message_rollup_inserts ON messaging.messages;
+CREATE TRIGGER message_rollup_inserts
+    AFTER INSERT ON messaging.messages
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION messaging.capture_message_rollup_inserts();
+
+DROP TRIGGER IF EXISTS message_rollup_updates ON messaging.messages;
+CREATE TRIGGER message_rollup_updates
+    AFTER UPDATE ON messaging.messages
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION messaging.capture_message_rollup_updates();
+
+DROP TRIGGER IF EXISTS message_rollup_deletes ON messaging.messages;
+CREATE TRIGGER message_rollup_deletes
+    AFTER DELETE ON messaging.messages
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION messaging.capture_message_rollup_deletes();
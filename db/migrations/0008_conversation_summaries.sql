@@ -0,0 +1,219 @@
+-- db/migrations/0008_conversation_summaries.sql
+
+-- ============================================================================
+-- Conversations
+-- conversation_key is the counterpart's number (sender of inbound, recipient
+-- of outbound), so a thread is one index range instead of
+-- (from_number = :phone OR to_number = :phone).
+--
+-- conversation_summaries holds one row per (tenant, channel, conversation):
+-- last message, last inbound time, unread count and the 24h customer-service
+-- window. Statement-level triggers keep it current in the same transaction
+-- as the message writes; the inbox pages over it on (last_message_at, id).
+--
+-- Note: adding a STORED generated column rewrites messaging.messages.
+-- ============================================================================
+
+ALTER TABLE messaging.messages
+    ADD COLUMN IF NOT EXISTS conversation_key TEXT
+    GENERATED ALWAYS AS (CASE WHEN direction = 'inbound' THEN from_number ELSE to_number END) STORED;
+
+CREATE INDEX IF NOT EXISTS ix_messages_conversation
+    ON messaging.messages (tenant_id, conversation_key, created_at DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS messaging.conversation_summaries (
+    id                UUID        NOT NULL DEFAULT gen_random_uuid() UNIQUE,
+    tenant_id         UUID        NOT NULL,
+    channel_id        UUID        NOT NULL,
+    conversation_key  TEXT        NOT NULL,
+    last_message_id   UUID        NOT NULL,
+    last_message_at   TIMESTAMPTZ NOT NULL,
+    last_direction    TEXT        NOT NULL,
+    last_message_type TEXT        NOT NULL,
+    last_inbound_at   TIMESTAMPTZ NULL,
+    window_expires_at TIMESTAMPTZ NULL,  -- last_inbound_at + 24h (free-form replies allowed until then)
+    unread_count      INTEGER     NOT NULL DEFAULT 0,
+    message_count     BIGINT      NOT NULL DEFAULT 0,
+    created_at        TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at        TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (tenant_id, channel_id, conversation_key)
+);
+
+CREATE INDEX IF NOT EXISTS ix_conversation_summaries_inbox
+    ON messaging.conversation_summaries (tenant_id, last_message_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_conversation_summaries_channel_inbox
+    ON messaging.conversation_summaries (tenant_id, channel_id, last_message_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_conversation_summaries_unread
+    ON messaging.conversation_summaries (tenant_id, last_message_at DESC, id DESC)
+    WHERE unread_count > 0;
+
+ALTER TABLE messaging.conversation_summaries ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS tenant_isolation_conversation_summaries ON messaging.conversation_summaries;
+CREATE POLICY tenant_isolation_conversation_summaries ON messaging.conversation_summaries
+    USING (tenant_id = jwt_tenant());
+
+-- ----------------------------------------------------------------------------
+-- Maintenance (one upsert/update per statement, keys in a fixed order)
+-- ----------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION messaging.summarize_conversation_inserts()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    WITH agg AS (
+        SELECT
+            tenant_id, channel_id, conversation_key,
+            COUNT(*) AS message_count,
+            COUNT(*) FILTER (WHERE direction = 'inbound' AND status <> 'read') AS unread_count,
+            MAX(created_at) FILTER (WHERE direction = 'inbound') AS last_inbound_at
+        FROM new_rows
+        GROUP BY tenant_id, channel_id, conversation_key
+    ),
+    latest AS (
+        SELECT DISTINCT ON (tenant_id, channel_id, conversation_key)
+            tenant_id, channel_id, conversation_key,
+            id, created_at, direction::text AS direction, message_type::text AS message_type
+        FROM new_rows
+        ORDER BY tenant_id, channel_id, conversation_key, created_at DESC, id DESC
+    )
+    INSERT INTO messaging.conversation_summaries AS s (
+        tenant_id, channel_id, conversation_key,
+        last_message_id, last_message_at, last_direction, last_message_type,
+        last_inbound_at, window_expires_at, unread_count, message_count
+    )
+    SELECT
+        agg.tenant_id, agg.channel_id, agg.conversation_key,
+        latest.id, latest.created_at, latest.direction, latest.message_type,
+        agg.last_inbound_at, agg.last_inbound_at + INTERVAL '24 hours',
+        agg.unread_count, agg.message_count
+    FROM agg
+    JOIN latest USING (tenant_id, channel_id, conversation_key)
+    ORDER BY agg.tenant_id, agg.channel_id, agg.conversation_key
+    ON CONFLICT (tenant_id, channel_id, conversation_key) DO UPDATE SET
+        last_message_id = CASE WHEN EXCLUDED.last_message_at >= s.last_message_at
+                               THEN EXCLUDED.last_message_id ELSE s.last_message_id END,
+        last_direction = CASE WHEN EXCLUDED.last_message_at >= s.last_message_at
+                              THEN EXCLUDED.last_direction ELSE s.last_direction END,
+        last_message_type = CASE WHEN EXCLUDED.last_message_at >= s.last_message_at
+                                 THEN EXCLUDED.last_message_type ELSE s.last_message_type END,
+        last_message_at = GREATEST(s.last_message_at, EXCLUDED.last_message_at),
+        last_inbound_at = GREATEST(s.last_inbound_at, EXCLUDED.last_inbound_at),
+        window_expires_at = GREATEST(s.last_inbound_at, EXCLUDED.last_inbound_at) + INTERVAL '24 hours',
+        unread_count = s.unread_count + EXCLUDED.unread_count,
+        message_count = s.message_count + EXCLUDED.message_count,
+        updated_at = NOW();
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION messaging.summarize_conversation_updates()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Only inbound status transitions into/out of 'read' change a summary
+    WITH delta AS (
+        SELECT
+            n.tenant_id, n.channel_id, n.conversation_key,
+            SUM((n.status <> 'read')::int - (o.status <> 'read')::int) AS unread_delta
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE n.direction = 'inbound'
+            AND o.status IS DISTINCT FROM n.status
+        GROUP BY n.tenant_id, n.channel_id, n.conversation_key
+        HAVING SUM((n.status <> 'read')::int - (o.status <> 'read')::int) <> 0
+    )
+    UPDATE messaging.conversation_summaries s
+    SET unread_count = GREATEST(s.unread_count + delta.unread_delta, 0),
+        updated_at = NOW()
+    FROM delta
+    WHERE s.tenant_id = delta.tenant_id
+        AND s.channel_id = delta.channel_id
+        AND s.conversation_key = delta.conversation_key;
+
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION messaging.summarize_conversation_deletes()
+RETURNS trigger
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- last_message_* keep pointing at the newest message ever seen; only
+    -- the counters are kept exact
+    WITH delta AS (
+        SELECT
+            tenant_id, channel_id, conversation_key,
+            COUNT(*) AS message_count,
+            COUNT(*) FILTER (WHERE direction = 'inbound' AND status <> 'read') AS unread_count
+        FROM old_rows
+        GROUP BY tenant_id, channel_id, conversation_key
+    )
+    UPDATE messaging.conversation_summaries s
+    SET message_count = GREATEST(s.message_count - delta.message_count, 0),
+        unread_count = GREATEST(s.unread_count - delta.unread_count, 0),
+        updated_at = NOW()
+    FROM delta
+    WHERE s.tenant_id = delta.tenant_id
+        AND s.channel_id = delta.channel_id
+        AND s.conversation_key = delta.conversation_key;
+
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS conversation_summary_inserts ON messaging.messages;
+CREATE TRIGGER conversation_summary_inserts
+    AFTER INSERT ON messaging.messages
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION messaging.summarize_conversation_inserts();
+
+DROP TRIGGER IF EXISTS conversation_summary_updates ON messaging.messages;
+CREATE TRIGGER conversation_summary_updates
+    AFTER UPDATE ON messaging.messages
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION messaging.summarize_conversation_updates();
+
+DROP TRIGGER IF EXISTS conversation_summary_deletes ON messaging.messages;
+CREATE TRIGGER conversation_summary_deletes
+    AFTER DELETE ON messaging.messages
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION messaging.summarize_conversation_deletes();
+
+-- ----------------------------------------------------------------------------
+-- Backfill existing conversations
+-- ----------------------------------------------------------------------------
+
+INSERT INTO messaging.conversation_summaries (
+    tenant_id, channel_id, conversation_key,
+    last_message_id, last_message_at, last_direction, last_message_type,
+    last_inbound_at, window_expires_at, unread_count, message_count
+)
+SELECT
+    agg.tenant_id, agg.channel_id, agg.conversation_key,
+    latest.id, latest.created_at, latest.direction, latest.message_type,
+    agg.last_inbound_at, agg.last_inbound_at + INTERVAL '24 hours',
+    agg.unread_count, agg.message_count
+FROM (
+    SELECT
+        tenant_id, channel_id, conversation_key,
+        COUNT(*) AS message_count,
+        COUNT(*) FILTER (WHERE direction = 'inbound' AND status <> 'read') AS unread_count,
+        MAX(created_at) FILTER (WHERE direction = 'inbound') AS last_inbound_at
+    FROM messaging.messages
+    GROUP BY tenant_id, channel_id, conversation_key
+) agg
+JOIN (
+    SELECT DISTINCT ON (tenant_id, channel_id, conversation_key)
+        tenant_id, channel_id, conversation_key,
+        id, created_at, direction::text AS direction, message_type::text AS message_type
+    FROM messaging.messages
+    ORDER BY tenant_id, channel_id, conversation_key, created_at DESC, id DESC
+) latest USING (tenant_id, channel_id, conversation_key)
+ON CONFLICT (tenant_id, channel_id, conversation_key) DO NOTHING;
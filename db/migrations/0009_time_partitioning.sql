@@ -0,0 +1,247 @@
+-- db/migrations/0009_time_partitioning.sql
+
+-- ============================================================================
+-- Time partitioning
+-- messaging.messages (monthly), public.outbox_events and
+-- whatsapp.webhook_events (daily) become range partitioned on created_at.
+-- PartitionManager (src/workers/partition_worker.py) keeps partitions
+-- created ahead of time and enforces retention by DETACH + DROP.
+--
+-- Conversion is in place, without copying rows: the existing table is
+-- renamed to <table>_legacy and attached as the partition for everything
+-- before the cutover (the next UTC period boundary). It is dropped by
+-- retention once the whole range has expired.
+--
+-- Consequences of partitioning:
+--   - Primary keys become (id, created_at) and other unique constraints
+--     gain created_at; a partitioned table cannot enforce uniqueness
+--     without the partition key.
+--   - ATTACH builds those widened unique indexes on the legacy partition,
+--     holding its lock for the duration; run during a quiet period.
+--   - Foreign keys referencing these tables are not supported and the
+--     conversion refuses to run while any exist (same for views).
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION public.convert_to_range_partitioned(
+    p_table regclass,
+    p_key TEXT,
+    p_cutover TIMESTAMPTZ
+)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_schema   TEXT;
+    v_name     TEXT;
+    v_legacy   TEXT;
+    v_parent   TEXT;
+    v_legacy_q TEXT;
+    v_def      TEXT;
+    v_index_defs   TEXT[] := '{}';
+    v_trigger_defs TEXT[] := '{}';
+    v_foreign_keys TEXT[] := '{}';
+    v_uniques      TEXT[] := '{}';
+    v_rls      BOOLEAN;
+    v_force    BOOLEAN;
+    r          RECORD;
+BEGIN
+    SELECT n.nspname, c.relname, c.relrowsecurity, c.relforcerowsecurity
+    INTO v_schema, v_name, v_rls, v_force
+    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.oid = p_table;
+
+    IF (SELECT relkind FROM pg_class WHERE oid = p_table) = 'p' THEN
+        RAISE NOTICE '%.% is already partitioned', v_schema, v_name;
+        RETURN;
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM pg_constraint WHERE confrelid = p_table AND contype = 'f') THEN
+        RAISE EXCEPTION '%.% is referenced by foreign keys; drop them before partitioning', v_schema, v_name;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM pg_depend d JOIN pg_rewrite rw ON rw.oid = d.objid
+        WHERE d.refobjid = p_table AND rw.ev_class <> p_table
+    ) THEN
+        RAISE EXCEPTION '%.% is used by views; drop them before partitioning', v_schema, v_name;
+    END IF;
+
+    v_legacy := left(v_name, 56) || '_legacy';
+    v_parent := format('%I.%I', v_schema, v_name);
+    v_legacy_q := format('%I.%I', v_schema, v_legacy);
+
+    -- Capture definitions while they still name the original table
+    FOR r IN
+        SELECT i.indexrelid, ic.relname AS index_name, i.indisunique, i.indisprimary,
+               i.indexprs IS NULL AND i.indpred IS NULL AS plain
+        FROM pg_index i JOIN pg_class ic ON ic.oid = i.indexrelid
+        WHERE i.indrelid = p_table
+    LOOP
+        IF r.indisprimary THEN
+            NULL;  -- replaced by (id, key) below
+        ELSIF r.indisunique THEN
+            IF NOT r.plain THEN
+                RAISE EXCEPTION 'Unique expression/partial index % cannot be partitioned', r.index_name;
+            END IF;
+            SELECT string_agg(quote_ident(a.attname), ', ' ORDER BY k.ord)
+            INTO v_def
+            FROM pg_index i
+            CROSS JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+            WHERE i.indexrelid = r.indexrelid;
+            IF position(quote_ident(p_key) IN v_def) = 0 THEN
+                v_def := v_def || ', ' || quote_ident(p_key);
+            END IF;
+            v_uniques := v_uniques || format('CREATE UNIQUE INDEX %I ON %s (%s)', r.index_name, v_parent, v_def);
+        ELSE
+            v_index_defs := v_index_defs || pg_get_indexdef(r.indexrelid);
+        END IF;
+        EXECUTE format('ALTER INDEX %I.%I RENAME TO %I', v_schema, r.index_name, left(r.index_name, 56) || '_legacy');
+    END LOOP;
+
+    FOR r IN SELECT oid, tgname FROM pg_trigger WHERE tgrelid = p_table AND NOT tgisinternal LOOP
+        v_trigger_defs := v_trigger_defs || pg_get_triggerdef(r.oid);
+    END LOOP;
+
+    FOR r IN SELECT conname, pg_get_constraintdef(oid) AS def FROM pg_constraint WHERE conrelid = p_table AND contype = 'f' LOOP
+        v_foreign_keys := v_foreign_keys || format('ALTER TABLE %s ADD CONSTRAINT %I %s', v_parent, r.conname, r.def);
+    END LOOP;
+
+    -- Unique constraints own their index; drop the constraint, the
+    -- replacement unique index on the parent is built at attach time
+    FOR r IN SELECT conname FROM pg_constraint WHERE conrelid = p_table AND contype = 'u' LOOP
+        EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', p_table, r.conname);
+    END LOOP;
+
+    EXECUTE format('ALTER TABLE %s RENAME TO %I', v_parent, v_legacy);
+
+    EXECUTE format(
+        'CREATE TABLE %s (LIKE %s INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING IDENTITY '
+        'INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY RANGE (%I)',
+        v_parent, v_legacy_q, p_key
+    );
+    EXECUTE format('ALTER TABLE %s ADD PRIMARY KEY (id, %I)', v_parent, p_key);
+
+    FOREACH v_def IN ARRAY v_index_defs || v_uniques || v_foreign_keys LOOP
+        EXECUTE v_def;
+    END LOOP;
+
+    -- Triggers move to the parent (row triggers are cloned to partitions)
+    FOR r IN SELECT tgname FROM pg_trigger WHERE tgrelid = v_legacy_q::regclass AND NOT tgisinternal LOOP
+        EXECUTE format('DROP TRIGGER %I ON %s', r.tgname, v_legacy_q);
+    END LOOP;
+    FOREACH v_def IN ARRAY v_trigger_defs LOOP
+        EXECUTE v_def;
+    END LOOP;
+
+    -- Row level security and grants apply through the parent
+    IF v_rls THEN
+        EXECUTE format('ALTER TABLE %s ENABLE ROW LEVEL SECURITY', v_parent);
+    END IF;
+    IF v_force THEN
+        EXECUTE format('ALTER TABLE %s FORCE ROW LEVEL SECURITY', v_parent);
+    END IF;
+    FOR r IN SELECT * FROM pg_policies WHERE schemaname = v_schema AND tablename = v_legacy LOOP
+        EXECUTE format(
+            'CREATE POLICY %I ON %s AS %s FOR %s TO %s%s%s',
+            r.policyname, v_parent, r.permissive, r.cmd,
+            (SELECT string_agg(CASE WHEN role = 'public' THEN 'PUBLIC' ELSE quote_ident(role) END, ', ')
+             FROM unnest(r.roles) AS role),
+            CASE WHEN r.qual IS NOT NULL THEN ' USING (' || r.qual || ')' ELSE '' END,
+            CASE WHEN r.with_check IS NOT NULL THEN ' WITH CHECK (' || r.with_check || ')' ELSE '' END
+        );
+    END LOOP;
+    FOR r IN
+        SELECT grantee, string_agg(privilege_type, ', ') AS privileges
+        FROM information_schema.role_table_grants
+        WHERE table_schema = v_schema AND table_name = v_legacy
+            AND grantee <> (SELECT pg_get_userbyid(relowner) FROM pg_class WHERE oid = v_legacy_q::regclass)
+        GROUP BY grantee
+    LOOP
+        EXECUTE format(
+            'GRANT %s ON %s TO %s', r.privileges, v_parent,
+            CASE WHEN r.grantee = 'PUBLIC' THEN 'PUBLIC' ELSE quote_ident(r.grantee) END
+        );
+    END LOOP;
+
+    -- A validated CHECK lets ATTACH skip its full-table scan
+    EXECUTE format(
+        'ALTER TABLE %s ADD CONSTRAINT %I CHECK (%I IS NOT NULL AND %I < %L) NOT VALID',
+        v_legacy_q, left(v_name, 50) || '_cutover', p_key, p_key, p_cutover
+    );
+    EXECUTE format('ALTER TABLE %s VALIDATE CONSTRAINT %I', v_legacy_q, left(v_name, 50) || '_cutover');
+    EXECUTE format(
+        'ALTER TABLE %s ATTACH PARTITION %s FOR VALUES FROM (MINVALUE) TO (%L)',
+        v_parent, v_legacy_q, p_cutover
+    );
+    EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', v_legacy_q, left(v_name, 50) || '_cutover');
+END;
+$$;
+
+-- Partitions [cutover, cutover + p_count * p_step), named like PartitionManager's
+CREATE OR REPLACE FUNCTION public.create_range_partitions(
+    p_table regclass,
+    p_from TIMESTAMPTZ,
+    p_step INTERVAL,
+    p_count INTEGER
+)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_schema TEXT;
+    v_name   TEXT;
+    v_start  TIMESTAMPTZ := p_from;
+    v_suffix TEXT;
+BEGIN
+    SELECT n.nspname, c.relname INTO v_schema, v_name
+    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.oid = p_table;
+
+    FOR i IN 1..p_count LOOP
+        v_suffix := to_char(v_start AT TIME ZONE 'UTC', CASE WHEN p_step = INTERVAL '1 day' THEN 'YYYYMMDD' ELSE 'YYYYMM' END);
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I.%I PARTITION OF %I.%I FOR VALUES FROM (%L) TO (%L)',
+            v_schema, v_name || '_p' || v_suffix, v_schema, v_name, v_start, v_start + p_step
+        );
+        v_start := v_start + p_step;
+    END LOOP;
+END;
+$$;
+
+-- ----------------------------------------------------------------------------
+-- Conversion (cutover at the next UTC period boundary)
+-- ----------------------------------------------------------------------------
+
+SELECT public.convert_to_range_partitioned(
+    'messaging.messages', 'created_at',
+    (date_trunc('month', now() AT TIME ZONE 'UTC') + INTERVAL '1 month') AT TIME ZONE 'UTC'
+);
+SELECT public.create_range_partitions(
+    'messaging.messages',
+    (date_trunc('month', now() AT TIME ZONE 'UTC') + INTERVAL '1 month') AT TIME ZONE 'UTC',
+    INTERVAL '1 month', 3
+);
+
+SELECT public.convert_to_range_partitioned(
+    'public.outbox_events', 'created_at',
+    (date_trunc('day', now() AT TIME ZONE 'UTC') + INTERVAL '1 day') AT TIME ZONE 'UTC'
+);
+SELECT public.create_range_partitions(
+    'public.outbox_events',
+    (date_trunc('day', now() AT TIME ZONE 'UTC') + INTERVAL '1 day') AT TIME ZONE 'UTC',
+    INTERVAL '1 day', 7
+);
+
+-- uq_webhook_events_stream_entry_id becomes (stream_entry_id, created_at);
+-- archive upserts derive created_at from the stream entry id, so a
+-- redelivered entry still conflicts with its first insert
+SELECT public.convert_to_range_partitioned(
+    'whatsapp.webhook_events', 'created_at',
+    (date_trunc('day', now() AT TIME ZONE 'UTC') + INTERVAL '1 day') AT TIME ZONE 'UTC'
+);
+SELECT public.create_range_partitions(
+    'whatsapp.webhook_events',
+    (date_trunc('day', now() AT TIME ZONE 'UTC') + INTERVAL '1 day') AT TIME ZONE 'UTC',
+    INTERVAL '1 day', 7
+);
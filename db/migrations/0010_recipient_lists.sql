@@ -0,0 +1,49 @@
+-- db/migrations/0010_recipient_lists.sql
+
+-- ============================================================================
+-- Recipient lists
+-- Bulk campaign audiences uploaded as CSV/JSONL. An import streams the
+-- upload through COPY into a transaction-local staging table, then moves
+-- the deduplicated rows here in one INSERT ... SELECT; a bulk send pages
+-- over recipient_list_entries on (list_id, position) instead of holding
+-- the audience in the request body.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS messaging.recipient_lists (
+    id            UUID        PRIMARY KEY DEFAULT gen_random_uuid(),
+    tenant_id     UUID        NOT NULL,
+    channel_id    UUID        NULL,
+    name          TEXT        NULL,
+    source_format TEXT        NOT NULL CHECK (source_format IN ('csv', 'jsonl')),
+    status        TEXT        NOT NULL DEFAULT 'ready' CHECK (status IN ('ready', 'archived')),
+    total_rows    BIGINT      NOT NULL DEFAULT 0,
+    valid_rows    BIGINT      NOT NULL DEFAULT 0,
+    invalid_rows  BIGINT      NOT NULL DEFAULT 0,
+    duplicate_rows BIGINT     NOT NULL DEFAULT 0,
+    created_by    UUID        NULL,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_recipient_lists_tenant
+    ON messaging.recipient_lists (tenant_id, created_at DESC);
+
+-- position: row number in the upload (first occurrence of a phone wins)
+CREATE TABLE IF NOT EXISTS messaging.recipient_list_entries (
+    list_id   UUID   NOT NULL REFERENCES messaging.recipient_lists (id) ON DELETE CASCADE,
+    tenant_id UUID   NOT NULL,
+    position  BIGINT NOT NULL,
+    phone     TEXT   NOT NULL,
+    variables JSONB  NULL,
+    PRIMARY KEY (list_id, position)
+);
+
+ALTER TABLE messaging.recipient_lists ENABLE ROW LEVEL SECURITY;
+ALTER TABLE messaging.recipient_list_entries ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS tenant_isolation_recipient_lists ON messaging.recipient_lists;
+CREATE POLICY tenant_isolation_recipient_lists ON messaging.recipient_lists
+    USING (tenant_id = jwt_tenant());
+
+DROP POLICY IF EXISTS tenant_isolation_recipient_list_entries ON messaging.recipient_list_entries;
+CREATE POLICY tenant_isolation_recipient_list_entries ON messaging.recipient_list_entries
+    USING (tenant_id = jwt_tenant());
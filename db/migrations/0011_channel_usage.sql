@@ -0,0 +1,28 @@
+-- db/migrations/0011_channel_usage.sql
+
+-- ============================================================================
+-- Channel usage per billing period
+-- Successful sends used to bump a usage column on the channel row itself,
+-- so every send on a channel rewrote (and row-locked) the same row.
+-- Senders now count in memory and flush aggregated deltas here with one
+-- set-based upsert per interval; the period key (first day of the UTC
+-- month) means a new month simply starts a new row.
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS messaging.channel_usage (
+    channel_id    UUID        NOT NULL,
+    period        DATE        NOT NULL,  -- first day of the billing month (UTC)
+    tenant_id     UUID        NOT NULL,
+    message_count BIGINT      NOT NULL DEFAULT 0,
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (channel_id, period)
+);
+
+CREATE INDEX IF NOT EXISTS ix_channel_usage_tenant_period
+    ON messaging.channel_usage (tenant_id, period);
+
+ALTER TABLE messaging.channel_usage ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS tenant_isolation_channel_usage ON messaging.channel_usage;
+CREATE POLICY tenant_isolation_channel_usage ON messaging.channel_usage
+    USING (tenant_id = jwt_tenant());
@@ -0,0 +1,11 @@
+-- db/migrations/0012_channel_usage_retention.sql
+
+-- ============================================================================
+-- Channel usage retention
+-- Usage is keyed by billing period (0011), so a new month needs no reset;
+-- the only periodic clean-up is pruning periods past retention, which
+-- walks this index in small batches.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS ix_channel_usage_period
+    ON messaging.channel_usage (period);
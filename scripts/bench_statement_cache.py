@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Statement cache benchmark.
+
+Compares the old way of running hot messaging queries (f-string SQL
+wrapped in a fresh text() per call) with the named statement registry.
+
+Without a database it measures the per-call Python overhead in front of
+the driver: building the statement, generating SQLAlchemy's cache key
+and fetching the compiled form from a compiled cache.
+
+With --database-url it also runs the count query against PostgreSQL and
+reports latency with asyncpg's prepared statement cache enabled (direct
+connections) and disabled (--pgbouncer settings), which is the parse and
+plan cost paid per execution when statements cannot be reused.
+
+Usage:
+    python scripts/bench_statement_cache.py [--iterations 20000]
+    python scripts/bench_statement_cache.py --database-url postgresql+asyncpg://... [--queries 2000]
+"""
+import argparse
+import asyncio
+import importlib.util
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+from sqlalchemy import text  # noqa: E402
+from sqlalchemy.dialects.postgresql import asyncpg as asyncpg_dialect  # noqa: E402
+
+from shared.infrastructure.database.statements import get_statement_registry  # noqa: E402
+
+# Register the messaging statements from their file: importing them as
+# src.messaging.infrastructure.persistence.statements would run the package
+# __init__, which maps the ORM models a second time (under src. and bare
+# module paths) and fails with "Table ... is already defined".
+_spec = importlib.util.spec_from_file_location(
+    "messaging_statements",
+    ROOT / "src" / "messaging" / "infrastructure" / "persistence" / "statements.py",
+)
+_spec.loader.exec_module(importlib.util.module_from_spec(_spec))
+
+FILTERS = {"channel_id": str(uuid4()), "status": "delivered"}
+
+
+def build_old(filters: dict):
+    """The previous MessageService.count_messages construction."""
+    conditions = ["tenant_id = :tenant_id"]
+    if "channel_id" in filters:
+        conditions.append("channel_id = :channel_id")
+    if "direction" in filters:
+        conditions.append("direction = :direction")
+    if "status" in filters:
+        conditions.append("status = :status")
+    return text(f"""
+        SELECT COUNT(*) as count
+        FROM messaging.messages
+        WHERE {' AND '.join(conditions)}
+    """)
+
+
+def build_new(filters: dict):
+    return get_statement_registry().get(
+        "messages.count",
+        has_channel="channel_id" in filters,
+        has_direction="direction" in filters,
+        has_status="status" in filters,
+        has_from=False,
+        has_to=False,
+    )
+
+
+def bench_python(name: str, build, iterations: int) -> None:
+    """Statement construction + cache key + compiled cache lookup per call."""
+    dialect = asyncpg_dialect.dialect()
+    compiled_cache: dict = {}
+
+    def run() -> None:
+        stmt = build(FILTERS)
+        key = stmt._generate_cache_key()
+        if key not in compiled_cache:
+            compiled_cache[key] = stmt.compile(dialect=dialect)
+
+    run()  # warm-up
+    started = time.process_time()
+    for _ in range(iterations):
+        run()
+    elapsed = time.process_time() - started
+    print(f"{name:<26} {elapsed / iterations * 1e6:>8.1f} us CPU/call")
+
+
+async def bench_database(database_url: str, queries: int) -> None:
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    modes = {
+        "prepared (direct)": {"prepared_statement_cache_size": 500},
+        "unprepared (pgbouncer)": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+    params = {"tenant_id": str(uuid4()), **FILTERS}
+
+    for mode, connect_args in modes.items():
+        engine = create_async_engine(database_url, pool_size=1, connect_args=connect_args)
+        try:
+            async with engine.connect() as conn:
+                for name, build in (("f-string text()", build_old), ("statement registry", build_new)):
+                    await conn.execute(build(FILTERS), params)  # warm-up
+                    started = time.perf_counter()
+                    for _ in range(queries):
+                        await conn.execute(build(FILTERS), params)
+                    elapsed = time.perf_counter() - started
+                    print(f"{mode:<24} {name:<20} {elapsed / queries * 1e3:>8.3f} ms/query")
+        finally:
+            await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--database-url", help="postgresql+asyncpg URL with a messaging.messages table")
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    bench_python("f-string text()", build_old, args.iterations)
+    bench_python("statement registry", build_new, args.iterations)
+    print(f"registry variants built: {get_statement_registry().variant_count()}")
+
+    if args.database_url:
+        print()
+        asyncio.run(bench_database(args.database_url, args.queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Webhook parse benchmark.
+
+Measures CPU time per webhook for the request path: HMAC verification
+plus parsing plus the walk over entries/changes/messages/statuses.
+
+Payloads mimic Meta batch deliveries: several changes per entry, each
+with a mix of text/interactive/image messages, contacts, and bursts of
+sent/delivered/read statuses for the same messages.
+
+Usage:
+    python scripts/bench_webhook_parse.py [--iterations 2000] [--batch 50]
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.messaging.infrastructure.ingestion.webhook_codec import decode_webhook  # noqa: E402
+
+APP_SECRET = b"benchmark-app-secret"
+
+
+def build_payload(batch: int, seed: int = 7) -> bytes:
+    """Build a Meta-style webhook body with `batch` messages + statuses."""
+    rng = random.Random(seed)
+    messages, statuses, contacts = [], [], []
+    now = 1_700_000_000
+
+    for i in range(batch):
+        wa_from = f"4917{rng.randrange(10**8, 10**9)}"
+        kind = rng.choice(["text", "text", "text", "interactive", "image"])
+        message = {
+            "from": wa_from,
+            "id": f"wamid.HBgL{rng.getrandbits(96):024X}",
+            "timestamp": str(now + i),
+            "type": kind,
+        }
+        if kind == "text":
+            message["text"] = {"body": "Hallo, ich habe eine Frage zu meiner Bestellung " * rng.randint(1, 3)}
+        elif kind == "interactive":
+            message["interactive"] = {
+                "type": "button_reply",
+                "button_reply": {"id": f"btn_{i}", "title": "Ja, bitte"},
+            }
+        else:
+            message["image"] = {
+                "id": str(rng.getrandbits(60)),
+                "mime_type": "image/jpeg",
+                "sha256": hashlib.sha256(str(i).encode()).hexdigest(),
+            }
+        messages.append(message)
+        contacts.append({"profile": {"name": f"Kunde {i}"}, "wa_id": wa_from})
+
+        outbound_id = f"wamid.HBgL{rng.getrandbits(96):024X}"
+        for offset, state in enumerate(["sent", "delivered", "read"]):
+            statuses.append({
+                "id": outbound_id,
+                "status": state,
+                "timestamp": str(now + i + offset),
+                "recipient_id": wa_from,
+                "conversation": {
+                    "id": f"{rng.getrandbits(64):016x}",
+                    "origin": {"type": "service"},
+                },
+                "pricing": {"billable": True, "pricing_model": "CBP", "category": "service"},
+            })
+
+    changes = []
+    for chunk in range(0, batch, 10):
+        changes.append({
+            "field": "messages",
+            "value": {
+                "messaging_product": "whatsapp",
+                "metadata": {"display_phone_number": "15550001111", "phone_number_id": "106540352242922"},
+                "contacts": contacts[chunk:chunk + 10],
+                "messages": messages[chunk:chunk + 10],
+                "statuses": statuses[chunk * 3:(chunk + 10) * 3],
+            },
+        })
+
+    body = {
+        "object": "whatsapp_business_account",
+        "entry": [{"id": "102290129340398", "changes": changes}],
+    }
+    return json.dumps(body).encode()
+
+
+def verify(body: bytes, signature: str) -> bool:
+    expected = hmac.new(APP_SECRET, body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature[7:], expected)
+
+
+def walk_dicts(payload: dict) -> int:
+    """Baseline: the dict walk WebhookService used to do."""
+    seen = 0
+    for entry in payload.get("entry", []):
+        for change in entry.get("changes", []):
+            value = change.get("value", {})
+            phone_number_id = value.get("metadata", {}).get("phone_number_id")
+            for message in value.get("messages", []):
+                seen += bool(message.get("id") and message.get("type") and phone_number_id)
+            for status in value.get("statuses", []):
+                seen += bool(status.get("id") and status.get("status"))
+    return seen
+
+
+def walk_structs(envelope) -> int:
+    """New path: attribute access on decoded structs."""
+    seen = 0
+    for entry in envelope.entry:
+        for change in entry.changes:
+            value = change.value
+            phone_number_id = value.metadata.phone_number_id
+            for message in value.messages:
+                seen += bool(message.id and message.type and phone_number_id)
+            for status in value.statuses:
+                seen += bool(status.id and status.status)
+    return seen
+
+
+def run_json(body: bytes, signature: str) -> int:
+    assert verify(body, signature)
+    return walk_dicts(json.loads(body))
+
+
+def run_pydantic(body: bytes, signature: str) -> int:
+    from src.messaging.api.schemas.webhook_dto import WebhookPayload
+
+    payload = WebhookPayload.model_validate_json(body)
+    assert verify(body, signature)
+    return walk_dicts(payload.model_dump())
+
+
+def run_msgspec(body: bytes, signature: str) -> int:
+    assert verify(body, signature)
+    return walk_structs(decode_webhook(body))
+
+
+def bench(name: str, fn, body: bytes, signature: str, iterations: int) -> None:
+    fn(body, signature)  # warm-up
+    started = time.process_time()
+    for _ in range(iterations):
+        fn(body, signature)
+    elapsed = time.process_time() - started
+
+    per_webhook_us = elapsed / iterations * 1e6
+    mb_per_s = len(body) * iterations / elapsed / 1e6
+    print(f"{name:<22} {per_webhook_us:>10.1f} us CPU/webhook {mb_per_s:>8.1f} MB/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=50, help="messages per webhook")
+    args = parser.parse_args()
+
+    body = build_payload(args.batch)
+    signature = "sha256=" + hmac.new(APP_SECRET, body, hashlib.sha256).hexdigest()
+    print(f"payload: {len(body)} bytes, {args.batch} messages, {args.batch * 3} statuses\n")
+
+    assert run_json(body, signature) == run_msgspec(body, signature)
+
+    bench("msgspec structs", run_msgspec, body, signature, args.iterations)
+    bench("json + dict walk", run_json, body, signature, args.iterations)
+    try:
+        bench("pydantic + dict walk", run_pydantic, body, signature, args.iterations)
+    except Exception as e:
+        # Optional comparison: pydantic or the DTO module may not import here
+        print(f"{'pydantic + dict walk':<22} skipped ({type(e).__name__}: {e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 # src/config.py
 
 from functools import lru_cache
-from typing import Optional, List, Union
+from typing import Any, Dict, Optional, List, Union
 
 from pydantic import Field, AnyHttpUrl
 from pydantic_settings import BaseSettings
@@ -36,8 +36,39 @@ class Settings(BaseSettings):
         description="Async SQLAlchemy URL (postgresql+asyncpg)",
     )
     TEST_DATABASE_URL: Optional[str] = Field(default=None)
+    DB_PGBOUNCER_MODE: bool = Field(
+        default=False,
+        description="Connect through PgBouncer in transaction pooling mode (no named prepared statements)",
+    )
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=500, description="Prepared statements cached per connection")
+    DB_COMPILED_CACHE_SIZE: int = Field(default=1000, description="SQLAlchemy compiled statement cache size")
+    DB_POOL_OVERRIDES: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description='Per-workload pool settings, e.g. {"analytics": {"pool_size": 10, "pool_timeout": 5}}'
+    )
+    DB_POOL_VALIDATE_INTERVAL_SECONDS: float = Field(default=30.0, description="Background idle-connection validation")
+    DATABASE_REPLICA_URLS: Union[List[str], str] = Field(
+        default_factory=list,
+        description="Streaming replicas for query-handler reads (list or comma-separated)",
+    )
+    REPLICA_MAX_LAG_SECONDS: float = Field(default=5.0, description="Replicas lagging more are bypassed")
+    REPLICA_CHECK_INTERVAL_SECONDS: float = Field(default=1.0)
+    READ_YOUR_WRITES_TTL_SECONDS: float = Field(default=30.0, description="How long a tenant's write pins its reads")
     REDIS_URL: Optional[str] = Field(default="redis://localhost:6379/0")
 
+    # ------------------------------------------------------------------------------------
+    # SQL profiling
+    # ------------------------------------------------------------------------------------
+    SQL_PROFILER_ENABLED: bool = Field(default=False, description="Per-request/job statement timings and N+1 detection")
+    SQL_QUERY_BUDGET: int = Field(default=25, description="Statements per request/job before it is flagged")
+    SQL_N_PLUS_ONE_THRESHOLD: int = Field(default=5, description="Repeats of one statement flagged as N+1")
+    SQL_SLOW_QUERY_MS: float = Field(default=200.0)
+    SQL_EXPLAIN_SAMPLE_RATE: float = Field(
+        default=0.0,
+        description="Fraction of slow SELECTs re-run with EXPLAIN (ANALYZE, BUFFERS); executes the query twice",
+    )
+    SQL_PROFILE_HISTORY: int = Field(default=200, description="Recent profiles kept for the debug endpoint")
+
     # ------------------------------------------------------------------------------------
     # JWT / Auth
     # ------------------------------------------------------------------------------------
@@ -83,6 +114,59 @@ class Settings(BaseSettings):
     WHATSAPP_VERIFY_TOKEN: str = Field(default="1f2iedKEuDo4BMubbGW1d5uY76", min_length=10)
     WHATSAPP_APP_SECRET: str = Field(default="1f2iedKEuDo4BMubbGW1d5uY76", min_length=10)
 
+    # ------------------------------------------------------------------------------------
+    # Webhook ingestion
+    # ------------------------------------------------------------------------------------
+    WEBHOOK_FAST_ACK: bool = Field(default=False, description="Buffer webhooks and ack before processing")
+    WEBHOOK_BUFFER_MAX_DEPTH: int = Field(default=100_000, description="Buffer depth that triggers 503 backpressure")
+    WEBHOOK_WORKER_CONCURRENCY: int = Field(default=32)
+    STATUS_UPDATE_WINDOW_SECONDS: float = Field(default=0.25, description="Status coalescing window")
+    STATUS_UPDATE_MAX_BATCH: int = Field(default=2000)
+    TRANSCRIPTION_ENGINE: str = Field(default="google", description="Voice-note engine: google or stub")
+    TRANSCRIPTION_CONCURRENCY: int = Field(default=8)
+    TRANSCRIPTION_PER_TENANT_CONCURRENCY: int = Field(default=2)
+    TRANSCRIPT_CACHE_TTL_SECONDS: int = Field(default=30 * 86400)
+    SESSION_WINDOW_NEGATIVE_TTL_SECONDS: int = Field(default=3600, description="Cache lifetime of a closed session window")
+    MESSAGE_COUNT_CACHE_TTL_SECONDS: int = Field(default=30, description="Lifetime of cached exact listing totals")
+    MESSAGE_COUNT_EXACT_THRESHOLD: int = Field(
+        default=10_000,
+        description="Ad-hoc counts estimated above this many rows are returned as planner estimates",
+    )
+
+    # ------------------------------------------------------------------------------------
+    # Channel usage metering
+    # ------------------------------------------------------------------------------------
+    USAGE_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=5.0,
+        description="Pause between flushes of per-process send counters to channel_usage",
+    )
+    USAGE_RETENTION_MONTHS: int = Field(default=13, description="Billing periods kept in channel_usage")
+    USAGE_PRUNE_BATCH: int = Field(default=5000)
+
+    # ------------------------------------------------------------------------------------
+    # Message rollups
+    # ------------------------------------------------------------------------------------
+    ROLLUP_FOLD_INTERVAL_SECONDS: float = Field(default=1.0, description="Pause between fold passes once drained")
+    ROLLUP_FOLD_BATCH: int = Field(default=10_000)
+    ROLLUP_RECONCILE_INTERVAL_SECONDS: float = Field(default=300.0)
+    ROLLUP_RECONCILE_HOURS: int = Field(default=48, description="Recent hours re-checked against raw messages")
+
+    # ------------------------------------------------------------------------------------
+    # Partitioning / retention
+    # ------------------------------------------------------------------------------------
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = Field(default=3600.0)
+    MESSAGE_RETENTION_MONTHS: Optional[int] = Field(default=24, description="None keeps messages forever")
+    OUTBOX_RETENTION_DAYS: int = Field(default=14, description="Partitions with unprocessed events are kept")
+    WEBHOOK_EVENT_RETENTION_DAYS: int = Field(default=30)
+
+    # ------------------------------------------------------------------------------------
+    # Message archive (cold tier)
+    # ------------------------------------------------------------------------------------
+    ARCHIVE_ENABLED: bool = Field(default=False, description="Archive expired message partitions to Parquet (requires pyarrow)")
+    ARCHIVE_ROOT: str = Field(default="/var/lib/messaging/archive", description="Local or mounted archive directory")
+    ARCHIVE_BATCH_SIZE: int = Field(default=10_000)
+    ARCHIVE_COMPRESSION: str = Field(default="zstd")
+
     # ------------------------------------------------------------------------------------
     # Feature Flags / Misc
     # ------------------------------------------------------------------------------------
@@ -116,6 +200,13 @@ class Settings(BaseSettings):
             return [o.strip() for o in self.BACKEND_CORS_ORIGINS.split(",") if o.strip()]
         return []
 
+    def replica_urls(self) -> List[str]:
+        if isinstance(self.DATABASE_REPLICA_URLS, list):
+            return self.DATABASE_REPLICA_URLS
+        if isinstance(self.DATABASE_REPLICA_URLS, str):
+            return [u.strip() for u in self.DATABASE_REPLICA_URLS.split(",") if u.strip()]
+        return []
+
     @property
     def effective_database_url(self) -> str:
         if self.IS_TESTING and self.TEST_DATABASE_URL:
@@ -11,6 +11,7 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.infrastructure.database import DatabaseSessionFactory
+from src.shared_.database import get_engine
 from src.identity.infrastructure.adapters.identity_unit_of_work import (
     IdentityUnitOfWork,
 )
@@ -33,11 +34,11 @@ def get_session_factory() -> DatabaseSessionFactory:
     """
     global _session_factory
     if _session_factory is None:
+        # Share the api pool of the engine registry instead of a second pool
         _session_factory = DatabaseSessionFactory(
             database_url=settings.DATABASE_URL,
             echo=settings.debug,
-            pool_size=20,
-            max_overflow=10
+            engine=get_engine("api")
         )
     return _session_factory
 
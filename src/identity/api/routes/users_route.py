@@ -111,12 +111,12 @@ async def create_user(
 async def list_users(
     current_user: Annotated[CurrentUser, Depends(get_current_active_user)],
     uow: Annotated[IdentityUnitOfWork, Depends(get_uow)],
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
 ) -> UserListResponse:
     """
-    List users in organization with pagination.
+    List users in organization with cursor pagination.
     
     Requires authentication.
     """
@@ -124,12 +124,20 @@ async def list_users(
     
     result = await user_service.list_users(
         organization_id=current_user.organization_id,
-        skip=skip,
         limit=limit,
+        cursor=cursor,
         is_active=is_active,
     )
     
     if result.is_failure():
+        if result.error.startswith("Invalid cursor"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "code": "invalid_cursor",
+                    "message": result.error,
+                },
+            )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={
@@ -159,8 +167,8 @@ async def list_users(
     return UserListResponse(
         users=users,
         total=list_dto.total,
-        skip=list_dto.skip,
         limit=list_dto.limit,
+        next_cursor=list_dto.next_cursor,
     )
 
 
@@ -71,6 +71,6 @@ class UserListResponse(BaseModel):
     model_config = ConfigDict(extra="forbid")
     
     users: list[UserResponse] = Field(..., description="List of users")
-    total: int = Field(..., description="Total users matching query")
-    skip: int = Field(..., description="Number of records skipped")
-    limit: int = Field(..., description="Maximum records returned")
\ No newline at end of file
+    total: int = Field(..., description="Users on this page")
+    limit: int = Field(..., description="Maximum records returned")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (null on the last page)")
\ No newline at end of file
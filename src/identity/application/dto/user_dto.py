@@ -34,5 +34,5 @@ class UserListDTO:
     """
     users: list[UserDTO]
     total: int
-    skip: int
-    limit: int
\ No newline at end of file
+    limit: int
+    next_cursor: Optional[str] = None
\ No newline at end of file
@@ -10,6 +10,7 @@ from uuid import UUID
 from shared.application.base_query import BaseQuery
 from shared.application.query_handler import QueryHandler
 from shared.domain.result import Result, Success, Failure
+from shared.infrastructure.database.pagination import InvalidCursorError
 from shared.infrastructure.observability.logger import get_logger
 
 from src.identity.infrastructure.adapters.identity_unit_of_work import (
@@ -23,17 +24,17 @@ logger = get_logger(__name__)
 @dataclass(frozen=True)
 class ListUsersQuery(BaseQuery):
     """
-    Query to list users with pagination.
+    Query to list users with keyset pagination.
     
     Attributes:
         organization_id: Organization UUID (for RLS)
-        skip: Number of records to skip
         limit: Maximum records to return
+        cursor: next_cursor of the previous page (optional)
         is_active: Filter by active status (optional)
     """
     organization_id: UUID
-    skip: int = 0
     limit: int = 100
+    cursor: Optional[str] = None
     is_active: Optional[bool] = None
 
 
@@ -69,10 +70,11 @@ class ListUsersQueryHandler(QueryHandler[ListUsersQuery, UserListDTO]):
                 if query.is_active is not None:
                     filters['is_active'] = query.is_active
                 
-                # Get users
-                users = await self.uow.users.find_all(
-                    skip=query.skip,
+                # Get users (newest first, keyset on created_at + id)
+                page = await self.uow.users.find_page(
                     limit=query.limit,
+                    cursor=query.cursor,
+                    order_by="created_at",
                     **filters,
                 )
                 
@@ -90,15 +92,15 @@ class ListUsersQueryHandler(QueryHandler[ListUsersQuery, UserListDTO]):
                         last_login_at=user.last_login_at.isoformat() if user.last_login_at else None,
                         created_at=user.created_at.isoformat(),
                     )
-                    for user in users
+                    for user in page.items
                 ]
                 
                 # Create list response
                 list_dto = UserListDTO(
                     users=user_dtos,
                     total=len(user_dtos),
-                    skip=query.skip,
                     limit=query.limit,
+                    next_cursor=page.next_cursor,
                 )
                 
                 logger.debug(
@@ -111,6 +113,8 @@ class ListUsersQueryHandler(QueryHandler[ListUsersQuery, UserListDTO]):
                 
                 return Success(list_dto)
                 
+        except InvalidCursorError as e:
+            return Failure(f"Invalid cursor: {str(e)}")
         except Exception as e:
             logger.error(
                 f"Failed to list users: {e}",
@@ -101,17 +101,17 @@ class UserService:
     async def list_users(
         self,
         organization_id: UUID,
-        skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         is_active: Optional[bool] = None,
     ) -> Result[UserListDTO, str]:
         """
-        List users with pagination.
+        List users with keyset pagination.
         
         Args:
             organization_id: Organization UUID (for RLS)
-            skip: Number of records to skip
             limit: Maximum records to return
+            cursor: next_cursor of the previous page
             is_active: Filter by active status
             
         Returns:
@@ -119,8 +119,8 @@ class UserService:
         """
         query = ListUsersQuery(
             organization_id=organization_id,
-            skip=skip,
             limit=limit,
+            cursor=cursor,
             is_active=is_active,
         )
         
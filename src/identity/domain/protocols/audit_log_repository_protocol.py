@@ -4,9 +4,10 @@ AuditLog Repository Protocol (Interface)
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional, Protocol, Sequence
+from typing import Optional, Protocol
 from uuid import UUID
 
+from shared.infrastructure.database.pagination import CursorPage
 from src.identity.domain.entities.audit_log import AuditLog
 
 
@@ -24,23 +25,23 @@ class IAuditLogRepository(Protocol):
     async def find_by_organization(
         self,
         organization_id: UUID,
-        skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         action: Optional[str] = None,
-    ) -> Sequence[AuditLog]:
+    ) -> CursorPage[AuditLog]:
         """Find audit logs for an organization with filters"""
         ...
     
     async def find_by_user(
         self,
         user_id: UUID,
-        skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> Sequence[AuditLog]:
+    ) -> CursorPage[AuditLog]:
         """Find audit logs for a user"""
         ...
     
@@ -48,9 +49,9 @@ class IAuditLogRepository(Protocol):
         self,
         resource_type: str,
         resource_id: UUID,
-        skip: int = 0,
         limit: int = 100,
-    ) -> Sequence[AuditLog]:
+        cursor: Optional[str] = None,
+    ) -> CursorPage[AuditLog]:
         """Find audit logs for a specific resource"""
         ...
     
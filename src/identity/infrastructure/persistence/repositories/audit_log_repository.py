@@ -4,12 +4,13 @@ AuditLog Repository Implementation
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional, Sequence
+from typing import Optional
 from uuid import UUID
 
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from shared.infrastructure.database.pagination import CursorPage
 from shared.infrastructure.database.sqlalchemy_repository import SQLAlchemyRepository
 from src.identity.domain.entities.audit_log import AuditLog
 from src.identity.infrastructure.persistence.models.audit_log_model import (
@@ -64,25 +65,25 @@ class AuditLogRepository(SQLAlchemyRepository[AuditLog, AuditLogModel]):
     async def find_by_organization(
         self,
         organization_id: UUID,
-        skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         action: Optional[str] = None,
-    ) -> Sequence[AuditLog]:
+    ) -> CursorPage[AuditLog]:
         """
         Find audit logs for an organization with filters.
         
         Args:
             organization_id: Organization UUID
-            skip: Number of records to skip
             limit: Maximum records to return
+            cursor: next_cursor of the previous page
             start_date: Filter logs after this date
             end_date: Filter logs before this date
             action: Filter by action type
             
         Returns:
-            List of audit logs
+            Page of audit logs, newest first
         """
         stmt = select(AuditLogModel).where(
             AuditLogModel.organization_id == organization_id
@@ -95,33 +96,28 @@ class AuditLogRepository(SQLAlchemyRepository[AuditLog, AuditLogModel]):
         if action:
             stmt = stmt.where(AuditLogModel.action == action)
         
-        stmt = stmt.offset(skip).limit(limit).order_by(AuditLogModel.created_at.desc())
-        
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._to_entity(model) for model in models]
+        return await self._paginate(stmt, limit, cursor)
     
     async def find_by_user(
         self,
         user_id: UUID,
-        skip: int = 0,
         limit: int = 100,
+        cursor: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-    ) -> Sequence[AuditLog]:
+    ) -> CursorPage[AuditLog]:
         """
         Find audit logs for a user.
         
         Args:
             user_id: User UUID
-            skip: Number of records to skip
             limit: Maximum records to return
+            cursor: next_cursor of the previous page
             start_date: Filter logs after this date
             end_date: Filter logs before this date
             
         Returns:
-            List of audit logs
+            Page of audit logs, newest first
         """
         stmt = select(AuditLogModel).where(AuditLogModel.user_id == user_id)
         
@@ -130,31 +126,26 @@ class AuditLogRepository(SQLAlchemyRepository[AuditLog, AuditLogModel]):
         if end_date:
             stmt = stmt.where(AuditLogModel.created_at <= end_date)
         
-        stmt = stmt.offset(skip).limit(limit).order_by(AuditLogModel.created_at.desc())
-        
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._to_entity(model) for model in models]
+        return await self._paginate(stmt, limit, cursor)
     
     async def find_by_resource(
         self,
         resource_type: str,
         resource_id: UUID,
-        skip: int = 0,
         limit: int = 100,
-    ) -> Sequence[AuditLog]:
+        cursor: Optional[str] = None,
+    ) -> CursorPage[AuditLog]:
         """
         Find audit logs for a specific resource.
         
         Args:
             resource_type: Resource type (e.g., 'user', 'role')
             resource_id: Resource UUID
-            skip: Number of records to skip
             limit: Maximum records to return
+            cursor: next_cursor of the previous page
             
         Returns:
-            List of audit logs
+            Page of audit logs, newest first
         """
         stmt = (
             select(AuditLogModel)
@@ -162,15 +153,9 @@ class AuditLogRepository(SQLAlchemyRepository[AuditLog, AuditLogModel]):
                 AuditLogModel.resource_type == resource_type,
                 AuditLogModel.resource_id == resource_id,
             )
-            .offset(skip)
-            .limit(limit)
-            .order_by(AuditLogModel.created_at.desc())
         )
         
-        result = await self.session.execute(stmt)
-        models = result.scalars().all()
-        
-        return [self._to_entity(model) for model in models]
+        return await self._paginate(stmt, limit, cursor)
     
     async def count_by_organization(
         self,
@@ -209,7 +209,7 @@ async def delete_channel(
 ):
     """Deactivate a channel."""
     try:
-        await service.deactivate_channel(channel_id, user.tenant_id)
+        await service.deactivate_channel(channel_id, user.id)
         return None
         
     except ValueError as e:
@@ -1,6 +1,6 @@
 """Message API routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, status
 from typing import Any, Dict, Optional, List
 from uuid import UUID
 from datetime import datetime, timedelta
@@ -11,10 +11,30 @@ from src.messaging.api.schemas.message_dto import (
     BulkSendMessageRequest,
     MessageResponse,
     MessageListResponse,
-    ConversationResponse
+    MessageCountResponse,
+    ConversationResponse,
+    ConversationListResponse,
+    ConversationSummaryResponse,
+    RecipientListResponse,
+    RecipientListSendRequest
 )
 from src.messaging.application.services.message_service import MessageService
-from src.messaging.infrastructure.dependencies import get_message_service
+from src.messaging.application.queries.list_conversations_query import (
+    ListConversationsQuery,
+    ListConversationsQueryHandler
+)
+from src.messaging.domain.exceptions import (
+    MonthlyQuotaExceededError,
+    RecipientImportError,
+    RecipientListNotFoundError
+)
+from src.messaging.infrastructure.dependencies import (
+    get_list_conversations_handler,
+    get_message_query_service,
+    get_message_service,
+    get_recipient_importer
+)
+from src.messaging.infrastructure.ingestion.recipient_import import FORMATS, RecipientImporter
 from src.shared_.api.dependencies import (
     get_current_user,
     check_permission,
@@ -22,6 +42,7 @@ from src.shared_.api.dependencies import (
 )
 from src.shared_.api.errors import ErrorResponse, error_response
 from src.shared_.domain.auth import User, Permission
+from shared.infrastructure.database.pagination import InvalidCursorError
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +90,11 @@ async def send_message(
         
         return MessageResponse.model_validate(message, from_attributes=True)
         
+    except MonthlyQuotaExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=error_response(429, "quota_exceeded", str(e))
+        )
     except ValueError as e:
         logger.warning(f"Message validation error: {e}")
         raise HTTPException(
@@ -118,6 +144,11 @@ async def send_bulk_messages(
             "message": f"Bulk send initiated for {results['queued']} messages"
         }
         
+    except MonthlyQuotaExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=error_response(429, "quota_exceeded", str(e))
+        )
     except ValueError as e:
         logger.warning(f"Bulk send validation error: {e}")
         raise HTTPException(
@@ -132,6 +163,132 @@ async def send_bulk_messages(
         )
 
 
+# Content types accepted for recipient uploads (a format query parameter overrides)
+RECIPIENT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/x-jsonlines": "jsonl",
+}
+
+
+@router.post(
+    "/recipient-lists",
+    response_model=RecipientListResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Import a recipient list",
+    description="Stream a CSV (header with a phone column) or JSONL upload into a recipient list"
+)
+async def import_recipient_list(
+    request: Request,
+    channel_id: Optional[UUID] = Query(None, description="Channel the list is meant for"),
+    name: Optional[str] = Query(None, max_length=255),
+    format: Optional[str] = Query(None, description="csv or jsonl (default: from Content-Type)"),
+    default_country_code: Optional[str] = Query(None, regex=r"^\+?[1-9]\d{0,2}$", description="For numbers without one"),
+    user: User = Depends(get_current_user),
+    _: None = Depends(lambda u=Depends(get_current_user): check_permission(u, Permission.MESSAGE_SEND)),
+    importer: RecipientImporter = Depends(get_recipient_importer)
+):
+    """Import recipients; the body is streamed, never held in memory."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    source_format = format or RECIPIENT_CONTENT_TYPES.get(content_type)
+    if source_format not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=error_response(415, "unsupported_format", "Upload CSV (text/csv) or JSONL (application/x-ndjson)")
+        )
+    
+    try:
+        importer.default_country_code = default_country_code
+        list_id, stats = await importer.import_list(
+            tenant_id=user.tenant_id,
+            chunks=request.stream(),
+            source_format=source_format,
+            channel_id=channel_id,
+            name=name,
+            created_by=user.id
+        )
+        
+        return RecipientListResponse(
+            id=list_id,
+            channel_id=channel_id,
+            name=name,
+            source_format=source_format,
+            total_rows=stats.total_rows,
+            valid_rows=stats.valid_rows,
+            invalid_rows=stats.invalid_rows,
+            duplicate_rows=stats.duplicate_rows,
+            errors=stats.errors
+        )
+        
+    except RecipientImportError as e:
+        logger.warning(f"Recipient import rejected: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_response(400, "validation_error", str(e))
+        )
+    except Exception as e:
+        logger.error(f"Failed to import recipient list: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_response(500, "internal_error", "Failed to import recipient list")
+        )
+
+
+@router.post(
+    "/send-list",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Send to a recipient list",
+    description="Queue messages for every recipient of an imported list"
+)
+async def send_to_recipient_list(
+    channel_id: UUID,
+    request: RecipientListSendRequest,
+    user: User = Depends(get_current_user),
+    _: None = Depends(lambda u=Depends(get_current_user): check_permission(u, Permission.MESSAGE_SEND)),
+    _idempotency: None = Depends(ensure_idempotency),
+    service: MessageService = Depends(get_message_service)
+):
+    """Send to an imported recipient list."""
+    try:
+        logger.info(f"Sending to recipient list {request.recipient_list_id} via channel {channel_id}")
+        
+        results = await service.send_to_recipient_list(
+            tenant_id=user.tenant_id,
+            channel_id=channel_id,
+            list_id=request.recipient_list_id,
+            content=request.content,
+            template_name=request.template_name,
+            template_variables=request.template_variables
+        )
+        
+        return {
+            "recipient_list_id": str(request.recipient_list_id),
+            "queued": results["queued"],
+            "failed": results["failed"],
+            "message": f"Bulk send initiated for {results['queued']} messages"
+        }
+        
+    except RecipientListNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=error_response(404, "not_found", str(e))
+        )
+    except MonthlyQuotaExceededError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=error_response(429, "quota_exceeded", str(e))
+        )
+    except Exception as e:
+        logger.error(f"Failed to send to recipient list: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_response(500, "internal_error", "Failed to send to recipient list")
+        )
+
+
 @router.get(
     "/",
     response_model=MessageListResponse,
@@ -144,49 +301,151 @@ async def list_messages(
     status: Optional[str] = Query(None, description="Filter by status"),
     from_date: Optional[datetime] = Query(None, description="Filter messages from this date"),
     to_date: Optional[datetime] = Query(None, description="Filter messages until this date"),
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(False, description="Also return the number of matching messages"),
     user: User = Depends(get_current_user),
     _: None = Depends(lambda u=Depends(get_current_user): check_permission(u, Permission.MESSAGE_READ)),
-    service: MessageService = Depends(get_message_service)
+    service: MessageService = Depends(get_message_query_service)
 ):
-    """List messages with filters."""
+    """List messages with filters, newest first (cursor pagination)."""
     try:
-        messages = await service.list_messages(
-            tenant_id=user.tenant_id,
-            channel_id=UUID(channel_id),
-            direction=direction,
-            limit=page_size,
-        )
-        
-        total = await service.count_messages(
+        page = await service.list_messages(
             tenant_id=user.tenant_id,
             channel_id=channel_id,
             direction=direction,
             status=status,
             from_date=from_date,
-            to_date=to_date
+            to_date=to_date,
+            limit=limit,
+            cursor=cursor
         )
         
+        total = None
+        if include_total:
+            total = await service.count_messages(
+                tenant_id=user.tenant_id,
+                channel_id=channel_id,
+                direction=direction,
+                status=status,
+                from_date=from_date,
+                to_date=to_date
+            )
+        
         return MessageListResponse(
             messages=[
                 MessageResponse.model_validate(msg, from_attributes=True)
-                for msg in messages
+                for msg in page.items
             ],
-            total=total,
-            page=page,
-            page_size=page_size,
-            has_more=(page * page_size) < total
+            limit=limit,
+            next_cursor=page.next_cursor,
+            has_more=page.has_more,
+            total=total.count if total else None,
+            total_exact=total.exact if total else None
         )
         
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=error_response(400, "invalid_cursor", str(e))
+        )
     except Exception as e:
         logger.error(f"Failed to list messages: {e}")
         raise HTTPException(
-            status_code="",
+            status_code=500,
             detail=error_response(500, "internal_error", "Failed to list messages")
         )
 
 
+@router.get(
+    "/count",
+    response_model=MessageCountResponse,
+    summary="Count messages",
+    description="Number of messages matching filters; exact=false marks a planner estimate"
+)
+async def count_messages(
+    channel_id: Optional[UUID] = Query(None, description="Filter by channel"),
+    direction: Optional[str] = Query(None, regex="^(inbound|outbound)$", description="Filter by direction"),
+    status: Optional[str] = Query(None, description="Filter by status"),
+    message_type: Optional[str] = Query(None, description="Filter by message type"),
+    phone: Optional[str] = Query(None, description="Filter by conversation phone number"),
+    from_date: Optional[datetime] = Query(None, description="Filter messages from this date"),
+    to_date: Optional[datetime] = Query(None, description="Filter messages until this date"),
+    user: User = Depends(get_current_user),
+    _: None = Depends(lambda u=Depends(get_current_user): check_permission(u, Permission.MESSAGE_READ)),
+    service: MessageService = Depends(get_message_query_service)
+):
+    """Count messages with filters."""
+    try:
+        result = await service.count_messages(
+            tenant_id=user.tenant_id,
+            channel_id=channel_id,
+            direction=direction,
+            status=status,
+            from_date=from_date,
+            to_date=to_date,
+            message_type=message_type,
+            phone=phone
+        )
+        
+        return MessageCountResponse(count=result.count, exact=result.exact, source=result.source)
+        
+    except Exception as e:
+        logger.error(f"Failed to count messages: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=error_response(500, "internal_error", "Failed to count messages")
+        )
+
+
+@router.get(
+    "/conversations",
+    response_model=ConversationListResponse,
+    summary="List conversations",
+    description="Inbox of conversations, most recently active first"
+)
+async def list_conversations(
+    channel_id: Optional[UUID] = Query(None, description="Filter by channel"),
+    unread_only: bool = Query(False, description="Only conversations with unread messages"),
+    limit: int = Query(50, ge=1, le=200, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    user: User = Depends(get_current_user),
+    _: None = Depends(lambda u=Depends(get_current_user): check_permission(u, Permission.MESSAGE_READ)),
+    handler: ListConversationsQueryHandler = Depends(get_list_conversations_handler)
+):
+    """List conversations (cursor pagination over last activity)."""
+    try:
+        page = await handler.handle(ListConversationsQuery(
+            tenant_id=user.tenant_id,
+            channel_id=channel_id,
+            unread_only=unread_only,
+            limit=limit,
+            cursor=cursor
+        ))
+        
+        return ConversationListResponse(
+            conversations=[
+                ConversationSummaryResponse.model_validate(conversation, from_attributes=True)
+                for conversation in page.items
+            ],
+            limit=limit,
+            next_cursor=page.next_cursor,
+            has_more=page.has_more
+        )
+        
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=error_response(400, "invalid_cursor", str(e))
+        )
+    except Exception as e:
+        logger.error(f"Failed to list conversations: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=error_response(500, "internal_error", "Failed to list conversations")
+        )
+
+
 @router.get(
     "/{message_id}",
     response_model=MessageResponse,
@@ -197,7 +456,7 @@ async def get_message(
     message_id: UUID = Path(..., description="Message UUID"),
     user: User = Depends(get_current_user),
     _: None = Depends(lambda u=Depends(get_current_user): check_permission(u, Permission.MESSAGE_READ)),
-    service: MessageService = Depends(get_message_service)
+    service: MessageService = Depends(get_message_query_service)
 ):
     """Get message details."""
     try:
@@ -233,7 +492,7 @@ async def get_conversation(
     limit: int = Query(50, ge=1, le=200, description="Number of messages to retrieve"),
     user: User = Depends(get_current_user),
     _: None = Depends(lambda u=Depends(get_current_user): check_permission(u, Permission.MESSAGE_READ)),
-    service: MessageService = Depends(get_message_service)
+    service: MessageService = Depends(get_message_query_service)
 ):
     """Get conversation thread with a phone number."""
     try:
@@ -5,9 +5,27 @@ from typing import Optional
 import logging
 import json
 
-from src.messaging.api.schemas.webhook_dto import WebhookVerificationRequest, WebhookPayload
-from src.messaging.application.services.webhook_service import WebhookService
-from src.messaging.infrastructure.dependencies import get_webhook_service
+import redis.asyncio as redis
+
+from src.messaging.api.schemas.webhook_dto import WebhookVerificationRequest
+from src.messaging.application.services.webhook_service import WebhookService, WebhookSignatureVerifier
+from src.messaging.domain.exceptions import WebhookBufferFullError
+from src.messaging.infrastructure.cache.channel_routing_index import ChannelRoutingIndex
+from src.messaging.infrastructure.cache.session_window_index import SessionWindowIndex
+from src.messaging.infrastructure.dependencies import (
+    build_webhook_service,
+    get_channel_routing_index,
+    get_redis,
+    get_session_window_index,
+    get_transcription_queue,
+    get_webhook_buffer,
+    get_webhook_service,
+    get_webhook_verifier
+)
+from src.messaging.infrastructure.ingestion.webhook_buffer import WebhookBuffer
+from src.messaging.infrastructure.transcription.transcription_queue import TranscriptionQueue
+from src.shared_.database import get_async_session
+from src.config import get_settings
 from src.shared_.api.errors import error_response
 
 logger = logging.getLogger(__name__)
@@ -79,9 +97,13 @@ async def verify_webhook(
 async def process_webhook(
     channel_id: str,
     request: Request,
-    payload: WebhookPayload,
     x_hub_signature_256: Optional[str] = Header(None),
-    service: WebhookService = Depends(get_webhook_service)
+    verifier: WebhookSignatureVerifier = Depends(get_webhook_verifier),
+    buffer: WebhookBuffer = Depends(get_webhook_buffer),
+    redis_client: redis.Redis = Depends(get_redis),
+    routing_index: ChannelRoutingIndex = Depends(get_channel_routing_index),
+    transcription_queue: TranscriptionQueue = Depends(get_transcription_queue),
+    session_windows: SessionWindowIndex = Depends(get_session_window_index)
 ):
     """
     Process WhatsApp webhook events.
@@ -91,60 +113,78 @@ async def process_webhook(
     - Delivery status updates
     - Read receipts
     - Other WhatsApp events
+
+    With WEBHOOK_FAST_ACK enabled the verified raw body is appended to
+    the ingestion buffer and acknowledged immediately; processing happens
+    in WebhookIngestWorker. A saturated buffer returns 503 so Meta retries.
+    Verification and buffering need no database session; one is opened
+    only for inline processing.
     """
     try:
         logger.info(f"Webhook event received for channel {channel_id}")
+
+        # Raw body is read once and reused for signature, buffering and parsing
+        body = await request.body()
         
-        # Verify signature if provided
-        if x_hub_signature_256:
-            # Get raw body for signature verification
-            body = await request.body()
-            
-            # Get app secret for this channel
-            app_secret = await service.get_channel_app_secret(channel_id)
-            
-            if not app_secret:
-                logger.warning(f"Channel {channel_id} not found for webhook processing")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid channel"
-                )
-            
-            # Verify signature
-            is_valid = await service.verify_signature(
-                x_hub_signature_256,
-                body,
-                app_secret
-            )
-            
-            if not is_valid:
-                logger.warning(f"Invalid webhook signature for channel {channel_id}")
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid signature"
-                )
+        # Get app secret for this channel (per-channel or global)
+        app_secret = await verifier.get_channel_app_secret(channel_id)
         
-        # Get tenant ID from channel
-        tenant_id = await service.get_tenant_from_channel(channel_id)
+        if not app_secret:
+            logger.warning(f"Channel {channel_id} not found for webhook processing")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid channel"
+            )
         
-        if not tenant_id:
-            logger.warning(f"Tenant not found for channel {channel_id}")
+        # With a secret configured every delivery must be signed
+        if not x_hub_signature_256:
+            logger.warning(f"Unsigned webhook rejected for channel {channel_id}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid channel configuration"
+                detail="Missing signature"
             )
         
-        # Process the webhook payload
-        await service.process_webhook(
-            tenant_id,
-            payload.model_dump()
+        # Verify signature
+        is_valid = verifier.verify_signature(
+            body,
+            x_hub_signature_256,
+            app_secret
         )
         
+        if not is_valid:
+            logger.warning(f"Invalid webhook signature for channel {channel_id}")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid signature"
+            )
+
+        if get_settings().WEBHOOK_FAST_ACK:
+            await buffer.append(channel_id, body, x_hub_signature_256, signature_verified=is_valid)
+            return {"status": "success"}
+
+        # Process the webhook payload (single compiled decode of the raw body);
+        # the service commits its own unit of work
+        async with get_async_session() as session:
+            service = build_webhook_service(
+                session,
+                redis_client,
+                routing_index,
+                transcription_queue,
+                session_windows=session_windows
+            )
+            await service.process_raw_webhook(body)
+        
         # WhatsApp expects a 200 OK response
         return {"status": "success"}
         
     except HTTPException:
         raise
+    except WebhookBufferFullError as e:
+        logger.warning(f"Webhook buffer full, rejecting delivery for channel {channel_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Temporarily unavailable"
+        )
     except Exception as e:
         logger.error(f"Webhook processing error for channel {channel_id}: {e}")
         # Don't expose internal errors to WhatsApp
@@ -183,7 +223,7 @@ async def debug_webhook(
             )
         
         # Process the webhook payload
-        await service.process_webhook(tenant_id, payload)
+        await service.process_webhook(payload)
         
         return {"status": "success", "debug": True}
         
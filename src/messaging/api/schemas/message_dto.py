@@ -96,12 +96,20 @@ class MessageResponse(BaseModel):
 
 
 class MessageListResponse(BaseModel):
-    """List of messages."""
+    """Page of messages (cursor pagination)."""
     messages: List[MessageResponse]
-    total: int
-    page: int
-    page_size: int
+    limit: int
+    next_cursor: Optional[str] = None
     has_more: bool
+    total: Optional[int] = Field(None, description="Matching messages (only with include_total)")
+    total_exact: Optional[bool] = Field(None, description="False when total is a planner estimate")
+
+
+class MessageCountResponse(BaseModel):
+    """Number of messages matching filters."""
+    count: int
+    exact: bool = Field(..., description="False when count is a planner estimate")
+    source: Literal["rollup", "cache", "exact", "estimate"]
 
 
 class MessageStatusUpdate(BaseModel):
@@ -118,4 +126,69 @@ class ConversationResponse(BaseModel):
     messages: List[MessageResponse]
     last_message_at: datetime
     total_messages: int
-    unread_count: int = 0
\ No newline at end of file
+    unread_count: int = 0
+
+class ConversationSummaryResponse(BaseModel):
+    """Inbox row for one conversation."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
+    channel_id: UUID
+    phone_number: str
+    last_message_id: UUID
+    last_message_at: datetime
+    last_direction: str
+    last_message_type: str
+    last_inbound_at: Optional[datetime] = None
+    window_expires_at: Optional[datetime] = None
+    unread_count: int = 0
+    message_count: int = 0
+
+
+class ConversationListResponse(BaseModel):
+    """Page of conversations (cursor pagination)."""
+    conversations: List[ConversationSummaryResponse]
+    limit: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+
+class RecipientImportRowError(BaseModel):
+    """One rejected upload row."""
+    row: int
+    value: Optional[str] = None
+    reason: str
+
+
+class RecipientListResponse(BaseModel):
+    """Imported recipient list."""
+    model_config = ConfigDict(from_attributes=True)
+    
+    id: UUID
+    channel_id: Optional[UUID] = None
+    name: Optional[str] = None
+    source_format: str
+    status: str = "ready"
+    total_rows: int
+    valid_rows: int
+    invalid_rows: int
+    duplicate_rows: int
+    errors: List[RecipientImportRowError] = Field(default_factory=list, description="First rejected rows")
+
+
+class RecipientListSendRequest(BaseModel):
+    """Request to send to an imported recipient list."""
+    model_config = ConfigDict(extra="forbid")
+    
+    recipient_list_id: UUID
+    content: Optional[str] = Field(None, max_length=4096)
+    template_name: Optional[str] = Field(None, max_length=512)
+    template_language: str = Field(default="en", max_length=10)
+    template_variables: Optional[Dict[str, str]] = Field(None, description="Defaults; per-recipient variables override")
+    
+    @model_validator(mode='after')
+    def validate_content_or_template(self):
+        """Ensure content or a template is provided."""
+        if not self.content and not self.template_name:
+            raise ValueError('Either content or template_name must be provided')
+        return self
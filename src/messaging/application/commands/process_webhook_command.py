@@ -1,18 +1,34 @@
 """Process webhook command implementation."""
 
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from uuid import UUID
 from datetime import datetime
 import logging
 import json
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.messaging.domain.entities.message import Message, MessageDirection, MessageType, MessageStatus
-from src.messaging.domain.value_objects.webhook_payload import WebhookMessage, WebhookStatus
-from src.messaging.domain.events.message_events import MessageReceived, MessageDelivered, MessageRead
+from src.messaging.domain.value_objects.webhook_payload import WebhookMessage
+from src.messaging.domain.events.message_events import MessageReceived
 from src.messaging.domain.interfaces.repositories import MessageRepository, ChannelRepository
 from src.messaging.infrastructure.cache.redis_cache import MessagingCache
+from src.messaging.infrastructure.cache.token_cache import get_token_cache
+from src.messaging.infrastructure.cache.channel_routing_index import (
+    ChannelRoutingIndex,
+    get_channel_routing_index
+)
+from src.messaging.infrastructure.cache.session_window_index import (
+    SessionWindowIndex,
+    get_session_window_index
+)
 from src.messaging.infrastructure.events.event_bus import EventBus
+from src.messaging.infrastructure.ingestion.webhook_codec import to_webhook_status
+from src.messaging.application.services.status_update_buffer import (
+    StatusUpdateBuffer,
+    get_status_update_buffer
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,12 +50,20 @@ class ProcessWebhookCommandHandler:
         message_repo: MessageRepository,
         channel_repo: ChannelRepository,
         cache: MessagingCache,
-        event_bus: EventBus
+        event_bus: EventBus,
+        session: AsyncSession,
+        status_buffer: Optional[StatusUpdateBuffer] = None,
+        session_windows: Optional[SessionWindowIndex] = None,
+        routing_index: Optional[ChannelRoutingIndex] = None
     ):
         self.message_repo = message_repo
         self.channel_repo = channel_repo
         self.cache = cache
         self.event_bus = event_bus
+        self.session = session
+        self.routing_index = routing_index or get_channel_routing_index()
+        self.status_buffer = status_buffer or get_status_update_buffer()
+        self.session_windows = session_windows or get_session_window_index()
     
     async def handle(self, command: ProcessWebhookCommand) -> None:
         """Execute process webhook command."""
@@ -100,9 +124,11 @@ class ProcessWebhookCommandHandler:
             await self.message_repo.create(message)
             
             # Update session window
-            await self.cache.set_session_window(
+            await self.session_windows.record_inbound(
+                command.tenant_id,
+                command.channel_id,
                 webhook_msg.from_number,
-                webhook_msg.timestamp.isoformat()
+                webhook_msg.timestamp
             )
             
             # Publish event
@@ -126,62 +152,19 @@ class ProcessWebhookCommandHandler:
             raise
     
     async def _process_status(self, command: ProcessWebhookCommand) -> None:
-        """Process delivery status update."""
+        """
+        Process delivery status update.
+        
+        Statuses are coalesced per message and applied in set-based
+        batches (with batched MessageDelivered/MessageRead events) by
+        the status buffer instead of a read-modify-write per status.
+        """
         try:
-            # Parse status update
-            webhook_status = WebhookStatus.from_webhook_data(command.payload)
-            
-            # Find message
-            message = await self.message_repo.get_by_whatsapp_id(
-                webhook_status.message_id,
-                command.tenant_id
+            await self.status_buffer.submit(
+                command.tenant_id,
+                [to_webhook_status(command.payload)]
             )
             
-            if not message:
-                logger.warning(f"Message not found for status: {webhook_status.message_id}")
-                return
-            
-            # Update message status
-            previous_status = message.status
-            
-            if webhook_status.status == "sent":
-                message.mark_sent(webhook_status.message_id)
-            elif webhook_status.status == "delivered":
-                message.mark_delivered()
-                # Publish delivered event
-                event = MessageDelivered(
-                    event_id=UUID(),
-                    aggregate_id=message.id,
-                    tenant_id=command.tenant_id,
-                    occurred_at=webhook_status.timestamp,
-                    whatsapp_message_id=webhook_status.message_id,
-                    delivered_at=webhook_status.timestamp
-                )
-                await self.event_bus.publish(event)
-            elif webhook_status.status == "read":
-                message.mark_read()
-                # Publish read event
-                event = MessageRead(
-                    event_id=UUID(),
-                    aggregate_id=message.id,
-                    tenant_id=command.tenant_id,
-                    occurred_at=webhook_status.timestamp,
-                    whatsapp_message_id=webhook_status.message_id,
-                    read_at=webhook_status.timestamp
-                )
-                await self.event_bus.publish(event)
-            elif webhook_status.status == "failed":
-                error = webhook_status.error or {}
-                message.mark_failed(
-                    str(error.get("code", "unknown")),
-                    error.get("message", "Unknown error")
-                )
-            
-            # Save updated message
-            await self.message_repo.update(message)
-            
-            logger.info(f"Updated message {message.id} status: {previous_status} -> {message.status}")
-            
         except Exception as e:
             logger.error(f"Failed to process status: {e}")
             raise
@@ -241,6 +224,10 @@ class ProcessWebhookCommandHandler:
                         logger.error(f"Channel {channel.id} deactivated due to invalid token notification")
                     await self.channel_repo.update(channel)
                     await self.cache.delete_channel(str(channel.id))
+                    get_token_cache().invalidate(channel.id)
+                    # Stop routing its webhooks everywhere, once the change is durable
+                    await self.session.commit()
+                    await self.routing_index.publish_remove(channel)
             
         except Exception as e:
             logger.error(f"Failed to process error: {e}")
@@ -6,11 +6,18 @@ from uuid import UUID
 from datetime import datetime
 import logging
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.messaging.domain.entities.message import Message, MessageDirection, MessageType, MessageStatus
 from src.messaging.domain.interfaces.repositories import MessageRepository, ChannelRepository, TemplateRepository
 from messaging.domain.protocols.external_services import WhatsAppClient
 from src.messaging.infrastructure.rate_limiter.token_bucket import TokenBucketRateLimiter
 from src.messaging.infrastructure.outbox.outbox_service import OutboxService
+from src.messaging.infrastructure.cache.session_window_index import (
+    SessionWindowIndex,
+    get_session_window_index
+)
+from src.messaging.infrastructure.usage.usage_meter import UsageMeter, get_usage_meter
 
 logger = logging.getLogger(__name__)
 
@@ -39,13 +46,19 @@ class SendMessageCommandHandler:
         channel_repo: ChannelRepository,
         template_repo: TemplateRepository,
         rate_limiter: TokenBucketRateLimiter,
-        outbox_service: OutboxService
+        outbox_service: OutboxService,
+        session: AsyncSession,
+        session_windows: Optional[SessionWindowIndex] = None,
+        usage: Optional[UsageMeter] = None
     ):
         self.message_repo = message_repo
         self.channel_repo = channel_repo
         self.template_repo = template_repo
         self.rate_limiter = rate_limiter
         self.outbox_service = outbox_service
+        self.session = session
+        self.session_windows = session_windows or get_session_window_index()
+        self.usage = usage or get_usage_meter()
     
     async def handle(self, command: SendMessageCommand) -> Message:
         """Execute send message command."""
@@ -58,6 +71,9 @@ class SendMessageCommandHandler:
             if not channel.can_send_message():
                 raise ValueError(f"Channel {command.channel_id} cannot send messages: {channel.status}")
             
+            # Check monthly quota
+            await self.usage.check_quota(self.session, channel)
+            
             # Check rate limit
             rate_key = f"channel:{channel.id}"
             allowed, tokens = await self.rate_limiter.is_allowed(
@@ -70,16 +86,13 @@ class SendMessageCommandHandler:
                 raise ValueError(f"Rate limit exceeded. Tokens remaining: {tokens}")
             
             # Check session window
-            last_inbound = await self.message_repo.get_last_inbound_time(
-                command.to_number,
-                command.tenant_id
+            within_session = await self.session_windows.is_open(
+                self.session,
+                command.tenant_id,
+                command.channel_id,
+                command.to_number
             )
             
-            within_session = False
-            if last_inbound:
-                time_diff = datetime.utcnow() - last_inbound
-                within_session = time_diff.total_seconds() < 24 * 60 * 60
-            
             # Determine message type
             message_type = self._determine_message_type(
                 command.content,
@@ -7,7 +7,9 @@ from datetime import datetime, timedelta
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+
+from src.messaging.infrastructure.persistence import statements  # noqa: F401 (registers statements)
+from shared.infrastructure.database.statements import get_statement_registry
 
 logger = logging.getLogger(__name__)
 
@@ -59,24 +61,8 @@ class GetChannelStatsQueryHandler:
             else:
                 start_date = now - timedelta(days=1)
             
-            # Get message statistics
-            stats_query = text("""
-                SELECT 
-                    COUNT(*) FILTER (WHERE direction = 'outbound') as messages_sent,
-                    COUNT(*) FILTER (WHERE direction = 'inbound') as messages_received,
-                    COUNT(*) FILTER (WHERE status = 'delivered') as messages_delivered,
-                    COUNT(*) FILTER (WHERE status = 'read') as messages_read,
-                    COUNT(*) FILTER (WHERE status = 'failed') as messages_failed,
-                    COUNT(*) FILTER (WHERE message_type = 'template') as template_messages,
-                    COUNT(*) FILTER (WHERE message_type IN ('image', 'video', 'audio', 'document')) as media_messages,
-                    AVG(EXTRACT(EPOCH FROM (delivered_at - sent_at))) FILTER (WHERE delivered_at IS NOT NULL) as avg_delivery_time,
-                    MAX(created_at) as last_message_at,
-                    COUNT(DISTINCT CASE WHEN direction = 'inbound' THEN from_number ELSE to_number END) as active_conversations
-                FROM messaging.messages
-                WHERE channel_id = :channel_id
-                    AND tenant_id = :tenant_id
-                    AND created_at >= :start_date
-            """)
+            # Get message statistics (hourly rollups)
+            stats_query = get_statement_registry().get("analytics.channel_stats")
             
             result = await self.session.execute(stats_query, {
                 "channel_id": query.channel_id,
@@ -86,15 +72,18 @@ class GetChannelStatsQueryHandler:
             
             stats = result.fetchone()
             
+            conversations_query = get_statement_registry().get("analytics.channel_active_conversations")
+            
+            conversations_result = await self.session.execute(conversations_query, {
+                "channel_id": query.channel_id,
+                "tenant_id": query.tenant_id,
+                "start_date": start_date
+            })
+            
+            active_conversations = conversations_result.scalar()
+            
             # Get channel usage info
-            channel_query = text("""
-                SELECT 
-                    current_month_usage,
-                    monthly_message_limit
-                FROM messaging.channels
-                WHERE id = :channel_id
-                    AND tenant_id = :tenant_id
-            """)
+            channel_query = get_statement_registry().get("analytics.channel_usage")
             
             channel_result = await self.session.execute(channel_query, {
                 "channel_id": query.channel_id,
@@ -122,7 +111,7 @@ class GetChannelStatsQueryHandler:
                 monthly_limit=int(channel.monthly_message_limit) if channel and channel.monthly_message_limit is not None else None,
                 usage_percentage=float(usage_percentage) if usage_percentage is not None else None,
                 last_message_at=stats.last_message_at if stats and stats.last_message_at is not None else None,
-                active_conversations=int(stats.active_conversations) if stats and stats.active_conversations is not None else 0
+                active_conversations=int(active_conversations) if active_conversations is not None else 0
             )
             
         except Exception as e:
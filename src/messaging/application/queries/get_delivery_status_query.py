@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
 from messaging.domain.protocols.message_repository import MessageRepository
+from src.messaging.infrastructure.archive.message_archive import MessageArchive
 
 logger = logging.getLogger(__name__)
 
@@ -41,15 +42,22 @@ class DeliveryStatusResult:
 
 
 class GetDeliveryStatusQueryHandler:
-    """Handler for get delivery status query."""
+    """
+    Handler for get delivery status query.
+
+    Messages whose partitions were archived and dropped are looked up in
+    the cold archive when one is configured.
+    """
     
     def __init__(
         self,
         message_repo: MessageRepository,
-        session: AsyncSession
+        session: AsyncSession,
+        archive: Optional[MessageArchive] = None
     ):
         self.message_repo = message_repo
         self.session = session
+        self.archive = archive
     
     async def handle(self, query: GetDeliveryStatusQuery) -> Optional[DeliveryStatusResult]:
         """Execute get delivery status query."""
@@ -65,7 +73,9 @@ class GetDeliveryStatusQueryHandler:
                 )
             
             if not message:
-                return None
+                if self.archive is None:
+                    return None
+                return await self._get_archived_status(query)
             
             # Get delivery history if requested
             history = None
@@ -90,6 +100,35 @@ class GetDeliveryStatusQueryHandler:
             logger.error(f"Failed to get delivery status: {e}")
             raise
     
+    async def _get_archived_status(self, query: GetDeliveryStatusQuery) -> Optional[DeliveryStatusResult]:
+        """Delivery status of an archived message."""
+        record = await self.archive.find_message(
+            query.tenant_id,
+            message_id=query.message_id,
+            whatsapp_message_id=query.whatsapp_message_id
+        )
+        if not record:
+            return None
+        
+        message_id = UUID(record["id"])
+        history = None
+        if query.include_history:
+            history = await self._get_delivery_history(message_id)
+        
+        return DeliveryStatusResult(
+            message_id=message_id,
+            whatsapp_message_id=record["whatsapp_message_id"],
+            status=record["status"],
+            sent_at=record["sent_at"],
+            delivered_at=record["delivered_at"],
+            read_at=record["read_at"],
+            failed_at=record["updated_at"] if record["status"] == "failed" else None,
+            error_code=record["error_code"],
+            error_message=record["error_message"],
+            retry_count=record["retry_count"] or 0,
+            history=history
+        )
+    
     async def _get_delivery_history(self, message_id: UUID) -> List[Dict[str, Any]]:
         """Get delivery status history."""
         query = text("""
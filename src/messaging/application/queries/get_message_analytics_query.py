@@ -1,13 +1,16 @@
 """Get message analytics query implementation."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import logging
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
+
+from src.messaging.infrastructure.archive.message_archive import MessageArchive
+from src.messaging.infrastructure.persistence import statements  # noqa: F401 (registers statements)
+from shared.infrastructure.database.statements import get_statement_registry
 
 logger = logging.getLogger(__name__)
 
@@ -36,13 +39,30 @@ class MessageAnalyticsResult:
     peak_hour: Optional[int]
     top_message_types: List[Dict[str, Any]]
     time_series: List[Dict[str, Any]]
+    response_time_percentiles_minutes: Dict[str, float] = field(default_factory=dict)
+
+
+def _percentile_cont(ordered: List[float], fraction: float) -> float:
+    """Linear-interpolated percentile of sorted values (as PERCENTILE_CONT)."""
+    position = fraction * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
 
 
 class GetMessageAnalyticsQueryHandler:
-    """Handler for get message analytics query."""
+    """
+    Handler for get message analytics query.
+
+    Counts come from the hourly rollups, which outlive message
+    partitions. Response times need raw messages, so for ranges reaching
+    past the retention horizon the archived part is read from the cold
+    archive (when configured) and merged with the live part.
+    """
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, archive: Optional[MessageArchive] = None):
         self.session = session
+        self.archive = archive
     
     async def handle(self, query: GetMessageAnalyticsQuery) -> MessageAnalyticsResult:
         """Execute get message analytics query."""
@@ -65,8 +85,8 @@ class GetMessageAnalyticsQueryHandler:
             # Get peak hour
             peak_hour = await self._get_peak_hour(query)
             
-            # Get average response time
-            avg_response = await self._get_avg_response_time(query)
+            # Get response time distribution
+            response_times = await self._get_response_times(query)
             
             # Calculate rates
             delivered_rate = 0
@@ -88,53 +108,46 @@ class GetMessageAnalyticsQueryHandler:
                 delivered_rate=round(delivered_rate, 2),
                 read_rate=round(read_rate, 2),
                 failed_rate=round(failed_rate, 2),
-                avg_response_time_minutes=avg_response,
+                avg_response_time_minutes=response_times.pop("avg", None),
                 peak_hour=peak_hour,
                 top_message_types=top_types,
-                time_series=time_series
+                time_series=time_series,
+                response_time_percentiles_minutes=response_times
             )
             
         except Exception as e:
             logger.error(f"Failed to get message analytics: {e}")
             raise
     
-    async def _get_overall_stats(self, query: GetMessageAnalyticsQuery) -> Dict[str, int]:
-        """Get overall message statistics."""
-        conditions = ["tenant_id = :tenant_id"]
+    @staticmethod
+    def _params(query: GetMessageAnalyticsQuery) -> Dict[str, Any]:
+        """Bind parameters shared by the analytics statements."""
         params = {
             "tenant_id": query.tenant_id,
             "start_date": query.start_date,
             "end_date": query.end_date
         }
-        
         if query.channel_id:
-            conditions.append("channel_id = :channel_id")
             params["channel_id"] = query.channel_id
-        
-        conditions.append("created_at BETWEEN :start_date AND :end_date")
-        
-        stats_query = text(f"""
-            SELECT 
-                COUNT(*) as total_messages,
-                COUNT(*) FILTER (WHERE direction = 'outbound') as sent_messages,
-                COUNT(*) FILTER (WHERE direction = 'inbound') as received_messages,
-                COUNT(*) FILTER (WHERE status = 'delivered') as delivered_messages,
-                COUNT(*) FILTER (WHERE status = 'read') as read_messages,
-                COUNT(*) FILTER (WHERE status = 'failed') as failed_messages
-            FROM messaging.messages
-            WHERE {' AND '.join(conditions)}
-        """)
+        return params
+    
+    async def _get_overall_stats(self, query: GetMessageAnalyticsQuery) -> Dict[str, int]:
+        """Get overall message statistics."""
+        params = self._params(query)
+        stats_query = get_statement_registry().get(
+            "analytics.overall_stats", has_channel=query.channel_id is not None
+        )
         
         result = await self.session.execute(stats_query, params)
         row = result.fetchone()
         
         return {
-            "total_messages": row.total_messages or 0,
-            "sent_messages": row.sent_messages or 0,
-            "received_messages": row.received_messages or 0,
-            "delivered_messages": row.delivered_messages or 0,
-            "read_messages": row.read_messages or 0,
-            "failed_messages": row.failed_messages or 0
+            "total_messages": int(row.total_messages or 0),
+            "sent_messages": int(row.sent_messages or 0),
+            "received_messages": int(row.received_messages or 0),
+            "delivered_messages": int(row.delivered_messages or 0),
+            "read_messages": int(row.read_messages or 0),
+            "failed_messages": int(row.failed_messages or 0)
         }
     
     async def _get_time_series(self, query: GetMessageAnalyticsQuery) -> List[Dict[str, Any]]:
@@ -149,31 +162,10 @@ class GetMessageAnalyticsQueryHandler:
         else:
             date_trunc = "day"
         
-        conditions = ["tenant_id = :tenant_id"]
-        params = {
-            "tenant_id": query.tenant_id,
-            "start_date": query.start_date,
-            "end_date": query.end_date
-        }
-        
-        if query.channel_id:
-            conditions.append("channel_id = :channel_id")
-            params["channel_id"] = query.channel_id
-        
-        conditions.append("created_at BETWEEN :start_date AND :end_date")
-        
-        series_query = text(f"""
-            SELECT 
-                DATE_TRUNC('{date_trunc}', created_at) as period,
-                COUNT(*) FILTER (WHERE direction = 'outbound') as sent,
-                COUNT(*) FILTER (WHERE direction = 'inbound') as received,
-                COUNT(*) FILTER (WHERE status = 'delivered') as delivered,
-                COUNT(*) FILTER (WHERE status = 'failed') as failed
-            FROM messaging.messages
-            WHERE {' AND '.join(conditions)}
-            GROUP BY period
-            ORDER BY period ASC
-        """)
+        params = self._params(query)
+        series_query = get_statement_registry().get(
+            "analytics.time_series", granularity=date_trunc, has_channel=query.channel_id is not None
+        )
         
         result = await self.session.execute(series_query, params)
         
@@ -181,40 +173,20 @@ class GetMessageAnalyticsQueryHandler:
         for row in result:
             time_series.append({
                 "period": row.period.isoformat(),
-                "sent": row.sent or 0,
-                "received": row.received or 0,
-                "delivered": row.delivered or 0,
-                "failed": row.failed or 0
+                "sent": int(row.sent or 0),
+                "received": int(row.received or 0),
+                "delivered": int(row.delivered or 0),
+                "failed": int(row.failed or 0)
             })
         
         return time_series
     
     async def _get_top_message_types(self, query: GetMessageAnalyticsQuery) -> List[Dict[str, Any]]:
         """Get top message types."""
-        conditions = ["tenant_id = :tenant_id"]
-        params = {
-            "tenant_id": query.tenant_id,
-            "start_date": query.start_date,
-            "end_date": query.end_date
-        }
-        
-        if query.channel_id:
-            conditions.append("channel_id = :channel_id")
-            params["channel_id"] = query.channel_id
-        
-        conditions.append("created_at BETWEEN :start_date AND :end_date")
-        
-        types_query = text(f"""
-            SELECT 
-                message_type,
-                COUNT(*) as count,
-                ROUND(COUNT(*) * 100.0 / SUM(COUNT(*)) OVER (), 2) as percentage
-            FROM messaging.messages
-            WHERE {' AND '.join(conditions)}
-            GROUP BY message_type
-            ORDER BY count DESC
-            LIMIT 5
-        """)
+        params = self._params(query)
+        types_query = get_statement_registry().get(
+            "analytics.top_message_types", has_channel=query.channel_id is not None
+        )
         
         result = await self.session.execute(types_query, params)
         
@@ -222,7 +194,7 @@ class GetMessageAnalyticsQueryHandler:
         for row in result:
             top_types.append({
                 "type": row.message_type,
-                "count": row.count,
+                "count": int(row.count),
                 "percentage": float(row.percentage)
             })
         
@@ -230,72 +202,69 @@ class GetMessageAnalyticsQueryHandler:
     
     async def _get_peak_hour(self, query: GetMessageAnalyticsQuery) -> Optional[int]:
         """Get peak message hour."""
-        conditions = ["tenant_id = :tenant_id"]
-        params = {
-            "tenant_id": query.tenant_id,
-            "start_date": query.start_date,
-            "end_date": query.end_date
-        }
-        
-        if query.channel_id:
-            conditions.append("channel_id = :channel_id")
-            params["channel_id"] = query.channel_id
-        
-        conditions.append("created_at BETWEEN :start_date AND :end_date")
-        
-        peak_query = text(f"""
-            SELECT 
-                EXTRACT(HOUR FROM created_at) as hour,
-                COUNT(*) as count
-            FROM messaging.messages
-            WHERE {' AND '.join(conditions)}
-            GROUP BY hour
-            ORDER BY count DESC
-            LIMIT 1
-        """)
+        params = self._params(query)
+        peak_query = get_statement_registry().get(
+            "analytics.peak_hour", has_channel=query.channel_id is not None
+        )
         
         result = await self.session.execute(peak_query, params)
         row = result.fetchone()
         
         return int(row.hour) if row else None
     
-    async def _get_avg_response_time(self, query: GetMessageAnalyticsQuery) -> Optional[float]:
-        """Get average response time to inbound messages."""
-        conditions = ["m1.tenant_id = :tenant_id"]
-        params = {
-            "tenant_id": query.tenant_id,
-            "start_date": query.start_date,
-            "end_date": query.end_date
-        }
+    async def _get_response_times(self, query: GetMessageAnalyticsQuery) -> Dict[str, float]:
+        """Get mean and percentiles of first-reply time to inbound messages."""
+        if self.archive is not None and self.archive.covers(query.start_date):
+            return await self._get_response_times_with_archive(query)
         
-        if query.channel_id:
-            conditions.append("m1.channel_id = :channel_id")
-            params["channel_id"] = query.channel_id
+        params = self._params(query)
+        response_query = get_statement_registry().get(
+            "analytics.response_time", has_channel=query.channel_id is not None
+        )
+        
+        result = await self.session.execute(response_query, params)
+        row = result.fetchone()
         
-        conditions.append("m1.created_at BETWEEN :start_date AND :end_date")
+        if not row or not row.responses:
+            return {}
         
-        response_query = text(f"""
-            WITH conversation_pairs AS (
-                SELECT 
-                    m1.created_at as inbound_time,
-                    MIN(m2.created_at) as response_time
-                FROM messaging.messages m1
-                JOIN messaging.messages m2 ON 
-                    m1.from_number = m2.to_number
-                    AND m1.to_number = m2.from_number
-                    AND m2.direction = 'outbound'
-                    AND m2.created_at > m1.created_at
-                    AND m2.created_at < m1.created_at + INTERVAL '1 hour'
-                WHERE m1.direction = 'inbound'
-                    AND {' AND '.join(conditions)}
-                GROUP BY m1.id, m1.created_at
+        return {
+            "avg": round(float(row.avg_minutes), 2),
+            "p50": round(float(row.p50_minutes), 2),
+            "p90": round(float(row.p90_minutes), 2),
+            "p95": round(float(row.p95_minutes), 2),
+            "p99": round(float(row.p99_minutes), 2)
+        }
+    
+    async def _get_response_times_with_archive(self, query: GetMessageAnalyticsQuery) -> Dict[str, float]:
+        """Response times over archived and live messages, split at the retention horizon."""
+        horizon = self.archive.horizon()
+        end_date = query.end_date if query.end_date.tzinfo else query.end_date.replace(tzinfo=timezone.utc)
+        
+        minutes = await self.archive.response_minutes(
+            query.tenant_id,
+            query.start_date,
+            min(end_date, horizon - timedelta(microseconds=1)),
+            channel_id=query.channel_id
+        )
+        
+        if end_date >= horizon:
+            params = self._params(query)
+            params["start_date"] = horizon
+            samples_query = get_statement_registry().get(
+                "analytics.response_time", has_channel=query.channel_id is not None, samples=True
             )
-            SELECT AVG(EXTRACT(EPOCH FROM (response_time - inbound_time)) / 60) as avg_minutes
-            FROM conversation_pairs
-            WHERE response_time IS NOT NULL
-        """)
+            result = await self.session.execute(samples_query, params)
+            minutes.extend(float(row.minutes) for row in result)
         
-        result = await self.session.execute(response_query, params)
-        row = result.fetchone()
+        if not minutes:
+            return {}
         
-        return round(row.avg_minutes, 2) if row and row.avg_minutes else None
\ No newline at end of file
+        minutes.sort()
+        return {
+            "avg": round(sum(minutes) / len(minutes), 2),
+            "p50": round(_percentile_cont(minutes, 0.5), 2),
+            "p90": round(_percentile_cont(minutes, 0.9), 2),
+            "p95": round(_percentile_cont(minutes, 0.95), 2),
+            "p99": round(_percentile_cont(minutes, 0.99), 2)
+        }
@@ -0,0 +1,115 @@
+"""List conversations (inbox) query implementation."""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from uuid import UUID
+from datetime import datetime
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.messaging.infrastructure.persistence import statements  # noqa: F401 (registers statements)
+from shared.infrastructure.database.pagination import CursorPage, InvalidCursorError, decode_cursor, encode_cursor
+from shared.infrastructure.database.statements import get_statement_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ListConversationsQuery:
+    """Query to list conversations, most recently active first."""
+    tenant_id: UUID
+    channel_id: Optional[UUID] = None
+    unread_only: bool = False
+    limit: int = 50
+    cursor: Optional[str] = None
+
+
+@dataclass
+class ConversationSummaryResult:
+    """One inbox row."""
+    id: UUID
+    channel_id: UUID
+    phone_number: str
+    last_message_id: UUID
+    last_message_at: datetime
+    last_direction: str
+    last_message_type: str
+    last_inbound_at: Optional[datetime]
+    window_expires_at: Optional[datetime]
+    unread_count: int
+    message_count: int
+
+
+class ListConversationsQueryHandler:
+    """
+    Handler for list conversations query.
+
+    Pages over messaging.conversation_summaries on (last_message_at, id),
+    so every page is one index range scan regardless of how many
+    conversations or messages a tenant has. A conversation that receives
+    a message while a client is paging moves to the top of the inbox and
+    is not repeated on later pages.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def handle(self, query: ListConversationsQuery) -> CursorPage[ConversationSummaryResult]:
+        """
+        Execute list conversations query.
+
+        Raises:
+            InvalidCursorError: If cursor is malformed
+        """
+        try:
+            params: Dict[str, Any] = {"tenant_id": query.tenant_id, "limit": query.limit + 1}
+
+            if query.channel_id:
+                params["channel_id"] = query.channel_id
+
+            if query.cursor:
+                cursor_last_message_at, cursor_id = decode_cursor(query.cursor, "last_message_at")
+                params["cursor_last_message_at"] = cursor_last_message_at
+                params["cursor_id"] = cursor_id
+
+            inbox_query = get_statement_registry().get(
+                "conversations.inbox",
+                has_channel=query.channel_id is not None,
+                has_cursor=bool(query.cursor),
+                unread_only=query.unread_only
+            )
+
+            result = await self.session.execute(inbox_query, params)
+            conversations = [self._row_to_summary(row) for row in result]
+
+            next_cursor = None
+            if len(conversations) > query.limit:
+                conversations = conversations[:query.limit]
+                last = conversations[-1]
+                next_cursor = encode_cursor("last_message_at", last.last_message_at, last.id)
+
+            return CursorPage(items=conversations, next_cursor=next_cursor)
+
+        except InvalidCursorError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to list conversations: {e}")
+            raise
+
+    @staticmethod
+    def _row_to_summary(row) -> ConversationSummaryResult:
+        """Convert a conversation_summaries row to a result."""
+        return ConversationSummaryResult(
+            id=row.id,
+            channel_id=row.channel_id,
+            phone_number=row.conversation_key,
+            last_message_id=row.last_message_id,
+            last_message_at=row.last_message_at,
+            last_direction=row.last_direction,
+            last_message_type=row.last_message_type,
+            last_inbound_at=row.last_inbound_at,
+            window_expires_at=row.window_expires_at,
+            unread_count=row.unread_count,
+            message_count=row.message_count
+        )
@@ -5,10 +5,17 @@ Business logic for channel management.
 from typing import List, Optional
 from uuid import UUID, uuid4
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from shared.infrastructure.security.field_encryption import decrypt_field_value, encrypt_field_value
 from src.messaging.domain.entities.channel import Channel
 from src.messaging.domain.protocols.channel_repository import ChannelRepository
 from src.messaging.domain.exceptions import ChannelNotFoundError, ChannelInactiveError
+from src.messaging.infrastructure.cache.token_cache import DecryptedTokenCache, get_token_cache
+from src.messaging.infrastructure.cache.channel_routing_index import (
+    ChannelRoutingIndex,
+    get_channel_routing_index
+)
 #from shared.infrastructure.security.encryption import encrypt_field, decrypt_field
 from shared.infrastructure.observability.logger import get_logger
 from shared.infrastructure.security.audit_log import AuditLogger
@@ -21,17 +28,26 @@ class ChannelService:
     Application service for channel operations.
     
     Handles encryption, business rules, and audit logging.
+    Each mutation commits its own transaction and only then publishes
+    the routing index update, so other instances never route to a
+    channel change that could still roll back.
     """
     
     def __init__(
         self,
         channel_repo: ChannelRepository,
         audit_logger: AuditLogger,
-        encryption_key: str
+        encryption_key: str,
+        session: AsyncSession,
+        token_cache: Optional[DecryptedTokenCache] = None,
+        routing_index: Optional[ChannelRoutingIndex] = None
     ):
         self.channel_repo = channel_repo
         self.audit_logger = audit_logger
         self.encryption_key = encryption_key
+        self.session = session
+        self.token_cache = token_cache or get_token_cache()
+        self.routing_index = routing_index or get_channel_routing_index()
     
     async def create_channel(
         self,
@@ -90,6 +106,9 @@ class ChannelService:
             details={"name": name, "phone": business_phone}
         )
         
+        await self.session.commit()
+        await self.routing_index.publish_upsert(channel)
+        
         logger.info(
             f"Channel created: {channel.id}",
             extra={"tenant_id": tenant_id, "channel_id": channel.id}
@@ -134,6 +153,7 @@ class ChannelService:
         
         # Persist
         channel = await self.channel_repo.update(channel)
+        self.token_cache.invalidate(channel.id)
         
         # Audit log
         await self.audit_logger.log(
@@ -145,6 +165,9 @@ class ChannelService:
             details={"updates": {"name": name, "rate_limit": rate_limit_per_second}}
         )
         
+        await self.session.commit()
+        await self.routing_index.publish_upsert(channel)
+        
         return channel
     
     async def activate_channel(
@@ -155,6 +178,7 @@ class ChannelService:
         channel.activate()
         
         channel = await self.channel_repo.update(channel)
+        self.token_cache.invalidate(channel.id)
         
         await self.audit_logger.log(
             tenant_id=channel.tenant_id,
@@ -164,6 +188,9 @@ class ChannelService:
             resource_id=channel.id
         )
         
+        await self.session.commit()
+        await self.routing_index.publish_upsert(channel)
+        
         return channel
     
     async def suspend_channel(
@@ -174,6 +201,7 @@ class ChannelService:
         channel.suspend()
         
         channel = await self.channel_repo.update(channel)
+        self.token_cache.invalidate(channel.id)
         
         await self.audit_logger.log(
             tenant_id=channel.tenant_id,
@@ -183,17 +211,47 @@ class ChannelService:
             resource_id=channel.id
         )
         
+        await self.session.commit()
+        await self.routing_index.publish_upsert(channel)
+        
         return channel
     
+    async def deactivate_channel(
+        self, channel_id: UUID, user_id: Optional[UUID] = None
+    ) -> None:
+        """Deactivate (soft-delete) a channel and stop routing its webhooks."""
+        channel = await self.get_channel(channel_id)
+        
+        await self.channel_repo.delete(channel.id)
+        self.token_cache.invalidate(channel.id)
+        
+        await self.audit_logger.log(
+            tenant_id=channel.tenant_id,
+            user_id=user_id,
+            action="channel.deactivated",
+            resource_type="channel",
+            resource_id=channel.id
+        )
+        
+        await self.session.commit()
+        await self.routing_index.publish_remove(channel)
+    
     async def get_decrypted_token(self, channel_id: UUID) -> str:
         """
         Get decrypted access token for API calls.
         
         Use carefully - only for internal services.
+        Plaintext is cached in-process per token version, so repeated
+        sends skip the Fernet decrypt.
         """
         channel = await self.get_channel(channel_id)
         
         if not channel.is_active():
+            self.token_cache.invalidate(channel.id)
             raise ChannelInactiveError(f"Channel {channel_id} is not active")
         
-        return decrypt_field_value(channel.access_token_encrypted)
\ No newline at end of file
+        return self.token_cache.get_or_decrypt(
+            channel.id,
+            channel.token_version,
+            lambda: decrypt_field_value(channel.access_token_encrypted)
+        )
\ No newline at end of file
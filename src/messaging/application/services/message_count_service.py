@@ -0,0 +1,188 @@
+"""
+Message Count Service
+Listing totals without an exact COUNT(*) over messaging.messages per call.
+
+Strategy by filter shape:
+  - rollup:   only rollup dimensions (channel, direction, status, type,
+              date range): whole hours from message_hourly_rollups, the
+              partial edge hours from raw messages. Exact.
+  - cache:    a previous exact count of the same filters (short TTL).
+  - exact:    other filters whose planner estimate is small enough to
+              count precisely.
+  - estimate: other filters on large result sets; the planner's row
+              estimate is returned and flagged as not exact.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.messaging.infrastructure.persistence import statements  # noqa: F401 (registers statements)
+from shared.infrastructure.database.statements import get_statement_registry
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+# Filters answered by the hourly rollups
+ROLLUP_FILTERS = frozenset({"channel_id", "direction", "status", "message_type", "from_date", "to_date"})
+
+
+@dataclass(frozen=True)
+class MessageCount:
+    """
+    A listing total.
+
+    Attributes:
+        count: Number of matching messages
+        exact: False when count is a planner estimate
+        source: rollup, cache, exact or estimate
+    """
+
+    count: int
+    exact: bool
+    source: str
+
+
+class MessageCountService:
+    """
+    Counts messages matching listing filters.
+
+    Attributes:
+        session: Session used for counting (replica-routed for reads)
+        redis: Cache of exact counts, or None
+        cache_ttl_seconds: Lifetime of a cached exact count
+        exact_threshold: Estimates up to this many rows are counted exactly
+    """
+
+    KEY_PREFIX = "message_count"
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        redis: Optional[Redis] = None,
+        cache_ttl_seconds: int = 30,
+        exact_threshold: int = 10_000,
+    ) -> None:
+        """
+        Initialize message count service.
+
+        Args:
+            session: Session used for counting
+            redis: Async Redis client (decode_responses=True)
+            cache_ttl_seconds: Lifetime of a cached exact count
+            exact_threshold: Estimates up to this many rows are counted exactly
+        """
+        self.session = session
+        self.redis = redis
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.exact_threshold = exact_threshold
+
+    async def count(
+        self,
+        tenant_id: UUID,
+        channel_id: Optional[UUID] = None,
+        direction: Optional[str] = None,
+        status: Optional[str] = None,
+        message_type: Optional[str] = None,
+        phone: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+    ) -> MessageCount:
+        """Count messages matching the filters (see module docstring)."""
+        filters: Dict[str, Any] = {
+            name: value
+            for name, value in (
+                ("channel_id", str(channel_id) if channel_id else None),
+                ("direction", direction),
+                ("status", status),
+                ("message_type", message_type),
+                ("phone", phone),
+                ("from_date", from_date),
+                ("to_date", to_date),
+            )
+            if value
+        }
+        params = {"tenant_id": str(tenant_id), **filters}
+        flags = self._filter_flags(params)
+        registry = get_statement_registry()
+
+        if ROLLUP_FILTERS.issuperset(filters):
+            flags.pop("has_phone")
+            row = (await self.session.execute(registry.get("messages.count_rollup", **flags), params)).one()
+            return self._record(MessageCount(int(row.count), exact=True, source="rollup"))
+
+        key = self._cache_key(params)
+        cached = await self._cache_get(key)
+        if cached is not None:
+            return self._record(cached)
+
+        plan = (await self.session.execute(registry.get("messages.count", estimate=True, **flags), params)).scalar_one()
+        estimate = self._plan_rows(plan)
+        if estimate > self.exact_threshold:
+            return self._record(MessageCount(estimate, exact=False, source="estimate"))
+
+        row = (await self.session.execute(registry.get("messages.count", **flags), params)).one()
+        result = MessageCount(int(row.count), exact=True, source="exact")
+        await self._cache_set(key, result)
+        return self._record(result)
+
+    @staticmethod
+    def _filter_flags(params: Dict[str, Any]) -> Dict[str, bool]:
+        return {
+            "has_channel": "channel_id" in params,
+            "has_direction": "direction" in params,
+            "has_status": "status" in params,
+            "has_type": "message_type" in params,
+            "has_phone": "phone" in params,
+            "has_from": "from_date" in params,
+            "has_to": "to_date" in params,
+        }
+
+    @staticmethod
+    def _plan_rows(plan: Any) -> int:
+        """Root row estimate of EXPLAIN (FORMAT JSON) output."""
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def _record(result: MessageCount) -> MessageCount:
+        get_metrics().increment_counter("message_counts_total", source=result.source)
+        return result
+
+    # ========================================================================
+    # CACHE
+    # ========================================================================
+
+    @classmethod
+    def _cache_key(cls, params: Dict[str, Any]) -> str:
+        canonical = json.dumps(params, sort_keys=True, default=str)
+        return f"{cls.KEY_PREFIX}:{params['tenant_id']}:{hashlib.sha1(canonical.encode()).hexdigest()}"
+
+    async def _cache_get(self, key: str) -> Optional[MessageCount]:
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(key)
+        except Exception as e:
+            logger.warning("Message count cache read failed", extra={"error": str(e)})
+            return None
+        if raw is None:
+            return None
+        return MessageCount(int(raw), exact=True, source="cache")
+
+    async def _cache_set(self, key: str, result: MessageCount) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, result.count, ex=self.cache_ttl_seconds)
+        except Exception as e:
+            logger.warning("Message count cache write failed", extra={"error": str(e)})
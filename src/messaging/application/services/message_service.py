@@ -7,12 +7,12 @@ import uuid
 import asyncio
 from uuid import UUID
 
-from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.messaging.domain.entities.message import Message, MessageDirection, MessageType, MessageStatus
 from messaging.domain.entities.message_template import MessageTemplate
 from src.messaging.domain.value_objects.phone_number import PhoneNumber
+from src.messaging.domain.exceptions import MonthlyQuotaExceededError, RecipientListNotFoundError
 from src.messaging.domain.protocols import (
     InboundMessageRepository, ChannelRepository, TemplateRepository,message_repository
 )
@@ -22,6 +22,20 @@ from messaging.domain.protocols.external_services import (
 from src.messaging.infrastructure.rate_limiter.token_bucket import TokenBucketRateLimiter
 from src.messaging.infrastructure.events.event_bus import EventBus
 from src.messaging.infrastructure.outbox.outbox_service import OutboxService
+from src.messaging.infrastructure.cache.session_window_index import (
+    SessionWindowIndex,
+    get_session_window_index
+)
+from src.messaging.application.services.message_count_service import MessageCount, MessageCountService
+from src.messaging.infrastructure.usage.usage_meter import UsageMeter, get_usage_meter
+from src.messaging.infrastructure.persistence import statements  # noqa: F401 (registers statements)
+from shared.infrastructure.database.pagination import (
+    CursorPage,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor
+)
+from shared.infrastructure.database.statements import get_statement_registry
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +52,10 @@ class MessageService:
         rate_limiter: TokenBucketRateLimiter,
         event_bus: EventBus,
         outbox_service: OutboxService,
-        session: AsyncSession
+        session: AsyncSession,
+        session_windows: Optional[SessionWindowIndex] = None,
+        counts: Optional[MessageCountService] = None,
+        usage: Optional[UsageMeter] = None
     ):
         self.message_repo = message_repo
         self.channel_repo = channel_repo
@@ -48,6 +65,9 @@ class MessageService:
         self.event_bus = event_bus
         self.outbox_service = outbox_service
         self.session = session
+        self.session_windows = session_windows or get_session_window_index()
+        self.counts = counts or MessageCountService(session)
+        self.usage = usage or get_usage_meter()
     
     async def send_message(
         self,
@@ -58,9 +78,15 @@ class MessageService:
         template_name: Optional[str] = None,
         template_variables: Optional[Dict[str, str]] = None,
         media_url: Optional[str] = None,
-        idempotency_key: Optional[str] = None
+        idempotency_key: Optional[str] = None,
+        within_session: Optional[bool] = None
     ) -> Message:
-        """Send a WhatsApp message."""
+        """
+        Send a WhatsApp message.
+        
+        within_session may be passed by callers that already looked up the
+        recipient's session window (e.g. bulk sends).
+        """
         try:
             # Validate phone number
             phone = PhoneNumber(to_number)
@@ -73,16 +99,17 @@ class MessageService:
             if not channel.can_send_message():
                 raise ValueError(f"Channel {channel_id} cannot send messages")
             
-            # Check if within session window (24 hours)
-            last_inbound_time = await self.message_repo.get_last_inbound_time(
-                to_number,
-                tenant_id
-            )
+            # Monthly quota pre-check (no database hit while Redis has the total)
+            await self.usage.check_quota(self.session, channel)
             
-            within_session = False
-            if last_inbound_time:
-                time_diff = datetime.utcnow() - last_inbound_time
-                within_session = time_diff.total_seconds() < 24 * 60 * 60
+            # Check if within session window (24 hours)
+            if within_session is None:
+                within_session = await self.session_windows.is_open(
+                    self.session,
+                    tenant_id,
+                    channel_id,
+                    to_number
+                )
             
             # Determine message type
             message_type = MessageType.TEXT
@@ -182,6 +209,15 @@ class MessageService:
                 logger.error(f"Channel {message.channel_id} not found")
                 return
             
+            # Quota may have run out while the message was queued
+            try:
+                await self.usage.check_quota(self.session, channel)
+            except MonthlyQuotaExceededError as e:
+                message.mark_failed("quota_exceeded", str(e))
+                await self.message_repo.update(message)
+                logger.warning(f"Message {message_id} not sent: {e}")
+                return
+            
             # Check rate limit
             rate_limit_key = f"channel:{channel.id}"
             allowed, tokens_remaining = await self.rate_limiter.is_allowed(
@@ -210,9 +246,8 @@ class MessageService:
                 message.mark_sent(response.message_id)
                 await self.message_repo.update(message)
                 
-                # Update channel usage
-                channel.increment_usage()
-                await self.channel_repo.update(channel)
+                # Count usage once the sent status commits (flushed to channel_usage in batches)
+                self.usage.record_on_commit(self.session, tenant_id, channel.id)
                 
                 # Publish event
                 event = MessageSent(
@@ -337,69 +372,138 @@ class MessageService:
         return min(2 ** retry_count, 3600)
 
     async def list_messages(
-        self,
-        tenant_id: UUID,
-        channel_id: UUID,
-        skip: int = 0,
-        limit: int = 100,
-        direction: Optional[MessageDirection] = None
-    ) -> List[Message]:
-        """List messages for a channel."""
-        return await self.message_repo.list_by_channel(
-            channel_id=channel_id,
-            tenant_id=tenant_id,
-            limit=limit
-        )
-
-    async def count_messages(
         self,
         tenant_id: UUID,
         channel_id: Optional[UUID] = None,
         direction: Optional[str] = None,
         status: Optional[str] = None,
         from_date: Optional[datetime] = None,
-        to_date: Optional[datetime] = None
-    ) -> int:
-        """Count messages with filters."""
+        to_date: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> CursorPage[Message]:
+        """
+        List messages newest first with keyset pagination.
+        
+        Continues strictly after (created_at, id) of the cursor, so page N
+        is the same index range scan as page 1.
+        
+        Raises:
+            InvalidCursorError: If cursor is malformed
+        """
         try:
-            conditions = ["tenant_id = :tenant_id"]
-            params: Dict[str, Any] = {"tenant_id": str(tenant_id)}
+            params: Dict[str, Any] = {"tenant_id": str(tenant_id), "limit": limit + 1}
             
             if channel_id:
-                conditions.append("channel_id = :channel_id")
                 params["channel_id"] = str(channel_id)
-            
             if direction:
-                conditions.append("direction = :direction")
                 params["direction"] = direction
-            
             if status:
-                conditions.append("status = :status")
                 params["status"] = status
-            
             if from_date:
-                conditions.append("created_at >= :from_date")
                 params["from_date"] = from_date
-            
             if to_date:
-                conditions.append("created_at <= :to_date")
                 params["to_date"] = to_date
             
-            query = text(f"""
-                SELECT COUNT(*) as count
-                FROM messaging.messages
-                WHERE {' AND '.join(conditions)}
-            """)
+            if cursor:
+                cursor_created_at, cursor_id = decode_cursor(cursor, "created_at")
+                params["cursor_created_at"] = cursor_created_at
+                params["cursor_id"] = str(cursor_id)
+            
+            query = get_statement_registry().get(
+                "messages.list", has_cursor=bool(cursor), **self._filter_flags(params)
+            )
             
             result = await self.session.execute(query, params)
-            row = result.fetchone()
+            messages = [self._row_to_message(row) for row in result]
+            
+            next_cursor = None
+            if len(messages) > limit:
+                messages = messages[:limit]
+                last = messages[-1]
+                next_cursor = encode_cursor("created_at", last.created_at, last.id)
             
-            return int(row.count) if row and row.count is not None else 0
+            return CursorPage(items=messages, next_cursor=next_cursor)
+            
+        except InvalidCursorError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to list messages: {e}")
+            raise
+
+    async def count_messages(
+        self,
+        tenant_id: UUID,
+        channel_id: Optional[UUID] = None,
+        direction: Optional[str] = None,
+        status: Optional[str] = None,
+        from_date: Optional[datetime] = None,
+        to_date: Optional[datetime] = None,
+        message_type: Optional[str] = None,
+        phone: Optional[str] = None
+    ) -> MessageCount:
+        """
+        Count messages with filters.
+        
+        Rollup-backed or cached where possible; ad-hoc filters on large
+        result sets return a planner estimate (MessageCount.exact is False).
+        """
+        try:
+            return await self.counts.count(
+                tenant_id=tenant_id,
+                channel_id=channel_id,
+                direction=direction,
+                status=status,
+                message_type=message_type,
+                phone=phone,
+                from_date=from_date,
+                to_date=to_date
+            )
             
         except Exception as e:
             logger.error(f"Failed to count messages: {e}")
             raise
 
+    @staticmethod
+    def _filter_flags(params: Dict[str, Any]) -> Dict[str, bool]:
+        """Statement variant flags for the optional filters present in params."""
+        return {
+            "has_channel": "channel_id" in params,
+            "has_direction": "direction" in params,
+            "has_status": "status" in params,
+            "has_from": "from_date" in params,
+            "has_to": "to_date" in params,
+        }
+
+    @staticmethod
+    def _row_to_message(row) -> Message:
+        """Convert a messaging.messages row to a Message entity."""
+        return Message(
+            id=row.id,
+            tenant_id=row.tenant_id,
+            channel_id=row.channel_id,
+            direction=MessageDirection(row.direction),
+            message_type=MessageType(row.message_type),
+            from_number=row.from_number,
+            to_number=row.to_number,
+            content=row.content,
+            media_url=row.media_url,
+            template_id=row.template_id,
+            template_variables=row.template_variables,
+            whatsapp_message_id=row.whatsapp_message_id,
+            status=MessageStatus(row.status),
+            error_code=row.error_code,
+            error_message=row.error_message,
+            metadata=row.metadata,
+            retry_count=row.retry_count or 0,
+            max_retries=row.max_retries or 3,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            sent_at=row.sent_at,
+            delivered_at=row.delivered_at,
+            read_at=row.read_at
+        )
+
     async def get_conversation(
         self,
         tenant_id: UUID,
@@ -409,10 +513,6 @@ class MessageService:
     ) -> Optional[Dict[str, Any]]:
         """Get conversation thread with a phone number."""
         try:
-            conditions = [
-                "tenant_id = :tenant_id",
-                "(from_number = :phone OR to_number = :phone)"
-            ]
             params: Dict[str, Any] = {
                 "tenant_id": str(tenant_id),
                 "phone": phone_number,
@@ -420,73 +520,30 @@ class MessageService:
             }
             
             if channel_id:
-                conditions.append("channel_id = :channel_id")
                 params["channel_id"] = str(channel_id)
             
-            query = text(f"""
-                SELECT 
-                    id, tenant_id, channel_id, direction, message_type,
-                    from_number, to_number, content, media_url, template_id,
-                    template_variables, whatsapp_message_id, status,
-                    error_code, error_message, metadata, retry_count,
-                    max_retries, created_at, updated_at, sent_at,
-                    delivered_at, read_at
-                FROM messaging.messages
-                WHERE {' AND '.join(conditions)}
-                ORDER BY created_at DESC
-                LIMIT :limit
-            """)
+            query = get_statement_registry().get(
+                "messages.conversation", has_channel=channel_id is not None
+            )
             
             result = await self.session.execute(query, params)
-            
-            messages: List[Message] = []
-            last_message_at: Optional[datetime] = None
-            unread_count = 0
-            
-            for row in result:
-                # Convert row to Message entity
-                msg = Message(
-                    id=row.id,
-                    tenant_id=row.tenant_id,
-                    channel_id=row.channel_id,
-                    direction=MessageDirection(row.direction),
-                    message_type=MessageType(row.message_type),
-                    from_number=row.from_number,
-                    to_number=row.to_number,
-                    content=row.content,
-                    media_url=row.media_url,
-                    template_id=row.template_id,
-                    template_variables=row.template_variables,
-                    whatsapp_message_id=row.whatsapp_message_id,
-                    status=MessageStatus(row.status),
-                    error_code=row.error_code,
-                    error_message=row.error_message,
-                    metadata=row.metadata,
-                    retry_count=row.retry_count or 0,
-                    max_retries=row.max_retries or 3,
-                    created_at=row.created_at,
-                    updated_at=row.updated_at,
-                    sent_at=row.sent_at,
-                    delivered_at=row.delivered_at,
-                    read_at=row.read_at
-                )
-                messages.append(msg)
-                
-                if not last_message_at:
-                    last_message_at = msg.created_at
-                
-                if msg.direction == MessageDirection.INBOUND and msg.status != MessageStatus.READ:
-                    unread_count += 1
+            messages: List[Message] = [self._row_to_message(row) for row in result]
             
             if not messages:
                 return None
             
+            # Counters are maintained with the message writes (migration 0008)
+            summary_query = get_statement_registry().get(
+                "conversations.summary", has_channel=channel_id is not None
+            )
+            summary = (await self.session.execute(summary_query, params)).fetchone()
+            
             return {
                 "phone_number": phone_number,
                 "messages": messages,
-                "last_message_at": last_message_at,
-                "total_messages": len(messages),
-                "unread_count": unread_count
+                "last_message_at": summary.last_message_at or messages[0].created_at,
+                "total_messages": int(summary.message_count) or len(messages),
+                "unread_count": int(summary.unread_count)
             }
             
         except Exception as e:
@@ -551,6 +608,17 @@ class MessageService:
             queued = 0
             failed = 0
             
+            # Refuse the whole batch up front instead of failing it per message
+            await self._check_batch_quota(channel_id, len(recipients))
+            
+            # Session windows of all recipients: one MGET, at most one query
+            open_windows = await self.session_windows.open_windows(
+                self.session,
+                tenant_id,
+                channel_id,
+                recipients
+            )
+            
             for i, recipient in enumerate(recipients):
                 try:
                     # Get variables for this recipient
@@ -565,7 +633,8 @@ class MessageService:
                         to_number=recipient,
                         content=content,
                         template_name=template_name,
-                        template_variables=variables
+                        template_variables=variables,
+                        within_session=open_windows.get(recipient, False)
                     )
                     
                     queued += 1
@@ -589,6 +658,98 @@ class MessageService:
             logger.error(f"Failed to send bulk messages: {e}")
             raise
 
+    async def send_to_recipient_list(
+        self,
+        tenant_id: UUID,
+        channel_id: UUID,
+        list_id: UUID,
+        content: Optional[str] = None,
+        template_name: Optional[str] = None,
+        template_variables: Optional[Dict[str, str]] = None,
+        page_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        Send to every recipient of an imported recipient list.
+        
+        Entries are read in keyset pages, so memory does not grow with the
+        list; per-entry variables override template_variables.
+        """
+        registry = get_statement_registry()
+        recipient_list = (
+            await self.session.execute(
+                registry.get("recipient_lists.get"),
+                {"list_id": list_id, "tenant_id": tenant_id}
+            )
+        ).first()
+        if recipient_list is None or recipient_list.status != "ready":
+            raise RecipientListNotFoundError(f"Recipient list {list_id} not found")
+        
+        await self._check_batch_quota(channel_id, recipient_list.valid_rows)
+        
+        queued = 0
+        failed = 0
+        after_position = 0
+        entries_query = registry.get("recipient_lists.entries")
+        
+        while True:
+            entries = (
+                await self.session.execute(
+                    entries_query,
+                    {
+                        "list_id": list_id,
+                        "tenant_id": tenant_id,
+                        "after_position": after_position,
+                        "limit": page_size
+                    }
+                )
+            ).all()
+            if not entries:
+                break
+            after_position = entries[-1].position
+            
+            open_windows = await self.session_windows.open_windows(
+                self.session,
+                tenant_id,
+                channel_id,
+                [entry.phone for entry in entries]
+            )
+            
+            for entry in entries:
+                variables = template_variables
+                if entry.variables:
+                    variables = {**(template_variables or {}), **entry.variables}
+                try:
+                    await self.send_message(
+                        tenant_id=tenant_id,
+                        channel_id=channel_id,
+                        to_number=entry.phone,
+                        content=content,
+                        template_name=template_name,
+                        template_variables=variables,
+                        within_session=open_windows.get(entry.phone, False)
+                    )
+                    queued += 1
+                except Exception as e:
+                    logger.error(f"Failed to queue message for {entry.phone}: {e}")
+                    failed += 1
+            
+            if len(entries) < page_size:
+                break
+        
+        logger.info(f"Recipient list {list_id} send completed: {queued} queued, {failed} failed")
+        
+        return {
+            "queued": queued,
+            "failed": failed
+        }
+
+    async def _check_batch_quota(self, channel_id: UUID, needed: int) -> None:
+        """Raise MonthlyQuotaExceededError if needed sends do not fit the quota."""
+        channel = await self.channel_repo.get_by_id(channel_id)
+        if not channel:
+            raise ValueError(f"Channel {channel_id} not found")
+        await self.usage.check_quota(self.session, channel, needed=needed)
+
     async def get_message(
         self,
         message_id: UUID,
@@ -0,0 +1,295 @@
+"""
+Status Update Buffer
+Coalesces webhook delivery statuses and applies them in set-based batches.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from src.messaging.domain.entities.outbound_message import STATUS_RANK
+from src.messaging.infrastructure.ingestion.webhook_codec import WebhookStatus
+from src.messaging.infrastructure.outbox.outbox_service import OutboxService
+from src.messaging.infrastructure.persistence.repositories.message_repository_impl import (
+    OutboundMessageRepositoryImpl
+)
+from src.shared_.database import get_async_session
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+# (status, outbox event, timestamp column) in STATUS_RANK order
+_EVENT_STAGES = (
+    ("delivered", "MessageDelivered", "delivered_at"),
+    ("read", "MessageRead", "read_at"),
+)
+
+
+@dataclass
+class CoalescedStatus:
+    """
+    All statuses seen for one message within a buffer window.
+
+    Keeps the highest status by STATUS_RANK plus the timestamp of every
+    stage observed, so a burst of sent/delivered/read becomes one row.
+    """
+
+    wa_message_id: str
+    status: str
+    sent_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
+    read_at: Optional[datetime] = None
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+
+    def merge(self, status: str, timestamp: Optional[datetime], error: Optional[Dict[str, Any]]) -> None:
+        """Fold another status for the same message into this one."""
+        if status == "sent":
+            self.sent_at = self.sent_at or timestamp
+        elif status == "delivered":
+            self.delivered_at = self.delivered_at or timestamp
+        elif status == "read":
+            self.read_at = self.read_at or timestamp
+            # A read receipt implies delivery even if "delivered" never arrived
+            self.delivered_at = self.delivered_at or timestamp
+        elif status == "failed" and error:
+            self.error_code = str(error.get("code", "unknown"))
+            self.error_message = error.get("message") or error.get("title")
+
+        if STATUS_RANK[status] > STATUS_RANK[self.status]:
+            self.status = status
+
+    def to_row(self) -> Dict[str, Any]:
+        """Row for OutboundMessageRepositoryImpl.apply_status_updates."""
+        return {
+            "wa_message_id": self.wa_message_id,
+            "status": self.status,
+            "sent_at": self.sent_at,
+            "delivered_at": self.delivered_at,
+            "read_at": self.read_at,
+            "error_code": self.error_code,
+            "error_message": self.error_message,
+        }
+
+
+class StatusUpdateBuffer:
+    """
+    Short-window buffer for delivery status webhooks.
+
+    Statuses are collapsed per (tenant, wa_message_id) to the highest
+    state, then flushed per tenant as one UPDATE ... FROM unnest(...) plus
+    one batched outbox insert for MessageDelivered/MessageRead events.
+
+    submit() resolves only once the batch containing its statuses is
+    committed, so callers (e.g. WebhookIngestWorker) never acknowledge a
+    webhook whose statuses could still be lost.
+
+    Attributes:
+        window_seconds: Maximum time a status waits before being flushed
+        max_batch: Pending message count that triggers an early flush
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 0.25,
+        max_batch: int = 2000,
+        session_factory: Callable = get_async_session,
+    ) -> None:
+        """
+        Initialize status buffer.
+
+        Args:
+            window_seconds: Coalescing window
+            max_batch: Flush early once this many messages are pending
+            session_factory: Async context manager yielding a session
+        """
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.session_factory = session_factory
+        self._pending: Dict[UUID, Dict[str, CoalescedStatus]] = {}
+        self._waiters: Dict[UUID, List[asyncio.Future]] = {}
+        self._pending_count = 0
+        self._timer: Optional[asyncio.Task] = None
+
+    async def submit(self, tenant_id: UUID, statuses: Iterable[WebhookStatus]) -> None:
+        """
+        Buffer webhook statuses and wait until they are persisted.
+
+        Args:
+            tenant_id: Tenant owning the channel the statuses arrived on
+            statuses: Decoded Meta status objects
+
+        Raises:
+            Exception: Whatever the flush of this tenant's batch raised
+        """
+        metrics = get_metrics()
+        tenant_pending = self._pending.setdefault(tenant_id, {})
+        received = 0
+
+        for raw in statuses:
+            status = raw.status
+            wa_message_id = raw.id
+            if not wa_message_id or status not in STATUS_RANK:
+                continue
+            received += 1
+
+            timestamp = self._parse_timestamp(raw.timestamp)
+            error = raw.errors[0] if raw.errors else None
+
+            entry = tenant_pending.get(wa_message_id)
+            if entry is None:
+                entry = CoalescedStatus(wa_message_id=wa_message_id, status=status)
+                tenant_pending[wa_message_id] = entry
+                self._pending_count += 1
+            else:
+                metrics.increment_counter("status_updates_coalesced_total")
+            entry.merge(status, timestamp, error)
+
+        if received == 0:
+            if not tenant_pending:
+                del self._pending[tenant_id]
+            return
+
+        metrics.increment_counter("status_updates_received_total", value=received)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(tenant_id, []).append(waiter)
+
+        if self._pending_count >= self.max_batch:
+            asyncio.create_task(self.flush())
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_after_window())
+
+        await waiter
+
+    async def flush(self) -> None:
+        """Persist everything buffered so far."""
+        if self._timer is not None:
+            # Only a still-sleeping timer is referenced here
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, {}
+        waiters, self._waiters = self._waiters, {}
+        self._pending_count = 0
+
+        for tenant_id, entries in pending.items():
+            tenant_waiters = waiters.get(tenant_id, [])
+            try:
+                await self._flush_tenant(tenant_id, list(entries.values()))
+            except Exception as e:
+                logger.error(
+                    "Failed to flush status updates",
+                    extra={"error": str(e), "tenant_id": str(tenant_id), "count": len(entries)}
+                )
+                for waiter in tenant_waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+                continue
+
+            for waiter in tenant_waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def _flush_after_window(self) -> None:
+        """Flush once the coalescing window elapses."""
+        await asyncio.sleep(self.window_seconds)
+        self._timer = None
+        await self.flush()
+
+    async def _flush_tenant(self, tenant_id: UUID, entries: List[CoalescedStatus]) -> None:
+        """One UPDATE and one outbox insert for a tenant's batch."""
+        started = time.perf_counter()
+        metrics = get_metrics()
+
+        async with self.session_factory() as session:
+            repo = OutboundMessageRepositoryImpl(session, tenant_id)
+            applied = await repo.apply_status_updates([entry.to_row() for entry in entries])
+            await OutboxService(session).create_events(self._build_events(tenant_id, applied))
+            await session.commit()
+
+        metrics.increment_counter("status_update_batches_total")
+        metrics.increment_counter("status_updates_applied_total", value=len(applied))
+        metrics.observe_histogram("status_update_batch_size", len(entries))
+        metrics.observe_histogram("status_update_flush_seconds", time.perf_counter() - started)
+
+        logger.info(
+            "Flushed status updates",
+            extra={
+                "tenant_id": str(tenant_id),
+                "messages": len(entries),
+                "applied": len(applied),
+            }
+        )
+
+    @staticmethod
+    def _build_events(tenant_id: UUID, applied: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        MessageDelivered/MessageRead outbox events for applied rows.
+
+        One event per stage the update moved past, so a delivered+read
+        burst coalesced into one row still emits both.
+        """
+        events = []
+        for row in applied:
+            old_rank = STATUS_RANK.get(row.get("previous_status"), 0)
+            new_rank = STATUS_RANK[row["status"]]
+            for stage, event_type, at_key in _EVENT_STAGES:
+                if not old_rank < STATUS_RANK[stage] <= new_rank:
+                    continue
+
+                at = row.get(at_key)
+                events.append({
+                    "aggregate_id": row["id"],
+                    "aggregate_type": "OutboundMessage",
+                    "event_type": event_type,
+                    "tenant_id": tenant_id,
+                    "payload": {
+                        "message_id": str(row["id"]),
+                        "whatsapp_message_id": row["wa_message_id"],
+                        at_key: at.isoformat() if at else None,
+                    },
+                })
+        return events
+
+    @staticmethod
+    def _parse_timestamp(value: Any) -> Optional[datetime]:
+        """Meta sends epoch seconds as a string."""
+        try:
+            return datetime.utcfromtimestamp(float(value))
+        except (TypeError, ValueError):
+            return None
+
+
+# Global status buffer instance
+_status_buffer: StatusUpdateBuffer | None = None
+
+
+def get_status_update_buffer() -> StatusUpdateBuffer:
+    """
+    Get the global status update buffer.
+
+    Returns:
+        StatusUpdateBuffer instance
+    """
+    global _status_buffer
+    if _status_buffer is None:
+        _status_buffer = StatusUpdateBuffer()
+    return _status_buffer
+
+
+def configure_status_update_buffer(window_seconds: float = 0.25, max_batch: int = 2000) -> None:
+    """
+    Configure the global status update buffer.
+
+    Args:
+        window_seconds: Coalescing window
+        max_batch: Pending message count that triggers an early flush
+    """
+    global _status_buffer
+    _status_buffer = StatusUpdateBuffer(window_seconds=window_seconds, max_batch=max_batch)
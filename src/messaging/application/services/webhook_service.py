@@ -2,32 +2,100 @@
 Webhook Service
 Processes inbound WhatsApp webhooks.
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Union
 from uuid import uuid4
 from datetime import datetime
 
+import msgspec
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.messaging.domain.entities.inbound_message import InboundMessage
 from src.messaging.domain.protocols.message_repository import InboundMessageRepository
 from src.messaging.domain.protocols.channel_repository import ChannelRepository
-from src.messaging.domain.protocols.speech_transcription import SpeechTranscription
 from src.messaging.domain.value_objects.webhook_signature import WebhookSignature
 from src.messaging.domain.exceptions import (
     InvalidWebhookSignatureError,
-    DuplicateMessageError,
     ChannelNotFoundError
 )
 from src.messaging.infrastructure.idempotency_checker import IdempotencyChecker
+from src.messaging.infrastructure.ingestion.webhook_codec import (
+    WebhookChangeValue,
+    WebhookEnvelope,
+    WebhookInboundMessage,
+    WebhookStatus,
+    decode_webhook
+)
+from src.messaging.infrastructure.transcription.transcription_queue import (
+    TranscriptionJob,
+    TranscriptionQueue
+)
+from src.messaging.infrastructure.cache.channel_routing_index import (
+    ChannelRoutingIndex,
+    get_channel_routing_index
+)
+from src.messaging.infrastructure.cache.session_window_index import (
+    SessionWindowIndex,
+    get_session_window_index
+)
+from src.messaging.application.services.status_update_buffer import (
+    StatusUpdateBuffer,
+    get_status_update_buffer
+)
 from shared.infrastructure.observability.logger import get_logger
 from shared.infrastructure.messaging.domain_event_publisher import DomainEventPublisher
 
 logger = get_logger(__name__)
 
 
+class WebhookSignatureVerifier:
+    """
+    Authenticates webhook deliveries from the routing index alone.
+    
+    Needs no database session, so the fast-ack path can verify and buffer
+    a delivery without opening one.
+    """
+    
+    def __init__(self, routing_index: ChannelRoutingIndex, app_secret: Optional[str] = None):
+        self.routing_index = routing_index
+        self.app_secret = app_secret
+    
+    def verify_signature(
+        self, payload: bytes, signature: str, app_secret: Optional[str] = None
+    ) -> bool:
+        """
+        Verify WhatsApp webhook signature.
+        
+        Args:
+            payload: Raw request body
+            signature: X-Hub-Signature-256 header value
+            app_secret: Per-channel secret (defaults to the global secret)
+        
+        Returns:
+            True if valid, False otherwise
+        """
+        try:
+            WebhookSignature(signature, payload, app_secret or self.app_secret)
+            return True
+        except ValueError:
+            return False
+    
+    async def get_channel_app_secret(self, channel_id: str) -> Optional[str]:
+        """Resolve the app secret used to sign a channel's webhooks."""
+        route = await self.routing_index.resolve_channel_id(channel_id)
+        if not route:
+            return None
+        return self.routing_index.app_secret(route) or self.app_secret
+
+
 class WebhookService:
     """
     Service for processing WhatsApp webhooks.
     
     Handles verification, message parsing, and idempotency.
+    
+    process_webhook owns the unit of work: it commits the session itself
+    so that message IDs marked as seen are released again whenever any
+    step up to and including the commit fails.
     """
     
     def __init__(
@@ -36,75 +104,126 @@ class WebhookService:
         channel_repo: ChannelRepository,
         idempotency_checker: IdempotencyChecker,
         event_publisher: DomainEventPublisher,
-        transcription_service: SpeechTranscription,
-        app_secret: str
+        transcription_queue: TranscriptionQueue,
+        app_secret: str,
+        session: AsyncSession,
+        routing_index: Optional[ChannelRoutingIndex] = None,
+        status_buffer: Optional[StatusUpdateBuffer] = None,
+        session_windows: Optional[SessionWindowIndex] = None
     ):
         self.inbound_repo = inbound_repo
         self.channel_repo = channel_repo
         self.idempotency_checker = idempotency_checker
         self.event_publisher = event_publisher
-        self.transcription_service = transcription_service
+        self.transcription_queue = transcription_queue
         self.app_secret = app_secret
+        self.session = session
+        self.routing_index = routing_index or get_channel_routing_index()
+        self.status_buffer = status_buffer or get_status_update_buffer()
+        self.session_windows = session_windows or get_session_window_index()
+        self.verifier = WebhookSignatureVerifier(self.routing_index, app_secret)
+    
+    def verify_signature(
+        self, payload: bytes, signature: str, app_secret: Optional[str] = None
+    ) -> bool:
+        """Verify WhatsApp webhook signature (see WebhookSignatureVerifier)."""
+        return self.verifier.verify_signature(payload, signature, app_secret)
+    
+    async def get_channel_app_secret(self, channel_id: str) -> Optional[str]:
+        """Resolve the app secret used to sign a channel's webhooks."""
+        return await self.verifier.get_channel_app_secret(channel_id)
+    
+    async def get_channel_verify_token(self, channel_id: str) -> Optional[str]:
+        """Resolve a channel's webhook verification token."""
+        route = await self.routing_index.resolve_channel_id(channel_id)
+        return route.verify_token if route else None
     
-    def verify_signature(self, payload: bytes, signature: str) -> bool:
+    async def get_tenant_from_channel(self, channel_id: str) -> Optional[str]:
+        """Resolve the tenant owning a channel."""
+        route = await self.routing_index.resolve_channel_id(channel_id)
+        return str(route.tenant_id) if route else None
+    
+    async def process_raw_webhook(self, body: bytes) -> None:
         """
-        Verify WhatsApp webhook signature.
-        
-        Args:
-            payload: Raw request body
-            signature: X-Hub-Signature-256 header value
+        Decode and process a raw webhook body.
         
-        Returns:
-            True if valid, False otherwise
+        The body is parsed exactly once, by a compiled decoder, into
+        structs that are used for the rest of the pipeline.
         """
-        try:
-            WebhookSignature(signature, payload, self.app_secret)
-            return True
-        except ValueError:
-            return False
+        await self.process_webhook(decode_webhook(body))
     
-    async def process_webhook(self, payload: Dict[str, Any]) -> None:
+    async def process_webhook(self, payload: Union[WebhookEnvelope, Dict[str, Any]]) -> None:
         """
         Process incoming webhook payload.
         
         Handles messages, status updates, and other events.
         """
         try:
-            # Extract entries
-            entries = payload.get("entry", [])
+            if isinstance(payload, dict):
+                payload = msgspec.convert(payload, WebhookEnvelope)
+            
+            # Deduplicate every message ID in the payload in one round trip
+            new_ids = await self.idempotency_checker.check_and_mark_many([
+                message.id
+                for entry in payload.entry
+                for change in entry.changes
+                for message in change.value.messages
+            ])
             
-            for entry in entries:
-                changes = entry.get("changes", [])
+            pending: List[InboundMessage] = []
+            try:
+                for entry in payload.entry:
+                    for change in entry.changes:
+                        value = change.value
+                        for message in value.messages:
+                            if message.id not in new_ids:
+                                logger.info(f"Duplicate message ignored: {message.id}")
+                                continue
+                            pending.append(await self._build_inbound_message(value, message))
+                
+                # Persist every new message in one statement
+                inserted = await self.inbound_repo.create_many_if_absent(pending)
+                
+                # Open/extend the customer-service windows in one round trip
+                await self.session_windows.record_inbound_many(
+                    (m.tenant_id, m.channel_id, m.from_number, m.timestamp_wa) for m in inserted
+                )
                 
-                for change in changes:
-                    value = change.get("value", {})
-                    
-                    # Process messages
-                    if "messages" in value:
-                        for message in value["messages"]:
-                            await self._process_message(value, message)
-                    
-                    # Process status updates
-                    if "statuses" in value:
-                        for status in value["statuses"]:
-                            await self._process_status_update(value, status)
+                for inbound_message in inserted:
+                    await self._publish_inbound_message(inbound_message)
+                
+                # Process status updates (coalesced and applied in batch)
+                for entry in payload.entry:
+                    for change in entry.changes:
+                        if change.value.statuses:
+                            await self._process_status_updates(change.value, change.value.statuses)
+                
+                await self.session.commit()
+            except Exception:
+                # Nothing was committed: let a redelivery of these messages through
+                await self.idempotency_checker.release(list(new_ids))
+                raise
+            
+            # Jobs reference committed rows only, so workers never race the insert
+            for inbound_message in inserted:
+                if inbound_message.content.get("transcription_status") == "pending":
+                    await self._enqueue_transcription(inbound_message, inbound_message.content)
         
         except Exception as e:
             logger.error(f"Webhook processing error: {str(e)}", exc_info=True)
             raise
     
-    async def _process_message(
-        self, value: Dict[str, Any], message: Dict[str, Any]
-    ) -> None:
-        """Process inbound message."""
-        wa_message_id = message.get("id")
-        message_type = message.get("type")
-        from_number = message.get("from")
-        timestamp = message.get("timestamp")
+    async def _build_inbound_message(
+        self, value: WebhookChangeValue, message: WebhookInboundMessage
+    ) -> InboundMessage:
+        """Resolve the channel and build the inbound message entity."""
+        wa_message_id = message.id
+        message_type = message.type
+        from_number = message.from_
         
         # Get channel info
-        phone_number_id = value.get("metadata", {}).get("phone_number_id")
-        to_number = value.get("metadata", {}).get("display_phone_number")
+        phone_number_id = value.metadata.phone_number_id if value.metadata else None
+        to_number = value.metadata.display_phone_number if value.metadata else None
         
         logger.info(
             f"Processing inbound message: {wa_message_id}",
@@ -115,76 +234,90 @@ class WebhookService:
             }
         )
         
-        # Find channel
-        # In production: cache this lookup
-        channels = await self.channel_repo.list_by_tenant(tenant_id=None)  # Need tenant context
-        channel = next(
-            (c for c in channels if c.phone_number_id == phone_number_id),
-            None
-        )
+        # Find channel (in-memory routing index, no DB round trip)
+        channel = await self.routing_index.resolve_phone_number_id(str(phone_number_id))
         
         if not channel:
             logger.warning(f"Channel not found for phone_number_id: {phone_number_id}")
             raise ChannelNotFoundError(f"No channel configured for {phone_number_id}")
         
-        # Check idempotency
-        try:
-            await self.idempotency_checker.check_and_mark(str(wa_message_id))
-        except DuplicateMessageError:
-            logger.info(f"Duplicate message ignored: {wa_message_id}")
-            return
-        
         # Extract content based on type
-        content = await self._extract_content(str(message_type), message)
+        content = await self._extract_content(message_type, message)
         
-        # Create inbound message entity
-        inbound_message = InboundMessage(
+        return InboundMessage(
             id=uuid4(),
             tenant_id=channel.tenant_id,
-            channel_id=channel.id,
-            wa_message_id=str(wa_message_id),
-            from_number=str(from_number),
+            channel_id=channel.channel_id,
+            wa_message_id=wa_message_id,
+            from_number=from_number,
             to_number=to_number,
-            message_type=str(message_type),
+            message_type=message_type,
             content=content,
-            timestamp_wa=datetime.fromtimestamp(float(timestamp)),
-            raw_payload=message,
+            timestamp_wa=datetime.fromtimestamp(float(message.timestamp)),
+            raw_payload=message.to_dict(),
             processed=False
         )
-        
-        # Persist
-        await self.inbound_repo.create(inbound_message)
+    
+    async def _publish_inbound_message(self, inbound_message: InboundMessage) -> None:
+        """Publish the received event (transcription is queued after commit)."""
+        content = inbound_message.content
         
         # Publish domain event for conversation engine
         await self.event_publisher.publish_events_from_aggregate.publish(
             event_type="message.received",
             payload={
                 "message_id": str(inbound_message.id),
-                "tenant_id": str(channel.tenant_id),
-                "channel_id": str(channel.id),
-                "from_number": from_number,
-                "message_type": message_type,
+                "tenant_id": str(inbound_message.tenant_id),
+                "channel_id": str(inbound_message.channel_id),
+                "from_number": inbound_message.from_number,
+                "message_type": inbound_message.message_type,
                 "content": content
             }
         )
         
         logger.info(f"Inbound message processed: {inbound_message.id}")
     
+    async def _enqueue_transcription(
+        self, inbound_message: InboundMessage, content: Dict[str, Any]
+    ) -> None:
+        """Queue a voice note for background transcription."""
+        if not content.get("audio_id"):
+            return
+        
+        try:
+            await self.transcription_queue.enqueue(
+                TranscriptionJob(
+                    message_id=str(inbound_message.id),
+                    tenant_id=str(inbound_message.tenant_id),
+                    channel_id=str(inbound_message.channel_id),
+                    media_id=content["audio_id"],
+                    mime_type=content.get("mime_type"),
+                    sha256=content.get("sha256")
+                )
+            )
+        except Exception as e:
+            # The message is stored either way; transcription stays pending
+            logger.error(
+                f"Failed to enqueue transcription: {str(e)}",
+                extra={"message_id": str(inbound_message.id)}
+            )
+    
     async def _extract_content(
-        self, message_type: str, message: Dict[str, Any]
+        self, message_type: str, message: WebhookInboundMessage
     ) -> Dict[str, Any]:
         """Extract content based on message type."""
         if message_type == "text":
-            return {"body": message.get("text", {}).get("body", "")}
+            return {"body": (message.text or {}).get("body", "")}
         
         elif message_type == "button":
+            button = message.button or {}
             return {
-                "button_id": message.get("button", {}).get("payload"),
-                "button_text": message.get("button", {}).get("text")
+                "button_id": button.get("payload"),
+                "button_text": button.get("text")
             }
         
         elif message_type == "interactive":
-            interactive = message.get("interactive", {})
+            interactive = message.interactive or {}
             if interactive.get("type") == "list_reply":
                 return {
                     "list_reply_id": interactive.get("list_reply", {}).get("id"),
@@ -196,54 +329,40 @@ class WebhookService:
                     "button_reply_title": interactive.get("button_reply", {}).get("title")
                 }
         
-        elif message_type == "voice":
-            # Handle voice transcription
-            voice = message.get("voice", {})
-            audio_id = voice.get("id")
-            mime_type = voice.get("mime_type")
-            
-            # Download and transcribe
-            # In production: get media URL from WhatsApp API first
-            try:
-                audio_url = f"https://placeholder/{audio_id}"  # Get from WhatsApp
-                transcript = await self.transcription_service.transcribe_audio(audio_url)
-                
-                return {
-                    "audio_id": audio_id,
-                    "mime_type": mime_type,
-                    "transcript": transcript
-                }
-            except Exception as e:
-                logger.error(f"Transcription failed: {str(e)}")
-                return {
-                    "audio_id": audio_id,
-                    "mime_type": mime_type,
-                    "transcript": None,
-                    "error": "Transcription failed"
-                }
+        elif message_type in ("voice", "audio"):
+            # Transcribed later by TranscriptionWorker (see _enqueue_transcription)
+            audio = (message.voice if message_type == "voice" else message.audio) or {}
+            return {
+                "audio_id": audio.get("id"),
+                "mime_type": audio.get("mime_type"),
+                "sha256": audio.get("sha256"),
+                "transcript": None,
+                "transcription_status": "pending"
+            }
         
         else:
             # Generic content
-            return message
+            return message.to_dict()
     
-    async def _process_status_update(
-        self, value: Dict[str, Any], status: Dict[str, Any]
+    async def _process_status_updates(
+        self, value: WebhookChangeValue, statuses: List[WebhookStatus]
     ) -> None:
-        """Process delivery status update."""
-        wa_message_id = status.get("id")
-        status_type = status.get("status")  # sent, delivered, read, failed
+        """
+        Hand delivery status updates to the status buffer.
+        
+        Returns once they are persisted; the buffer collapses them per
+        message and applies them with one UPDATE per tenant batch.
+        """
+        phone_number_id = value.metadata.phone_number_id if value.metadata else None
+        channel = await self.routing_index.resolve_phone_number_id(str(phone_number_id))
+        
+        if not channel:
+            logger.warning(f"Channel not found for phone_number_id: {phone_number_id}")
+            raise ChannelNotFoundError(f"No channel configured for {phone_number_id}")
         
         logger.info(
-            f"Status update: {wa_message_id} -> {status_type}",
-            extra={"wa_message_id": wa_message_id, "status": status_type}
+            f"Status updates: {len(statuses)}",
+            extra={"channel_id": str(channel.channel_id), "count": len(statuses)}
         )
         
-        # Publish event for outbound message tracking
-        await self.event_publisher.publish_events_from_aggregate.publish(
-            event_type="message.status_updated",
-            payload={
-                "wa_message_id": wa_message_id,
-                "status": status_type,
-                "timestamp": status.get("timestamp")
-            }
-        )
\ No newline at end of file
+        await self.status_buffer.submit(channel.tenant_id, statuses)
@@ -12,7 +12,8 @@ from src.messaging.infrastructure.outbox.outbox_service import OutboxService
 from src.messaging.application.services.message_service import MessageService
 from src.messaging.infrastructure.middleware.tenant_context import TenantContextManager
 #from src.shared.infrastructure.database import get_session, get_engine
-from src.shared_.database import get_async_session
+from src.shared_.database import close_database, get_async_session, init_database
+from src.shared_.database.profiler import profile_scope
 from src.messaging.infrastructure.dependencies import (
     get_message_service,
     get_redis
@@ -74,7 +75,11 @@ class OutboxWorker:
                 await asyncio.sleep(self.poll_interval)
     
     async def _process_event(self, event: dict):
-        """Process a single outbox event."""
+        """Process a single outbox event (profiled as one SQL scope)."""
+        async with profile_scope(f"outbox:{event.get('event_type')}", kind="job"):
+            await self._handle_event(event)
+
+    async def _handle_event(self, event: dict):
         try:
             event_type = event["event_type"]
             tenant_id = event["tenant_id"]
@@ -90,12 +95,15 @@ class OutboxWorker:
             else:
                 logger.warning(f"Unknown event type: {event_type}")
             
-            # Mark as processed
+            # Mark as processed and commit (sends are counted on commit)
             await self.outbox_service.mark_processed(event["id"])
+            await self.outbox_service.session.commit()
             
         except Exception as e:
             logger.error(f"Failed to process event {event['id']}: {e}")
+            await self.outbox_service.session.rollback()
             await self.outbox_service.mark_failed(event["id"], str(e))
+            await self.outbox_service.session.commit()
         finally:
             # Clear tenant context
             await self.tenant_context.clear_tenant_context()
@@ -142,6 +150,12 @@ class OutboxWorker:
             logger.info(f"Waiting for {len(self.tasks)} tasks to complete...")
             await asyncio.gather(*self.tasks, return_exceptions=True)
         
+        # Flush usage counters of the sends above before exiting
+        try:
+            await self.message_service.usage.stop()
+        except Exception as e:
+            logger.error(f"Failed to flush channel usage: {e}")
+        
         logger.info("Outbox worker stopped")
 
 
@@ -152,10 +166,11 @@ async def main():
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
-    # Initialize dependencies
-    engine = get_engine()
-    async with engine.begin() as conn:
-        session = get_session()
+    from src.config import get_settings
+    
+    # Initialize dependencies (dispatch has its own pool, isolated from API/analytics)
+    await init_database(get_settings().effective_database_url)
+    async with get_async_session("dispatch") as session:
         redis = await get_redis()
         
         # Create services
@@ -176,7 +191,7 @@ async def main():
         finally:
             await worker.stop()
             await redis.close()
-            await engine.dispose()
+            await close_database()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,182 @@
+"""Worker that keeps hourly message rollups current."""
+
+import argparse
+import asyncio
+import logging
+import signal
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.messaging.infrastructure.persistence.repositories.message_rollup_repository import (
+    MessageRollupRepository
+)
+from src.shared_.database import close_database, get_async_session, init_database
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _hour_floor(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+class RollupWorker:
+    """
+    Folds rollup deltas and corrects late data.
+
+    - Folds up to `batch_size` deltas per transaction and keeps folding
+      while full batches come back; once drained it sleeps for
+      `fold_interval`. Several workers may run side by side.
+    - Every `reconcile_interval` seconds, re-checks the last
+      `reconcile_hours` hours against messaging.messages (one hour per
+      transaction) and appends correcting deltas, then prunes rollup
+      rows that folded back to zero.
+    - Publishes fold throughput and the age of the oldest pending delta.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 10_000,
+        fold_interval: float = 1.0,
+        reconcile_interval: float = 300.0,
+        reconcile_hours: int = 48
+    ):
+        self.batch_size = batch_size
+        self.fold_interval = fold_interval
+        self.reconcile_interval = reconcile_interval
+        self.reconcile_hours = reconcile_hours
+        self.running = False
+        self._last_reconcile = 0.0
+
+    async def start(self):
+        """Start the worker."""
+        logger.info(
+            f"Starting rollup worker (batch={self.batch_size}, "
+            f"reconcile every {self.reconcile_interval}s over {self.reconcile_hours}h)"
+        )
+        self.running = True
+
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        while self.running:
+            try:
+                folded = await self.fold()
+
+                now = time.monotonic()
+                if now - self._last_reconcile >= self.reconcile_interval:
+                    self._last_reconcile = now
+                    end = _hour_floor(datetime.now(timezone.utc)) + timedelta(hours=1)
+                    await self.reconcile(end - timedelta(hours=self.reconcile_hours), end)
+
+                if folded < self.batch_size:
+                    await asyncio.sleep(self.fold_interval)
+
+            except Exception as e:
+                logger.error(f"Rollup worker error: {e}")
+                await asyncio.sleep(1)
+
+    async def fold(self) -> int:
+        """Fold one batch of deltas; returns the number of deltas moved."""
+        started = time.perf_counter()
+        metrics = get_metrics()
+
+        async with get_async_session("maintenance") as session:
+            repository = MessageRollupRepository(session)
+            folded = await repository.fold_deltas(self.batch_size)
+            await session.commit()
+            if folded < self.batch_size:
+                age = await repository.oldest_delta_age()
+                metrics.set_gauge("message_rollup_lag_seconds", age or 0.0)
+
+        metrics.increment_counter("message_rollup_deltas_folded_total", value=folded)
+        metrics.observe_histogram("message_rollup_fold_seconds", time.perf_counter() - started)
+        return folded
+
+    async def reconcile(self, start: datetime, end: datetime) -> int:
+        """Reconcile [start, end) hour by hour; returns corrections appended."""
+        corrections = 0
+        hour = _hour_floor(start)
+        while hour < end and self.running:
+            async with get_async_session("maintenance") as session:
+                corrections += await MessageRollupRepository(session).reconcile(
+                    hour, hour + timedelta(hours=1)
+                )
+                await session.commit()
+            hour += timedelta(hours=1)
+
+        async with get_async_session("maintenance") as session:
+            pruned = await MessageRollupRepository(session).prune_empty(_hour_floor(start), end)
+            await session.commit()
+
+        get_metrics().increment_counter("message_rollup_corrections_total", value=corrections)
+        if corrections or pruned:
+            logger.info(
+                f"Rollup reconcile {start.isoformat()}..{end.isoformat()}: "
+                f"{corrections} corrections, {pruned} empty rows pruned"
+            )
+        return corrections
+
+    async def drain(self):
+        """Fold until no deltas are pending."""
+        while await self.fold() >= self.batch_size:
+            pass
+
+    def _handle_signal(self, signum, frame):
+        """Handle shutdown signals."""
+        logger.info(f"Received signal {signum}, shutting down...")
+        self.running = False
+
+    async def stop(self):
+        """Stop the worker gracefully."""
+        logger.info("Stopping rollup worker...")
+        self.running = False
+        logger.info("Rollup worker stopped")
+
+
+async def main():
+    """Main entry point for the rollup worker."""
+    parser = argparse.ArgumentParser(description="Maintain hourly message rollups")
+    parser.add_argument(
+        "--backfill-days",
+        type=int,
+        help="Rebuild rollups for the last N days from raw messages, then exit"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    from src.config import get_settings
+
+    settings = get_settings()
+    await init_database(settings.effective_database_url)
+
+    worker = RollupWorker(
+        batch_size=settings.ROLLUP_FOLD_BATCH,
+        fold_interval=settings.ROLLUP_FOLD_INTERVAL_SECONDS,
+        reconcile_interval=settings.ROLLUP_RECONCILE_INTERVAL_SECONDS,
+        reconcile_hours=settings.ROLLUP_RECONCILE_HOURS
+    )
+
+    try:
+        if args.backfill_days:
+            # Reconciling against empty rollups appends the full aggregates
+            worker.running = True
+            end = _hour_floor(datetime.now(timezone.utc)) + timedelta(hours=1)
+            await worker.reconcile(end - timedelta(days=args.backfill_days), end)
+            await worker.drain()
+            return
+
+        try:
+            await worker.start()
+        finally:
+            await worker.stop()
+    finally:
+        await close_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
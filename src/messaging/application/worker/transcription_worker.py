@@ -0,0 +1,380 @@
+"""Worker that transcribes voice notes off the webhook path."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import signal
+import socket
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set
+from uuid import UUID
+
+from shared.infrastructure.security.field_encryption import decrypt_field_value
+from src.messaging.domain.exceptions import TranscriptionError
+from src.messaging.domain.protocols.speech_transcription import TranscriptionEngine
+from src.messaging.infrastructure.cache.token_cache import get_token_cache
+from src.messaging.infrastructure.outbox.outbox_service import OutboxService
+from src.messaging.infrastructure.persistence.adapter.whatsapp_gateway import WhatsAppGatewayImpl
+from src.messaging.infrastructure.persistence.repositories.channel_repository_impl import ChannelRepositoryImpl
+from src.messaging.infrastructure.persistence.repositories.message_repository_impl import (
+    InboundMessageRepositoryImpl
+)
+from src.messaging.infrastructure.transcription.transcript_cache import TranscriptCache
+from src.messaging.infrastructure.transcription.transcription_queue import (
+    TranscriptionJob,
+    TranscriptionQueue
+)
+from src.shared_.database import close_database, get_async_session, init_database
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptionWorker:
+    """
+    Consumes transcription jobs with bounded, tenant-fair concurrency.
+
+    - At most `concurrency` jobs run at once, and at most
+      `per_tenant_concurrency` for any one tenant. Jobs beyond a tenant's
+      limit wait in a per-tenant backlog, and free slots are handed out
+      round-robin across tenants, so one tenant's burst of voice notes
+      cannot starve the others.
+    - Transcripts are cached by audio SHA-256; forwarded voice notes hit
+      the cache and skip download and recognition.
+    - The transcript is merged into the inbound message content and a
+      message.transcribed outbox event is written in the same transaction.
+    - Failed jobs stay pending and are reclaimed after `claim_idle_ms`;
+      after `max_attempts` the message is marked failed and the job acked.
+    """
+
+    def __init__(
+        self,
+        queue: TranscriptionQueue,
+        engine: TranscriptionEngine,
+        cache: TranscriptCache,
+        gateway: Optional[WhatsAppGatewayImpl] = None,
+        concurrency: int = 8,
+        per_tenant_concurrency: int = 2,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 120000,
+        max_attempts: int = 3,
+        lag_report_interval: float = 10.0,
+        consumer_name: Optional[str] = None
+    ):
+        self.queue = queue
+        self.engine = engine
+        self.cache = cache
+        self.gateway = gateway or WhatsAppGatewayImpl()
+        self.concurrency = concurrency
+        self.per_tenant_concurrency = per_tenant_concurrency
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_attempts = max_attempts
+        self.lag_report_interval = lag_report_interval
+        self.consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self.running = False
+        self.tasks: Set[asyncio.Task] = set()
+        self._backlog: "OrderedDict[str, Deque[TranscriptionJob]]" = OrderedDict()
+        self._in_flight: Dict[str, int] = {}
+        self._attempts: Dict[str, int] = {}
+        self._completed: List[str] = []
+        self._last_claim = 0.0
+        self._last_lag_report = 0.0
+
+    async def start(self):
+        """Start the worker."""
+        logger.info(
+            f"Starting transcription worker {self.consumer_name} "
+            f"(engine={self.engine.name}, concurrency={self.concurrency}, "
+            f"per_tenant={self.per_tenant_concurrency})"
+        )
+        self.running = True
+
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        await self.queue.ensure_group()
+
+        while self.running:
+            try:
+                await self._flush_completed()
+                await self._report_lag()
+
+                self._dispatch()
+
+                if len(self.tasks) >= self.concurrency:
+                    await asyncio.wait(self.tasks, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                # Keep the local backlog bounded; unread jobs stay in Redis
+                room = self.concurrency * 2 - len(self.tasks) - self._backlog_size()
+                if room <= 0:
+                    if self.tasks:
+                        await asyncio.wait(self.tasks, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                for job in await self._next_jobs(room):
+                    self._backlog.setdefault(job.tenant_id, deque()).append(job)
+
+            except Exception as e:
+                logger.error(f"Transcription worker error: {e}")
+                await asyncio.sleep(1)
+
+    def _dispatch(self):
+        """Start backlog jobs round-robin across tenants under both limits."""
+        while len(self.tasks) < self.concurrency:
+            started = False
+            for tenant_id in list(self._backlog):
+                if len(self.tasks) >= self.concurrency:
+                    break
+                if self._in_flight.get(tenant_id, 0) >= self.per_tenant_concurrency:
+                    continue
+
+                jobs = self._backlog.pop(tenant_id)
+                job = jobs.popleft()
+                if jobs:
+                    # Re-append so the next round starts with other tenants
+                    self._backlog[tenant_id] = jobs
+
+                self._in_flight[tenant_id] = self._in_flight.get(tenant_id, 0) + 1
+                task = asyncio.create_task(self._run(job))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+                started = True
+
+            if not started:
+                return
+
+    async def _next_jobs(self, count: int) -> List[TranscriptionJob]:
+        """Reclaim stale jobs first, then read new ones."""
+        jobs: List[TranscriptionJob] = []
+
+        now = time.monotonic()
+        if now - self._last_claim >= self.claim_idle_ms / 1000:
+            self._last_claim = now
+            jobs = await self.queue.claim_stale(self.consumer_name, self.claim_idle_ms, count)
+
+        remaining = count - len(jobs)
+        if remaining > 0:
+            # Don't block if reclaimed jobs are waiting; block briefly while
+            # backlogged tenants wait for one of their slots to free up
+            if jobs:
+                block_ms = 0
+            elif self._backlog:
+                block_ms = min(self.block_ms, 100)
+            else:
+                block_ms = self.block_ms
+            jobs.extend(await self.queue.read(self.consumer_name, remaining, block_ms=block_ms))
+
+        return jobs
+
+    async def _run(self, job: TranscriptionJob):
+        """Run one job and release its tenant slot."""
+        metrics = get_metrics()
+        metrics.observe_histogram("transcription_wait_seconds", time.time() - job.enqueued_at)
+
+        try:
+            await self._transcribe(job)
+            self._attempts.pop(job.entry_id, None)
+            self._completed.append(job.entry_id)
+            metrics.increment_counter("transcription_jobs_total", result="completed")
+
+        except Exception as e:
+            attempts = self._attempts.get(job.entry_id, 0) + 1
+            self._attempts[job.entry_id] = attempts
+            logger.error(
+                f"Transcription failed for message {job.message_id} "
+                f"(attempt {attempts}/{self.max_attempts}): {e}"
+            )
+            if attempts >= self.max_attempts or isinstance(e, TranscriptionError):
+                # Engine rejected the audio or retries are exhausted
+                await self._give_up(job, str(e))
+            else:
+                metrics.increment_counter("transcription_jobs_total", result="retry")
+
+        finally:
+            remaining = self._in_flight.get(job.tenant_id, 1) - 1
+            if remaining > 0:
+                self._in_flight[job.tenant_id] = remaining
+            else:
+                self._in_flight.pop(job.tenant_id, None)
+
+    async def _transcribe(self, job: TranscriptionJob):
+        """Resolve transcript (cache or engine) and attach it to the message."""
+        tenant_id = UUID(job.tenant_id)
+        transcript = None
+
+        if job.sha256:
+            transcript = await self.cache.get(job.sha256, self.engine.name, job.language_code)
+
+        if transcript is None:
+            audio = await self._download(job, tenant_id)
+            checksum = job.sha256 or hashlib.sha256(audio).hexdigest()
+
+            if not job.sha256:
+                # Meta omitted the checksum; the computed one still dedups
+                transcript = await self.cache.get(checksum, self.engine.name, job.language_code)
+
+            if transcript is None:
+                started = time.perf_counter()
+                transcript = await self.engine.transcribe(audio, job.mime_type, job.language_code)
+                get_metrics().observe_histogram(
+                    "transcription_duration_seconds",
+                    time.perf_counter() - started,
+                    engine=self.engine.name
+                )
+                if transcript is not None:
+                    await self.cache.set(checksum, self.engine.name, transcript, job.language_code)
+
+        if not await self._attach(job, tenant_id, transcript, "completed"):
+            # The webhook transaction may not have committed yet; retry later
+            raise LookupError(f"Inbound message {job.message_id} not found")
+
+    async def _download(self, job: TranscriptionJob, tenant_id: UUID) -> bytes:
+        """Fetch the audio using the channel's (cached) access token."""
+        async with get_async_session() as session:
+            channel = await ChannelRepositoryImpl(session, tenant_id).get_by_id(UUID(job.channel_id))
+
+        if channel is None:
+            raise TranscriptionError(f"Channel {job.channel_id} not found")
+
+        access_token = get_token_cache().get_or_decrypt(
+            channel.id,
+            channel.token_version,
+            lambda: decrypt_field_value(channel.access_token_encrypted)
+        )
+        media_url = await self.gateway.get_media_url(job.media_id, access_token)
+        return await self.gateway.download_media(media_url, access_token)
+
+    async def _attach(
+        self,
+        job: TranscriptionJob,
+        tenant_id: UUID,
+        transcript: Optional[str],
+        status: str
+    ) -> bool:
+        """Write transcript and outbox event in one transaction."""
+        message_id = UUID(job.message_id)
+
+        async with get_async_session() as session:
+            found = await InboundMessageRepositoryImpl(session, tenant_id).attach_transcript(
+                message_id, transcript, status, engine=self.engine.name
+            )
+            if found:
+                await OutboxService(session).create_event(
+                    aggregate_id=message_id,
+                    aggregate_type="inbound_message",
+                    event_type="message.transcribed",
+                    payload={
+                        "message_id": job.message_id,
+                        "tenant_id": job.tenant_id,
+                        "channel_id": job.channel_id,
+                        "transcript": transcript,
+                        "transcription_status": status,
+                    },
+                    tenant_id=tenant_id
+                )
+            await session.commit()
+
+        return found
+
+    async def _give_up(self, job: TranscriptionJob, error: str):
+        """Mark the message's transcription failed and drop the job."""
+        get_metrics().increment_counter("transcription_jobs_total", result="failed")
+        try:
+            await self._attach(job, UUID(job.tenant_id), None, "failed")
+            self._attempts.pop(job.entry_id, None)
+            self._completed.append(job.entry_id)
+        except Exception as e:
+            # Left pending; reclaimed and retried later
+            logger.error(f"Failed to record transcription failure for {job.message_id}: {e} ({error})")
+
+    async def _flush_completed(self):
+        """Ack finished jobs in batch."""
+        if not self._completed:
+            return
+
+        completed, self._completed = self._completed, []
+        try:
+            await self.queue.ack(completed)
+        except Exception as e:
+            # Unacked jobs are reclaimed; re-running them hits the cache
+            logger.error(f"Failed to ack {len(completed)} transcription jobs: {e}")
+
+    async def _report_lag(self):
+        """Publish queue gauges at most every lag_report_interval."""
+        now = time.monotonic()
+        if now - self._last_lag_report < self.lag_report_interval:
+            return
+        self._last_lag_report = now
+
+        try:
+            lag = await self.queue.lag()
+        except Exception as e:
+            logger.warning(f"Failed to read transcription queue lag: {e}")
+            return
+
+        metrics = get_metrics()
+        metrics.set_gauge("transcription_queue_depth", lag["depth"])
+        metrics.set_gauge("transcription_queue_pending", lag["pending"])
+        metrics.set_gauge("transcription_queue_lag_seconds", lag["oldest_age_seconds"])
+        metrics.set_gauge("transcription_in_flight", len(self.tasks))
+        metrics.set_gauge("transcription_backlog", self._backlog_size())
+
+    def _backlog_size(self) -> int:
+        return sum(len(jobs) for jobs in self._backlog.values())
+
+    def _handle_signal(self, signum, frame):
+        """Handle shutdown signals."""
+        logger.info(f"Received signal {signum}, shutting down...")
+        self.running = False
+
+    async def stop(self):
+        """Stop the worker gracefully."""
+        logger.info("Stopping transcription worker...")
+        self.running = False
+
+        if self.tasks:
+            logger.info(f"Waiting for {len(self.tasks)} transcriptions to finish...")
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+        # Backlogged jobs stay pending in the stream and are reclaimed
+        await self._flush_completed()
+        logger.info("Transcription worker stopped")
+
+
+async def main():
+    """Main entry point for the transcription worker."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    from src.config import get_settings
+    from src.messaging.infrastructure.dependencies import get_redis
+    from src.messaging.infrastructure.transcription.engines import create_transcription_engine
+
+    settings = get_settings()
+    await init_database(settings.effective_database_url)
+    redis = await get_redis()
+
+    worker = TranscriptionWorker(
+        queue=TranscriptionQueue(redis),
+        engine=create_transcription_engine(settings.TRANSCRIPTION_ENGINE),
+        cache=TranscriptCache(redis, ttl_seconds=settings.TRANSCRIPT_CACHE_TTL_SECONDS),
+        concurrency=settings.TRANSCRIPTION_CONCURRENCY,
+        per_tenant_concurrency=settings.TRANSCRIPTION_PER_TENANT_CONCURRENCY
+    )
+
+    try:
+        await worker.start()
+    finally:
+        await worker.stop()
+        await redis.close()
+        await close_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
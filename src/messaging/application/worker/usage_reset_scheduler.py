@@ -1,90 +1,115 @@
-"""Scheduler for resetting monthly usage."""
+"""Scheduler for monthly usage period maintenance."""
 
-import asyncio
 import logging
-from datetime import datetime
+import uuid
+from datetime import date, datetime, timezone
+from typing import Optional
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler  # type: ignore
 from apscheduler.triggers.cron import CronTrigger  # type: ignore
-from src.messaging.application.services.channel_service import ChannelService
+
+from src.messaging.infrastructure.persistence import statements  # noqa: F401 (registers statements)
+from src.messaging.infrastructure.usage.usage_meter import usage_period
+from src.shared_.cache.redis import RedisClient, get_redis
 from src.shared_.database import get_async_session
-from sqlalchemy import text
+from shared.infrastructure.database.statements import get_statement_registry
+from shared.infrastructure.observability.metrics import get_metrics
 
 logger = logging.getLogger(__name__)
 
 
+def _months_before(period: date, months: int) -> date:
+    index = period.year * 12 + period.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
 class UsageResetScheduler:
-    """Scheduler for resetting monthly channel usage."""
-    
-    def __init__(self, channel_service: ChannelService):
-        self.channel_service = channel_service
+    """
+    Maintains billing periods of channel usage.
+
+    Usage is counted per (channel, period) in messaging.channel_usage, the
+    period being the first day of the UTC month, so there is nothing to
+    reset: the first send of a month starts a new row and quota checks
+    read the current period only.
+
+    What is left is pruning periods older than `retention_months`. It runs
+    as a set-based DELETE in batches of `batch_size`, one transaction per
+    batch. The predicate is the period alone, so a rerun is a no-op and an
+    interrupted run resumes where it stopped. A Redis lock keeps it to one
+    scheduler instance at a time.
+    """
+
+    LOCK_NAME = "usage_period_maintenance"
+
+    def __init__(
+        self,
+        retention_months: int = 13,
+        batch_size: int = 5000,
+        lock_ttl_seconds: int = 900,
+        redis: Optional[RedisClient] = None
+    ):
+        self.retention_months = retention_months
+        self.batch_size = batch_size
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.redis = redis
         self.scheduler = AsyncIOScheduler()
-    
+
     def start(self):
         """Start the scheduler."""
-        logger.info("Starting usage reset scheduler...")
-        
-        # Schedule monthly reset on the 1st of each month at midnight
-        self.scheduler.add_job(
-            self._reset_all_usage,
-            CronTrigger(day=1, hour=0, minute=0),
-            id="reset_monthly_usage",
-            name="Reset monthly channel usage",
-            replace_existing=True
-        )
-        
-        # Also schedule daily check for channels that need reset
+        logger.info("Starting usage period scheduler...")
+
+        # Daily, so a missed run (deploy, outage) is picked up the next day
         self.scheduler.add_job(
-            self._check_and_reset,
+            self.run_once,
             CronTrigger(hour=0, minute=30),
-            id="check_usage_reset",
-            name="Check and reset channel usage",
+            id="usage_period_maintenance",
+            name="Prune expired channel usage periods",
             replace_existing=True
         )
-        
+
         self.scheduler.start()
-        logger.info("Usage reset scheduler started")
-    
-    async def _reset_all_usage(self):
-        """Reset usage for all channels."""
-        try:
-            logger.info("Starting monthly usage reset for all channels")
-            
-            async with get_async_session() as session:
-                # Get all active tenants
-                query = text("""
-                    SELECT DISTINCT tenant_id
-                    FROM messaging.channels
-                    WHERE deleted_at IS NULL
-                        AND status IN ('active', 'pending')
-                """)
-                
-                result = await session.execute(query)
-                
-                reset_count = 0
-                for row in result:
-                    await self.channel_service.reset_monthly_usage(row.tenant_id)
-                    reset_count += 1
-                
-                logger.info(f"Reset monthly usage for {reset_count} tenants")
-                
-        except Exception as e:
-            logger.error(f"Failed to reset monthly usage: {e}")
-    
-    async def _check_and_reset(self):
-        """Check for channels that need usage reset."""
+        logger.info("Usage period scheduler started")
+
+    async def run_once(self) -> int:
+        """Run one maintenance pass under the lock; returns rows pruned."""
         try:
-            # This handles edge cases where channels were created
-            # mid-month or the scheduled reset was missed
-            
-            current_day = datetime.utcnow().day
-            if current_day <= 3:  # Check first 3 days of month
-                await self._reset_all_usage()
-                
+            redis = self.redis or await get_redis()
+            lock_key = redis.lock_key(self.LOCK_NAME)
+            token = str(uuid.uuid4())
+
+            if not await redis.acquire_lock(lock_key, token, self.lock_ttl_seconds):
+                logger.info("Usage period maintenance already running elsewhere, skipping")
+                return 0
+            try:
+                return await self.prune_expired()
+            finally:
+                await redis.release_lock(lock_key, token)
+
         except Exception as e:
-            logger.error(f"Failed in usage check: {e}")
-    
+            logger.error(f"Usage period maintenance failed: {e}")
+            return 0
+
+    async def prune_expired(self, now: Optional[datetime] = None) -> int:
+        """Delete usage periods past retention, one batch per transaction."""
+        before = _months_before(usage_period(now or datetime.now(timezone.utc)), self.retention_months)
+        query = get_statement_registry().get("usage.prune")
+
+        pruned = 0
+        while True:
+            async with get_async_session("maintenance") as session:
+                result = await session.execute(query, {"before": before, "limit": self.batch_size})
+                await session.commit()
+            pruned += result.rowcount
+            if result.rowcount < self.batch_size:
+                break
+
+        if pruned:
+            get_metrics().increment_counter("usage_periods_pruned_total", value=float(pruned))
+            logger.info(f"Pruned {pruned} channel usage rows before {before:%Y-%m}")
+        return pruned
+
     def stop(self):
         """Stop the scheduler."""
-        logger.info("Stopping usage reset scheduler...")
+        logger.info("Stopping usage period scheduler...")
         self.scheduler.shutdown()
-        logger.info("Usage reset scheduler stopped")
\ No newline at end of file
+        logger.info("Usage period scheduler stopped")
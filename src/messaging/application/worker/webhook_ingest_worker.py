@@ -0,0 +1,340 @@
+"""Worker that drains the webhook ingestion buffer with bounded concurrency."""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import msgspec
+
+from src.messaging.infrastructure.ingestion.webhook_buffer import BufferedWebhook, WebhookBuffer
+from src.messaging.infrastructure.persistence.repositories.webhook_event_repository_impl import (
+    WebhookEventRepositoryImpl,
+    stream_entry_time
+)
+from src.shared_.database import close_database, get_async_session, init_database
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+# (channel_id, raw body) -> None; raises on failure
+WebhookProcessor = Callable[[str, bytes], Awaitable[None]]
+
+
+class WebhookIngestWorker:
+    """
+    Consumes buffered webhooks and runs them through normal processing.
+
+    - Reads only as many entries as there are free processing slots, so
+      in-flight work never exceeds `concurrency` (backpressure towards
+      the buffer, which in turn refuses appends when full).
+    - Archives each read batch to webhook_events in one INSERT before
+      processing, and marks successes processed in one UPDATE.
+    - Entries that fail stay pending and are reclaimed after
+      `claim_idle_ms`; after `max_deliveries` they are dead-lettered.
+    - Publishes lag metrics (depth, pending, oldest entry age).
+    """
+
+    def __init__(
+        self,
+        buffer: WebhookBuffer,
+        processor: WebhookProcessor,
+        concurrency: int = 32,
+        block_ms: int = 1000,
+        claim_idle_ms: int = 60000,
+        max_deliveries: int = 5,
+        lag_report_interval: float = 10.0,
+        consumer_name: Optional[str] = None
+    ):
+        self.buffer = buffer
+        self.processor = processor
+        self.concurrency = concurrency
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+        self.lag_report_interval = lag_report_interval
+        self.consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self.running = False
+        self.tasks: Set[asyncio.Task] = set()
+        self._completed: List[Tuple[str, Optional[UUID]]] = []
+        self._last_claim = 0.0
+        self._last_lag_report = 0.0
+
+    async def start(self):
+        """Start the worker."""
+        logger.info(
+            f"Starting webhook ingest worker {self.consumer_name} "
+            f"(concurrency={self.concurrency})"
+        )
+        self.running = True
+
+        signal.signal(signal.SIGTERM, self._handle_signal)
+        signal.signal(signal.SIGINT, self._handle_signal)
+
+        await self.buffer.ensure_group()
+
+        while self.running:
+            try:
+                await self._flush_completed()
+                await self._report_lag()
+
+                free_slots = self.concurrency - len(self.tasks)
+                if free_slots <= 0:
+                    await asyncio.wait(self.tasks, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                entries = await self._next_entries(free_slots)
+                if not entries:
+                    continue
+
+                event_ids = await self._archive(entries)
+
+                for entry in entries:
+                    task = asyncio.create_task(
+                        self._process_entry(entry, event_ids.get(entry.entry_id))
+                    )
+                    self.tasks.add(task)
+                    task.add_done_callback(self.tasks.discard)
+
+            except Exception as e:
+                logger.error(f"Webhook ingest worker error: {e}")
+                await asyncio.sleep(1)
+
+    async def _next_entries(self, free_slots: int) -> List[BufferedWebhook]:
+        """Reclaim stale entries first, then read new ones."""
+        entries: List[BufferedWebhook] = []
+
+        now = time.monotonic()
+        if now - self._last_claim >= self.claim_idle_ms / 1000:
+            self._last_claim = now
+            entries = await self.buffer.claim_stale(
+                self.consumer_name, self.claim_idle_ms, free_slots
+            )
+
+        remaining = free_slots - len(entries)
+        if remaining > 0:
+            # Don't block if reclaimed entries are already waiting
+            block_ms = 0 if entries else self.block_ms
+            entries.extend(
+                await self.buffer.read(self.consumer_name, remaining, block_ms=block_ms)
+            )
+
+        return entries
+
+    async def _archive(self, entries: List[BufferedWebhook]) -> Dict[str, UUID]:
+        """Persist raw payloads of a batch to webhook_events (one INSERT)."""
+        events = []
+        for entry in entries:
+            try:
+                payload = msgspec.json.decode(entry.body)
+            except msgspec.DecodeError:
+                payload = {"unparseable_body": entry.body.decode("utf-8", "replace")}
+            events.append({
+                "stream_entry_id": entry.entry_id,
+                "channel_id": self._as_uuid(entry.channel_id),
+                "event_type": payload.get("object", "unknown") if isinstance(payload, dict) else "unknown",
+                "raw_payload": payload,
+                "signature": entry.signature,
+                "signature_verified": entry.signature_verified,
+            })
+
+        try:
+            async with get_async_session() as session:
+                ids = await WebhookEventRepositoryImpl(session).add_many(events)
+                await session.commit()
+                return ids
+        except Exception as e:
+            # Archiving is for audit/replay; the stream remains the durable
+            # copy, so processing continues without event ids.
+            logger.error(f"Failed to archive {len(events)} webhook events: {e}")
+            return {}
+
+    async def _process_entry(self, entry: BufferedWebhook, event_id: Optional[UUID]):
+        """Process one buffered webhook."""
+        started = time.perf_counter()
+        metrics = get_metrics()
+
+        try:
+            await self.processor(entry.channel_id, entry.body)
+
+            self._completed.append((entry.entry_id, event_id))
+            metrics.increment_counter("webhook_ingest_processed_total")
+
+        except Exception as e:
+            metrics.increment_counter("webhook_ingest_failed_total")
+            logger.error(
+                f"Failed to process buffered webhook {entry.entry_id} "
+                f"(delivery {entry.deliveries}/{self.max_deliveries}): {e}"
+            )
+            await self._record_failure(entry, event_id, str(e))
+        finally:
+            metrics.observe_histogram(
+                "webhook_ingest_processing_seconds", time.perf_counter() - started
+            )
+            metrics.observe_histogram(
+                "webhook_ingest_end_to_end_seconds", time.time() - entry.enqueued_at
+            )
+
+    async def _record_failure(
+        self,
+        entry: BufferedWebhook,
+        event_id: Optional[UUID],
+        error: str
+    ):
+        """Record error; dead-letter entries that exhausted their retries."""
+        try:
+            if event_id is not None:
+                async with get_async_session() as session:
+                    await WebhookEventRepositoryImpl(session).mark_failed(
+                        event_id, error, created_at=stream_entry_time(entry.entry_id)
+                    )
+                    await session.commit()
+
+            if entry.deliveries >= self.max_deliveries:
+                await self.buffer.dead_letter(entry, error)
+                logger.warning(f"Webhook {entry.entry_id} moved to dead-letter stream")
+        except Exception as e:
+            logger.error(f"Failed to record webhook failure for {entry.entry_id}: {e}")
+
+    async def _flush_completed(self):
+        """Mark finished entries processed and ack them in batch."""
+        if not self._completed:
+            return
+
+        completed, self._completed = self._completed, []
+        entry_ids = [entry_id for entry_id, _ in completed]
+        event_ids = [event_id for _, event_id in completed if event_id is not None]
+
+        try:
+            if event_ids:
+                async with get_async_session() as session:
+                    # Archived rows carry their entry's enqueue time as created_at
+                    times = [t for t in map(stream_entry_time, entry_ids) if t]
+                    await WebhookEventRepositoryImpl(session).mark_processed(
+                        event_ids, since=min(times) if times else None
+                    )
+                    await session.commit()
+            await self.buffer.ack(entry_ids)
+        except Exception as e:
+            # Unacked entries are reclaimed and reprocessed idempotently
+            logger.error(f"Failed to ack {len(entry_ids)} webhook entries: {e}")
+
+    async def _report_lag(self):
+        """Publish buffer lag gauges at most every lag_report_interval."""
+        now = time.monotonic()
+        if now - self._last_lag_report < self.lag_report_interval:
+            return
+        self._last_lag_report = now
+
+        try:
+            lag = await self.buffer.lag()
+        except Exception as e:
+            logger.warning(f"Failed to read webhook buffer lag: {e}")
+            return
+
+        metrics = get_metrics()
+        metrics.set_gauge("webhook_buffer_depth", lag["depth"])
+        metrics.set_gauge("webhook_buffer_pending", lag["pending"])
+        metrics.set_gauge("webhook_buffer_lag_seconds", lag["oldest_age_seconds"])
+        metrics.set_gauge("webhook_ingest_in_flight", len(self.tasks))
+
+        if lag["oldest_age_seconds"] > 60:
+            logger.warning(
+                f"Webhook buffer lagging: depth={lag['depth']} "
+                f"pending={lag['pending']} oldest={lag['oldest_age_seconds']}s"
+            )
+
+    @staticmethod
+    def _as_uuid(value: str) -> Optional[UUID]:
+        """Parse channel id; path parameters are not guaranteed to be UUIDs."""
+        try:
+            return UUID(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _handle_signal(self, signum, frame):
+        """Handle shutdown signals."""
+        logger.info(f"Received signal {signum}, shutting down...")
+        self.running = False
+
+    async def stop(self):
+        """Stop the worker gracefully."""
+        logger.info("Stopping webhook ingest worker...")
+        self.running = False
+
+        if self.tasks:
+            logger.info(f"Waiting for {len(self.tasks)} webhooks to finish...")
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+        await self._flush_completed()
+        logger.info("Webhook ingest worker stopped")
+
+
+async def main():
+    """Main entry point for the webhook ingest worker."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    from src.config import get_settings
+    from src.messaging.application.services.status_update_buffer import configure_status_update_buffer
+    from src.messaging.infrastructure.transcription.transcription_queue import TranscriptionQueue
+    from src.messaging.infrastructure.dependencies import (
+        build_webhook_service,
+        get_binary_redis,
+        get_channel_routing_index,
+        get_redis,
+        get_session_window_index
+    )
+
+    settings = get_settings()
+    await init_database(settings.effective_database_url)
+    configure_status_update_buffer(
+        window_seconds=settings.STATUS_UPDATE_WINDOW_SECONDS,
+        max_batch=settings.STATUS_UPDATE_MAX_BATCH
+    )
+    redis = await get_redis()
+    # Warm channel routing before the first entry is processed
+    routing_index = await get_channel_routing_index(redis)
+    buffer = WebhookBuffer(
+        await get_binary_redis(),
+        max_depth=settings.WEBHOOK_BUFFER_MAX_DEPTH
+    )
+
+    transcription_queue = TranscriptionQueue(redis)
+    session_windows = await get_session_window_index(redis)
+
+    async def process(channel_id: str, body: bytes) -> None:
+        async with get_async_session() as session:
+            service = build_webhook_service(
+                session,
+                redis,
+                routing_index,
+                transcription_queue,
+                session_windows=session_windows
+            )
+            # Commits itself (and releases dedup marks if anything fails)
+            await service.process_raw_webhook(body)
+
+    worker = WebhookIngestWorker(
+        buffer=buffer,
+        processor=process,
+        concurrency=settings.WEBHOOK_WORKER_CONCURRENCY
+    )
+
+    try:
+        await worker.start()
+    finally:
+        await worker.stop()
+        await routing_index.stop()
+        await redis.close()
+        await close_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,339 @@
+"""Replay/backfill stored webhook payloads through normal processing."""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+import msgspec
+
+from src.messaging.application.worker.webhook_ingest_worker import WebhookProcessor
+from src.messaging.infrastructure.persistence.repositories.webhook_event_repository_impl import (
+    ReplayCursor,
+    ReplayFilter,
+    WebhookEventRepositoryImpl
+)
+from src.shared_.database import close_database, get_async_session, init_database
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookReplayer:
+    """
+    Re-drives webhook_events rows through the webhook processor.
+
+    - Rows are read in (created_at, id) keyset order with a server-side
+      cursor, one page of `page_size` rows per transaction.
+    - `parallelism` consumers process events; the read-ahead queue is
+      bounded so reading never outruns processing.
+    - Idempotency is the normal path's: duplicate message IDs are
+      dropped by the idempotency checker and the wa_message_id unique
+      constraint, and status updates only move forward.
+    - Every `checkpoint_interval` seconds, processed/failed flags are
+      written set-based and the checkpoint advances to the highest
+      position below which every event has finished, in one transaction.
+      A rerun with the same name resumes from there.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        processor: WebhookProcessor,
+        filters: ReplayFilter,
+        parallelism: int = 32,
+        batch_size: int = 1000,
+        page_size: int = 50_000,
+        checkpoint_interval: float = 5.0,
+        progress_interval: float = 10.0
+    ):
+        self.name = name
+        self.processor = processor
+        self.filters = filters
+        self.parallelism = parallelism
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.checkpoint_interval = checkpoint_interval
+        self.progress_interval = progress_interval
+
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=parallelism * 4)
+        self._dispatched: Deque[Tuple[int, ReplayCursor]] = deque()
+        self._finished: Set[int] = set()
+        self._watermark: Optional[ReplayCursor] = None
+        self._succeeded: List[UUID] = []
+        self._failed: List[Tuple[UUID, str]] = []
+        self._processed_count = 0
+        self._failed_count = 0
+        self._read_count = 0
+        self._started = 0.0
+        self._last_progress = (0.0, 0)
+
+    async def run(self, reset: bool = False) -> Dict[str, Any]:
+        """
+        Replay all matching events.
+
+        Args:
+            reset: Ignore an existing checkpoint and start from the beginning
+
+        Returns:
+            Summary with processed, failed, elapsed_seconds and events_per_second
+        """
+        if not reset:
+            await self._resume()
+
+        logger.info(
+            f"Starting webhook replay '{self.name}' "
+            f"(parallelism={self.parallelism}, filters={self.filters.to_dict()}, "
+            f"from={self._watermark})"
+        )
+        self._started = time.monotonic()
+        self._last_progress = (self._started, 0)
+
+        consumers = [asyncio.create_task(self._consume()) for _ in range(self.parallelism)]
+        checkpointer = asyncio.create_task(self._checkpoint_loop())
+
+        try:
+            await self._produce()
+            for _ in consumers:
+                await self._queue.put(None)
+            await asyncio.gather(*consumers)
+        finally:
+            checkpointer.cancel()
+            for task in consumers:
+                task.cancel()
+            await self._checkpoint()
+
+        summary = self._summary()
+        logger.info(f"Webhook replay '{self.name}' finished: {summary}")
+        return summary
+
+    async def _resume(self):
+        """Load the checkpoint of a previous run with the same name."""
+        async with get_async_session() as session:
+            checkpoint = await WebhookEventRepositoryImpl(session).load_replay_checkpoint(self.name)
+
+        if checkpoint is None:
+            return
+
+        self._watermark = checkpoint["cursor"]
+        self._processed_count = checkpoint["processed"]
+        self._failed_count = checkpoint["failed"]
+        if checkpoint["filters"] != self.filters.to_dict():
+            logger.warning(
+                f"Replay '{self.name}' resumed with different filters "
+                f"(checkpoint: {checkpoint['filters']})"
+            )
+
+    async def _produce(self):
+        """Page through matching events and feed the consumers."""
+        cursor = self._watermark
+        seq = 0
+
+        while True:
+            page_rows = 0
+            async with get_async_session() as session:
+                repo = WebhookEventRepositoryImpl(session)
+                async for batch in repo.stream_for_replay(
+                    self.filters,
+                    after=cursor,
+                    limit=self.page_size,
+                    batch_size=self.batch_size
+                ):
+                    for event in batch:
+                        seq += 1
+                        self._dispatched.append((seq, event.cursor))
+                        await self._queue.put((seq, event))
+                        cursor = event.cursor
+                    page_rows += len(batch)
+                    self._read_count += len(batch)
+
+            if page_rows < self.page_size:
+                return
+
+    async def _consume(self):
+        """Process queued events until the end-of-stream marker."""
+        metrics = get_metrics()
+
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+
+            seq, event = item
+            try:
+                await self.processor(
+                    str(event.channel_id) if event.channel_id else "",
+                    msgspec.json.encode(event.raw_payload)
+                )
+                self._succeeded.append(event.id)
+                self._processed_count += 1
+                metrics.increment_counter("webhook_replay_events_total", result="processed")
+            except Exception as e:
+                self._failed.append((event.id, str(e)))
+                self._failed_count += 1
+                metrics.increment_counter("webhook_replay_events_total", result="failed")
+                logger.warning(f"Replay of webhook event {event.id} failed: {e}")
+            finally:
+                self._finished.add(seq)
+
+    def _advance_watermark(self):
+        """Move the watermark past the contiguous prefix of finished events."""
+        while self._dispatched and self._dispatched[0][0] in self._finished:
+            seq, cursor = self._dispatched.popleft()
+            self._finished.discard(seq)
+            self._watermark = cursor
+
+    async def _checkpoint_loop(self):
+        """Periodically persist progress and report throughput."""
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            try:
+                await self._checkpoint()
+            except Exception as e:
+                # Outcomes stay buffered and are written with the next checkpoint
+                logger.error(f"Failed to checkpoint replay '{self.name}': {e}")
+            self._report_progress()
+
+    async def _checkpoint(self):
+        """Write event outcomes and the watermark in one transaction."""
+        # Watermark first: every event below it has already queued its outcome
+        self._advance_watermark()
+        watermark = self._watermark
+        succeeded, self._succeeded = self._succeeded, []
+        failed, self._failed = self._failed, []
+
+        try:
+            async with get_async_session() as session:
+                repo = WebhookEventRepositoryImpl(session)
+                await repo.mark_processed(succeeded)
+                await repo.mark_failed_many(failed)
+                await repo.save_replay_checkpoint(
+                    self.name,
+                    watermark,
+                    self._processed_count,
+                    self._failed_count,
+                    self.filters
+                )
+                await session.commit()
+        except Exception:
+            self._succeeded[:0] = succeeded
+            self._failed[:0] = failed
+            raise
+
+    def _report_progress(self):
+        """Log and publish throughput at most every progress_interval."""
+        now = time.monotonic()
+        last_at, last_done = self._last_progress
+        if now - last_at < self.progress_interval:
+            return
+
+        done = self._processed_count + self._failed_count
+        rate = (done - last_done) / (now - last_at)
+        self._last_progress = (now, done)
+
+        metrics = get_metrics()
+        metrics.set_gauge("webhook_replay_events_per_second", rate, replay=self.name)
+        metrics.set_gauge("webhook_replay_queue_depth", self._queue.qsize(), replay=self.name)
+
+        logger.info(
+            f"Replay '{self.name}': processed={self._processed_count} "
+            f"failed={self._failed_count} read={self._read_count} "
+            f"rate={rate:.0f}/s ({rate * 3600:.0f}/h) at={self._watermark}"
+        )
+
+    def _summary(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self._started
+        return {
+            "processed": self._processed_count,
+            "failed": self._failed_count,
+            "elapsed_seconds": round(elapsed, 1),
+            "events_per_second": round(self._read_count / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay stored WhatsApp webhooks")
+    parser.add_argument("--name", required=True, help="Run name; reruns resume from its checkpoint")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="created_at >= (ISO 8601)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="created_at < (ISO 8601)")
+    parser.add_argument("--account-id", type=UUID)
+    parser.add_argument("--channel-id", type=UUID)
+    parser.add_argument(
+        "--processed", choices=["false", "true", "all"], default="false",
+        help="Replay unprocessed (default), processed, or all events"
+    )
+    parser.add_argument("--parallelism", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--reset", action="store_true", help="Ignore an existing checkpoint")
+    return parser.parse_args()
+
+
+async def main():
+    """Main entry point for webhook replay."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    args = _parse_args()
+
+    from src.config import get_settings
+    from src.messaging.application.services.status_update_buffer import configure_status_update_buffer
+    from src.messaging.infrastructure.transcription.transcription_queue import TranscriptionQueue
+    from src.messaging.infrastructure.dependencies import (
+        build_webhook_service,
+        get_channel_routing_index,
+        get_redis,
+        get_session_window_index
+    )
+
+    settings = get_settings()
+    await init_database(settings.effective_database_url)
+    configure_status_update_buffer(
+        window_seconds=settings.STATUS_UPDATE_WINDOW_SECONDS,
+        max_batch=settings.STATUS_UPDATE_MAX_BATCH
+    )
+    redis = await get_redis()
+    routing_index = await get_channel_routing_index(redis)
+    transcription_queue = TranscriptionQueue(redis)
+    session_windows = await get_session_window_index(redis)
+
+    async def process(channel_id: str, body: bytes) -> None:
+        async with get_async_session() as session:
+            service = build_webhook_service(
+                session,
+                redis,
+                routing_index,
+                transcription_queue,
+                session_windows=session_windows
+            )
+            # Commits itself (and releases dedup marks if anything fails)
+            await service.process_raw_webhook(body)
+
+    replayer = WebhookReplayer(
+        name=args.name,
+        processor=process,
+        filters=ReplayFilter(
+            since=args.since,
+            until=args.until,
+            account_id=args.account_id,
+            channel_id=args.channel_id,
+            processed={"false": False, "true": True, "all": None}[args.processed]
+        ),
+        parallelism=args.parallelism,
+        batch_size=args.batch_size
+    )
+
+    try:
+        await replayer.run(reset=args.reset)
+    finally:
+        await routing_index.stop()
+        await redis.close()
+        await close_database()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
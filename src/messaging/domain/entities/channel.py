@@ -2,6 +2,7 @@
 WhatsApp Channel Entity
 Represents a tenant's WhatsApp Business Account configuration.
 """
+import hashlib
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
@@ -73,5 +74,12 @@ class Channel(BaseEntity):
         """Check if channel is operational."""
         return self.status == "active"
     
+    @property
+    def token_version(self) -> str:
+        """Fingerprint of the encrypted access token; changes on rotation."""
+        return hashlib.blake2b(
+            self.access_token_encrypted.encode("utf-8"), digest_size=8
+        ).hexdigest()
+    
     def __repr__(self) -> str:
         return f"<Channel(id={self.id}, name={self.name}, phone={self.business_phone})>"
\ No newline at end of file
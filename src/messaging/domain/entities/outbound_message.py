@@ -8,6 +8,17 @@ from uuid import UUID
 
 from shared.domain.base_entity import BaseEntity
 
+# Delivery progress order. Status updates only ever move a message forward:
+# a late "delivered" never overwrites "read", and "failed" never
+# overwrites a confirmed delivery.
+STATUS_RANK = {
+    "queued": 0,
+    "sent": 1,
+    "failed": 2,
+    "delivered": 3,
+    "read": 4,
+}
+
 
 class OutboundMessage(BaseEntity):
     """
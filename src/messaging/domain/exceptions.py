@@ -105,4 +105,24 @@ class InvalidWebhookSignatureError(WhatsAppDomainError):
 
 class TranscriptionError(WhatsAppDomainError):
     """Voice transcription failed."""
-    pass
\ No newline at end of file
+    pass
+
+
+class WebhookBufferFullError(WhatsAppDomainError):
+    """Webhook ingestion buffer is saturated (backpressure)."""
+    pass
+
+
+class RecipientImportError(WhatsAppDomainError):
+    """Recipient upload is malformed (unknown format, missing phone column, oversized record)."""
+    pass
+
+
+class RecipientListNotFoundError(WhatsAppDomainError):
+    """Recipient list does not exist or is not ready."""
+    pass
+
+
+class MonthlyQuotaExceededError(WhatsAppDomainError):
+    """Channel has used its monthly_message_limit for the current period."""
+    pass
@@ -3,12 +3,13 @@ Message Repository Protocol
 Defines persistence interfaces for inbound/outbound messages.
 """
 from abc import abstractmethod
-from typing import Optional, List, Protocol
+from typing import Optional, List, Protocol, Sequence
 from uuid import UUID
 from datetime import datetime
 
 from src.messaging.domain.entities.inbound_message import InboundMessage
 from src.messaging.domain.entities.outbound_message import OutboundMessage
+from shared.infrastructure.database.pagination import CursorPage
 
 
 class InboundMessageRepository(Protocol):
@@ -29,12 +30,31 @@ class InboundMessageRepository(Protocol):
         """Persist new inbound message."""
         ...
     
+    @abstractmethod
+    async def create_many_if_absent(self, messages: Sequence[InboundMessage]) -> List[InboundMessage]:
+        """Persist inbound messages in bulk, skipping existing wa_message_ids; returns those inserted."""
+        ...
+    
+    @abstractmethod
+    async def attach_transcript(
+        self, message_id: UUID, transcript: Optional[str], status: str, engine: Optional[str] = None
+    ) -> bool:
+        """Merge a voice-note transcript and its status into the message content."""
+        ...
+    
     @abstractmethod
     async def list_by_channel(
         self, channel_id: UUID, limit: int = 100
     ) -> List[InboundMessage]:
         """List recent inbound messages for a channel."""
         ...
+    
+    @abstractmethod
+    async def page_by_channel(
+        self, channel_id: UUID, limit: int = 100, cursor: Optional[str] = None
+    ) -> CursorPage[InboundMessage]:
+        """Page through a channel's inbound messages, newest first (keyset)."""
+        ...
 
 
 class OutboundMessageRepository(Protocol):
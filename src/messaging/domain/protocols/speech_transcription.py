@@ -30,4 +30,38 @@ class SpeechTranscription(Protocol):
         Raises:
             TranscriptionError: If transcription fails
         """
-        ...
\ No newline at end of file
+        ...
+
+
+class TranscriptionEngine(Protocol):
+    """
+    Protocol for pluggable transcription engines.
+    
+    Engines receive audio bytes (already downloaded by the transcription
+    worker) so they can be swapped without touching media handling.
+    """
+    
+    name: str
+    
+    @abstractmethod
+    async def transcribe(
+        self,
+        audio: bytes,
+        mime_type: Optional[str] = None,
+        language_code: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Transcribe audio bytes to text.
+        
+        Args:
+            audio: Raw audio file contents
+            mime_type: Media MIME type (e.g. audio/ogg; codecs=opus)
+            language_code: Optional language hint (en-US, hi-IN)
+        
+        Returns:
+            Transcribed text, or None if nothing was recognized
+        
+        Raises:
+            TranscriptionError: If the engine fails
+        """
+        ...
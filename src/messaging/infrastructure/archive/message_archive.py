@@ -0,0 +1,461 @@
+"""
+Message Archive
+Cold tier for messages past retention: closed partitions of
+messaging.messages are written to compressed Parquet files before they
+are dropped, and read back through a facade with predicate pushdown.
+
+Layout (hive-style, one file per source partition):
+
+    <root>/tenant_id=<uuid>/month=<YYYY-MM>/<partition>.parquet
+    <root>/_index/<id|whatsapp_message_id>/tenant_id=<uuid>/<partition>.parquet
+
+The _index files map message ids to their month, sorted by id, so a
+lookup by id reads one month instead of the tenant's whole archive.
+
+pyarrow is required when ARCHIVE_ENABLED; without it the archive fails
+loudly rather than keeping partitions forever or reading as empty.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shared.infrastructure.database.partitioning import PartitionInfo, PartitionSpec, period_start, shift_period
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+# (column, arrow type name); tenant_id and month come from the directory names
+ARCHIVE_COLUMNS: Sequence[tuple] = (
+    ("id", "string"),
+    ("channel_id", "string"),
+    ("direction", "string"),
+    ("message_type", "string"),
+    ("from_number", "string"),
+    ("to_number", "string"),
+    ("content", "string"),
+    ("media_url", "string"),
+    ("template_id", "string"),
+    ("template_variables", "string"),
+    ("whatsapp_message_id", "string"),
+    ("status", "string"),
+    ("error_code", "string"),
+    ("error_message", "string"),
+    ("metadata", "string"),
+    ("retry_count", "int32"),
+    ("max_retries", "int32"),
+    ("created_at", "timestamp"),
+    ("updated_at", "timestamp"),
+    ("sent_at", "timestamp"),
+    ("delivered_at", "timestamp"),
+    ("read_at", "timestamp"),
+)
+
+# Columns with an id -> month index under <root>/_index/<column>
+INDEX_KEYS: Sequence[str] = ("id", "whatsapp_message_id")
+_INDEX_DIR = "_index"
+
+_ROW_GROUP_SIZE = 64_000
+
+
+def _pyarrow():
+    """Import pyarrow (and its parquet/dataset modules) on first use."""
+    try:
+        pa = importlib.import_module("pyarrow")
+        pq = importlib.import_module("pyarrow.parquet")
+        ds = importlib.import_module("pyarrow.dataset")
+    except ImportError:
+        raise RuntimeError("Message archive requires pyarrow (pip install pyarrow)")
+    return pa, pq, ds
+
+
+def pyarrow_available() -> bool:
+    """Whether the archive can be written and read in this environment."""
+    try:
+        _pyarrow()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _utc(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=timezone.utc) if moment.tzinfo is None else moment.astimezone(timezone.utc)
+
+
+def _month_key(moment: datetime) -> str:
+    return _utc(moment).strftime("%Y-%m")
+
+
+def _arrow_schema(pa):
+    types = {
+        "string": pa.string(),
+        "int32": pa.int32(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in ARCHIVE_COLUMNS])
+
+
+def _index_schema(pa):
+    return pa.schema([("key", pa.string()), ("month", pa.string())])
+
+
+def _select_list() -> str:
+    # uuid, enum and jsonb columns are all archived as text
+    columns = ["tenant_id"]
+    for name, kind in ARCHIVE_COLUMNS:
+        columns.append(f"CAST({name} AS text) AS {name}" if kind == "string" else name)
+    return ", ".join(columns)
+
+
+class _GroupWriter:
+    """Writes one group (directory) of a partition to a temp file, then publishes it."""
+
+    def __init__(self, directory: str, partition: str, schema, compression: str):
+        pa, pq, _ = _pyarrow()
+        self._pa = pa
+        self.directory = directory
+        self.schema = schema
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{partition}.parquet")
+        # Leading dot keeps dataset discovery away from half-written files
+        self.tmp_path = os.path.join(directory, f".{partition}.parquet.tmp")
+        self.writer = pq.ParquetWriter(self.tmp_path, self.schema, compression=compression)
+        self.rows = 0
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        table = self._pa.Table.from_pylist(rows, schema=self.schema)
+        self.writer.write_table(table, row_group_size=_ROW_GROUP_SIZE)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        self.writer.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self) -> None:
+        self.writer.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class MessageArchiver:
+    """
+    Streams a closed messages partition into the archive.
+
+    Rows are read through a server-side cursor ordered by
+    (tenant_id, created_at), so memory stays bounded by batch_size and
+    every file is sorted by created_at - row-group statistics then let
+    readers skip most of a file for time-bounded queries. The id indexes
+    are written the same way, ordered by the key. Files are written
+    under a temporary name and renamed into place, and each file is
+    named after its source partition, so an archive run that is retried
+    (e.g. because the drop failed) simply overwrites its output.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        root: str,
+        batch_size: int = 10_000,
+        compression: str = "zstd",
+    ) -> None:
+        self.engine = engine
+        self.root = root
+        self.batch_size = batch_size
+        self.compression = compression
+
+    async def archive_partition(self, spec: PartitionSpec, partition: PartitionInfo) -> int:
+        """
+        Archive one partition (PartitionManager archive hook).
+
+        Returns:
+            Number of rows archived
+
+        Raises:
+            RuntimeError: If pyarrow is not installed
+        """
+        pa, _, _ = _pyarrow()
+        schema, name = partition.name.split(".", 1)
+        started = time.perf_counter()
+
+        async with self.engine.connect() as conn:
+            quote = conn.dialect.identifier_preparer.quote
+            table = f"{quote(schema)}.{quote(name)}"
+
+            def message_group(record: Dict[str, Any]) -> str:
+                tenant_id = str(record.pop("tenant_id"))
+                month = _month_key(record["created_at"])
+                return os.path.join(self.root, f"tenant_id={tenant_id}", f"month={month}")
+
+            rows, files = await self._copy(
+                conn,
+                f"SELECT {_select_list()} FROM {table} ORDER BY tenant_id, created_at, id",
+                message_group, name, _arrow_schema(pa),
+            )
+
+            for key in INDEX_KEYS:
+                def index_group(record: Dict[str, Any], key: str = key) -> str:
+                    tenant_id = str(record.pop("tenant_id"))
+                    record["month"] = _month_key(record.pop("created_at"))
+                    return os.path.join(self.root, _INDEX_DIR, key, f"tenant_id={tenant_id}")
+
+                await self._copy(
+                    conn,
+                    f"SELECT tenant_id, CAST({key} AS text) AS key, created_at FROM {table} "
+                    f"WHERE {key} IS NOT NULL ORDER BY tenant_id, {key}",
+                    index_group, name, _index_schema(pa),
+                )
+
+        elapsed = time.perf_counter() - started
+        metrics = get_metrics()
+        metrics.increment_counter("message_archive_rows_total", value=float(rows))
+        metrics.increment_counter("message_archive_partitions_total")
+        metrics.observe_histogram("message_archive_seconds", elapsed)
+        logger.info(
+            "Partition archived",
+            extra={"partition": partition.name, "rows": rows, "files": files, "seconds": round(elapsed, 2)},
+        )
+        return rows
+
+    async def _copy(
+        self,
+        conn,
+        query: str,
+        group_of: Callable[[Dict[str, Any]], str],
+        partition: str,
+        schema,
+    ) -> Tuple[int, int]:
+        """Stream query rows into one file per group directory; returns (rows, files)."""
+        rows = 0
+        files = 0
+        writer: Optional[_GroupWriter] = None
+        buffer: List[Dict[str, Any]] = []
+
+        result = await conn.stream(text(query).execution_options(yield_per=self.batch_size))
+        try:
+            async for batch in result.partitions(self.batch_size):
+                for row in batch:
+                    record = dict(row._mapping)
+                    directory = group_of(record)
+                    if writer is None or directory != writer.directory:
+                        if writer is not None:
+                            await self._finish(writer, buffer)
+                            writer = None
+                            files += 1
+                        buffer = []
+                        writer = await asyncio.to_thread(
+                            _GroupWriter, directory, partition, schema, self.compression
+                        )
+                    buffer.append(record)
+                    if len(buffer) >= self.batch_size:
+                        await asyncio.to_thread(writer.write, buffer)
+                        buffer = []
+                    rows += 1
+            if writer is not None:
+                await self._finish(writer, buffer)
+                files += 1
+                writer = None
+        finally:
+            if writer is not None:
+                await asyncio.to_thread(writer.abort)
+        return rows, files
+
+    @staticmethod
+    async def _finish(writer: _GroupWriter, buffer: List[Dict[str, Any]]) -> None:
+        if buffer:
+            await asyncio.to_thread(writer.write, buffer)
+        await asyncio.to_thread(writer.close)
+
+
+class MessageArchive:
+    """
+    Read facade over the archive.
+
+    Filters are pushed down: tenant and month prune directories, and
+    created_at/id/channel predicates are checked against Parquet
+    row-group statistics before any page is decoded. Lookups by id go
+    through the id index first and then read only the months it names.
+    Reads run in a worker thread. Before anything was archived every
+    lookup comes back empty; without pyarrow every lookup raises.
+
+    Messages older than horizon() live only here once the partition
+    manager has dropped their partitions.
+    """
+
+    def __init__(self, root: str, retention_months: Optional[int]) -> None:
+        self.root = root
+        self.retention_months = retention_months
+
+    def horizon(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """Start of the oldest month still kept in Postgres; None when nothing is dropped."""
+        if self.retention_months is None:
+            return None
+        current = period_start(now or datetime.now(timezone.utc), "month")
+        return shift_period(current, "month", -self.retention_months)
+
+    def covers(self, start: datetime) -> bool:
+        """Whether a range starting at start reaches into archived months."""
+        horizon = self.horizon()
+        return horizon is not None and _utc(start) < horizon
+
+    async def find_message(
+        self,
+        tenant_id: UUID,
+        message_id: Optional[UUID] = None,
+        whatsapp_message_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Archived message by id or WhatsApp id, as a column dict."""
+        if message_id is None and whatsapp_message_id is None:
+            return None
+        rows = await asyncio.to_thread(
+            self._find_message, str(tenant_id),
+            str(message_id) if message_id else None, whatsapp_message_id,
+        )
+        return rows[0] if rows else None
+
+    async def scan(
+        self,
+        tenant_id: UUID,
+        start: datetime,
+        end: datetime,
+        channel_id: Optional[UUID] = None,
+        columns: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Archived messages of a tenant with start <= created_at <= end."""
+        return await asyncio.to_thread(
+            self._scan, str(tenant_id), _utc(start), _utc(end),
+            str(channel_id) if channel_id else None, list(columns) if columns else None,
+        )
+
+    async def response_minutes(
+        self,
+        tenant_id: UUID,
+        start: datetime,
+        end: datetime,
+        channel_id: Optional[UUID] = None,
+        window: timedelta = timedelta(hours=1),
+    ) -> List[float]:
+        """
+        First-reply times (minutes) of archived inbound messages.
+
+        Same definition as the analytics.response_time statement: the
+        first later outbound message of the conversation, if it came
+        within window.
+        """
+        rows = await self.scan(
+            tenant_id, start, _utc(end) + window, channel_id,
+            columns=("direction", "created_at", "from_number", "to_number"),
+        )
+        end = _utc(end)
+        rows.sort(key=lambda r: r["created_at"], reverse=True)
+
+        next_reply: Dict[tuple, datetime] = {}
+        minutes: List[float] = []
+        for row in rows:
+            inbound = row["direction"] == "inbound"
+            key = (row["from_number"], row["to_number"]) if inbound else (row["to_number"], row["from_number"])
+            if inbound:
+                replied_at = next_reply.get(key)
+                if row["created_at"] <= end and replied_at is not None and replied_at < row["created_at"] + window:
+                    minutes.append((replied_at - row["created_at"]).total_seconds() / 60)
+            elif row["direction"] == "outbound":
+                next_reply[key] = row["created_at"]
+        return minutes
+
+    # ------------------------------------------------------------------
+    # Blocking readers (run in a thread)
+    # ------------------------------------------------------------------
+
+    def _dataset(self, path: str, partition_fields: Sequence[str]):
+        pa, _, ds = _pyarrow()
+        if not os.path.isdir(path):
+            return None
+        partitioning = ds.partitioning(
+            pa.schema([(field, pa.string()) for field in partition_fields]), flavor="hive"
+        )
+        return ds.dataset(path, format="parquet", partitioning=partitioning)
+
+    def _read(self, expression, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        # Directories starting with "_" (the id indexes) are not discovered
+        dataset = self._dataset(self.root, ("tenant_id", "month"))
+        if dataset is None:
+            return []
+        return dataset.to_table(columns=columns, filter=expression).to_pylist()
+
+    def _months_of(self, tenant_id: str, key: str, value: str) -> List[str]:
+        _, _, ds = _pyarrow()
+        index = self._dataset(os.path.join(self.root, _INDEX_DIR, key), ("tenant_id",))
+        if index is None:
+            return []
+        expression = (ds.field("tenant_id") == tenant_id) & (ds.field("key") == value)
+        rows = index.to_table(columns=["month"], filter=expression).to_pylist()
+        return sorted({row["month"] for row in rows})
+
+    def _find_message(
+        self, tenant_id: str, message_id: Optional[str], whatsapp_message_id: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        _, _, ds = _pyarrow()
+        key, value = ("id", message_id) if message_id else ("whatsapp_message_id", whatsapp_message_id)
+        months = self._months_of(tenant_id, key, value)
+        if not months:
+            return []
+        expression = (
+            (ds.field("tenant_id") == tenant_id)
+            & ds.field("month").isin(months)
+            & (ds.field(key) == value)
+        )
+        return self._read(expression)
+
+    def _scan(
+        self,
+        tenant_id: str,
+        start: datetime,
+        end: datetime,
+        channel_id: Optional[str],
+        columns: Optional[List[str]],
+    ) -> List[Dict[str, Any]]:
+        pa, _, ds = _pyarrow()
+        timestamp = pa.timestamp("us", tz="UTC")
+        expression = (
+            (ds.field("tenant_id") == tenant_id)
+            & (ds.field("month") >= _month_key(start))
+            & (ds.field("month") <= _month_key(end))
+            & (ds.field("created_at") >= pa.scalar(start, type=timestamp))
+            & (ds.field("created_at") <= pa.scalar(end, type=timestamp))
+        )
+        if channel_id:
+            expression = expression & (ds.field("channel_id") == channel_id)
+        return self._read(expression, columns)
+
+
+_archive: Optional[MessageArchive] = None
+
+
+def get_message_archive() -> Optional[MessageArchive]:
+    """
+    Get the global archive facade.
+
+    Returns:
+        MessageArchive, or None when ARCHIVE_ENABLED is off
+
+    Raises:
+        RuntimeError: If ARCHIVE_ENABLED is on but pyarrow is not installed
+    """
+    global _archive
+    if _archive is None:
+        from src.config import get_settings
+
+        settings = get_settings()
+        if not settings.ARCHIVE_ENABLED:
+            return None
+        _pyarrow()
+        _archive = MessageArchive(settings.ARCHIVE_ROOT, settings.MESSAGE_RETENTION_MONTHS)
+    return _archive
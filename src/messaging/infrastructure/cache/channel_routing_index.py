@@ -0,0 +1,490 @@
+"""
+Channel Routing Index
+Maps phone_number_id / channel_id to routing info without hitting the DB.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from uuid import UUID
+
+from redis.asyncio import Redis
+
+from shared.infrastructure.security.field_encryption import decrypt_field_value, encrypt_field_value
+from src.messaging.domain.entities.channel import Channel
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+ChannelLoader = Callable[[], Awaitable[Iterable[Channel]]]
+
+# Only these channels receive webhooks; anything else is removed from the index
+ROUTABLE_STATUSES = frozenset({"active"})
+
+
+@dataclass(frozen=True)
+class ChannelRoute:
+    """
+    Everything webhook routing needs to know about a channel.
+
+    Attributes:
+        channel_id: Channel UUID
+        tenant_id: Owning tenant UUID
+        phone_number_id: WhatsApp phone number ID from Meta
+        status: Channel status at the time of indexing
+        app_secret_encrypted: Per-channel Meta app secret, field-encrypted
+            (None = global secret)
+        verify_token: Webhook verification token
+    """
+
+    channel_id: UUID
+    tenant_id: UUID
+    phone_number_id: str
+    status: str = "active"
+    app_secret_encrypted: Optional[str] = None
+    verify_token: Optional[str] = None
+
+    @classmethod
+    def from_channel(cls, channel: Channel) -> "ChannelRoute":
+        """Build a route from a channel aggregate."""
+        app_secret = (channel.metadata or {}).get("app_secret")
+        return cls(
+            channel_id=channel.id,
+            tenant_id=channel.tenant_id,
+            phone_number_id=channel.phone_number_id,
+            status=channel.status,
+            app_secret_encrypted=encrypt_field_value(app_secret) if app_secret else None,
+            verify_token=channel.webhook_verify_token,
+        )
+
+    def to_json(self) -> str:
+        """Serialize for Redis."""
+        data = asdict(self)
+        data["channel_id"] = str(self.channel_id)
+        data["tenant_id"] = str(self.tenant_id)
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "ChannelRoute":
+        """Deserialize from Redis."""
+        data = json.loads(raw)
+        data["channel_id"] = UUID(data["channel_id"])
+        data["tenant_id"] = UUID(data["tenant_id"])
+        # Plaintext secrets written before encryption are dropped (rewritten on warm)
+        data.pop("app_secret", None)
+        return cls(**data)
+
+
+class ChannelRoutingIndex:
+    """
+    Two-level (process memory, then Redis) routing index for channels.
+
+    - Lookups by phone_number_id or channel_id are dict lookups; Redis is
+      only consulted on a local miss, and the database never is.
+    - Warmed at startup from the channels table and kept current through
+      a Redis pub/sub channel that ChannelService publishes to on
+      create/update/delete, so every instance converges without polling.
+      Updates published while the subscription is down are lost, so the
+      local index is rebuilt from the database on every (re)subscribe.
+    - A warm rebuilds the shared Redis hashes wholesale (temporary keys
+      then RENAME), so channels deleted since the last warm disappear.
+    - Only routable (active) channels are ever served; a non-routable
+      route read from Redis or pub/sub is dropped.
+    - Unknown IDs are negatively cached for negative_ttl_seconds so a
+      stream of webhooks for an unconfigured number can't hammer Redis.
+
+    The Redis hashes and pub/sub messages hold the app secret only in
+    field-encrypted form; it is decrypted on first use per process. The
+    access token is never indexed.
+
+    Attributes:
+        redis: Async Redis client (None = process-local only)
+        negative_ttl_seconds: Lifetime of a negative cache entry
+    """
+
+    PHONE_KEY = "channels:routing:phone"
+    CHANNEL_KEY = "channels:routing:id"
+    UPDATES_CHANNEL = "channels:routing:updates"
+
+    def __init__(
+        self,
+        redis: Optional[Redis] = None,
+        negative_ttl_seconds: float = 60.0,
+        max_negative_entries: int = 10_000,
+    ) -> None:
+        """
+        Initialize routing index.
+
+        Args:
+            redis: Async Redis client shared between instances
+            negative_ttl_seconds: How long an unknown ID stays "unknown"
+            max_negative_entries: Upper bound on negative cache size
+        """
+        self.redis = redis
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_negative_entries = max_negative_entries
+        self._by_phone: Dict[str, ChannelRoute] = {}
+        self._by_channel: Dict[UUID, ChannelRoute] = {}
+        self._negative: Dict[str, float] = {}
+        self._secrets: Dict[UUID, Tuple[str, str]] = {}
+        self._warmed = False
+        self._start_lock = asyncio.Lock()
+        self._listener: Optional[asyncio.Task] = None
+        self._loader: Optional[ChannelLoader] = None
+
+    # ========================================================================
+    # LIFECYCLE
+    # ========================================================================
+
+    @property
+    def is_warm(self) -> bool:
+        """Whether the index has been loaded from the database."""
+        return self._warmed
+
+    async def start(self, loader: ChannelLoader) -> None:
+        """
+        Warm the index and start listening for updates (idempotent).
+
+        Args:
+            loader: Coroutine returning all routable channels
+        """
+        async with self._start_lock:
+            if self._warmed:
+                return
+            self._loader = loader
+            await self.warm(loader)
+            if self.redis is not None and self._listener is None:
+                self._listener = asyncio.create_task(self._listen())
+
+    async def warm(self, loader: ChannelLoader, rebuild_redis: bool = True) -> int:
+        """
+        Rebuild the index from every routable channel.
+
+        Args:
+            loader: Coroutine returning all routable channels
+            rebuild_redis: Also replace the shared Redis hashes
+
+        Returns:
+            Number of routes loaded
+        """
+        started = time.perf_counter()
+        routes = [
+            ChannelRoute.from_channel(channel)
+            for channel in await loader()
+            if channel.status in ROUTABLE_STATUSES
+        ]
+
+        # Swap in a fresh index so channels that disappeared are dropped too
+        self._by_phone = {route.phone_number_id: route for route in routes}
+        self._by_channel = {route.channel_id: route for route in routes}
+        self._negative.clear()
+        self._secrets = {k: v for k, v in self._secrets.items() if k in self._by_channel}
+
+        if self.redis is not None and rebuild_redis:
+            await self._rebuild_hashes(routes)
+
+        self._warmed = True
+        get_metrics().set_gauge("channel_routing_index_size", len(self._by_phone))
+
+        logger.info(
+            "Channel routing index warmed",
+            extra={
+                "routes": len(routes),
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            },
+        )
+        return len(routes)
+
+    async def _rebuild_hashes(self, routes: list[ChannelRoute]) -> None:
+        """Atomically replace both Redis hashes with exactly these routes."""
+        suffix = uuid.uuid4().hex
+        phone_tmp = f"{self.PHONE_KEY}:rebuild:{suffix}"
+        channel_tmp = f"{self.CHANNEL_KEY}:rebuild:{suffix}"
+
+        pipe = self.redis.pipeline(transaction=True)
+        if routes:
+            pipe.hset(phone_tmp, mapping={r.phone_number_id: r.to_json() for r in routes})
+            pipe.hset(channel_tmp, mapping={str(r.channel_id): r.to_json() for r in routes})
+            pipe.rename(phone_tmp, self.PHONE_KEY)
+            pipe.rename(channel_tmp, self.CHANNEL_KEY)
+        else:
+            pipe.delete(self.PHONE_KEY, self.CHANNEL_KEY)
+        await pipe.execute()
+
+    async def stop(self) -> None:
+        """Stop the update listener."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    # ========================================================================
+    # LOOKUPS
+    # ========================================================================
+
+    async def resolve_phone_number_id(self, phone_number_id: str) -> Optional[ChannelRoute]:
+        """
+        Resolve a Meta phone_number_id to its channel route.
+
+        Args:
+            phone_number_id: phone_number_id from webhook metadata
+
+        Returns:
+            ChannelRoute or None if no channel is configured
+        """
+        route = self._by_phone.get(phone_number_id)
+        if route is not None:
+            get_metrics().increment_counter("channel_routing_hits_total", layer="memory")
+            return route
+
+        return await self._resolve_remote(
+            f"phone:{phone_number_id}", self.PHONE_KEY, phone_number_id
+        )
+
+    async def resolve_channel_id(self, channel_id: UUID | str) -> Optional[ChannelRoute]:
+        """
+        Resolve a channel ID (e.g. from the webhook URL) to its route.
+
+        Args:
+            channel_id: Channel UUID or its string form
+
+        Returns:
+            ChannelRoute or None if unknown
+        """
+        try:
+            channel_uuid = channel_id if isinstance(channel_id, UUID) else UUID(str(channel_id))
+        except ValueError:
+            return None
+
+        route = self._by_channel.get(channel_uuid)
+        if route is not None:
+            get_metrics().increment_counter("channel_routing_hits_total", layer="memory")
+            return route
+
+        return await self._resolve_remote(
+            f"channel:{channel_uuid}", self.CHANNEL_KEY, str(channel_uuid)
+        )
+
+    def app_secret(self, route: ChannelRoute) -> Optional[str]:
+        """
+        Plaintext app secret of a route (decrypted once per secret value).
+
+        Args:
+            route: Resolved channel route
+
+        Returns:
+            Per-channel secret, or None if the channel uses the global one
+        """
+        if not route.app_secret_encrypted:
+            return None
+        cached = self._secrets.get(route.channel_id)
+        if cached is not None and cached[0] == route.app_secret_encrypted:
+            return cached[1]
+        secret = decrypt_field_value(route.app_secret_encrypted)
+        self._secrets[route.channel_id] = (route.app_secret_encrypted, secret)
+        return secret
+
+    async def _resolve_remote(self, negative_key: str, hash_key: str, field: str) -> Optional[ChannelRoute]:
+        """Consult negative cache, then Redis, on a local miss."""
+        metrics = get_metrics()
+
+        expires_at = self._negative.get(negative_key)
+        if expires_at is not None:
+            if expires_at > time.monotonic():
+                metrics.increment_counter("channel_routing_hits_total", layer="negative")
+                return None
+            del self._negative[negative_key]
+
+        if self.redis is not None:
+            try:
+                raw = await self.redis.hget(hash_key, field)
+            except Exception as e:
+                logger.warning(
+                    "Channel routing Redis lookup failed",
+                    extra={"error": str(e), "key": negative_key},
+                )
+                raw = None
+
+            if raw:
+                route = ChannelRoute.from_json(raw)
+                if route.status in ROUTABLE_STATUSES:
+                    self._apply_upsert(route)
+                    metrics.increment_counter("channel_routing_hits_total", layer="redis")
+                    return route
+                self._apply_remove(route.channel_id, route.phone_number_id)
+
+        metrics.increment_counter("channel_routing_misses_total")
+        self._remember_unknown(negative_key)
+        return None
+
+    # ========================================================================
+    # UPDATES
+    # ========================================================================
+
+    async def publish_upsert(self, channel: Channel) -> None:
+        """
+        Index a created/updated channel and notify other instances.
+
+        Call only after the change has committed. Channels that are not
+        routable (suspended, inactive, deleted) are removed instead.
+
+        Args:
+            channel: Persisted channel aggregate
+        """
+        if channel.status not in ROUTABLE_STATUSES:
+            await self.publish_remove(channel)
+            return
+
+        route = ChannelRoute.from_channel(channel)
+        previous = self._by_channel.get(route.channel_id)
+        self._apply_upsert(route)
+
+        if self.redis is None:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        if previous is not None and previous.phone_number_id != route.phone_number_id:
+            pipe.hdel(self.PHONE_KEY, previous.phone_number_id)
+        pipe.hset(self.PHONE_KEY, route.phone_number_id, route.to_json())
+        pipe.hset(self.CHANNEL_KEY, str(route.channel_id), route.to_json())
+        pipe.publish(self.UPDATES_CHANNEL, json.dumps({"op": "upsert", "route": route.to_json()}))
+        await pipe.execute()
+
+    async def publish_remove(self, channel: Channel) -> None:
+        """
+        Drop a channel and notify other instances (call after commit).
+
+        Args:
+            channel: Deleted channel aggregate
+        """
+        self._apply_remove(channel.id, channel.phone_number_id)
+
+        if self.redis is None:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hdel(self.PHONE_KEY, channel.phone_number_id)
+        pipe.hdel(self.CHANNEL_KEY, str(channel.id))
+        pipe.publish(
+            self.UPDATES_CHANNEL,
+            json.dumps({
+                "op": "remove",
+                "channel_id": str(channel.id),
+                "phone_number_id": channel.phone_number_id,
+            }),
+        )
+        await pipe.execute()
+
+    async def _listen(self) -> None:
+        """Apply updates published by other instances."""
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.UPDATES_CHANNEL)
+                # Subscribed first, so nothing published from here on is lost;
+                # whatever was published before (or while disconnected) is
+                # covered by reloading. Messages queued meanwhile apply after.
+                if self._loader is not None:
+                    await self.warm(self._loader, rebuild_redis=False)
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    self._apply_message(message["data"])
+            except asyncio.CancelledError:
+                await pubsub.close()
+                raise
+            except Exception as e:
+                # Missed messages are covered by the re-warm on resubscribe
+                logger.warning(
+                    "Channel routing listener disconnected",
+                    extra={"error": str(e)},
+                )
+                await pubsub.close()
+                await asyncio.sleep(1)
+
+    def _apply_message(self, data: Any) -> None:
+        """Apply one pub/sub update message."""
+        try:
+            update = json.loads(data)
+            if update["op"] == "upsert":
+                self._apply_upsert(ChannelRoute.from_json(update["route"]))
+            elif update["op"] == "remove":
+                self._apply_remove(UUID(update["channel_id"]), update["phone_number_id"])
+        except (KeyError, ValueError, TypeError) as e:
+            logger.warning("Ignoring malformed routing update", extra={"error": str(e)})
+
+    def _apply_upsert(self, route: ChannelRoute) -> None:
+        """Insert or replace a route in memory (non-routable ones are removed)."""
+        if route.status not in ROUTABLE_STATUSES:
+            self._apply_remove(route.channel_id, route.phone_number_id)
+            return
+
+        previous = self._by_channel.get(route.channel_id)
+        if previous is not None and previous.phone_number_id != route.phone_number_id:
+            self._by_phone.pop(previous.phone_number_id, None)
+
+        self._by_phone[route.phone_number_id] = route
+        self._by_channel[route.channel_id] = route
+        self._negative.pop(f"phone:{route.phone_number_id}", None)
+        self._negative.pop(f"channel:{route.channel_id}", None)
+
+    def _apply_remove(self, channel_id: UUID, phone_number_id: str) -> None:
+        """Remove a route from memory."""
+        self._by_channel.pop(channel_id, None)
+        self._secrets.pop(channel_id, None)
+        route = self._by_phone.get(phone_number_id)
+        if route is not None and route.channel_id == channel_id:
+            del self._by_phone[phone_number_id]
+
+    def _remember_unknown(self, negative_key: str) -> None:
+        """Negatively cache an unknown ID."""
+        if len(self._negative) >= self.max_negative_entries:
+            now = time.monotonic()
+            self._negative = {k: v for k, v in self._negative.items() if v > now}
+            if len(self._negative) >= self.max_negative_entries:
+                self._negative.clear()
+        self._negative[negative_key] = time.monotonic() + self.negative_ttl_seconds
+
+
+# Global routing index instance
+_routing_index: ChannelRoutingIndex | None = None
+
+
+def get_channel_routing_index() -> ChannelRoutingIndex:
+    """
+    Get the global channel routing index.
+
+    Returns:
+        ChannelRoutingIndex instance
+    """
+    global _routing_index
+    if _routing_index is None:
+        _routing_index = ChannelRoutingIndex()
+    return _routing_index
+
+
+def configure_channel_routing_index(
+    redis: Optional[Redis] = None,
+    negative_ttl_seconds: float = 60.0,
+) -> ChannelRoutingIndex:
+    """
+    Configure the global channel routing index.
+
+    Args:
+        redis: Async Redis client shared between instances
+        negative_ttl_seconds: Lifetime of negative cache entries
+
+    Returns:
+        The configured ChannelRoutingIndex
+    """
+    global _routing_index
+    _routing_index = ChannelRoutingIndex(redis=redis, negative_ttl_seconds=negative_ttl_seconds)
+    return _routing_index
@@ -2,7 +2,7 @@
 
 import json
 import logging
-from typing import Optional, Any, Dict, Union
+from typing import Optional, Any, Dict, List, Set, Union
 import redis.asyncio as redis
 from datetime import timedelta
 
@@ -65,18 +65,6 @@ class MessagingCache:
         effective_ttl = ttl or self.default_ttl
         await self.redis.setex(key, effective_ttl, json.dumps(templates))
     
-    # Session management
-    async def get_session_window(self, phone_number: str) -> Optional[str]:
-        """Get last inbound timestamp for session window."""
-        key = f"session:{phone_number}"
-        return await self.redis.get(key)
-    
-    async def set_session_window(self, phone_number: str, timestamp: str) -> None:
-        """Set last inbound timestamp for session window."""
-        key = f"session:{phone_number}"
-        ttl = 86400  # 24 hours
-        await self.redis.setex(key, ttl, timestamp)
-    
     # Idempotency
     async def check_idempotency(self, key: str) -> bool:
         """Check if operation was already processed."""
@@ -87,9 +75,17 @@ class MessagingCache:
     # Webhook deduplication
     async def is_webhook_processed(self, message_id: str) -> bool:
         """Check if webhook message was already processed."""
-        key = f"webhook:processed:{message_id}"
-        result = await self.redis.set(key, "1", nx=True, ex=3600)
-        return not bool(result)  # Return True if already processed
+        return message_id not in await self.mark_webhooks_processed([message_id])
+    
+    async def mark_webhooks_processed(self, message_ids: List[str]) -> Set[str]:
+        """Mark webhook messages processed in one round trip; return the new ones."""
+        if not message_ids:
+            return set()
+        pipe = self.redis.pipeline(transaction=False)
+        for message_id in message_ids:
+            pipe.set(f"webhook:processed:{message_id}", "1", nx=True, ex=3600)
+        results = await pipe.execute()
+        return {mid for mid, result in zip(message_ids, results) if result}
     
     # Rate limit info caching
     async def get_rate_limit_info(self, channel_id: str) -> Optional[Dict[str, Union[int, float]]]:
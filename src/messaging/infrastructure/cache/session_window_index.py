@@ -0,0 +1,293 @@
+"""
+Session Window Index
+Last inbound time per (tenant, channel, customer) in Redis, so the
+24-hour customer-service window check costs no database query.
+"""
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.messaging.infrastructure.persistence import statements  # noqa: F401 (registers statements)
+from shared.infrastructure.database.statements import get_statement_registry
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+# WhatsApp customer-service window: free-form messages are allowed for
+# 24 hours after the customer's last message
+SESSION_WINDOW = timedelta(hours=24)
+
+# Stored for "no inbound message known" (negative cache entry)
+_NONE = "0"
+
+# Only ever move the timestamp forward: webhooks can arrive out of order
+_RECORD_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current >= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+InboundEntry = Tuple[UUID, UUID, str, datetime]
+
+
+def normalize_phone(phone: str) -> str:
+    """
+    One E.164 form (leading '+') for window keys.
+
+    Webhooks report the sender without '+', while sends carry whatever
+    the client passed as to_number; both must land on the same key.
+    """
+    phone = phone.strip().replace(" ", "").replace("-", "")
+    return phone if phone.startswith("+") else f"+{phone}"
+
+
+def _epoch(moment: datetime) -> float:
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class SessionWindowIndex:
+    """
+    Redis index of the last inbound message time per conversation.
+
+    - Keyed by (tenant_id, channel_id, phone): the same customer talking
+      to two channels, or to two tenants, has independent windows.
+      Phones are normalized to E.164 with a leading '+'.
+    - Written by inbound processing with a TTL ending when the window
+      closes, so an expired key never answers "open".
+    - Read one at a time or in bulk with a single MGET. Misses are
+      loaded from conversation summaries and whatsapp.inbound_messages
+      in one query and
+      written back with SET NX, so a concurrent inbound write always
+      wins. "No inbound known" is cached for negative_ttl_seconds;
+      a later inbound message overwrites it immediately.
+
+    Without Redis every lookup goes to the database.
+
+    Attributes:
+        redis: Async Redis client (decode_responses=True), or None
+        negative_ttl_seconds: Lifetime of a cached "closed" answer
+    """
+
+    KEY_PREFIX = "session_window"
+
+    def __init__(self, redis: Optional[Redis] = None, negative_ttl_seconds: int = 3600) -> None:
+        """
+        Initialize session window index.
+
+        Args:
+            redis: Async Redis client shared between instances
+            negative_ttl_seconds: How long a closed/unknown window is cached
+        """
+        self.redis = redis
+        self.negative_ttl_seconds = negative_ttl_seconds
+
+    @classmethod
+    def key(cls, tenant_id: UUID, channel_id: UUID, phone: str) -> str:
+        """Redis key of one conversation."""
+        return f"{cls.KEY_PREFIX}:{tenant_id}:{channel_id}:{normalize_phone(phone)}"
+
+    # ========================================================================
+    # WRITES
+    # ========================================================================
+
+    async def record_inbound(self, tenant_id: UUID, channel_id: UUID, phone: str, at: datetime) -> None:
+        """Record an inbound message (opens or extends the window)."""
+        await self.record_inbound_many([(tenant_id, channel_id, phone, at)])
+
+    async def record_inbound_many(self, entries: Iterable[InboundEntry]) -> None:
+        """
+        Record inbound messages in one round trip.
+
+        Args:
+            entries: (tenant_id, channel_id, phone, received_at) tuples
+        """
+        if self.redis is None:
+            return
+
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        queued = 0
+        for tenant_id, channel_id, phone, at in entries:
+            received = _epoch(at)
+            ttl = int(received + SESSION_WINDOW.total_seconds() - now)
+            if ttl <= 0:
+                continue
+            pipe.eval(_RECORD_LUA, 1, self.key(tenant_id, channel_id, phone), received, ttl)
+            queued += 1
+
+        if queued:
+            try:
+                await pipe.execute()
+            except Exception as e:
+                # The database stays authoritative; lookups fall back to it
+                get_metrics().increment_counter("session_window_write_errors_total")
+                logger.warning("Session window write failed", extra={"error": str(e), "entries": queued})
+
+    # ========================================================================
+    # READS
+    # ========================================================================
+
+    async def is_open(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        channel_id: UUID,
+        phone: str,
+    ) -> bool:
+        """Whether free-form messages to phone are currently allowed."""
+        return (await self.open_windows(session, tenant_id, channel_id, [phone]))[phone]
+
+    async def open_windows(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        channel_id: UUID,
+        phones: Sequence[str],
+    ) -> Dict[str, bool]:
+        """Window state of many recipients of one channel (one MGET, at most one query)."""
+        now = time.time()
+        window = SESSION_WINDOW.total_seconds()
+        return {
+            phone: last is not None and now - last < window
+            for phone, last in (await self.last_inbound_many(session, tenant_id, channel_id, phones)).items()
+        }
+
+    async def last_inbound_many(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        channel_id: UUID,
+        phones: Sequence[str],
+    ) -> Dict[str, Optional[float]]:
+        """
+        Last inbound time (epoch seconds) per phone; None if none is known.
+
+        Args:
+            session: Session used to load cache misses
+            tenant_id: Tenant UUID
+            channel_id: Channel UUID
+            phones: Customer numbers
+        """
+        numbers = {phone: normalize_phone(phone) for phone in phones}
+        if not numbers:
+            return {}
+
+        result = await self._lookup(session, tenant_id, channel_id, list(dict.fromkeys(numbers.values())))
+        return {phone: result[number] for phone, number in numbers.items()}
+
+    async def _lookup(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        channel_id: UUID,
+        phones: List[str],
+    ) -> Dict[str, Optional[float]]:
+        """Last inbound times of normalized phones: Redis first, then the database."""
+        result: Dict[str, Optional[float]] = {}
+        missing: List[str] = list(phones)
+        if self.redis is not None:
+            try:
+                values = await self.redis.mget([self.key(tenant_id, channel_id, phone) for phone in phones])
+                missing = []
+                for phone, raw in zip(phones, values):
+                    if raw is None:
+                        missing.append(phone)
+                    else:
+                        result[phone] = None if raw == _NONE else float(raw)
+            except Exception as e:
+                logger.warning("Session window read failed", extra={"error": str(e)})
+
+        metrics = get_metrics()
+        metrics.increment_counter("session_window_lookups_total", value=float(len(phones) - len(missing)), result="hit")
+        if missing:
+            metrics.increment_counter("session_window_lookups_total", value=float(len(missing)), result="miss")
+            loaded = await self._load(session, tenant_id, channel_id, missing)
+            result.update(loaded)
+            await self._backfill(tenant_id, channel_id, loaded)
+
+        return result
+
+    async def _load(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        channel_id: UUID,
+        phones: List[str],
+    ) -> Dict[str, Optional[float]]:
+        """Last inbound times from conversation summaries and inbound messages."""
+        query = get_statement_registry().get("conversations.last_inbound")
+        # Stored numbers are raw: match both the '+' and the bare form
+        candidates = phones + [phone[1:] for phone in phones]
+        since = datetime.now(timezone.utc) - SESSION_WINDOW
+        rows = await session.execute(
+            query,
+            {"tenant_id": tenant_id, "channel_id": channel_id, "phones": candidates, "since": since},
+        )
+        loaded: Dict[str, Optional[float]] = dict.fromkeys(phones)
+        for row in rows:
+            if row.last_inbound_at is None:
+                continue
+            phone = normalize_phone(row.phone)
+            last = _epoch(row.last_inbound_at)
+            if loaded.get(phone) is None or last > loaded[phone]:
+                loaded[phone] = last
+        return loaded
+
+    async def _backfill(self, tenant_id: UUID, channel_id: UUID, loaded: Dict[str, Optional[float]]) -> None:
+        """Cache loaded values without overwriting newer inbound writes."""
+        if self.redis is None or not loaded:
+            return
+
+        now = time.time()
+        pipe = self.redis.pipeline(transaction=False)
+        for phone, last in loaded.items():
+            ttl = int(last + SESSION_WINDOW.total_seconds() - now) if last is not None else 0
+            if ttl > 0:
+                pipe.set(self.key(tenant_id, channel_id, phone), last, nx=True, ex=ttl)
+            else:
+                pipe.set(self.key(tenant_id, channel_id, phone), _NONE, nx=True, ex=self.negative_ttl_seconds)
+        try:
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Session window backfill failed", extra={"error": str(e)})
+
+
+# Global session window index (database-only until configured with Redis)
+_session_window_index: SessionWindowIndex | None = None
+
+
+def get_session_window_index() -> SessionWindowIndex:
+    """
+    Get the global session window index.
+
+    Returns:
+        SessionWindowIndex instance
+    """
+    global _session_window_index
+    if _session_window_index is None:
+        _session_window_index = SessionWindowIndex()
+    return _session_window_index
+
+
+def configure_session_window_index(redis: Optional[Redis], negative_ttl_seconds: int = 3600) -> None:
+    """
+    Configure the global session window index.
+
+    Args:
+        redis: Async Redis client shared between instances
+        negative_ttl_seconds: How long a closed/unknown window is cached
+    """
+    global _session_window_index
+    _session_window_index = SessionWindowIndex(redis, negative_ttl_seconds=negative_ttl_seconds)
@@ -0,0 +1,233 @@
+"""
+Decrypted Access Token Cache
+In-process, TTL-bounded cache of decrypted channel access tokens.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+
+class DecryptedTokenCache:
+    """
+    LRU cache of decrypted Meta access tokens.
+
+    Entries are keyed by (channel_id, token_version) so a rotated token
+    never serves a stale plaintext, and expire after a short TTL so a
+    token revoked on another instance drops out quickly.
+
+    Memory is bounded by max_entries: the least recently used entry is
+    evicted when the cache is full. At most one version per channel is
+    kept, indexed by channel so replacing or invalidating it is O(1).
+
+    CRITICAL: Plaintext tokens live only in process memory - never
+    write them to Redis, logs, or metrics labels.
+
+    Attributes:
+        ttl_seconds: Lifetime of a cached entry
+        max_entries: Maximum number of cached tokens
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 1024) -> None:
+        """
+        Initialize token cache.
+
+        Args:
+            ttl_seconds: Entry lifetime in seconds (default: 5 minutes)
+            max_entries: Upper bound on cached tokens (default: 1024)
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Tuple[UUID, str], Tuple[str, float]] = OrderedDict()
+        self._versions: Dict[UUID, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, channel_id: UUID, token_version: str) -> Optional[str]:
+        """
+        Return cached plaintext token if present and not expired.
+
+        Args:
+            channel_id: Channel UUID
+            token_version: Version fingerprint of the encrypted token
+
+        Returns:
+            Decrypted token or None on miss
+        """
+        key = (channel_id, token_version)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                get_metrics().increment_counter("token_cache_misses_total")
+                return None
+
+            token, expires_at = entry
+            if expires_at <= now:
+                self._remove(key)
+                get_metrics().increment_counter("token_cache_misses_total")
+                return None
+
+            self._entries.move_to_end(key)
+
+        get_metrics().increment_counter("token_cache_hits_total")
+        return token
+
+    def put(self, channel_id: UUID, token_version: str, token: str) -> None:
+        """
+        Cache a decrypted token.
+
+        Older versions of the same channel's token are dropped.
+
+        Args:
+            channel_id: Channel UUID
+            token_version: Version fingerprint of the encrypted token
+            token: Decrypted plaintext token
+        """
+        key = (channel_id, token_version)
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            self._drop_channel(channel_id, keep_version=token_version)
+            self._entries[key] = (token, expires_at)
+            self._entries.move_to_end(key)
+            self._versions[channel_id] = token_version
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                get_metrics().increment_counter("token_cache_evictions_total")
+
+    def get_or_decrypt(
+        self,
+        channel_id: UUID,
+        token_version: str,
+        decrypt: Callable[[], str],
+    ) -> str:
+        """
+        Return cached token or decrypt and cache it.
+
+        Args:
+            channel_id: Channel UUID
+            token_version: Version fingerprint of the encrypted token
+            decrypt: Zero-arg callable producing the plaintext token
+
+        Returns:
+            Decrypted token
+        """
+        token = self.get(channel_id, token_version)
+        if token is not None:
+            return token
+
+        token = decrypt()
+        self.put(channel_id, token_version, token)
+        return token
+
+    def invalidate(self, channel_id: UUID) -> None:
+        """
+        Drop all cached versions of a channel's token.
+
+        Call whenever a channel is updated, suspended or deactivated.
+
+        Args:
+            channel_id: Channel UUID
+        """
+        with self._lock:
+            removed = self._drop_channel(channel_id)
+
+        if removed:
+            logger.debug(
+                "Token cache invalidated",
+                extra={"channel_id": str(channel_id)},
+            )
+
+    def evict_expired(self) -> int:
+        """
+        Remove all expired entries.
+
+        Returns:
+            Number of entries removed
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                self._remove(key)
+
+        return len(expired)
+
+    def clear(self) -> None:
+        """Remove all entries (for testing and key rotation)."""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get cache occupancy.
+
+        Returns:
+            Dictionary with current size, capacity and TTL
+        """
+        with self._lock:
+            size = len(self._entries)
+
+        return {
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+    def _drop_channel(self, channel_id: UUID, keep_version: Optional[str] = None) -> int:
+        """Remove a channel's cached version unless it is keep_version (caller must hold the lock)."""
+        version = self._versions.get(channel_id)
+        if version is None or version == keep_version:
+            return 0
+        self._remove((channel_id, version))
+        return 1
+
+    def _remove(self, key: Tuple[UUID, str]) -> None:
+        """Remove an entry and its channel index (caller must hold the lock)."""
+        del self._entries[key]
+        if self._versions.get(key[0]) == key[1]:
+            del self._versions[key[0]]
+
+
+# Global token cache instance
+_token_cache: DecryptedTokenCache | None = None
+
+
+def get_token_cache() -> DecryptedTokenCache:
+    """
+    Get the global decrypted token cache.
+
+    Returns:
+        DecryptedTokenCache instance
+    """
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = DecryptedTokenCache()
+    return _token_cache
+
+
+def configure_token_cache(ttl_seconds: float = 300.0, max_entries: int = 1024) -> None:
+    """
+    Configure the global decrypted token cache.
+
+    Args:
+        ttl_seconds: Entry lifetime in seconds
+        max_entries: Upper bound on cached tokens
+    """
+    global _token_cache
+    _token_cache = DecryptedTokenCache(ttl_seconds=ttl_seconds, max_entries=max_entries)
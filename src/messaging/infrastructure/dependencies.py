@@ -1,25 +1,53 @@
 """Dependency injection for messaging module."""
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
 
-from src.shared_.database.deps import get_tenant_scoped_db
+from src.shared_.database.deps import get_analytics_db, get_read_db, get_tenant_scoped_db
 from src.messaging.infrastructure.adapters.whatsapp_adapter import WhatsAppAPIAdapter
 from messaging.infrastructure.persistence.adapter.encryption_adapter import EncryptionAdapter
-from messaging.infrastructure.persistence.adapter.google_speech_adapter import GoogleSpeechAdapter
-from src.messaging.infrastructure.repositories.channel_repository_impl import ChannelRepositoryImpl
+from src.messaging.infrastructure.persistence.repositories.channel_repository_impl import ChannelRepositoryImpl
 from src.messaging.infrastructure.repositories.message_repository_impl import MessageRepositoryImpl
+from src.messaging.infrastructure.persistence.repositories.message_repository_impl import InboundMessageRepositoryImpl
+from src.messaging.infrastructure.idempotency_checker import IdempotencyChecker
 from src.messaging.infrastructure.repositories.template_repository_impl import TemplateRepositoryImpl
 from src.messaging.infrastructure.rate_limiter.token_bucket import TokenBucketRateLimiter
 from src.messaging.infrastructure.cache.redis_cache import MessagingCache
 from src.messaging.infrastructure.events.event_bus import EventBus
 from src.messaging.infrastructure.outbox.outbox_service import OutboxService
-from src.messaging.application.services.webhook_service import WebhookService
+from src.messaging.infrastructure.ingestion.webhook_buffer import WebhookBuffer
+from src.messaging.infrastructure.ingestion.recipient_import import RecipientImporter
+from src.messaging.infrastructure.transcription.transcription_queue import TranscriptionQueue
+from src.messaging.infrastructure.cache.channel_routing_index import (
+    ChannelRoutingIndex,
+    configure_channel_routing_index,
+    get_channel_routing_index as _get_global_routing_index
+)
+from src.messaging.infrastructure.cache.session_window_index import (
+    SessionWindowIndex,
+    configure_session_window_index,
+    get_session_window_index as _get_global_session_window_index
+)
+from src.messaging.infrastructure.usage.usage_meter import (
+    UsageMeter,
+    configure_usage_meter,
+    get_usage_meter as _get_global_usage_meter
+)
+from src.shared_.database import get_async_session
+from src.messaging.application.services.webhook_service import WebhookService, WebhookSignatureVerifier
 from src.messaging.application.services.message_service import MessageService
+from src.messaging.application.services.message_count_service import MessageCountService
 from src.messaging.application.services.channel_service import ChannelService
 from src.messaging.application.services.template_service import TemplateService
+from src.messaging.application.queries.get_message_analytics_query import GetMessageAnalyticsQueryHandler
+from src.messaging.infrastructure.archive.message_archive import get_message_archive
+from src.messaging.application.queries.get_channel_stats_query import GetChannelStatsQueryHandler
+from src.messaging.application.queries.list_conversations_query import ListConversationsQueryHandler
+from shared.infrastructure.cache.redis_cache import RedisCache
+from shared.infrastructure.messaging.domain_event_publisher import DomainEventPublisher
+from src.config import get_settings
 
 
 # Redis client singleton
@@ -37,26 +65,149 @@ async def get_redis() -> redis.Redis:
     return _redis_client
 
 
+# Raw-bytes Redis client (webhook bodies must round-trip byte-exact)
+_binary_redis_client = None
+
+async def get_binary_redis() -> redis.Redis:
+    """Get Redis client without response decoding."""
+    global _binary_redis_client
+    if _binary_redis_client is None:
+        _binary_redis_client = await redis.from_url(
+            "redis://localhost:6379",
+            decode_responses=False
+        )
+    return _binary_redis_client
+
+
+# Webhook buffer singleton (keeps its last observed depth between requests)
+_webhook_buffer = None
+
+async def get_webhook_buffer(
+    redis: redis.Redis = Depends(get_binary_redis)
+) -> WebhookBuffer:
+    """Get webhook ingestion buffer."""
+    global _webhook_buffer
+    if _webhook_buffer is None:
+        _webhook_buffer = WebhookBuffer(
+            redis,
+            max_depth=get_settings().WEBHOOK_BUFFER_MAX_DEPTH
+        )
+    return _webhook_buffer
+
+
+async def get_transcription_queue(
+    redis: redis.Redis = Depends(get_redis)
+) -> TranscriptionQueue:
+    """Get voice-note transcription queue."""
+    return TranscriptionQueue(redis)
+
+
+# Channel routing index (warmed on first use, then kept current via pub/sub)
+_routing_index_configured = False
+
+async def _load_routable_channels():
+    """Load all routable channels for warming the routing index."""
+    async with get_async_session() as session:
+        return await ChannelRepositoryImpl(session, tenant_id=None).list_routable()
+
+
+async def get_channel_routing_index(
+    redis: redis.Redis = Depends(get_redis)
+) -> ChannelRoutingIndex:
+    """Get the warmed channel routing index."""
+    global _routing_index_configured
+    if not _routing_index_configured:
+        configure_channel_routing_index(redis)
+        _routing_index_configured = True
+    index = _get_global_routing_index()
+    await index.start(_load_routable_channels)
+    return index
+
+
+# Session window index (shared by inbound processing and senders)
+_session_window_index_configured = False
+
+async def get_session_window_index(
+    redis: redis.Redis = Depends(get_redis)
+) -> SessionWindowIndex:
+    """Get the Redis-backed session window index."""
+    global _session_window_index_configured
+    if not _session_window_index_configured:
+        configure_session_window_index(
+            redis,
+            negative_ttl_seconds=get_settings().SESSION_WINDOW_NEGATIVE_TTL_SECONDS
+        )
+        _session_window_index_configured = True
+    return _get_global_session_window_index()
+
+
+# Usage meter (per-process counters, Redis totals for quota pre-checks)
+_usage_meter_configured = False
+
+async def get_usage_meter(
+    redis: redis.Redis = Depends(get_redis)
+) -> UsageMeter:
+    """Get the usage meter, flushing in the background."""
+    global _usage_meter_configured
+    if not _usage_meter_configured:
+        configure_usage_meter(
+            redis,
+            flush_interval=get_settings().USAGE_FLUSH_INTERVAL_SECONDS
+        )
+        _usage_meter_configured = True
+    meter = _get_global_usage_meter()
+    await meter.start()
+    return meter
+
+
+async def get_webhook_verifier(
+    routing_index: ChannelRoutingIndex = Depends(get_channel_routing_index)
+) -> WebhookSignatureVerifier:
+    """Get webhook signature verifier (no database session)."""
+    return WebhookSignatureVerifier(routing_index, get_settings().WHATSAPP_APP_SECRET)
+
+
 # Service dependencies
 async def get_webhook_service(
     session: AsyncSession = Depends(get_tenant_scoped_db),
-    redis: redis.Redis = Depends(get_redis)
+    redis: redis.Redis = Depends(get_redis),
+    routing_index: ChannelRoutingIndex = Depends(get_channel_routing_index),
+    transcription_queue: TranscriptionQueue = Depends(get_transcription_queue),
+    session_windows: SessionWindowIndex = Depends(get_session_window_index)
 ) -> WebhookService:
     """Get webhook service."""
-    message_repo = MessageRepositoryImpl(session)
-    channel_repo = ChannelRepositoryImpl(session, EncryptionAdapter())
-    whatsapp_client = WhatsAppAPIAdapter()
-    speech_client = GoogleSpeechAdapter()
-    cache = MessagingCache(redis)
-    event_bus = EventBus(redis)
+    return build_webhook_service(
+        session,
+        redis,
+        routing_index,
+        transcription_queue,
+        session_windows=session_windows
+    )
+
+
+def build_webhook_service(
+    session: AsyncSession,
+    redis: redis.Redis,
+    routing_index: ChannelRoutingIndex,
+    transcription_queue: TranscriptionQueue,
+    session_windows: Optional[SessionWindowIndex] = None
+) -> WebhookService:
+    """
+    Build a webhook service outside FastAPI (ingest worker, replayer).
     
+    Webhooks span tenants, so the repositories are not tenant-bound;
+    inserts set the RLS context per tenant.
+    """
     return WebhookService(
-        message_repo=message_repo,
-        channel_repo=channel_repo,
-        whatsapp_client=whatsapp_client,
-        speech_client=speech_client,
-        redis_cache=cache,
-        event_bus=event_bus
+        inbound_repo=InboundMessageRepositoryImpl(session, tenant_id=None),
+        channel_repo=ChannelRepositoryImpl(session, tenant_id=None),
+        idempotency_checker=IdempotencyChecker(RedisCache(redis)),
+        event_publisher=DomainEventPublisher(),
+        transcription_queue=transcription_queue,
+        app_secret=get_settings().WHATSAPP_APP_SECRET,
+        session=session,
+        routing_index=routing_index,
+        session_windows=session_windows or _get_global_session_window_index()
     )
 
 
@@ -80,10 +231,54 @@ async def get_message_service(
         whatsapp_client=whatsapp_client,
         rate_limiter=rate_limiter,
         redis_cache=cache,
-        outbox=outbox
+        outbox=outbox,
+        session_windows=await get_session_window_index(redis),
+        counts=MessageCountService(
+            session,
+            redis,
+            cache_ttl_seconds=get_settings().MESSAGE_COUNT_CACHE_TTL_SECONDS,
+            exact_threshold=get_settings().MESSAGE_COUNT_EXACT_THRESHOLD
+        ),
+        usage=await get_usage_meter(redis)
     )
 
 
+async def get_recipient_importer(
+    session: AsyncSession = Depends(get_tenant_scoped_db)
+) -> RecipientImporter:
+    """Get recipient list importer."""
+    return RecipientImporter(session)
+
+
+async def get_message_query_service(
+    session: AsyncSession = Depends(get_read_db),
+    redis: redis.Redis = Depends(get_redis)
+) -> MessageService:
+    """Get message service for read-only endpoints (replica-routed session)."""
+    return await get_message_service(session, redis)
+
+
+async def get_message_analytics_handler(
+    session: AsyncSession = Depends(get_analytics_db)
+) -> GetMessageAnalyticsQueryHandler:
+    """Get message analytics query handler (replica-routed, analytics pool)."""
+    return GetMessageAnalyticsQueryHandler(session, archive=get_message_archive())
+
+
+async def get_channel_stats_handler(
+    session: AsyncSession = Depends(get_analytics_db)
+) -> GetChannelStatsQueryHandler:
+    """Get channel stats query handler (replica-routed, analytics pool)."""
+    return GetChannelStatsQueryHandler(session)
+
+
+async def get_list_conversations_handler(
+    session: AsyncSession = Depends(get_read_db)
+) -> ListConversationsQueryHandler:
+    """Get conversation inbox query handler (replica-routed session)."""
+    return ListConversationsQueryHandler(session)
+
+
 async def get_channel_service(
     session: AsyncSession = Depends(get_tenant_scoped_db)  # ✅ FIXED
 ) -> ChannelService:
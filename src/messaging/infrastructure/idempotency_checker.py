@@ -2,26 +2,135 @@
 Idempotency Checker using Redis
 Prevents duplicate message processing.
 """
-from typing import Optional
-from uuid import UUID
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Set
+
+from redis.exceptions import RedisError
 
 from shared.infrastructure.cache.redis_cache import RedisCache
 from src.messaging.domain.exceptions import DuplicateMessageError
 from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
 
 logger = get_logger(__name__)
 
 
+class RecentIdCache:
+    """
+    Small in-process LRU of recently seen message IDs.
+
+    Meta retries and duplicate deliveries usually arrive within seconds,
+    so most duplicates are caught here without touching Redis.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def contains(self, message_id: str) -> bool:
+        """Check whether an ID was seen within the TTL."""
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._entries.get(message_id)
+            if expires_at is None:
+                return False
+            if expires_at <= now:
+                del self._entries[message_id]
+                return False
+            self._entries.move_to_end(message_id)
+            return True
+
+    def add_many(self, message_ids: Iterable[str]) -> None:
+        """Remember IDs as seen."""
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for message_id in message_ids:
+                self._entries[message_id] = expires_at
+                self._entries.move_to_end(message_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard_many(self, message_ids: Iterable[str]) -> None:
+        """Forget IDs (e.g. processing failed and will be retried)."""
+        with self._lock:
+            for message_id in message_ids:
+                self._entries.pop(message_id, None)
+
+
 class IdempotencyChecker:
     """
     Redis-based idempotency checker for WhatsApp messages.
-    
-    Uses wa_message_id as idempotency key.
+
+    Uses wa_message_id as idempotency key. All IDs of a webhook are
+    checked and marked together: local LRU first, then one pipelined
+    SET NX EX for the rest. If Redis is unavailable every remaining ID
+    is reported as new and the inbound_messages unique constraint on
+    wa_message_id (insert ... on conflict do nothing) is the backstop.
     """
-    
-    def __init__(self, redis: RedisCache):
+
+    KEY_PREFIX = "idempotency:wa_message:"
+
+    def __init__(self, redis: RedisCache, recent: Optional[RecentIdCache] = None):
         self.redis = redis
-    
+        self.recent = recent or get_recent_id_cache()
+
+    async def check_and_mark_many(
+        self,
+        wa_message_ids: List[str],
+        ttl: int = 86400  # 24 hours
+    ) -> Set[str]:
+        """
+        Check and mark a batch of message IDs in at most one round trip.
+
+        Args:
+            wa_message_ids: WhatsApp message IDs from one webhook payload
+            ttl: Key expiry in seconds
+
+        Returns:
+            IDs seen for the first time (the ones to process)
+        """
+        metrics = get_metrics()
+
+        # Duplicates inside the same payload count once
+        candidates = list(dict.fromkeys(wa_message_ids))
+        unseen = [mid for mid in candidates if not self.recent.contains(mid)]
+        local_hits = len(candidates) - len(unseen)
+        if local_hits:
+            metrics.increment_counter("idempotency_duplicates_total", value=local_hits, layer="local")
+
+        if not unseen:
+            return set()
+
+        try:
+            results = await self.redis.set_if_absent_many(
+                [f"{self.KEY_PREFIX}{mid}" for mid in unseen], "1", ttl=ttl
+            )
+        except RedisError:
+            # Fall back to the database unique constraint
+            metrics.increment_counter("idempotency_redis_fallback_total")
+            logger.warning(
+                "Idempotency check falling back to database constraint",
+                extra={"count": len(unseen)}
+            )
+            self.recent.add_many(unseen)
+            return set(unseen)
+
+        new_ids = {mid for mid in unseen if results.get(f"{self.KEY_PREFIX}{mid}")}
+        redis_hits = len(unseen) - len(new_ids)
+        if redis_hits:
+            metrics.increment_counter("idempotency_duplicates_total", value=redis_hits, layer="redis")
+            logger.info(
+                "Duplicate messages detected",
+                extra={"count": redis_hits}
+            )
+
+        self.recent.add_many(unseen)
+        return new_ids
+
     async def check_and_mark(
         self,
         wa_message_id: str,
@@ -29,30 +138,53 @@ class IdempotencyChecker:
     ) -> None:
         """
         Check if message already processed and mark as processed.
-        
+
         Args:
             wa_message_id: WhatsApp message ID
             ttl: Key expiry in seconds
-        
+
         Raises:
             DuplicateMessageError: If message already processed
         """
-        key = f"idempotency:wa_message:{wa_message_id}"
-        
-        # Try to set key with NX (only if not exists)
-        result = await self.redis.set(key, "1", ttl=ttl)
-        
-        if not result:
+        if not await self.check_and_mark_many([wa_message_id], ttl=ttl):
             logger.warning(
                 f"Duplicate message detected: {wa_message_id}",
                 extra={"wa_message_id": wa_message_id}
             )
             raise DuplicateMessageError(f"Message {wa_message_id} already processed")
-        
+
         logger.debug(f"Message marked as processed: {wa_message_id}")
-    
+
+    async def release(self, wa_message_ids: List[str]) -> None:
+        """
+        Unmark IDs whose processing failed so a redelivery is processed.
+
+        Args:
+            wa_message_ids: WhatsApp message IDs
+        """
+        self.recent.discard_many(wa_message_ids)
+        await self.redis.delete_many([f"{self.KEY_PREFIX}{mid}" for mid in wa_message_ids])
+
     async def is_processed(self, wa_message_id: str) -> bool:
         """Check if message was already processed."""
-        key = f"idempotency:wa_message:{wa_message_id}"
-        result = await self.redis.get(key)
-        return result is not None
\ No newline at end of file
+        if self.recent.contains(wa_message_id):
+            return True
+        key = f"{self.KEY_PREFIX}{wa_message_id}"
+        return await self.redis.exists(key)
+
+
+# Global recent-ID cache instance (shared by per-request checkers)
+_recent_ids: Optional[RecentIdCache] = None
+
+
+def get_recent_id_cache() -> RecentIdCache:
+    """
+    Get the global recent message ID cache.
+
+    Returns:
+        RecentIdCache instance
+    """
+    global _recent_ids
+    if _recent_ids is None:
+        _recent_ids = RecentIdCache()
+    return _recent_ids
@@ -0,0 +1,320 @@
+"""
+Recipient Import
+Streams a CSV or JSONL recipient upload into messaging.recipient_list_entries.
+
+The request body is consumed chunk by chunk: bytes are decoded
+incrementally, split into complete records, parsed and normalized one
+batch at a time and fed to asyncpg's COPY as an async iterator, so memory
+stays bounded by one network chunk plus one batch regardless of upload
+size. Rows land in a transaction-local staging table and are moved into
+the list, deduplicated by phone, with a single INSERT ... SELECT.
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import msgspec
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.messaging.domain.exceptions import RecipientImportError
+from src.messaging.domain.value_objects.phone_number import PhoneNumber
+from src.messaging.infrastructure.persistence import statements  # noqa: F401 (registers statements)
+from shared.infrastructure.database.statements import get_statement_registry
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+FORMATS = ("csv", "jsonl")
+
+# Column (CSV) or key (JSONL) holding the recipient, first match wins
+PHONE_FIELDS = ("phone", "to", "to_number", "msisdn", "recipient")
+
+# A record without a newline this long is rejected instead of buffered
+MAX_RECORD_CHARS = 64 * 1024
+
+MAX_ERROR_SAMPLES = 20
+
+STAGE_TABLE = "recipient_import_stage"
+STAGE_COLUMNS = ("position", "phone", "variables")
+
+_SEPARATORS_RE = re.compile(r"[\s\-().]")
+
+StageRecord = Tuple[int, str, Optional[str]]
+
+
+def normalize_phone(raw: Any, default_country_code: Optional[str] = None) -> Optional[str]:
+    """
+    E.164 form of a phone number, or None if it cannot be one.
+
+    Separators are dropped, a 00 international prefix becomes +, and
+    national numbers get default_country_code (trunk 0 removed) if given.
+    """
+    if raw is None:
+        return None
+    phone = _SEPARATORS_RE.sub("", str(raw))
+    if phone.startswith("00"):
+        phone = "+" + phone[2:]
+    elif not phone.startswith("+"):
+        if phone.isdigit() and default_country_code:
+            phone = f"+{default_country_code.lstrip('+')}{phone.lstrip('0')}"
+        else:
+            phone = "+" + phone
+    return phone if PhoneNumber.E164_PATTERN.match(phone) else None
+
+
+@dataclass
+class ImportStats:
+    """Counters of one import (filled while the upload streams)."""
+
+    total_rows: int = 0
+    valid_rows: int = 0
+    invalid_rows: int = 0
+    duplicate_rows: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def reject(self, row: int, value: Any, reason: str) -> None:
+        self.invalid_rows += 1
+        if len(self.errors) < MAX_ERROR_SAMPLES:
+            self.errors.append({"row": row, "value": None if value is None else str(value)[:64], "reason": reason})
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+async def iter_records(chunks: AsyncIterator[bytes], quoted: bool = False) -> AsyncIterator[List[str]]:
+    """
+    Complete records of a text upload, one batch per network chunk.
+
+    Args:
+        chunks: Raw body chunks (e.g. Request.stream())
+        quoted: CSV mode: a newline inside double quotes does not end a
+            record (quote parity; escaped "" keeps it even)
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        text = pending + decoder.decode(chunk)
+        lines = text.split("\n")
+        pending = lines.pop()
+        if quoted:
+            lines, carry = _close_quoted(lines)
+            if carry:
+                pending = carry + "\n" + pending
+        if len(pending) > MAX_RECORD_CHARS:
+            raise RecipientImportError(f"Record longer than {MAX_RECORD_CHARS} characters")
+        batch = [line.rstrip("\r") for line in lines if line.strip()]
+        if batch:
+            yield batch
+
+    tail = (pending + decoder.decode(b"", final=True)).rstrip("\r")
+    if tail.strip():
+        yield [tail]
+
+
+def _close_quoted(lines: List[str]) -> Tuple[List[str], str]:
+    """Join lines into records with balanced quotes; returns (records, open tail)."""
+    records: List[str] = []
+    current: Optional[str] = None
+    for line in lines:
+        current = line if current is None else current + "\n" + line
+        if current.count('"') % 2 == 0:
+            records.append(current)
+            current = None
+    return records, current or ""
+
+
+async def iter_csv_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[Tuple[Any, Optional[Dict[str, str]]]]]:
+    """(phone, variables) batches of a CSV upload with a header row."""
+    header: Optional[List[str]] = None
+    phone_index = -1
+    async for records in iter_records(chunks, quoted=True):
+        rows = csv.reader(records)
+        if header is None:
+            header = [name.strip() for name in next(rows)]
+            lowered = [name.lower() for name in header]
+            phone_index = next((lowered.index(name) for name in PHONE_FIELDS if name in lowered), -1)
+            if phone_index < 0:
+                raise RecipientImportError(f"CSV header needs a phone column ({', '.join(PHONE_FIELDS)})")
+
+        batch = []
+        for row in rows:
+            phone = row[phone_index] if phone_index < len(row) else None
+            variables = {
+                name: value
+                for i, (name, value) in enumerate(zip(header, row))
+                if i != phone_index and name and value != ""
+            }
+            batch.append((phone, variables or None))
+        if batch:
+            yield batch
+
+
+async def iter_jsonl_rows(chunks: AsyncIterator[bytes]) -> AsyncIterator[List[Tuple[Any, Optional[Dict[str, Any]]]]]:
+    """
+    (phone, variables) batches of a JSONL upload.
+
+    Each line is an object with a phone key and either a "variables"
+    object or the variables as sibling keys.
+    """
+    decoder = msgspec.json.Decoder()
+    async for records in iter_records(chunks):
+        batch = []
+        for line in records:
+            try:
+                item = decoder.decode(line)
+            except msgspec.DecodeError:
+                item = None
+            if not isinstance(item, dict):
+                batch.append((None, None))
+                continue
+            phone = next((item[name] for name in PHONE_FIELDS if name in item), None)
+            variables = item.get("variables")
+            if not isinstance(variables, dict):
+                variables = {key: value for key, value in item.items() if key not in PHONE_FIELDS} or None
+            batch.append((phone, variables))
+        yield batch
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+class RecipientImporter:
+    """
+    Streams an upload into a new recipient list (one transaction).
+
+    Attributes:
+        session: Tenant-scoped session; the list is visible on commit
+        default_country_code: Prefix for national numbers (e.g. "91")
+    """
+
+    def __init__(self, session: AsyncSession, default_country_code: Optional[str] = None) -> None:
+        """
+        Initialize recipient importer.
+
+        Args:
+            session: Tenant-scoped session (asyncpg driver)
+            default_country_code: Prefix for numbers without a country code
+        """
+        self.session = session
+        self.default_country_code = default_country_code
+
+    async def import_list(
+        self,
+        tenant_id: UUID,
+        chunks: AsyncIterator[bytes],
+        source_format: str,
+        channel_id: Optional[UUID] = None,
+        name: Optional[str] = None,
+        created_by: Optional[UUID] = None,
+    ) -> Tuple[UUID, ImportStats]:
+        """
+        Create a recipient list from an upload.
+
+        Args:
+            tenant_id: Tenant UUID
+            chunks: Raw body chunks
+            source_format: "csv" or "jsonl"
+            channel_id: Channel the list is meant for (informational)
+            name: Display name
+            created_by: Uploading user
+
+        Returns:
+            (list_id, stats)
+
+        Raises:
+            RecipientImportError: Unknown format or malformed upload
+        """
+        if source_format not in FORMATS:
+            raise RecipientImportError(f"Unsupported recipient format: {source_format}")
+
+        started = time.perf_counter()
+        registry = get_statement_registry()
+        list_id = uuid.uuid4()
+        stats = ImportStats()
+
+        await self.session.execute(
+            registry.get("recipient_lists.insert"),
+            {
+                "id": list_id,
+                "tenant_id": tenant_id,
+                "channel_id": channel_id,
+                "name": name,
+                "source_format": source_format,
+                "created_by": created_by,
+            },
+        )
+        await self.session.execute(registry.get("recipient_lists.create_stage"))
+
+        rows = iter_csv_rows(chunks) if source_format == "csv" else iter_jsonl_rows(chunks)
+        driver = await self._driver_connection()
+        await driver.copy_records_to_table(STAGE_TABLE, records=self._stage_records(rows, stats), columns=STAGE_COLUMNS)
+
+        inserted = (
+            await self.session.execute(
+                registry.get("recipient_lists.promote_stage"), {"list_id": list_id, "tenant_id": tenant_id}
+            )
+        ).scalar_one()
+        stats.duplicate_rows = stats.valid_rows - inserted
+        stats.valid_rows = inserted
+
+        await self.session.execute(
+            registry.get("recipient_lists.finish"),
+            {
+                "list_id": list_id,
+                "tenant_id": tenant_id,
+                "total_rows": stats.total_rows,
+                "valid_rows": stats.valid_rows,
+                "invalid_rows": stats.invalid_rows,
+                "duplicate_rows": stats.duplicate_rows,
+            },
+        )
+
+        elapsed = time.perf_counter() - started
+        metrics = get_metrics()
+        metrics.increment_counter("recipient_import_rows_total", value=float(stats.valid_rows), result="valid")
+        metrics.increment_counter("recipient_import_rows_total", value=float(stats.invalid_rows), result="invalid")
+        metrics.increment_counter("recipient_import_rows_total", value=float(stats.duplicate_rows), result="duplicate")
+        metrics.observe_histogram("recipient_import_seconds", elapsed, format=source_format)
+        logger.info(
+            "Recipient list imported",
+            extra={
+                "list_id": str(list_id),
+                "format": source_format,
+                "total_rows": stats.total_rows,
+                "valid_rows": stats.valid_rows,
+                "invalid_rows": stats.invalid_rows,
+                "duplicate_rows": stats.duplicate_rows,
+                "seconds": round(elapsed, 3),
+            },
+        )
+        return list_id, stats
+
+    async def _stage_records(self, rows: AsyncIterator[List[Tuple[Any, Any]]], stats: ImportStats) -> AsyncIterator[StageRecord]:
+        """Normalized COPY records; invalid rows are counted, not staged."""
+        encoder = msgspec.json.Encoder()
+        async for batch in rows:
+            for raw_phone, variables in batch:
+                stats.total_rows += 1
+                position = stats.total_rows
+                phone = normalize_phone(raw_phone, self.default_country_code)
+                if phone is None:
+                    stats.reject(position, raw_phone, "missing phone" if raw_phone in (None, "") else "invalid phone")
+                    continue
+                stats.valid_rows += 1
+                yield position, phone, encoder.encode(variables).decode() if variables else None
+
+    async def _driver_connection(self):
+        """asyncpg connection behind the session (same transaction)."""
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
@@ -0,0 +1,333 @@
+"""
+Webhook Ingestion Buffer
+Durable Redis Stream that decouples webhook acknowledgement from processing.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from src.messaging.domain.exceptions import WebhookBufferFullError
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class BufferedWebhook:
+    """
+    A raw webhook delivery read back from the buffer.
+
+    Attributes:
+        entry_id: Redis Stream entry ID (<ms>-<seq>)
+        channel_id: Channel the webhook was posted to
+        body: Raw request body exactly as signed by Meta
+        signature: X-Hub-Signature-256 header value
+        signature_verified: Whether the HTTP handler verified the signature
+        deliveries: How many times this entry has been handed to a consumer
+    """
+
+    entry_id: str
+    channel_id: str
+    body: bytes
+    signature: Optional[str]
+    signature_verified: bool = False
+    deliveries: int = 1
+
+    @property
+    def enqueued_at(self) -> float:
+        """Enqueue time (epoch seconds) encoded in the stream entry ID."""
+        return int(self.entry_id.split("-", 1)[0]) / 1000.0
+
+
+class WebhookBuffer:
+    """
+    Redis Stream backed buffer for raw webhook payloads.
+
+    The HTTP handler appends the signed raw body with a single XADD and
+    acknowledges Meta immediately; WebhookIngestWorker consumes entries
+    through a consumer group so crashed consumers' entries are reclaimed.
+
+    Backpressure: once the stream depth reaches max_depth, append() raises
+    WebhookBufferFullError so the handler can return 503 and let Meta
+    retry later instead of growing the backlog without bound.
+
+    Attributes:
+        redis: Async Redis client (must NOT use decode_responses for bodies)
+        stream_key: Stream name
+        group: Consumer group name
+        max_depth: Depth at which new deliveries are refused
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream_key: str = "webhooks:whatsapp:ingest",
+        group: str = "webhook-processors",
+        max_depth: int = 100_000,
+        dead_letter_key: str = "webhooks:whatsapp:dead",
+    ) -> None:
+        """
+        Initialize webhook buffer.
+
+        Args:
+            redis: Async Redis client
+            stream_key: Redis Stream key for pending webhooks
+            group: Consumer group used by processing workers
+            max_depth: Stream depth at which appends are refused
+            dead_letter_key: Stream receiving entries that exhausted retries
+        """
+        self.redis = redis
+        self.stream_key = stream_key
+        self.group = group
+        self.max_depth = max_depth
+        self.dead_letter_key = dead_letter_key
+        self._last_depth = 0
+
+    async def ensure_group(self) -> None:
+        """Create the consumer group (and stream) if missing."""
+        try:
+            await self.redis.xgroup_create(
+                self.stream_key, self.group, id="0", mkstream=True
+            )
+            logger.info(
+                "Webhook consumer group created",
+                extra={"stream": self.stream_key, "group": self.group},
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def append(
+        self,
+        channel_id: str,
+        body: bytes,
+        signature: Optional[str] = None,
+        signature_verified: bool = False,
+    ) -> str:
+        """
+        Append a verified raw webhook to the buffer.
+
+        Costs one round trip (XADD and XLEN pipelined). While the buffer
+        is saturated only XLEN is issued, so the depth refreshes as
+        workers drain it.
+
+        Args:
+            channel_id: Channel the webhook was posted to
+            body: Raw request body
+            signature: Signature header (kept for audit)
+            signature_verified: Result of the handler's signature check
+
+        Returns:
+            Stream entry ID
+
+        Raises:
+            WebhookBufferFullError: If the buffer depth exceeds max_depth
+        """
+        if self._last_depth >= self.max_depth:
+            self._last_depth = await self.redis.xlen(self.stream_key)
+            if self._last_depth >= self.max_depth:
+                get_metrics().increment_counter("webhook_buffer_rejected_total")
+                raise WebhookBufferFullError(
+                    f"Webhook buffer saturated ({self._last_depth} pending)"
+                )
+
+        fields = {
+            "channel_id": channel_id,
+            "body": body,
+            "verified": b"1" if signature_verified else b"0",
+        }
+        if signature:
+            fields["signature"] = signature
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xadd(self.stream_key, fields)
+        pipe.xlen(self.stream_key)
+        entry_id, depth = await pipe.execute()
+
+        self._last_depth = depth
+        get_metrics().increment_counter("webhook_buffer_appended_total")
+        get_metrics().set_gauge("webhook_buffer_depth", depth)
+
+        return entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+
+    async def read(
+        self,
+        consumer: str,
+        count: int,
+        block_ms: int = 1000,
+    ) -> List[BufferedWebhook]:
+        """
+        Read new entries for a consumer.
+
+        Args:
+            consumer: Consumer name (unique per worker process)
+            count: Maximum number of entries to return
+            block_ms: How long to block waiting for new entries
+
+        Returns:
+            List of buffered webhooks (possibly empty)
+        """
+        if count <= 0:
+            return []
+
+        response = await self.redis.xreadgroup(
+            self.group,
+            consumer,
+            {self.stream_key: ">"},
+            count=count,
+            block=block_ms or None,  # BLOCK 0 would wait forever
+        )
+
+        entries: List[BufferedWebhook] = []
+        for _stream, messages in response or []:
+            for entry_id, fields in messages:
+                entries.append(self._to_buffered(entry_id, fields))
+
+        return entries
+
+    async def claim_stale(
+        self,
+        consumer: str,
+        min_idle_ms: int,
+        count: int,
+    ) -> List[BufferedWebhook]:
+        """
+        Take over entries left pending by consumers that stopped responding.
+
+        Args:
+            consumer: Consumer name claiming the entries
+            min_idle_ms: Minimum idle time before an entry is reclaimed
+            count: Maximum number of entries to claim
+
+        Returns:
+            Claimed entries with their delivery counts
+        """
+        if count <= 0:
+            return []
+
+        pending = await self.redis.xpending_range(
+            self.stream_key,
+            self.group,
+            min="-",
+            max="+",
+            count=count,
+            idle=min_idle_ms,
+        )
+        if not pending:
+            return []
+
+        deliveries = {
+            self._decode(item["message_id"]): item["times_delivered"] + 1
+            for item in pending
+        }
+        claimed = await self.redis.xclaim(
+            self.stream_key,
+            self.group,
+            consumer,
+            min_idle_time=min_idle_ms,
+            message_ids=list(deliveries.keys()),
+        )
+
+        entries: List[BufferedWebhook] = []
+        for entry_id, fields in claimed:
+            if not fields:
+                # Entry was trimmed while pending; nothing left to process
+                continue
+            entry = self._to_buffered(entry_id, fields)
+            entries.append(
+                BufferedWebhook(
+                    entry_id=entry.entry_id,
+                    channel_id=entry.channel_id,
+                    body=entry.body,
+                    signature=entry.signature,
+                    signature_verified=entry.signature_verified,
+                    deliveries=deliveries.get(entry.entry_id, 1),
+                )
+            )
+
+        return entries
+
+    async def ack(self, entry_ids: Sequence[str]) -> None:
+        """
+        Acknowledge and delete processed entries in one round trip.
+
+        Args:
+            entry_ids: Stream entry IDs
+        """
+        if not entry_ids:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xack(self.stream_key, self.group, *entry_ids)
+        pipe.xdel(self.stream_key, *entry_ids)
+        await pipe.execute()
+
+    async def dead_letter(self, entry: BufferedWebhook, error: str) -> None:
+        """
+        Move an entry that exhausted its retries to the dead-letter stream.
+
+        Args:
+            entry: Failed entry
+            error: Last processing error
+        """
+        fields = {
+            "channel_id": entry.channel_id,
+            "body": entry.body,
+            "error": error[:1000],
+            "source_id": entry.entry_id,
+            "verified": b"1" if entry.signature_verified else b"0",
+        }
+        if entry.signature:
+            fields["signature"] = entry.signature
+
+        await self.redis.xadd(self.dead_letter_key, fields)
+        await self.ack([entry.entry_id])
+        get_metrics().increment_counter("webhook_buffer_dead_lettered_total")
+
+    async def lag(self) -> Dict[str, float]:
+        """
+        Measure buffer lag.
+
+        Returns:
+            Dictionary with depth, pending (delivered but unacked) and
+            oldest_age_seconds (age of the oldest unacknowledged entry)
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xlen(self.stream_key)
+        pipe.xpending(self.stream_key, self.group)
+        pipe.xrange(self.stream_key, min="-", max="+", count=1)
+        depth, pending, oldest = await pipe.execute()
+
+        oldest_age = 0.0
+        if oldest:
+            oldest_id = self._decode(oldest[0][0])
+            oldest_age = max(0.0, time.time() - int(oldest_id.split("-", 1)[0]) / 1000.0)
+
+        self._last_depth = depth
+        return {
+            "depth": depth,
+            "pending": (pending or {}).get("pending", 0),
+            "oldest_age_seconds": round(oldest_age, 3),
+        }
+
+    def _to_buffered(self, entry_id: bytes | str, fields: Dict) -> BufferedWebhook:
+        """Convert a raw stream entry into a BufferedWebhook."""
+        signature = fields.get(b"signature")
+        return BufferedWebhook(
+            entry_id=self._decode(entry_id),
+            channel_id=self._decode(fields[b"channel_id"]),
+            body=fields[b"body"],
+            signature=self._decode(signature) if signature else None,
+            signature_verified=fields.get(b"verified") == b"1",
+        )
+
+    @staticmethod
+    def _decode(value: bytes | str) -> str:
+        """Decode Redis bytes to str."""
+        return value.decode() if isinstance(value, bytes) else value
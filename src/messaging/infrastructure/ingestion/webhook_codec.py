@@ -0,0 +1,117 @@
+"""
+Webhook Codec
+Compiled msgspec decoder for Meta WhatsApp webhook payloads.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import msgspec
+
+
+class WebhookMetadata(msgspec.Struct, omit_defaults=True):
+    """value.metadata: which business number the change belongs to."""
+
+    phone_number_id: str
+    display_phone_number: Optional[str] = None
+
+
+class WebhookInboundMessage(msgspec.Struct, omit_defaults=True):
+    """
+    One entry of value.messages.
+
+    Type-specific bodies are kept as plain dicts: they are small, only
+    one is present per message, and they are persisted as-is.
+    """
+
+    id: str
+    type: str
+    timestamp: str
+    from_: str = msgspec.field(name="from")
+    text: Optional[Dict[str, Any]] = None
+    button: Optional[Dict[str, Any]] = None
+    interactive: Optional[Dict[str, Any]] = None
+    voice: Optional[Dict[str, Any]] = None
+    audio: Optional[Dict[str, Any]] = None
+    image: Optional[Dict[str, Any]] = None
+    video: Optional[Dict[str, Any]] = None
+    document: Optional[Dict[str, Any]] = None
+    sticker: Optional[Dict[str, Any]] = None
+    location: Optional[Dict[str, Any]] = None
+    contacts: Optional[List[Dict[str, Any]]] = None
+    reaction: Optional[Dict[str, Any]] = None
+    context: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Wire-format dict (for raw_payload persistence)."""
+        return msgspec.to_builtins(self)
+
+
+class WebhookStatus(msgspec.Struct, omit_defaults=True):
+    """One entry of value.statuses."""
+
+    id: str
+    status: str
+    timestamp: Optional[str] = None
+    recipient_id: Optional[str] = None
+    errors: List[Dict[str, Any]] = []
+    conversation: Optional[Dict[str, Any]] = None
+    pricing: Optional[Dict[str, Any]] = None
+
+
+class WebhookChangeValue(msgspec.Struct, omit_defaults=True):
+    """changes[].value."""
+
+    metadata: Optional[WebhookMetadata] = None
+    messaging_product: Optional[str] = None
+    contacts: List[Dict[str, Any]] = []
+    messages: List[WebhookInboundMessage] = []
+    statuses: List[WebhookStatus] = []
+    errors: List[Dict[str, Any]] = []
+
+
+class WebhookChange(msgspec.Struct, omit_defaults=True):
+    """entry[].changes[]."""
+
+    value: WebhookChangeValue
+    field: Optional[str] = None
+
+
+class WebhookEntry(msgspec.Struct, omit_defaults=True):
+    """entry[] (one per WhatsApp Business Account)."""
+
+    id: Optional[str] = None
+    changes: List[WebhookChange] = []
+
+
+class WebhookEnvelope(msgspec.Struct, omit_defaults=True):
+    """Top-level webhook body."""
+
+    object: str
+    entry: List[WebhookEntry] = []
+
+
+_envelope_decoder = msgspec.json.Decoder(WebhookEnvelope)
+
+
+def decode_webhook(body: bytes) -> WebhookEnvelope:
+    """
+    Decode a raw webhook body straight into structs.
+
+    Unknown fields are skipped during parsing rather than materialized.
+
+    Args:
+        body: Raw request body
+
+    Returns:
+        Decoded envelope
+
+    Raises:
+        msgspec.ValidationError: If the body is not a valid webhook
+    """
+    return _envelope_decoder.decode(body)
+
+
+def to_webhook_status(raw: Dict[str, Any]) -> WebhookStatus:
+    """Convert an already-parsed status dict (e.g. from a command)."""
+    return msgspec.convert(raw, WebhookStatus)
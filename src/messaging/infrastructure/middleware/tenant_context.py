@@ -4,9 +4,10 @@ import logging
 from typing import List, Optional
 from contextvars import ContextVar
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 import uuid
 
+from shared.infrastructure.database.rls import RLSManager
+
 logger = logging.getLogger(__name__)
 
 # Context variables for tenant isolation
@@ -28,23 +29,8 @@ class TenantContextManager:
     ) -> None:
         """Set tenant context for RLS."""
         try:
-            # Set PostgreSQL session variables
-            await self.session.execute(
-                text("SET LOCAL app.jwt_tenant = :tenant_id"),
-                {"tenant_id": str(tenant_id)}
-            )
-            
-            if user_id:
-                await self.session.execute(
-                    text("SET LOCAL app.user_id = :user_id"),
-                    {"user_id": str(user_id)}
-                )
-            
-            if roles:
-                await self.session.execute(
-                    text("SET LOCAL app.roles = :roles"),
-                    {"roles": ','.join(roles)}
-                )
+            # Set PostgreSQL transaction-local variables (one round trip)
+            await RLSManager.set_tenant_context(self.session, tenant_id, user_id, roles)
             
             # Set context variables
             tenant_context.set(tenant_id)
@@ -60,9 +46,7 @@ class TenantContextManager:
     async def clear_tenant_context(self) -> None:
         """Clear tenant context."""
         try:
-            await self.session.execute(text("RESET app.jwt_tenant"))
-            await self.session.execute(text("RESET app.user_id"))
-            await self.session.execute(text("RESET app.roles"))
+            await RLSManager.clear_tenant_context(self.session)
             
             tenant_context.set(None)
             user_context.set(None)
@@ -2,7 +2,7 @@
 
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -72,6 +72,63 @@ class OutboxService:
             logger.error(f"Failed to create outbox event: {e}")
             raise
     
+    async def create_events(self, events: List[Dict[str, Any]]) -> List[uuid.UUID]:
+        """
+        Create many outbox events in one executemany round trip.
+        
+        Each dict takes the create_event arguments (aggregate_id,
+        aggregate_type, event_type, payload, tenant_id, scheduled_at).
+        """
+        if not events:
+            return []
+        
+        try:
+            now = datetime.utcnow()
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "aggregate_id": event["aggregate_id"],
+                    "aggregate_type": event["aggregate_type"],
+                    "event_type": event["event_type"],
+                    "payload": json.dumps(event["payload"]),
+                    "tenant_id": event["tenant_id"],
+                    "created_at": now,
+                    "scheduled_at": event.get("scheduled_at")
+                }
+                for event in events
+            ]
+            
+            query = text("""
+                INSERT INTO outbox_events (
+                    id,
+                    aggregate_id,
+                    aggregate_type,
+                    event_type,
+                    payload,
+                    tenant_id,
+                    created_at,
+                    scheduled_at
+                ) VALUES (
+                    :id,
+                    :aggregate_id,
+                    :aggregate_type,
+                    :event_type,
+                    :payload,
+                    :tenant_id,
+                    :created_at,
+                    :scheduled_at
+                )
+            """)
+            
+            await self.session.execute(query, rows)
+            
+            logger.info(f"Created {len(rows)} outbox events")
+            return [row["id"] for row in rows]
+            
+        except Exception as e:
+            logger.error(f"Failed to create outbox events: {e}")
+            raise
+    
     async def get_pending_events(self, limit: int = 10) -> list:
         """Get pending events from outbox."""
         try:
@@ -8,6 +8,7 @@ import os
 
 from messaging.domain.protocols.external_services import SpeechToTextClient
 from messaging.domain.protocols.speech_transcription import SpeechTranscription
+from messaging.domain.exceptions import TranscriptionError
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,8 @@ logger = logging.getLogger(__name__)
 class GoogleSpeechAdapter(SpeechTranscription):
     """Google Cloud Speech-to-Text implementation."""
     
+    name = "google"
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or os.getenv('GOOGLE_SPEECH_API_KEY')
         self.base_url = "https://speech.googleapis.com/v1"
@@ -26,55 +29,66 @@ class GoogleSpeechAdapter(SpeechTranscription):
         language_code: str = "en-US"
     ) -> Optional[str]:
         """Transcribe audio to text using Google Speech-to-Text."""
+        # Download audio file
+        audio_data = await self._download_audio(audio_url)
+        if not audio_data:
+            return None
+        
         try:
-            # Download audio file
-            audio_data = await self._download_audio(audio_url)
-            if not audio_data:
-                return None
-            
-            # Prepare request
-            url = f"{self.base_url}/speech:recognize"
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": self.api_key
-            }
-            
-            # Base64 encode audio
-            audio_content = base64.b64encode(audio_data).decode('utf-8')
-            
-            payload = {
-                "config": {
-                    "encoding": "OGG_OPUS",  # WhatsApp voice notes format
-                    "sampleRateHertz": 16000,
-                    "languageCode": language_code,
-                    "model": "latest_short",
-                    "enableAutomaticPunctuation": True
-                },
-                "audio": {
-                    "content": audio_content
-                }
+            return await self.transcribe(audio_data, language_code=language_code)
+        except TranscriptionError:
+            return None
+    
+    async def transcribe(
+        self,
+        audio: bytes,
+        mime_type: Optional[str] = None,
+        language_code: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Transcribe audio bytes (TranscriptionEngine).
+        
+        Voice notes are short enough for synchronous recognize with
+        inline content; the call runs in the transcription worker, never
+        on the webhook path.
+        """
+        url = f"{self.base_url}/speech:recognize"
+        headers = {
+            "Content-Type": "application/json",
+            "X-Goog-Api-Key": self.api_key
+        }
+        
+        payload = {
+            "config": {
+                "encoding": "OGG_OPUS",  # WhatsApp voice notes format
+                "sampleRateHertz": 16000,
+                "languageCode": language_code or "en-US",
+                "model": "latest_short",
+                "enableAutomaticPunctuation": True
+            },
+            "audio": {
+                "content": base64.b64encode(audio).decode('ascii')
             }
-            
-            # Send request
+        }
+        
+        try:
             response = await self.client.post(url, headers=headers, json=payload)
-            
-            if response.status_code == 200:
-                data = response.json()
-                results = data.get("results", [])
-                
-                if results:
-                    # Get the first alternative of the first result
-                    transcript = results[0].get("alternatives", [{}])[0].get("transcript", "")
-                    return transcript
-                
-                return None
-            else:
-                logger.error(f"Speech-to-Text API error: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            logger.error(f"Failed to transcribe audio: {e}")
+        except httpx.HTTPError as e:
+            raise TranscriptionError(f"Speech-to-Text request failed: {e}")
+        
+        if response.status_code != 200:
+            logger.error(f"Speech-to-Text API error: {response.status_code}")
+            raise TranscriptionError(f"Speech-to-Text API error: {response.status_code}")
+        
+        results = response.json().get("results", [])
+        if not results:
             return None
+        
+        # Join all recognized segments (first alternative of each)
+        return " ".join(
+            result.get("alternatives", [{}])[0].get("transcript", "").strip()
+            for result in results
+        ).strip() or None
     
     async def _download_audio(self, audio_url: str) -> Optional[bytes]:
         """Download audio file from URL."""
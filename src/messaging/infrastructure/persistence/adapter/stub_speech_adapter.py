@@ -0,0 +1,38 @@
+"""Local stub transcription engine for offline development and tests."""
+
+import asyncio
+import hashlib
+import logging
+from typing import Optional
+
+from messaging.domain.protocols.speech_transcription import TranscriptionEngine
+
+logger = logging.getLogger(__name__)
+
+
+class LocalStubSpeechAdapter(TranscriptionEngine):
+    """
+    Deterministic transcription engine that never leaves the process.
+    
+    The transcript is derived from the audio checksum, so the same
+    voice note always yields the same text (useful for cache tests).
+    """
+    
+    name = "stub"
+    
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+    
+    async def transcribe(
+        self,
+        audio: bytes,
+        mime_type: Optional[str] = None,
+        language_code: Optional[str] = None
+    ) -> Optional[str]:
+        """Return a stable fake transcript for the given audio."""
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+        
+        digest = hashlib.sha256(audio).hexdigest()[:12]
+        logger.debug(f"Stub transcribing {len(audio)} bytes ({digest})")
+        return f"[stub transcript {digest}, {len(audio)} bytes, {language_code or 'und'}]"
@@ -22,6 +22,7 @@ class InboundMessageModel(Base):
         Index("idx_inbound_wa_message_id", "wa_message_id"),
         Index("idx_inbound_channel_tenant", "channel_id", "tenant_id"),
         Index("idx_inbound_processed", "processed"),
+        Index("idx_inbound_channel_created_id", "tenant_id", "channel_id", "created_at", "id"),
         {"schema": "whatsapp"}
     )
     
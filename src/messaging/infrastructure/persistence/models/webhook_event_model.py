@@ -22,7 +22,16 @@ class WebhookEventModel(Base):
     __tablename__ = "webhook_events"
     __table_args__ = (
         Index("idx_webhook_events_account", "account_id"),
+        Index("idx_webhook_events_channel", "channel_id", "created_at"),
         Index("idx_webhook_events_type", "event_type"),
+        Index("idx_webhook_events_replay", "created_at", "id"),
+        # Partitioned by created_at (0009): uniqueness must include the key
+        Index(
+            "uq_webhook_events_stream_entry_id",
+            "stream_entry_id",
+            "created_at",
+            unique=True,
+        ),
         Index(
             "idx_webhook_events_unprocessed",
             "created_at",
@@ -39,6 +48,16 @@ class WebhookEventModel(Base):
         nullable=True,
     )
     
+    channel_id: Mapped[UUID | None] = mapped_column(
+        PGUUID(as_uuid=True),
+        nullable=True,
+    )
+    
+    stream_entry_id: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+    )
+    
     event_type: Mapped[str] = mapped_column(
         String(50),
         nullable=False,
@@ -0,0 +1,33 @@
+"""
+Messaging Partitions
+Partitioning policy of the high-volume messaging tables (migration 0009).
+"""
+from typing import List
+
+from shared.infrastructure.database.partitioning import PartitionSpec
+
+
+def messaging_partition_specs(settings) -> List[PartitionSpec]:
+    """Partition specs for messages, outbox events and webhook events."""
+    return [
+        PartitionSpec(
+            table="messaging.messages",
+            interval="month",
+            premake=3,
+            retention=settings.MESSAGE_RETENTION_MONTHS,
+            archive=settings.ARCHIVE_ENABLED,
+        ),
+        PartitionSpec(
+            table="public.outbox_events",
+            interval="day",
+            premake=7,
+            retention=settings.OUTBOX_RETENTION_DAYS,
+            retention_guard="processed_at IS NULL",
+        ),
+        PartitionSpec(
+            table="whatsapp.webhook_events",
+            interval="day",
+            premake=7,
+            retention=settings.WEBHOOK_EVENT_RETENTION_DAYS,
+        ),
+    ]
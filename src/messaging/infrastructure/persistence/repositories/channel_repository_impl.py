@@ -167,6 +167,37 @@ class ChannelRepositoryImpl(SQLAlchemyRepository[Channel, ChannelModel], Channel
             )
             raise
     
+    async def list_routable(self) -> List[Channel]:
+        """
+        List every active channel across all tenants.
+
+        Used only to warm the webhook routing index, which must resolve
+        a phone_number_id before the tenant is known. Runs without tenant
+        context, so the session's role must be exempt from RLS.
+
+        Returns:
+            List of channel entities
+        """
+        try:
+            result = await self.session.execute(
+                select(ChannelModel).where(ChannelModel.status == "active")
+            )
+            channels = [self._to_entity(model) for model in result.scalars().all()]
+
+            logger.debug(
+                "Listed routable channels",
+                extra={"count": len(channels)}
+            )
+
+            return channels
+
+        except Exception as e:
+            logger.error(
+                "Failed to list routable channels",
+                extra={"error": str(e)}
+            )
+            raise
+    
     # ========================================================================
     # OVERRIDE METHODS WITH RLS ENFORCEMENT
     # ========================================================================
@@ -3,20 +3,22 @@
 SQLAlchemy Implementation of Message Repositories
 Extends generic SQLAlchemyRepository base class
 """
-from typing import Optional, List
+import json
+from typing import Any, Dict, Optional, List, Sequence
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.messaging.domain.entities.inbound_message import InboundMessage
-from src.messaging.domain.entities.outbound_message import OutboundMessage
+from src.messaging.domain.entities.outbound_message import OutboundMessage, STATUS_RANK
 from src.messaging.domain.protocols.message_repository import (
     InboundMessageRepository,
     OutboundMessageRepository,
 )
 from src.messaging.infrastructure.persistence.models.inboundmessage_model import InboundMessageModel
 from src.messaging.infrastructure.persistence.models.outboundmessage_model import OutboundMessageModel
+from shared.infrastructure.database.pagination import CursorPage
 from shared.infrastructure.database.sqlalchemy_repository import SQLAlchemyRepository
 from shared.infrastructure.database.rls import RLSManager
 from shared.infrastructure.observability.logger import get_logger
@@ -106,28 +108,50 @@ class InboundMessageRepositoryImpl(
         Returns:
             List of inbound messages ordered by creation time (newest first)
         """
+        page = await self.page_by_channel(channel_id, limit=limit)
+        return list(page.items)
+    
+    async def page_by_channel(
+        self,
+        channel_id: UUID,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> CursorPage[InboundMessage]:
+        """
+        Page through a channel's inbound messages, newest first.
+        
+        Keyset on (created_at, id), so later pages cost the same as the
+        first one.
+        
+        Args:
+            channel_id: Channel UUID
+            limit: Page size
+            cursor: next_cursor of the previous page
+            
+        Returns:
+            CursorPage of inbound messages
+        """
         await RLSManager.set_tenant_context(self.session, self.tenant_id)
         
         try:
-            messages = await self.find_all(
-                tenant_id=self.tenant_id,
-                channel_id=channel_id,
+            page = await self.find_page(
                 limit=limit,
-                order_by="created_at"
+                cursor=cursor,
+                order_by="created_at",
+                descending=True,
+                tenant_id=self.tenant_id,
+                channel_id=channel_id
             )
             
-            # Reverse to get newest first (SQLAlchemy orders asc by default)
-            result = list(reversed(list(messages)))
-            
             logger.debug(
                 "Listed inbound messages for channel",
                 extra={
                     "channel_id": str(channel_id),
-                    "count": len(result)
+                    "count": len(page.items)
                 }
             )
             
-            return result
+            return page
             
         except Exception as e:
             logger.error(
@@ -193,6 +217,94 @@ class InboundMessageRepositoryImpl(
         await RLSManager.set_tenant_context(self.session, entity.tenant_id)
         return await super().add(entity)
     
+    async def create_many_if_absent(
+        self, entities: Sequence[InboundMessage]
+    ) -> List[InboundMessage]:
+        """
+        Insert inbound messages, skipping wa_message_ids that already exist.
+        
+        One INSERT ... ON CONFLICT DO NOTHING RETURNING per tenant, instead
+        of a round trip per message.
+        
+        Args:
+            entities: Inbound messages to persist
+            
+        Returns:
+            The messages that were actually inserted
+        """
+        by_tenant: Dict[UUID, List[InboundMessage]] = {}
+        for entity in entities:
+            by_tenant.setdefault(entity.tenant_id, []).append(entity)
+        
+        inserted: List[InboundMessage] = []
+        for tenant_id, group in by_tenant.items():
+            await RLSManager.set_tenant_context(self.session, tenant_id)
+            inserted.extend(
+                await self.upsert_many(
+                    group,
+                    conflict_columns=["wa_message_id"],
+                    update_columns=[]
+                )
+            )
+        
+        if len(inserted) < len(entities):
+            logger.info(
+                "Duplicate inbound messages dropped by unique constraint",
+                extra={"dropped": len(entities) - len(inserted)}
+            )
+        
+        return inserted
+
+    async def attach_transcript(
+        self,
+        message_id: UUID,
+        transcript: Optional[str],
+        status: str,
+        engine: Optional[str] = None
+    ) -> bool:
+        """
+        Merge a voice-note transcript into the message content.
+
+        Single UPDATE with a jsonb merge, so other content keys written at
+        ingestion time are kept and no read-modify-write is needed.
+
+        Args:
+            message_id: Inbound message UUID
+            transcript: Transcribed text (None if transcription failed)
+            status: Transcription status (completed, failed)
+            engine: Engine that produced the transcript
+
+        Returns:
+            True if the message was found and updated
+        """
+        await RLSManager.set_tenant_context(self.session, self.tenant_id)
+
+        stmt = text(
+            """
+            UPDATE whatsapp.inbound_messages
+            SET content = (COALESCE(content::jsonb, '{}'::jsonb) || CAST(:patch AS jsonb))::json
+            WHERE id = :message_id
+            RETURNING id
+            """
+        )
+        patch = {"transcript": transcript, "transcription_status": status}
+        if engine:
+            patch["transcription_engine"] = engine
+
+        try:
+            result = await self.session.execute(
+                stmt,
+                {"message_id": message_id, "patch": json.dumps(patch)}
+            )
+            return result.scalar_one_or_none() is not None
+
+        except Exception as e:
+            logger.error(
+                "Failed to attach transcript",
+                extra={"error": str(e), "message_id": str(message_id)}
+            )
+            raise
+
     async def update(self, entity: InboundMessage) -> InboundMessage:
         """Update inbound message with RLS enforcement."""
         await RLSManager.set_tenant_context(self.session, entity.tenant_id)
@@ -413,6 +525,105 @@ class OutboundMessageRepositoryImpl(
             )
             raise
     
+    async def apply_status_updates(
+        self,
+        updates: Sequence[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply delivery status updates in a single set-based UPDATE.
+        
+        Monotonic transitions are enforced in SQL (see STATUS_RANK): rows
+        whose current status is already at or past the update are left
+        untouched, so out-of-order and duplicate webhooks are harmless.
+        Target rows are locked first so previous_status is the status the
+        update actually replaced.
+        
+        Args:
+            updates: One dict per wa_message_id with status, sent_at,
+                delivered_at, read_at, error_code and error_message keys
+            
+        Returns:
+            Updated rows (id, wa_message_id, status, previous_status,
+            delivered_at, read_at)
+        """
+        if not updates:
+            return []
+        
+        await RLSManager.set_tenant_context(self.session, self.tenant_id)
+        
+        rank_case = " ".join(
+            f"WHEN '{status}' THEN {rank}" for status, rank in STATUS_RANK.items()
+        )
+        stmt = text(f"""
+            WITH u AS (
+                SELECT *
+                FROM unnest(
+                    CAST(:wa_message_ids AS text[]),
+                    CAST(:statuses AS text[]),
+                    CAST(:ranks AS integer[]),
+                    CAST(:sent_at AS timestamp[]),
+                    CAST(:delivered_at AS timestamp[]),
+                    CAST(:read_at AS timestamp[]),
+                    CAST(:error_codes AS text[]),
+                    CAST(:error_messages AS text[])
+                ) AS u(wa_message_id, status, rank, sent_at, delivered_at, read_at, error_code, error_message)
+            ),
+            prev AS (
+                SELECT m.id, m.status AS previous_status
+                FROM whatsapp.outbound_messages AS m
+                JOIN u ON u.wa_message_id = m.wa_message_id
+                WHERE m.tenant_id = :tenant_id
+                ORDER BY m.id
+                FOR UPDATE OF m
+            )
+            UPDATE whatsapp.outbound_messages AS m
+            SET status = u.status,
+                sent_at = COALESCE(m.sent_at, u.sent_at),
+                delivered_at = COALESCE(m.delivered_at, u.delivered_at),
+                read_at = COALESCE(m.read_at, u.read_at),
+                error_code = COALESCE(u.error_code, m.error_code),
+                error_message = COALESCE(u.error_message, m.error_message),
+                updated_at = now()
+            FROM prev, u
+            WHERE m.id = prev.id
+              AND m.tenant_id = :tenant_id
+              AND m.wa_message_id = u.wa_message_id
+              AND (CASE prev.previous_status {rank_case} ELSE 0 END) < u.rank
+            RETURNING m.id, m.wa_message_id, m.status, prev.previous_status, m.delivered_at, m.read_at
+        """)
+        
+        try:
+            result = await self.session.execute(stmt, {
+                "tenant_id": self.tenant_id,
+                "wa_message_ids": [u["wa_message_id"] for u in updates],
+                "statuses": [u["status"] for u in updates],
+                "ranks": [STATUS_RANK[u["status"]] for u in updates],
+                "sent_at": [u.get("sent_at") for u in updates],
+                "delivered_at": [u.get("delivered_at") for u in updates],
+                "read_at": [u.get("read_at") for u in updates],
+                "error_codes": [u.get("error_code") for u in updates],
+                "error_messages": [u.get("error_message") for u in updates],
+            })
+            rows = [dict(row._mapping) for row in result]
+            
+            logger.debug(
+                "Applied status updates",
+                extra={
+                    "tenant_id": str(self.tenant_id),
+                    "submitted": len(updates),
+                    "applied": len(rows)
+                }
+            )
+            
+            return rows
+            
+        except Exception as e:
+            logger.error(
+                "Failed to apply status updates",
+                extra={"error": str(e), "tenant_id": str(self.tenant_id)}
+            )
+            raise
+    
     # ========================================================================
     # OVERRIDE METHODS WITH RLS ENFORCEMENT
     # ========================================================================
@@ -432,6 +643,20 @@ class OutboundMessageRepositoryImpl(
         await RLSManager.set_tenant_context(self.session, entity.tenant_id)
         return await super().update(entity)
     
+    async def add_many(
+        self, entities: Sequence[OutboundMessage], chunk_size: int = 1000
+    ) -> List[OutboundMessage]:
+        """Add outbound messages in bulk (e.g. campaign fan-out) with RLS enforcement."""
+        await RLSManager.set_tenant_context(self.session, self.tenant_id)
+        return await super().add_many(entities, chunk_size)
+    
+    async def update_many(
+        self, entities: Sequence[OutboundMessage], columns: Sequence[str], chunk_size: int = 5000
+    ) -> int:
+        """Update outbound message columns in bulk with RLS enforcement."""
+        await RLSManager.set_tenant_context(self.session, self.tenant_id)
+        return await super().update_many(entities, columns, chunk_size)
+    
     # ========================================================================
     # ENTITY <-> MODEL MAPPING
     # ========================================================================
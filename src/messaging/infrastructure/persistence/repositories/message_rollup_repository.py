@@ -0,0 +1,196 @@
+# src/messaging/infrastructure/persistence/repositories/message_rollup_repository.py
+"""
+Message Rollup Repository
+Maintenance of messaging.message_hourly_rollups (see migration 0007).
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.infrastructure.observability.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROLLUP_KEY = "tenant_id, channel_id, hour, direction, message_type, status"
+
+# Move up to :batch_size deltas into the rollups in one statement. Deltas are
+# pre-aggregated per key so each rollup row is upserted once; SKIP LOCKED lets
+# several folders run without waiting on each other.
+_FOLD_SQL = text(f"""
+    WITH moved AS (
+        DELETE FROM messaging.message_rollup_deltas
+        WHERE id IN (
+            SELECT id
+            FROM messaging.message_rollup_deltas
+            ORDER BY id
+            LIMIT :batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    ),
+    folded AS (
+        INSERT INTO messaging.message_hourly_rollups AS r (
+            {ROLLUP_KEY},
+            message_count, delivered_count, delivery_seconds_sum, last_message_at
+        )
+        SELECT
+            {ROLLUP_KEY},
+            SUM(message_count), SUM(delivered_count),
+            SUM(delivery_seconds_sum), MAX(last_message_at)
+        FROM moved
+        GROUP BY {ROLLUP_KEY}
+        ON CONFLICT (tenant_id, channel_id, hour, direction, message_type, status) DO UPDATE SET
+            message_count = r.message_count + EXCLUDED.message_count,
+            delivered_count = r.delivered_count + EXCLUDED.delivered_count,
+            delivery_seconds_sum = r.delivery_seconds_sum + EXCLUDED.delivery_seconds_sum,
+            last_message_at = GREATEST(r.last_message_at, EXCLUDED.last_message_at),
+            updated_at = NOW()
+    )
+    SELECT COUNT(*) AS moved FROM moved
+""")
+
+# Raw aggregates minus (rollups + pending deltas) over whole hours, appended
+# as correcting deltas. Must run in a REPEATABLE READ snapshot: a fold moves
+# deltas into rollups atomically, so the sum seen is exact.
+_RECONCILE_SQL = text(f"""
+    WITH raw AS (
+        SELECT
+            tenant_id, channel_id, date_trunc('hour', created_at) AS hour,
+            direction::text AS direction, message_type::text AS message_type,
+            status::text AS status,
+            COUNT(*) AS message_count,
+            COUNT(*) FILTER (WHERE delivered_at IS NOT NULL AND sent_at IS NOT NULL) AS delivered_count,
+            COALESCE(SUM(EXTRACT(EPOCH FROM delivered_at - sent_at)), 0) AS delivery_seconds_sum,
+            MAX(created_at) AS last_message_at
+        FROM messaging.messages
+        WHERE created_at >= :start AND created_at < :end
+        GROUP BY 1, 2, 3, 4, 5, 6
+    ),
+    current AS (
+        SELECT
+            {ROLLUP_KEY},
+            SUM(message_count) AS message_count,
+            SUM(delivered_count) AS delivered_count,
+            SUM(delivery_seconds_sum) AS delivery_seconds_sum,
+            MAX(last_message_at) AS last_message_at
+        FROM (
+            SELECT {ROLLUP_KEY}, message_count, delivered_count, delivery_seconds_sum, last_message_at
+            FROM messaging.message_hourly_rollups
+            WHERE hour >= :start AND hour < :end
+            UNION ALL
+            SELECT {ROLLUP_KEY}, message_count, delivered_count, delivery_seconds_sum, last_message_at
+            FROM messaging.message_rollup_deltas
+            WHERE hour >= :start AND hour < :end
+        ) tracked
+        GROUP BY {ROLLUP_KEY}
+    ),
+    diff AS (
+        SELECT
+            {ROLLUP_KEY},
+            COALESCE(raw.message_count, 0) - COALESCE(current.message_count, 0) AS message_count,
+            COALESCE(raw.delivered_count, 0) - COALESCE(current.delivered_count, 0) AS delivered_count,
+            COALESCE(raw.delivery_seconds_sum, 0) - COALESCE(current.delivery_seconds_sum, 0) AS delivery_seconds_sum,
+            CASE
+                WHEN raw.last_message_at > current.last_message_at OR current.last_message_at IS NULL
+                THEN raw.last_message_at
+            END AS last_message_at
+        FROM raw
+        FULL JOIN current USING ({ROLLUP_KEY})
+    ),
+    corrections AS (
+        INSERT INTO messaging.message_rollup_deltas (
+            {ROLLUP_KEY},
+            message_count, delivered_count, delivery_seconds_sum, last_message_at
+        )
+        SELECT
+            {ROLLUP_KEY},
+            message_count, delivered_count, delivery_seconds_sum, last_message_at
+        FROM diff
+        WHERE message_count <> 0
+            OR delivered_count <> 0
+            OR ABS(delivery_seconds_sum) > 0.001
+            OR last_message_at IS NOT NULL
+        RETURNING 1
+    )
+    SELECT COUNT(*) AS corrections FROM corrections
+""")
+
+_PRUNE_SQL = text("""
+    DELETE FROM messaging.message_hourly_rollups
+    WHERE hour >= :start AND hour < :end
+        AND message_count = 0
+        AND delivered_count = 0
+""")
+
+_OLDEST_DELTA_SQL = text("""
+    SELECT EXTRACT(EPOCH FROM NOW() - created_at) AS age_seconds
+    FROM messaging.message_rollup_deltas
+    ORDER BY id
+    LIMIT 1
+""")
+
+
+class MessageRollupRepository:
+    """
+    Folds and reconciles hourly message rollups.
+
+    Deltas are appended by triggers on messaging.messages in the writing
+    transaction; this repository only moves them into the rollups and
+    corrects drift. All statements are set-based and tenant-agnostic, so
+    it is meant for workers, not request sessions.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def fold_deltas(self, batch_size: int = 10_000) -> int:
+        """
+        Fold the oldest pending deltas into the rollups.
+
+        Args:
+            batch_size: Maximum number of delta rows moved
+
+        Returns:
+            Number of delta rows folded (less than batch_size when drained)
+        """
+        result = await self.session.execute(_FOLD_SQL, {"batch_size": batch_size})
+        return int(result.scalar_one())
+
+    async def reconcile(self, start: datetime, end: datetime) -> int:
+        """
+        Append correcting deltas so rollups for [start, end) match raw data.
+
+        Catches late-arriving rows and changes the triggers did not see
+        (bulk loads with triggers disabled, manual fixes). Bounds should
+        be hour aligned. Switches the transaction to REPEATABLE READ, so
+        it must be the first statement of its transaction.
+
+        Args:
+            start: Inclusive lower bound (hour)
+            end: Exclusive upper bound (hour)
+
+        Returns:
+            Number of correcting deltas appended
+        """
+        await self.session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        result = await self.session.execute(_RECONCILE_SQL, {"start": start, "end": end})
+        corrections = int(result.scalar_one())
+        if corrections:
+            logger.info(
+                "Rollup corrections appended",
+                extra={"start": start.isoformat(), "end": end.isoformat(), "corrections": corrections},
+            )
+        return corrections
+
+    async def prune_empty(self, start: datetime, end: datetime) -> int:
+        """Delete rollup rows in [start, end) whose counters folded back to zero."""
+        result = await self.session.execute(_PRUNE_SQL, {"start": start, "end": end})
+        return result.rowcount or 0
+
+    async def oldest_delta_age(self) -> Optional[float]:
+        """Age in seconds of the oldest unfolded delta (None when drained)."""
+        result = await self.session.execute(_OLDEST_DELTA_SQL)
+        age = result.scalar_one_or_none()
+        return float(age) if age is not None else None
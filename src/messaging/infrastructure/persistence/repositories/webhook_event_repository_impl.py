@@ -0,0 +1,383 @@
+# src/messaging/infrastructure/persistence/repositories/webhook_event_repository_impl.py
+"""
+Webhook Event Store
+Set-based persistence of raw webhook payloads for audit and replay.
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.messaging.infrastructure.persistence.models.webhook_event_model import WebhookEventModel
+from shared.infrastructure.observability.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keyset position in replay order: (created_at, id)
+ReplayCursor = Tuple[datetime, UUID]
+
+
+def stream_entry_time(stream_entry_id: Optional[str]) -> Optional[datetime]:
+    """Enqueue time (naive UTC, ms precision) encoded in a Redis Stream entry ID."""
+    if not stream_entry_id:
+        return None
+    try:
+        return datetime.utcfromtimestamp(int(stream_entry_id.split("-", 1)[0]) / 1000.0)
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class ReplayFilter:
+    """
+    Selection of webhook events to replay.
+
+    Attributes:
+        since: Inclusive lower bound on created_at
+        until: Exclusive upper bound on created_at
+        account_id: Only events of this WhatsApp account
+        channel_id: Only events posted to this channel
+        processed: Only processed (True) / unprocessed (False) events; None for all
+    """
+
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    account_id: Optional[UUID] = None
+    channel_id: Optional[UUID] = None
+    processed: Optional[bool] = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-safe representation (stored with checkpoints)."""
+        return {
+            "since": self.since.isoformat() if self.since else None,
+            "until": self.until.isoformat() if self.until else None,
+            "account_id": str(self.account_id) if self.account_id else None,
+            "channel_id": str(self.channel_id) if self.channel_id else None,
+            "processed": self.processed,
+        }
+
+
+@dataclass(frozen=True)
+class ReplayEvent:
+    """A stored webhook selected for replay."""
+
+    id: UUID
+    created_at: datetime
+    channel_id: Optional[UUID]
+    raw_payload: Dict[str, Any]
+
+    @property
+    def cursor(self) -> ReplayCursor:
+        return (self.created_at, self.id)
+
+
+class WebhookEventRepositoryImpl:
+    """
+    Raw webhook event store.
+
+    Webhook events are not tenant-owned domain entities (tenant is only
+    known after routing), so this store works on rows rather than
+    entities and never sets RLS context.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize webhook event store.
+
+        Args:
+            session: Active async database session
+        """
+        self.session = session
+
+    async def add_many(self, events: Sequence[Dict[str, Any]]) -> Dict[str, UUID]:
+        """
+        Insert raw webhook events in a single statement.
+
+        Re-inserting an already archived stream entry returns the existing
+        row's id, so redelivered buffer entries stay idempotent. created_at
+        is the enqueue time encoded in the stream entry id, which keeps the
+        (stream_entry_id, created_at) conflict target stable across
+        redeliveries on the partitioned table.
+
+        Args:
+            events: Dicts with stream_entry_id, channel_id, event_type,
+                raw_payload, signature and signature_verified keys
+
+        Returns:
+            Mapping of stream_entry_id to webhook event id
+        """
+        if not events:
+            return {}
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": uuid4(),
+                "stream_entry_id": event["stream_entry_id"],
+                "channel_id": event.get("channel_id"),
+                "event_type": event.get("event_type", "whatsapp_business_account"),
+                "raw_payload": event["raw_payload"],
+                "signature": event.get("signature"),
+                "signature_verified": event.get("signature_verified", False),
+                "processed": False,
+                "created_at": stream_entry_time(event["stream_entry_id"]) or now,
+                "updated_at": now,
+            }
+            for event in events
+        ]
+
+        try:
+            stmt = (
+                insert(WebhookEventModel)
+                .values(rows)
+                .on_conflict_do_update(
+                    index_elements=[WebhookEventModel.stream_entry_id, WebhookEventModel.created_at],
+                    set_={"updated_at": now},
+                )
+                .returning(WebhookEventModel.stream_entry_id, WebhookEventModel.id)
+            )
+            result = await self.session.execute(stmt)
+
+            ids = {row.stream_entry_id: row.id for row in result}
+
+            logger.debug(
+                "Archived webhook events",
+                extra={"count": len(ids)}
+            )
+
+            return ids
+
+        except Exception as e:
+            logger.error(
+                "Failed to archive webhook events",
+                extra={"error": str(e), "count": len(events)}
+            )
+            raise
+
+    async def mark_processed(self, event_ids: Sequence[UUID], since: Optional[datetime] = None) -> int:
+        """
+        Mark events processed in a single statement.
+
+        Args:
+            event_ids: Webhook event UUIDs
+            since: Lower bound on the events' created_at; lets the update
+                touch only the matching daily partitions
+
+        Returns:
+            Number of rows updated
+        """
+        if not event_ids:
+            return 0
+
+        now = datetime.utcnow()
+        stmt = (
+            update(WebhookEventModel)
+            .where(WebhookEventModel.id.in_(list(event_ids)))
+            .values(processed=True, processed_at=now, error_message=None, updated_at=now)
+        )
+        if since is not None:
+            stmt = stmt.where(WebhookEventModel.created_at >= since)
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def mark_failed(self, event_id: UUID, error_message: str, created_at: Optional[datetime] = None) -> None:
+        """
+        Record a processing error on an event.
+
+        Args:
+            event_id: Webhook event UUID
+            error_message: Last processing error
+            created_at: The event's created_at, if known (partition pruning)
+        """
+        stmt = (
+            update(WebhookEventModel)
+            .where(WebhookEventModel.id == event_id)
+            .values(error_message=error_message[:1000], updated_at=datetime.utcnow())
+        )
+        if created_at is not None:
+            stmt = stmt.where(WebhookEventModel.created_at == created_at)
+        await self.session.execute(stmt)
+
+    async def mark_failed_many(self, failures: Sequence[Tuple[UUID, str]]) -> None:
+        """
+        Record processing errors for many events in a single statement.
+
+        Args:
+            failures: (event_id, error_message) pairs
+        """
+        if not failures:
+            return
+
+        stmt = text(
+            """
+            UPDATE whatsapp.webhook_events AS e
+            SET error_message = f.error_message, updated_at = now()
+            FROM unnest(CAST(:ids AS uuid[]), CAST(:errors AS text[]))
+                AS f(id, error_message)
+            WHERE e.id = f.id
+            """
+        )
+        await self.session.execute(
+            stmt,
+            {
+                "ids": [event_id for event_id, _ in failures],
+                "errors": [error[:1000] for _, error in failures],
+            }
+        )
+
+    # ========================================================================
+    # REPLAY
+    # ========================================================================
+
+    async def stream_for_replay(
+        self,
+        filters: ReplayFilter,
+        after: Optional[ReplayCursor] = None,
+        limit: int = 50_000,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[List[ReplayEvent]]:
+        """
+        Stream events in (created_at, id) order through a server-side cursor.
+
+        Rows arrive in batches of batch_size instead of being buffered
+        client-side. At most limit rows are read per call so the
+        transaction holding the cursor stays short; callers continue from
+        the last yielded cursor.
+
+        Args:
+            filters: Event selection
+            after: Exclusive keyset position to start from
+            limit: Maximum rows for this call
+            batch_size: Rows fetched per round trip
+
+        Yields:
+            Batches of replay events
+        """
+        conditions = []
+        if filters.since is not None:
+            conditions.append(WebhookEventModel.created_at >= filters.since)
+        if filters.until is not None:
+            conditions.append(WebhookEventModel.created_at < filters.until)
+        if filters.account_id is not None:
+            conditions.append(WebhookEventModel.account_id == filters.account_id)
+        if filters.channel_id is not None:
+            conditions.append(WebhookEventModel.channel_id == filters.channel_id)
+        if filters.processed is not None:
+            conditions.append(WebhookEventModel.processed.is_(filters.processed))
+        if after is not None:
+            conditions.append(
+                tuple_(WebhookEventModel.created_at, WebhookEventModel.id) > tuple_(*after)
+            )
+
+        stmt = (
+            select(
+                WebhookEventModel.id,
+                WebhookEventModel.created_at,
+                WebhookEventModel.channel_id,
+                WebhookEventModel.raw_payload,
+            )
+            .where(and_(*conditions))
+            .order_by(WebhookEventModel.created_at, WebhookEventModel.id)
+            .limit(limit)
+            .execution_options(yield_per=batch_size)
+        )
+
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield [
+                ReplayEvent(
+                    id=row.id,
+                    created_at=row.created_at,
+                    channel_id=row.channel_id,
+                    raw_payload=row.raw_payload,
+                )
+                for row in partition
+            ]
+
+    async def load_replay_checkpoint(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a replay checkpoint.
+
+        Args:
+            name: Replay run name
+
+        Returns:
+            Dict with cursor, processed, failed and filters; None if absent
+        """
+        result = await self.session.execute(
+            text(
+                """
+                SELECT cursor_created_at, cursor_id, processed_count,
+                       failed_count, filters
+                FROM whatsapp.webhook_replay_checkpoints
+                WHERE name = :name
+                """
+            ),
+            {"name": name}
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        cursor = None
+        if row.cursor_created_at is not None:
+            cursor = (row.cursor_created_at, row.cursor_id)
+
+        return {
+            "cursor": cursor,
+            "processed": row.processed_count,
+            "failed": row.failed_count,
+            "filters": row.filters,
+        }
+
+    async def save_replay_checkpoint(
+        self,
+        name: str,
+        cursor: Optional[ReplayCursor],
+        processed: int,
+        failed: int,
+        filters: ReplayFilter,
+    ) -> None:
+        """
+        Upsert a replay checkpoint.
+
+        Args:
+            name: Replay run name
+            cursor: Last position whose events (and all before it) are done
+            processed: Events processed so far
+            failed: Events failed so far
+            filters: Selection the run was started with
+        """
+        await self.session.execute(
+            text(
+                """
+                INSERT INTO whatsapp.webhook_replay_checkpoints (
+                    name, cursor_created_at, cursor_id, processed_count,
+                    failed_count, filters, updated_at
+                ) VALUES (
+                    :name, :cursor_created_at, :cursor_id, :processed,
+                    :failed, CAST(:filters AS jsonb), now()
+                )
+                ON CONFLICT (name) DO UPDATE SET
+                    cursor_created_at = EXCLUDED.cursor_created_at,
+                    cursor_id = EXCLUDED.cursor_id,
+                    processed_count = EXCLUDED.processed_count,
+                    failed_count = EXCLUDED.failed_count,
+                    filters = EXCLUDED.filters,
+                    updated_at = now()
+                """
+            ),
+            {
+                "name": name,
+                "cursor_created_at": cursor[0] if cursor else None,
+                "cursor_id": cursor[1] if cursor else None,
+                "processed": processed,
+                "failed": failed,
+                "filters": json.dumps(filters.to_dict()),
+            }
+        )
@@ -0,0 +1,558 @@
+"""
+Messaging SQL Statements
+Hot raw-SQL queries over messaging.messages, declared once with stable text.
+
+Optional filters are variant flags (has_channel, has_status, ...); their
+values are always bind parameters. See StatementRegistry.
+
+Counting analytics read messaging.message_hourly_rollups plus the deltas
+not yet folded into them (migration 0007) at hour resolution: a range
+covers every hour it touches.
+"""
+from shared.infrastructure.database.statements import statement, where
+
+MESSAGE_COLUMNS = """
+    id, tenant_id, channel_id, direction, message_type,
+    from_number, to_number, content, media_url, template_id,
+    template_variables, whatsapp_message_id, status,
+    error_code, error_message, metadata, retry_count,
+    max_retries, created_at, updated_at, sent_at,
+    delivered_at, read_at"""
+
+GRANULARITIES = ("hour", "day", "week", "month")
+
+
+def _message_filters(
+    has_channel: bool = False,
+    has_direction: bool = False,
+    has_status: bool = False,
+    has_type: bool = False,
+    has_phone: bool = False,
+    has_from: bool = False,
+    has_to: bool = False,
+) -> str:
+    return where(
+        "tenant_id = :tenant_id",
+        has_channel and "channel_id = :channel_id",
+        has_direction and "direction = :direction",
+        has_status and "status = :status",
+        has_type and "message_type = :message_type",
+        has_phone and "conversation_key = :phone",
+        has_from and "created_at >= :from_date",
+        has_to and "created_at <= :to_date",
+    )
+
+
+def _analytics_filters(has_channel: bool, alias: str = "") -> str:
+    return where(
+        f"{alias}tenant_id = :tenant_id",
+        has_channel and f"{alias}channel_id = :channel_id",
+        f"{alias}created_at BETWEEN :start_date AND :end_date",
+    )
+
+
+def _rollup_filters(has_channel: bool) -> str:
+    return where(
+        "tenant_id = :tenant_id",
+        has_channel and "channel_id = :channel_id",
+        "hour >= date_trunc('hour', CAST(:start_date AS timestamptz))",
+        "hour <= CAST(:end_date AS timestamptz)",
+    )
+
+
+ROLLUP_COLUMNS = """
+                hour, direction, message_type, status, message_count,
+                delivered_count, delivery_seconds_sum, last_message_at"""
+
+
+def _rollups(conditions: str) -> str:
+    # Folded rollups plus pending deltas, each filtered on its own indexes
+    return f"""(
+            SELECT {ROLLUP_COLUMNS}
+            FROM messaging.message_hourly_rollups WHERE {conditions}
+            UNION ALL
+            SELECT {ROLLUP_COLUMNS}
+            FROM messaging.message_rollup_deltas WHERE {conditions}
+        ) AS rollups"""
+
+
+# ============================================================================
+# MESSAGE LISTINGS
+# ============================================================================
+
+@statement("messages.list")
+def _list_messages(has_cursor: bool = False, **filters: bool) -> str:
+    conditions = where(
+        _message_filters(**filters),
+        has_cursor and "(created_at, id) < (:cursor_created_at, :cursor_id)",
+    )
+    return f"""
+        SELECT {MESSAGE_COLUMNS}
+        FROM messaging.messages
+        WHERE {conditions}
+        ORDER BY created_at DESC, id DESC
+        LIMIT :limit
+    """
+
+
+@statement("messages.count")
+def _count_messages(estimate: bool = False, **filters: bool) -> str:
+    if estimate:
+        # Planner row estimate of the same filters (no aggregate on top, so
+        # the root node's "Plan Rows" is the estimated match count)
+        return f"""
+            EXPLAIN (FORMAT JSON)
+            SELECT 1
+            FROM messaging.messages
+            WHERE {_message_filters(**filters)}
+        """
+    return f"""
+        SELECT COUNT(*) AS count
+        FROM messaging.messages
+        WHERE {_message_filters(**filters)}
+    """
+
+
+@statement("messages.count_rollup")
+def _count_rollup(
+    has_channel: bool = False,
+    has_direction: bool = False,
+    has_status: bool = False,
+    has_type: bool = False,
+    has_from: bool = False,
+    has_to: bool = False,
+) -> str:
+    # Whole hours inside the range come from the rollups plus deltas not yet
+    # folded; the partial hours at either end are counted from raw messages
+    # (each under an hour of one tenant's (tenant_id, created_at) index).
+    # Hours are truncated in SQL, exactly as the rollup triggers do.
+    dimensions = dict(has_channel=has_channel, has_direction=has_direction, has_status=has_status, has_type=has_type)
+    hours = where(
+        has_from and "hour >= (SELECT hours_from FROM bounds)",
+        has_to and "hour < (SELECT hours_to FROM bounds)",
+    )
+    rollup_filters = where(_message_filters(**dimensions), hours)
+
+    bounds = []
+    if has_from:
+        bounds.append("""CASE
+                WHEN date_trunc('hour', CAST(:from_date AS timestamptz)) = CAST(:from_date AS timestamptz)
+                THEN CAST(:from_date AS timestamptz)
+                ELSE date_trunc('hour', CAST(:from_date AS timestamptz)) + INTERVAL '1 hour'
+            END AS hours_from""")
+    if has_to:
+        bounds.append("date_trunc('hour', CAST(:to_date AS timestamptz)) AS hours_to")
+
+    edges = []
+    if has_from:
+        lower = where(
+            _message_filters(**dimensions),
+            "created_at >= :from_date",
+            "created_at < (SELECT hours_from FROM bounds)",
+            has_to and "created_at <= :to_date",
+        )
+        edges.append(f"(SELECT COUNT(*) FROM messaging.messages WHERE {lower})")
+    if has_to:
+        upper_start = "GREATEST(hours_to, hours_from)" if has_from else "hours_to"
+        upper = where(
+            _message_filters(**dimensions),
+            f"created_at >= (SELECT {upper_start} FROM bounds)",
+            "created_at <= :to_date",
+        )
+        edges.append(f"(SELECT COUNT(*) FROM messaging.messages WHERE {upper})")
+
+    with_bounds = f"WITH bounds AS (SELECT {', '.join(bounds)})" if bounds else ""
+    return f"""
+        {with_bounds}
+        SELECT
+            (SELECT COALESCE(SUM(message_count), 0)
+                FROM messaging.message_hourly_rollups WHERE {rollup_filters})
+            + (SELECT COALESCE(SUM(message_count), 0)
+                FROM messaging.message_rollup_deltas WHERE {rollup_filters})
+            {''.join(f" + {edge}" for edge in edges)}
+            AS count
+    """
+
+
+@statement("messages.conversation")
+def _conversation(has_channel: bool = False) -> str:
+    conditions = where(
+        "tenant_id = :tenant_id",
+        "conversation_key = :phone",
+        has_channel and "channel_id = :channel_id",
+    )
+    return f"""
+        SELECT {MESSAGE_COLUMNS}
+        FROM messaging.messages
+        WHERE {conditions}
+        ORDER BY created_at DESC, id DESC
+        LIMIT :limit
+    """
+
+
+# ============================================================================
+# CONVERSATIONS (messaging.conversation_summaries, migration 0008)
+# ============================================================================
+
+SUMMARY_COLUMNS = """
+    id, channel_id, conversation_key, last_message_id, last_message_at,
+    last_direction, last_message_type, last_inbound_at, window_expires_at,
+    unread_count, message_count"""
+
+
+@statement("conversations.summary")
+def _conversation_summary(has_channel: bool = False) -> str:
+    conditions = where(
+        "tenant_id = :tenant_id",
+        "conversation_key = :phone",
+        has_channel and "channel_id = :channel_id",
+    )
+    return f"""
+        SELECT
+            MAX(last_message_at) AS last_message_at,
+            COALESCE(SUM(unread_count), 0) AS unread_count,
+            COALESCE(SUM(message_count), 0) AS message_count
+        FROM messaging.conversation_summaries
+        WHERE {conditions}
+    """
+
+
+@statement("conversations.last_inbound")
+def _last_inbound() -> str:
+    # Backs the session window index on a miss. Webhook ingestion only
+    # writes whatsapp.inbound_messages, so both tables are consulted; the
+    # created_at bound prunes inbound partitions to the open window.
+    return """
+        SELECT conversation_key AS phone, last_inbound_at
+        FROM messaging.conversation_summaries
+        WHERE tenant_id = :tenant_id
+            AND channel_id = :channel_id
+            AND conversation_key = ANY(:phones)
+        UNION ALL
+        SELECT from_number AS phone, MAX(timestamp_wa) AS last_inbound_at
+        FROM whatsapp.inbound_messages
+        WHERE tenant_id = :tenant_id
+            AND channel_id = :channel_id
+            AND created_at >= :since
+            AND from_number = ANY(:phones)
+        GROUP BY from_number
+    """
+
+
+@statement("conversations.inbox")
+def _inbox(has_channel: bool = False, has_cursor: bool = False, unread_only: bool = False) -> str:
+    conditions = where(
+        "tenant_id = :tenant_id",
+        has_channel and "channel_id = :channel_id",
+        unread_only and "unread_count > 0",
+        has_cursor and "(last_message_at, id) < (:cursor_last_message_at, :cursor_id)",
+    )
+    return f"""
+        SELECT {SUMMARY_COLUMNS}
+        FROM messaging.conversation_summaries
+        WHERE {conditions}
+        ORDER BY last_message_at DESC, id DESC
+        LIMIT :limit
+    """
+
+
+# ============================================================================
+# ANALYTICS
+# ============================================================================
+
+@statement("analytics.overall_stats")
+def _overall_stats(has_channel: bool = False) -> str:
+    return f"""
+        SELECT
+            COALESCE(SUM(message_count), 0) AS total_messages,
+            COALESCE(SUM(message_count) FILTER (WHERE direction = 'outbound'), 0) AS sent_messages,
+            COALESCE(SUM(message_count) FILTER (WHERE direction = 'inbound'), 0) AS received_messages,
+            COALESCE(SUM(message_count) FILTER (WHERE status = 'delivered'), 0) AS delivered_messages,
+            COALESCE(SUM(message_count) FILTER (WHERE status = 'read'), 0) AS read_messages,
+            COALESCE(SUM(message_count) FILTER (WHERE status = 'failed'), 0) AS failed_messages
+        FROM {_rollups(_rollup_filters(has_channel))}
+    """
+
+
+@statement("analytics.time_series")
+def _time_series(granularity: str = "day", has_channel: bool = False) -> str:
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    return f"""
+        SELECT
+            DATE_TRUNC('{granularity}', hour) AS period,
+            COALESCE(SUM(message_count) FILTER (WHERE direction = 'outbound'), 0) AS sent,
+            COALESCE(SUM(message_count) FILTER (WHERE direction = 'inbound'), 0) AS received,
+            COALESCE(SUM(message_count) FILTER (WHERE status = 'delivered'), 0) AS delivered,
+            COALESCE(SUM(message_count) FILTER (WHERE status = 'failed'), 0) AS failed
+        FROM {_rollups(_rollup_filters(has_channel))}
+        GROUP BY period
+        HAVING SUM(message_count) > 0
+        ORDER BY period ASC
+    """
+
+
+@statement("analytics.top_message_types")
+def _top_message_types(has_channel: bool = False) -> str:
+    return f"""
+        SELECT
+            message_type,
+            SUM(message_count) AS count,
+            ROUND(SUM(message_count) * 100.0 / SUM(SUM(message_count)) OVER (), 2) AS percentage
+        FROM {_rollups(_rollup_filters(has_channel))}
+        GROUP BY message_type
+        HAVING SUM(message_count) > 0
+        ORDER BY count DESC
+        LIMIT 5
+    """
+
+
+@statement("analytics.peak_hour")
+def _peak_hour(has_channel: bool = False) -> str:
+    return f"""
+        SELECT
+            EXTRACT(HOUR FROM hour) AS hour,
+            SUM(message_count) AS count
+        FROM {_rollups(_rollup_filters(has_channel))}
+        GROUP BY 1
+        HAVING SUM(message_count) > 0
+        ORDER BY count DESC
+        LIMIT 1
+    """
+
+
+RESPONSE_WINDOW = "1 hour"
+
+
+@statement("analytics.response_time")
+def _response_time(has_channel: bool = False, samples: bool = False) -> str:
+    # One ordered pass per conversation (customer, business number): walking
+    # each conversation newest first, a running MIN over the strictly later
+    # outbound rows is the first reply to every inbound message. The frame
+    # head never moves, so the aggregate is incremental (no self-join).
+    conditions = where(
+        "tenant_id = :tenant_id",
+        has_channel and "channel_id = :channel_id",
+        "created_at >= :start_date",
+        f"created_at <= CAST(:end_date AS timestamptz) + INTERVAL '{RESPONSE_WINDOW}'",
+    )
+    if samples:
+        # Raw per-response minutes, for merging with archived responses
+        select = "SELECT minutes FROM responses"
+    else:
+        select = """SELECT
+            COUNT(*) AS responses,
+            AVG(minutes) AS avg_minutes,
+            PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY minutes) AS p50_minutes,
+            PERCENTILE_CONT(0.9) WITHIN GROUP (ORDER BY minutes) AS p90_minutes,
+            PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY minutes) AS p95_minutes,
+            PERCENTILE_CONT(0.99) WITHIN GROUP (ORDER BY minutes) AS p99_minutes
+        FROM responses"""
+    return f"""
+        WITH ordered AS (
+            SELECT
+                direction,
+                created_at,
+                MIN(created_at) FILTER (WHERE direction = 'outbound') OVER (
+                    PARTITION BY
+                        CASE WHEN direction = 'inbound' THEN from_number ELSE to_number END,
+                        CASE WHEN direction = 'inbound' THEN to_number ELSE from_number END
+                    ORDER BY created_at DESC
+                    RANGE BETWEEN UNBOUNDED PRECEDING AND INTERVAL '1 microsecond' PRECEDING
+                ) AS replied_at
+            FROM messaging.messages
+            WHERE {conditions}
+        ),
+        responses AS (
+            SELECT EXTRACT(EPOCH FROM (replied_at - created_at)) / 60 AS minutes
+            FROM ordered
+            WHERE direction = 'inbound'
+                AND created_at <= :end_date
+                AND replied_at < created_at + INTERVAL '{RESPONSE_WINDOW}'
+        )
+        {select}
+    """
+
+
+@statement("analytics.channel_stats")
+def _channel_stats() -> str:
+    conditions = where(
+        "channel_id = :channel_id",
+        "tenant_id = :tenant_id",
+        "hour >= date_trunc('hour', CAST(:start_date AS timestamptz))",
+    )
+    return f"""
+        SELECT
+            SUM(message_count) FILTER (WHERE direction = 'outbound') AS messages_sent,
+            SUM(message_count) FILTER (WHERE direction = 'inbound') AS messages_received,
+            SUM(message_count) FILTER (WHERE status = 'delivered') AS messages_delivered,
+            SUM(message_count) FILTER (WHERE status = 'read') AS messages_read,
+            SUM(message_count) FILTER (WHERE status = 'failed') AS messages_failed,
+            SUM(message_count) FILTER (WHERE message_type = 'template') AS template_messages,
+            SUM(message_count) FILTER (WHERE message_type IN ('image', 'video', 'audio', 'document')) AS media_messages,
+            SUM(delivery_seconds_sum) / NULLIF(SUM(delivered_count), 0) AS avg_delivery_time,
+            MAX(last_message_at) AS last_message_at
+        FROM {_rollups(conditions)}
+    """
+
+
+@statement("analytics.channel_active_conversations")
+def _channel_active_conversations() -> str:
+    # Distinct counterparties are not additive across hours, so this one
+    # still reads raw messages over the (tenant_id, created_at) index
+    return """
+        SELECT
+            COUNT(DISTINCT CASE WHEN direction = 'inbound' THEN from_number ELSE to_number END) AS active_conversations
+        FROM messaging.messages
+        WHERE channel_id = :channel_id
+            AND tenant_id = :tenant_id
+            AND created_at >= :start_date
+    """
+
+
+@statement("analytics.channel_usage")
+def _channel_usage() -> str:
+    # Flushed usage of the current billing period (migration 0011)
+    return """
+        SELECT
+            COALESCE(u.message_count, 0) AS current_month_usage,
+            c.monthly_message_limit
+        FROM messaging.channels c
+        LEFT JOIN messaging.channel_usage u
+            ON u.channel_id = c.id
+            AND u.period = CAST(date_trunc('month', now() AT TIME ZONE 'UTC') AS date)
+        WHERE c.id = :channel_id
+            AND c.tenant_id = :tenant_id
+    """
+
+
+# ============================================================================
+# CHANNEL USAGE (migration 0011)
+# ============================================================================
+
+@statement("usage.flush")
+def _flush_usage() -> str:
+    # One upsert for every (channel, period) delta of a flush; callers sort
+    # by channel so concurrent flushers lock rows in the same order
+    return """
+        INSERT INTO messaging.channel_usage (channel_id, period, tenant_id, message_count)
+        SELECT channel_id, period, tenant_id, delta
+        FROM unnest(
+            CAST(:channel_ids AS uuid[]),
+            CAST(:periods AS date[]),
+            CAST(:tenant_ids AS uuid[]),
+            CAST(:deltas AS bigint[])
+        ) AS d(channel_id, period, tenant_id, delta)
+        ON CONFLICT (channel_id, period) DO UPDATE
+        SET message_count = messaging.channel_usage.message_count + EXCLUDED.message_count,
+            updated_at = NOW()
+        RETURNING channel_id, period, message_count
+    """
+
+
+@statement("usage.current")
+def _current_usage() -> str:
+    return """
+        SELECT message_count
+        FROM messaging.channel_usage
+        WHERE channel_id = :channel_id
+            AND period = :period
+    """
+
+
+@statement("usage.prune")
+def _prune_usage() -> str:
+    # One batch per call; SKIP LOCKED lets a concurrent flush of the same
+    # rows finish first instead of blocking the batch
+    return """
+        DELETE FROM messaging.channel_usage u
+        USING (
+            SELECT channel_id, period
+            FROM messaging.channel_usage
+            WHERE period < :before
+            ORDER BY period, channel_id
+            LIMIT :limit
+            FOR UPDATE SKIP LOCKED
+        ) AS expired
+        WHERE u.channel_id = expired.channel_id
+            AND u.period = expired.period
+    """
+
+
+# ============================================================================
+# RECIPIENT LISTS (migration 0010)
+# ============================================================================
+
+@statement("recipient_lists.create_stage")
+def _create_recipient_stage() -> str:
+    # Transaction-local: dropped with the import's transaction, never WAL-logged
+    return """
+        CREATE TEMP TABLE recipient_import_stage (
+            position BIGINT NOT NULL,
+            phone TEXT NOT NULL,
+            variables JSONB
+        ) ON COMMIT DROP
+    """
+
+
+@statement("recipient_lists.insert")
+def _insert_recipient_list() -> str:
+    return """
+        INSERT INTO messaging.recipient_lists (
+            id, tenant_id, channel_id, name, source_format, created_by
+        ) VALUES (
+            :id, :tenant_id, :channel_id, :name, :source_format, :created_by
+        )
+    """
+
+
+@statement("recipient_lists.promote_stage")
+def _promote_recipient_stage() -> str:
+    # First occurrence of a phone wins; the count feeds duplicate_rows
+    return """
+        WITH moved AS (
+            INSERT INTO messaging.recipient_list_entries (list_id, tenant_id, position, phone, variables)
+            SELECT DISTINCT ON (phone) :list_id, :tenant_id, position, phone, variables
+            FROM recipient_import_stage
+            ORDER BY phone, position
+            RETURNING 1
+        )
+        SELECT COUNT(*) AS inserted FROM moved
+    """
+
+
+@statement("recipient_lists.finish")
+def _finish_recipient_list() -> str:
+    return """
+        UPDATE messaging.recipient_lists
+        SET total_rows = :total_rows,
+            valid_rows = :valid_rows,
+            invalid_rows = :invalid_rows,
+            duplicate_rows = :duplicate_rows
+        WHERE id = :list_id
+            AND tenant_id = :tenant_id
+    """
+
+
+@statement("recipient_lists.get")
+def _get_recipient_list() -> str:
+    return """
+        SELECT id, channel_id, name, source_format, status, total_rows,
+               valid_rows, invalid_rows, duplicate_rows, created_at
+        FROM messaging.recipient_lists
+        WHERE id = :list_id
+            AND tenant_id = :tenant_id
+    """
+
+
+@statement("recipient_lists.entries")
+def _recipient_list_entries() -> str:
+    return """
+        SELECT position, phone, variables
+        FROM messaging.recipient_list_entries
+        WHERE list_id = :list_id
+            AND tenant_id = :tenant_id
+            AND position > :after_position
+        ORDER BY position
+        LIMIT :limit
+    """
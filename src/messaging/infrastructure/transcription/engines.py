@@ -0,0 +1,48 @@
+"""
+Transcription Engine Registry
+Maps TRANSCRIPTION_ENGINE setting values to engine implementations.
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict
+
+from src.messaging.domain.protocols.speech_transcription import TranscriptionEngine
+from src.messaging.infrastructure.persistence.adapter.google_speech_adapter import GoogleSpeechAdapter
+from src.messaging.infrastructure.persistence.adapter.stub_speech_adapter import LocalStubSpeechAdapter
+
+_ENGINES: Dict[str, Callable[[], TranscriptionEngine]] = {
+    "google": GoogleSpeechAdapter,
+    "stub": LocalStubSpeechAdapter,
+}
+
+
+def register_transcription_engine(name: str, factory: Callable[[], TranscriptionEngine]) -> None:
+    """
+    Register an additional engine.
+
+    Args:
+        name: Value of TRANSCRIPTION_ENGINE selecting this engine
+        factory: Zero-arg callable building the engine
+    """
+    _ENGINES[name] = factory
+
+
+def create_transcription_engine(name: str) -> TranscriptionEngine:
+    """
+    Build the configured engine.
+
+    Args:
+        name: Engine name (google, stub, or a registered one)
+
+    Returns:
+        TranscriptionEngine instance
+
+    Raises:
+        ValueError: If no engine is registered under name
+    """
+    try:
+        return _ENGINES[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown transcription engine '{name}' (available: {', '.join(sorted(_ENGINES))})"
+        )
@@ -0,0 +1,93 @@
+"""
+Transcript Cache
+Transcription results keyed by audio checksum.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+
+class TranscriptCache:
+    """
+    Redis cache of transcripts keyed by media SHA-256.
+
+    Forwarded voice notes carry the same audio (and the same checksum in
+    the webhook), so they are transcribed once per engine and language.
+    Cache failures are logged and treated as misses.
+
+    Attributes:
+        redis: Async Redis client
+        ttl_seconds: Lifetime of a cached transcript
+    """
+
+    def __init__(self, redis: Redis, ttl_seconds: int = 30 * 86400) -> None:
+        """
+        Initialize transcript cache.
+
+        Args:
+            redis: Async Redis client
+            ttl_seconds: Transcript lifetime (default: 30 days)
+        """
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(sha256: str, engine: str, language_code: Optional[str]) -> str:
+        return f"transcript:{engine}:{language_code or 'auto'}:{sha256}"
+
+    async def get(self, sha256: str, engine: str, language_code: Optional[str] = None) -> Optional[str]:
+        """
+        Look up a cached transcript.
+
+        Args:
+            sha256: Hex SHA-256 of the audio
+            engine: Engine name
+            language_code: Language hint used for the transcription
+
+        Returns:
+            Transcript or None on miss
+        """
+        try:
+            value = await self.redis.get(self._key(sha256, engine, language_code))
+        except RedisError as e:
+            logger.warning("Transcript cache GET failed", extra={"error": str(e)})
+            return None
+
+        metrics = get_metrics()
+        if value is None:
+            metrics.increment_counter("transcription_cache_misses_total")
+            return None
+
+        metrics.increment_counter("transcription_cache_hits_total")
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set(
+        self,
+        sha256: str,
+        engine: str,
+        transcript: str,
+        language_code: Optional[str] = None,
+    ) -> None:
+        """
+        Cache a transcript.
+
+        Args:
+            sha256: Hex SHA-256 of the audio
+            engine: Engine name
+            transcript: Transcribed text
+            language_code: Language hint used for the transcription
+        """
+        try:
+            await self.redis.set(
+                self._key(sha256, engine, language_code), transcript, ex=self.ttl_seconds
+            )
+        except RedisError as e:
+            logger.warning("Transcript cache SET failed", extra={"error": str(e)})
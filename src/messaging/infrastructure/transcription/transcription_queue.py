@@ -0,0 +1,204 @@
+"""
+Transcription Queue
+Redis Stream of voice-note transcription jobs.
+"""
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class TranscriptionJob:
+    """
+    A voice note waiting for its transcript.
+
+    Attributes:
+        message_id: Inbound message UUID (string) to attach the transcript to
+        tenant_id: Owning tenant UUID (string)
+        channel_id: Channel the audio arrived on (for the media access token)
+        media_id: WhatsApp media ID
+        mime_type: Media MIME type
+        sha256: Media checksum from the webhook, if Meta provided one
+        language_code: Optional language hint
+        enqueued_at: Epoch seconds at enqueue time
+        entry_id: Stream entry ID (set when read back)
+    """
+
+    message_id: str
+    tenant_id: str
+    channel_id: str
+    media_id: str
+    mime_type: Optional[str] = None
+    sha256: Optional[str] = None
+    language_code: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.time)
+    entry_id: Optional[str] = None
+
+    def to_json(self) -> str:
+        """Serialize for the stream (entry_id is assigned by Redis)."""
+        data = asdict(self)
+        data.pop("entry_id")
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes, entry_id: str) -> "TranscriptionJob":
+        """Deserialize a stream entry."""
+        return cls(**json.loads(raw), entry_id=entry_id)
+
+
+class TranscriptionQueue:
+    """
+    Durable queue of transcription jobs (Redis Stream + consumer group).
+
+    The webhook path only pays one XADD per voice note; TranscriptionWorker
+    consumes jobs with bounded, per-tenant-limited concurrency.
+
+    Acknowledged jobs are deleted by ack(), so the stream only ever holds
+    jobs that are waiting or in flight. It is never length-trimmed, since
+    trimming could only drop jobs that still need work.
+
+    Attributes:
+        redis: Async Redis client
+        stream_key: Stream name
+        group: Consumer group name
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        stream_key: str = "transcription:jobs",
+        group: str = "transcribers",
+    ) -> None:
+        """
+        Initialize transcription queue.
+
+        Args:
+            redis: Async Redis client
+            stream_key: Redis Stream key
+            group: Consumer group used by transcription workers
+        """
+        self.redis = redis
+        self.stream_key = stream_key
+        self.group = group
+
+    async def ensure_group(self) -> None:
+        """Create the consumer group (and stream) if missing."""
+        try:
+            await self.redis.xgroup_create(self.stream_key, self.group, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def enqueue(self, job: TranscriptionJob) -> str:
+        """
+        Add a job to the queue.
+
+        Args:
+            job: Transcription job
+
+        Returns:
+            Stream entry ID
+        """
+        entry_id = await self.redis.xadd(self.stream_key, {"job": job.to_json()})
+        get_metrics().increment_counter("transcription_jobs_enqueued_total")
+        return entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+
+    async def read(self, consumer: str, count: int, block_ms: int = 1000) -> List[TranscriptionJob]:
+        """
+        Read new jobs for a consumer.
+
+        Args:
+            consumer: Consumer name
+            count: Maximum number of jobs
+            block_ms: How long to block waiting for jobs
+
+        Returns:
+            List of jobs (possibly empty)
+        """
+        if count <= 0:
+            return []
+
+        response = await self.redis.xreadgroup(
+            self.group, consumer, {self.stream_key: ">"}, count=count,
+            block=block_ms or None,  # BLOCK 0 would wait forever
+        )
+        return [
+            self._to_job(entry_id, fields)
+            for _stream, messages in response or []
+            for entry_id, fields in messages
+        ]
+
+    async def claim_stale(self, consumer: str, min_idle_ms: int, count: int) -> List[TranscriptionJob]:
+        """
+        Take over jobs left pending by a crashed worker.
+
+        Args:
+            consumer: Consumer name claiming the jobs
+            min_idle_ms: Minimum idle time before a job is reclaimed
+            count: Maximum number of jobs
+
+        Returns:
+            Claimed jobs
+        """
+        if count <= 0:
+            return []
+
+        _next, claimed, *_ = await self.redis.xautoclaim(
+            self.stream_key, self.group, consumer, min_idle_time=min_idle_ms, count=count
+        )
+        return [self._to_job(entry_id, fields) for entry_id, fields in claimed if fields]
+
+    async def ack(self, entry_ids: Sequence[str]) -> None:
+        """Acknowledge and delete finished jobs in one round trip."""
+        if not entry_ids:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xack(self.stream_key, self.group, *entry_ids)
+        pipe.xdel(self.stream_key, *entry_ids)
+        await pipe.execute()
+
+    async def lag(self) -> Dict[str, float]:
+        """
+        Measure queue lag.
+
+        Returns:
+            Dictionary with depth, pending and oldest_age_seconds
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xlen(self.stream_key)
+        pipe.xpending(self.stream_key, self.group)
+        pipe.xrange(self.stream_key, min="-", max="+", count=1)
+        depth, pending, oldest = await pipe.execute()
+
+        oldest_age = 0.0
+        if oldest:
+            oldest_id = self._decode(oldest[0][0])
+            oldest_age = max(0.0, time.time() - int(oldest_id.split("-", 1)[0]) / 1000.0)
+
+        return {
+            "depth": depth,
+            "pending": (pending or {}).get("pending", 0),
+            "oldest_age_seconds": round(oldest_age, 3),
+        }
+
+    def _to_job(self, entry_id, fields: Dict) -> TranscriptionJob:
+        """Convert a raw stream entry into a job."""
+        raw = fields.get("job") or fields.get(b"job")
+        return TranscriptionJob.from_json(raw, self._decode(entry_id))
+
+    @staticmethod
+    def _decode(value: bytes | str) -> str:
+        """Decode Redis bytes to str."""
+        return value.decode() if isinstance(value, bytes) else value
@@ -0,0 +1,329 @@
+"""
+Usage Meter
+Per-channel monthly send counts without writing the channel row per send.
+
+Each process accumulates successful sends in memory per (channel,
+billing period) and flushes the deltas to messaging.channel_usage with
+one set-based upsert every flush_interval seconds. Redis holds a running
+total per (channel, period) for the quota pre-check, shared by every
+sender, so checking a quota costs one GET and no database round trip.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import AbstractAsyncContextManager
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.messaging.domain.exceptions import MonthlyQuotaExceededError
+from src.messaging.infrastructure.persistence import statements  # noqa: F401 (registers statements)
+from src.shared_.database import get_async_session
+from shared.infrastructure.database.statements import get_statement_registry
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+# Running totals outlive their month long enough for late pre-checks
+_KEY_TTL_SECONDS = 40 * 86400
+
+# Raise the Redis total to the flushed database total (repairs a Redis
+# restart without ever lowering a total other senders already raised)
+_RAISE_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if current >= tonumber(ARGV[1]) then
+    return current
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return tonumber(ARGV[1])
+"""
+
+# Session.info entry holding sends that count once the transaction commits
+_ON_COMMIT = "usage_meter_on_commit"
+
+UsageKey = Tuple[UUID, date]
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+
+def usage_period(at: Optional[datetime] = None) -> date:
+    """Billing period of a moment: first day of its UTC month."""
+    moment = at or datetime.now(timezone.utc)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return date(moment.year, moment.month, 1)
+
+
+class UsageMeter:
+    """
+    Sharded (per-process) usage counters with periodic set-based flushes.
+
+    - record() is in-memory plus one pipelined INCRBY; no row locks.
+      record_on_commit() defers that until the caller's transaction
+      commits, so a failed commit or a retried send is not counted.
+    - flush() writes all pending deltas in one upsert, sorted by channel
+      so concurrent flushers never deadlock. Database totals are exact
+      as of the last flush of every sender; a failed flush keeps its
+      deltas for the next attempt.
+    - Without Redis the quota pre-check reads the flushed total plus this
+      process's pending deltas and the batch a running flush is writing.
+
+    Attributes:
+        redis: Async Redis client (decode_responses=True), or None
+        flush_interval: Seconds between background flushes
+    """
+
+    KEY_PREFIX = "channel_usage"
+
+    def __init__(
+        self,
+        redis: Optional[Redis] = None,
+        flush_interval: float = 5.0,
+        session_factory: Optional[SessionFactory] = None,
+    ) -> None:
+        """
+        Initialize usage meter.
+
+        Args:
+            redis: Async Redis client shared between senders
+            flush_interval: Seconds between background flushes
+            session_factory: Sessions used for flushing (default: dispatch pool)
+        """
+        self.redis = redis
+        self.flush_interval = flush_interval
+        self._session_factory = session_factory or (lambda: get_async_session("dispatch"))
+        self._pending: Dict[UsageKey, List] = {}
+        self._flushing: Dict[UsageKey, List] = {}
+        self._increments: Set[asyncio.Task] = set()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def key(cls, channel_id: UUID, period: date) -> str:
+        """Redis key of one channel's running total in a period."""
+        return f"{cls.KEY_PREFIX}:{period:%Y%m}:{channel_id}"
+
+    # ========================================================================
+    # RECORDING
+    # ========================================================================
+
+    async def record(self, tenant_id: UUID, channel_id: UUID, count: int = 1, at: Optional[datetime] = None) -> None:
+        """Count successful sends of a channel."""
+        period = self._add(tenant_id, channel_id, count, at)
+        await self._increment(channel_id, period, count)
+
+    def record_on_commit(
+        self,
+        session: AsyncSession,
+        tenant_id: UUID,
+        channel_id: UUID,
+        count: int = 1,
+        at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Count successful sends once session's transaction commits.
+
+        Dropped if the transaction rolls back instead.
+        """
+        sync_session = session.sync_session
+        sync_session.info.setdefault(_ON_COMMIT, []).append(
+            (self, tenant_id, channel_id, count, at or datetime.now(timezone.utc))
+        )
+        if not event.contains(sync_session, "after_commit", _record_committed):
+            event.listen(sync_session, "after_commit", _record_committed)
+            event.listen(sync_session, "after_rollback", _discard_uncommitted)
+
+    def _add(self, tenant_id: UUID, channel_id: UUID, count: int, at: Optional[datetime]) -> date:
+        period = usage_period(at)
+        entry = self._pending.setdefault((channel_id, period), [tenant_id, 0])
+        entry[1] += count
+        return period
+
+    def _increment_later(self, channel_id: UUID, period: date, count: int) -> None:
+        # Called from a synchronous session event inside the event loop
+        task = asyncio.get_running_loop().create_task(self._increment(channel_id, period, count))
+        self._increments.add(task)
+        task.add_done_callback(self._increments.discard)
+
+    async def _increment(self, channel_id: UUID, period: date, count: int) -> None:
+        if self.redis is None:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.incrby(self.key(channel_id, period), count)
+            pipe.expire(self.key(channel_id, period), _KEY_TTL_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            # Pre-checks fall back to the database; the flush stays exact
+            get_metrics().increment_counter("usage_meter_redis_errors_total")
+            logger.warning("Usage counter increment failed", extra={"error": str(e), "channel_id": str(channel_id)})
+
+    # ========================================================================
+    # QUOTA
+    # ========================================================================
+
+    async def usage(self, session: AsyncSession, channel_id: UUID, at: Optional[datetime] = None) -> int:
+        """Sends of a channel in the current (or given) period."""
+        period = usage_period(at)
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(self.key(channel_id, period))
+                if value is not None:
+                    return int(value)
+            except Exception as e:
+                logger.warning("Usage counter read failed", extra={"error": str(e)})
+
+        flushed = (
+            await session.execute(
+                get_statement_registry().get("usage.current"),
+                {"channel_id": channel_id, "period": period},
+            )
+        ).scalar()
+        unflushed = sum(
+            deltas[(channel_id, period)][1]
+            for deltas in (self._pending, self._flushing)
+            if (channel_id, period) in deltas
+        )
+        return int(flushed or 0) + unflushed
+
+    async def check_quota(self, session: AsyncSession, channel, needed: int = 1) -> None:
+        """
+        Fast pre-check of a channel's monthly_message_limit.
+
+        Raises:
+            MonthlyQuotaExceededError: If needed more sends exceed the limit
+        """
+        limit = channel.monthly_message_limit
+        if not limit:
+            return
+        used = await self.usage(session, channel.id)
+        if used + needed > limit:
+            get_metrics().increment_counter("usage_quota_rejections_total")
+            raise MonthlyQuotaExceededError(
+                f"Channel {channel.id} has used {used} of {limit} messages this month"
+            )
+
+    # ========================================================================
+    # FLUSHING
+    # ========================================================================
+
+    async def flush(self) -> int:
+        """Write pending deltas to the database; returns rows upserted."""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            # Still counted by usage() until the upsert is committed
+            self._flushing = pending
+            keys = sorted(pending, key=lambda key: (str(key[0]), key[1]))
+
+            try:
+                async with self._session_factory() as session:
+                    rows = (
+                        await session.execute(
+                            get_statement_registry().get("usage.flush"),
+                            {
+                                "channel_ids": [channel_id for channel_id, _ in keys],
+                                "periods": [period for _, period in keys],
+                                "tenant_ids": [pending[key][0] for key in keys],
+                                "deltas": [pending[key][1] for key in keys],
+                            },
+                        )
+                    ).all()
+                    await session.commit()
+                    self._flushing = {}
+            except Exception:
+                # Keep the deltas (plus anything recorded meanwhile) for the next flush
+                self._flushing = {}
+                for key, (tenant_id, delta) in pending.items():
+                    self._pending.setdefault(key, [tenant_id, 0])[1] += delta
+                get_metrics().increment_counter("usage_meter_flush_errors_total")
+                raise
+
+        metrics = get_metrics()
+        metrics.increment_counter("usage_meter_flushed_rows_total", value=float(len(rows)))
+        metrics.increment_counter("usage_meter_flushed_sends_total", value=float(sum(d for _, d in pending.values())))
+        await self._raise_redis_totals(rows)
+        return len(rows)
+
+    async def _raise_redis_totals(self, rows) -> None:
+        if self.redis is None or not rows:
+            return
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            for row in rows:
+                pipe.eval(_RAISE_LUA, 1, self.key(row.channel_id, row.period), row.message_count, _KEY_TTL_SECONDS)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("Usage counter repair failed", extra={"error": str(e)})
+
+    async def start(self) -> None:
+        """Start background flushing."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop background flushing and flush what is left."""
+        if self._increments:
+            await asyncio.gather(*self._increments, return_exceptions=True)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error("Usage flush failed", extra={"error": str(e)})
+
+
+def _record_committed(session: Session) -> None:
+    for meter, tenant_id, channel_id, count, at in session.info.pop(_ON_COMMIT, ()):
+        period = meter._add(tenant_id, channel_id, count, at)
+        meter._increment_later(channel_id, period, count)
+
+
+def _discard_uncommitted(session: Session) -> None:
+    session.info.pop(_ON_COMMIT, None)
+
+
+# Global usage meter (in-memory only until configured with Redis)
+_usage_meter: UsageMeter | None = None
+
+
+def get_usage_meter() -> UsageMeter:
+    """
+    Get the global usage meter.
+
+    Returns:
+        UsageMeter instance
+    """
+    global _usage_meter
+    if _usage_meter is None:
+        _usage_meter = UsageMeter()
+    return _usage_meter
+
+
+def configure_usage_meter(redis: Optional[Redis], flush_interval: float = 5.0) -> UsageMeter:
+    """
+    Configure the global usage meter.
+
+    Args:
+        redis: Async Redis client shared between senders
+        flush_interval: Seconds between background flushes
+    """
+    global _usage_meter
+    _usage_meter = UsageMeter(redis, flush_interval=flush_interval)
+    return _usage_meter
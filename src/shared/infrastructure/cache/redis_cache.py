@@ -253,6 +253,68 @@ class RedisCache:
             )
             return {}
     
+    async def set_if_absent_many(
+        self,
+        keys: list[str],
+        value: Any = 1,
+        ttl: int | None = None,
+    ) -> dict[str, bool]:
+        """
+        SET NX (with optional EX) for many keys in one pipelined round trip.
+        
+        Unlike the other helpers this re-raises RedisError: callers use
+        the result for correctness (deduplication) and must know when
+        Redis could not answer.
+        
+        Args:
+            keys: Cache keys
+            value: Value to store (must be JSON-serializable)
+            ttl: Time-to-live in seconds
+            
+        Returns:
+            Mapping of key to True if it was newly set, False if it existed
+        """
+        if not keys:
+            return {}
+        
+        try:
+            serialized = json.dumps(value)
+            pipeline = self.redis.pipeline(transaction=False)
+            
+            for key in keys:
+                pipeline.set(self._make_key(key), serialized, nx=True, ex=ttl)
+            
+            results = await pipeline.execute()
+            return {key: bool(result) for key, result in zip(keys, results)}
+        except RedisError as e:
+            logger.error(
+                "Redis SET NX pipeline failed",
+                extra={"count": len(keys), "error": str(e)},
+            )
+            raise
+    
+    async def delete_many(self, keys: list[str]) -> int:
+        """
+        Delete multiple keys in one call.
+        
+        Args:
+            keys: Cache keys to delete
+            
+        Returns:
+            Number of keys deleted
+        """
+        if not keys:
+            return 0
+        
+        try:
+            return await self.redis.delete(*[self._make_key(k) for k in keys])
+        except RedisError as e:
+            logger.error(
+                "Redis DELETE failed",
+                extra={"count": len(keys), "error": str(e)},
+            )
+            return 0
+    
     async def clear(self) -> bool:
         """
         Clear all keys with this prefix (use with caution).
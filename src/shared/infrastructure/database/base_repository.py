@@ -4,10 +4,11 @@ Contract for all repository implementations
 """
 from __future__ import annotations
 
-from typing import Any, Generic, Protocol, Sequence, TypeVar
+from typing import Any, AsyncIterator, Generic, Protocol, Sequence, TypeVar
 from uuid import UUID
 
 from shared.domain.base_entity import BaseEntity
+from shared.infrastructure.database.pagination import CursorPage
 
 T = TypeVar("T", bound=BaseEntity, contravariant=True)
 TEntity = TypeVar("TEntity", bound=BaseEntity)
@@ -39,7 +40,65 @@ class IRepository(Protocol, Generic[TEntity]):
             DuplicateEntityError: If entity with same ID already exists
         """
         ...
-    
+
+    async def add_many(
+        self,
+        entities: Sequence[TEntity],
+        chunk_size: int = 1000,
+    ) -> Sequence[TEntity]:
+        """
+        Add many entities in as few statements as possible.
+
+        Args:
+            entities: Domain entities to persist
+            chunk_size: Maximum rows per statement
+
+        Returns:
+            The persisted entities
+        """
+        ...
+
+    async def upsert_many(
+        self,
+        entities: Sequence[TEntity],
+        conflict_columns: Sequence[str] = ("id",),
+        update_columns: Sequence[str] | None = None,
+        chunk_size: int = 1000,
+    ) -> Sequence[TEntity]:
+        """
+        Insert many entities, updating (or skipping) conflicting rows.
+
+        Args:
+            entities: Domain entities to persist
+            conflict_columns: Unique columns forming the conflict target
+            update_columns: Columns overwritten on conflict (None = all,
+                empty = skip conflicting rows)
+            chunk_size: Maximum rows per statement
+
+        Returns:
+            Inserted/updated entities (skipped rows are not returned)
+        """
+        ...
+
+    async def update_many(
+        self,
+        entities: Sequence[TEntity],
+        columns: Sequence[str],
+        chunk_size: int = 5000,
+    ) -> int:
+        """
+        Update the given columns of many entities, matched by ID.
+
+        Args:
+            entities: Entities carrying the new values
+            columns: Column names to update
+            chunk_size: Maximum rows per statement
+
+        Returns:
+            Number of rows updated
+        """
+        ...
+
     async def get_by_id(self, entity_id: UUID) -> TEntity | None:
         """
         Retrieve entity by its unique identifier.
@@ -85,6 +144,51 @@ class IRepository(Protocol, Generic[TEntity]):
         """
         ...
     
+    async def find_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        order_by: str = "created_at",
+        descending: bool = True,
+        **filters: Any,
+    ) -> CursorPage[TEntity]:
+        """
+        Find one page of entities using keyset pagination.
+        
+        Args:
+            limit: Page size
+            cursor: Opaque cursor from the previous page (None for first page)
+            order_by: Sort column name; id breaks ties
+            descending: Newest/largest first
+            **filters: Column filters
+            
+        Returns:
+            CursorPage with items and next_cursor
+            
+        Raises:
+            InvalidCursorError: If cursor is malformed or for another ordering
+        """
+        ...
+    
+    def stream(
+        self,
+        order_by: str | None = None,
+        fetch_size: int = 1000,
+        **filters: Any,
+    ) -> AsyncIterator[TEntity]:
+        """
+        Iterate over all matching entities with a server-side cursor.
+        
+        Args:
+            order_by: Column name to order by
+            fetch_size: Rows fetched per round trip
+            **filters: Column filters
+            
+        Yields:
+            Matching entities
+        """
+        ...
+    
     async def find_one(self, **filters: Any) -> TEntity | None:
         """
         Find single entity matching filters.
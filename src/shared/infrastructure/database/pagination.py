@@ -0,0 +1,109 @@
+"""
+Keyset Pagination
+Opaque cursors over (sort column, id) and the page container returned by
+repositories.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Generic, Sequence, TypeVar
+from uuid import UUID
+
+T = TypeVar("T")
+
+
+class InvalidCursorError(ValueError):
+    """Cursor could not be decoded (tampered, truncated or from another listing)."""
+
+
+@dataclass(frozen=True)
+class CursorPage(Generic[T]):
+    """
+    One page of a keyset-paginated listing.
+
+    Attributes:
+        items: Entities on this page
+        next_cursor: Opaque cursor for the following page (None on the last page)
+    """
+
+    items: Sequence[T] = field(default_factory=list)
+    next_cursor: str | None = None
+
+    @property
+    def has_more(self) -> bool:
+        """Whether another page follows."""
+        return self.next_cursor is not None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, UUID):
+        return {"u": str(value)}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "u" in value:
+            return UUID(value["u"])
+        if "n" in value:
+            return Decimal(value["n"])
+    return value
+
+
+def encode_cursor(sort_key: str, sort_value: Any, entity_id: UUID) -> str:
+    """
+    Build an opaque cursor pointing just after a row.
+
+    Args:
+        sort_key: Name of the sort column (guards against reuse across listings)
+        sort_value: Sort column value of the last row on the page
+        entity_id: ID of the last row on the page (tie-breaker)
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps(
+        [sort_key, _encode_value(sort_value), str(entity_id)],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> tuple[Any, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor string
+        sort_key: Expected sort column name
+
+    Returns:
+        (sort_value, entity_id)
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or for another sort key
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key, value, entity_id = json.loads(base64.urlsafe_b64decode(padded))
+        if key != sort_key:
+            raise InvalidCursorError(f"Cursor is for '{key}' ordering, not '{sort_key}'")
+        return _decode_value(value), UUID(entity_id)
+    except InvalidCursorError:
+        raise
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed pagination cursor") from e
@@ -0,0 +1,328 @@
+"""
+Time Partition Management
+Declarative range partitions: pre-creation of upcoming partitions and
+retention by DETACH + DROP instead of DELETE.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+INTERVALS = ("day", "month")
+
+_BOUND_RE = re.compile(r"FROM \((.+?)\) TO \((.+?)\)")
+
+_PARTITIONS_SQL = text("""
+    SELECT
+        n.nspname || '.' || c.relname AS name,
+        pg_get_expr(c.relpartbound, c.oid) AS bound
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE i.inhparent = CAST(:parent AS regclass)
+""")
+
+# Session-level advisory lock so only one manager runs at a time
+_LOCK_KEY = "partition_manager"
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """
+    Partitioning policy for one range-partitioned table.
+
+    Attributes:
+        table: Schema-qualified parent table
+        column: Partition key column (timestamp)
+        interval: Partition width ("day" or "month")
+        premake: Future partitions kept ready beyond the current one
+        retention: Periods kept (older partitions are dropped); None keeps all
+        retention_guard: SQL predicate; a partition with any matching row is
+            never dropped (e.g. "processed_at IS NULL" for an outbox)
+        archive: Hand expired partitions to the manager's archiver before
+            dropping them; they are kept while no archiver is configured
+    """
+
+    table: str
+    column: str = "created_at"
+    interval: str = "month"
+    premake: int = 3
+    retention: int | None = None
+    retention_guard: str | None = None
+    archive: bool = False
+
+    def __post_init__(self) -> None:
+        if self.interval not in INTERVALS:
+            raise ValueError(f"Unsupported partition interval: {self.interval}")
+        if "." not in self.table:
+            raise ValueError(f"Partitioned table must be schema-qualified: {self.table}")
+
+    @property
+    def schema(self) -> str:
+        return self.table.split(".", 1)[0]
+
+    @property
+    def name(self) -> str:
+        return self.table.split(".", 1)[1]
+
+
+@dataclass(frozen=True)
+class PartitionInfo:
+    """An attached partition and its bounds (None = MINVALUE/MAXVALUE)."""
+
+    name: str
+    lower: datetime | None
+    upper: datetime | None
+    is_default: bool = False
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        if self.is_default:
+            return False
+        return (self.lower is None or self.lower < end) and (self.upper is None or self.upper > start)
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    """Start (UTC) of the period containing moment."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    moment = moment.astimezone(timezone.utc)
+    start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == "month":
+        start = start.replace(day=1)
+    return start
+
+
+def shift_period(start: datetime, interval: str, periods: int = 1) -> datetime:
+    """Move a period start by a number of periods (may be negative)."""
+    if interval == "day":
+        return start + timedelta(days=periods)
+    month = start.month - 1 + periods
+    return start.replace(year=start.year + month // 12, month=month % 12 + 1)
+
+
+def period_bounds(moment: datetime, interval: str) -> tuple[datetime, datetime]:
+    """
+    [start, end) of the partition holding moment.
+
+    Queries that add `column >= start AND column < end` (or any bounds on
+    the partition key) are pruned to the matching partitions at plan or
+    execution time.
+    """
+    start = period_start(moment, interval)
+    return start, shift_period(start, interval)
+
+
+def partition_name(spec: PartitionSpec, start: datetime) -> str:
+    """Unqualified partition name for a period (messages_p202501, ..._p20250107)."""
+    suffix = start.strftime("%Y%m") if spec.interval == "month" else start.strftime("%Y%m%d")
+    return f"{spec.name}_p{suffix}"
+
+
+def _parse_bound(value: str) -> datetime | None:
+    value = value.strip()
+    if value in ("MINVALUE", "MAXVALUE"):
+        return None
+    parsed = datetime.fromisoformat(value.strip("'"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class PartitionManager:
+    """
+    Keeps range-partitioned tables ahead of time and within retention.
+
+    - Creates the current and the next `premake` partitions of every
+      spec. New partitions are empty, so creation is instant; indexes,
+      constraints and row triggers defined on the parent are created on
+      them automatically. DDL runs with a short lock_timeout and is
+      simply retried on the next run if the parent is busy.
+    - Drops partitions that fell out of retention by detaching them
+      (CONCURRENTLY where possible, so writers are not blocked) and
+      dropping the detached table. Cost is independent of row count,
+      and no dead tuples or index bloat are left behind as with DELETE.
+
+    Ranges already covered by an existing partition (e.g. the legacy
+    partition of a converted table) are skipped.
+
+    For specs with archive=True, an expired partition is first passed to
+    `archiver(spec, partition)` while still attached; it is only dropped
+    once the archiver returned, so a failed archive keeps the data.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        specs: Sequence[PartitionSpec],
+        lock_timeout_ms: int = 2000,
+        archiver: Callable[[PartitionSpec, PartitionInfo], Awaitable[Any]] | None = None,
+    ) -> None:
+        self.engine = engine
+        self.specs = list(specs)
+        self.lock_timeout_ms = lock_timeout_ms
+        self.archiver = archiver
+
+    async def run(self, now: datetime | None = None) -> dict[str, dict[str, list[str]]]:
+        """
+        Run one maintenance pass over all specs.
+
+        Returns:
+            {table: {"created": [...], "dropped": [...]}}; empty when another
+            manager holds the maintenance lock
+        """
+        now = now or datetime.now(timezone.utc)
+        summary: dict[str, dict[str, list[str]]] = {}
+
+        async with self.engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            locked = (
+                await conn.execute(text("SELECT pg_try_advisory_lock(hashtext(:key))"), {"key": _LOCK_KEY})
+            ).scalar_one()
+            if not locked:
+                logger.info("Partition maintenance already running elsewhere")
+                return summary
+
+            try:
+                await conn.execute(text(f"SET lock_timeout = {int(self.lock_timeout_ms)}"))
+                for spec in self.specs:
+                    summary[spec.table] = {
+                        "created": await self._run_step(self.ensure_partitions, conn, spec, now),
+                        "dropped": await self._run_step(self.apply_retention, conn, spec, now),
+                    }
+            finally:
+                await conn.execute(text("RESET lock_timeout"))
+                await conn.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), {"key": _LOCK_KEY})
+
+        return summary
+
+    async def _run_step(self, step: Any, conn: AsyncConnection, spec: PartitionSpec, now: datetime) -> list[str]:
+        try:
+            return await step(conn, spec, now)
+        except Exception as e:
+            get_metrics().increment_counter("partition_maintenance_errors_total", table=spec.table)
+            logger.error(
+                "Partition maintenance step failed",
+                extra={"table": spec.table, "step": step.__name__, "error": str(e)},
+            )
+            return []
+
+    async def partitions(self, conn: AsyncConnection, spec: PartitionSpec) -> list[PartitionInfo]:
+        """Attached partitions of a spec's parent table."""
+        result = await conn.execute(_PARTITIONS_SQL, {"parent": spec.table})
+        partitions = []
+        for row in result:
+            if row.bound.strip().upper() == "DEFAULT":
+                partitions.append(PartitionInfo(name=row.name, lower=None, upper=None, is_default=True))
+                continue
+            match = _BOUND_RE.search(row.bound)
+            if not match:
+                continue
+            partitions.append(
+                PartitionInfo(
+                    name=row.name,
+                    lower=_parse_bound(match.group(1)),
+                    upper=_parse_bound(match.group(2)),
+                )
+            )
+        return partitions
+
+    async def ensure_partitions(self, conn: AsyncConnection, spec: PartitionSpec, now: datetime) -> list[str]:
+        """Create missing partitions from the current period to premake ahead."""
+        existing = await self.partitions(conn, spec)
+        quote = conn.dialect.identifier_preparer.quote
+        created: list[str] = []
+
+        start = period_start(now, spec.interval)
+        for _ in range(spec.premake + 1):
+            end = shift_period(start, spec.interval)
+            if not any(partition.overlaps(start, end) for partition in existing):
+                name = partition_name(spec, start)
+                await conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {quote(spec.schema)}.{quote(name)} "
+                    f"PARTITION OF {quote(spec.schema)}.{quote(spec.name)} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                ))
+                existing.append(PartitionInfo(name=f"{spec.schema}.{name}", lower=start, upper=end))
+                created.append(name)
+                get_metrics().increment_counter("partitions_created_total", table=spec.table)
+                logger.info("Partition created", extra={"table": spec.table, "partition": name})
+            start = end
+
+        horizon = max((p.upper for p in existing if p.upper is not None), default=None)
+        if horizon is not None:
+            ahead = horizon - period_start(now, spec.interval)
+            get_metrics().set_gauge("partition_horizon_seconds", ahead.total_seconds(), table=spec.table)
+        return created
+
+    async def apply_retention(self, conn: AsyncConnection, spec: PartitionSpec, now: datetime) -> list[str]:
+        """Detach and drop partitions entirely older than the retention window."""
+        if spec.retention is None:
+            return []
+
+        cutoff = shift_period(period_start(now, spec.interval), spec.interval, -spec.retention)
+        quote = conn.dialect.identifier_preparer.quote
+        parent = f"{quote(spec.schema)}.{quote(spec.name)}"
+        has_default = False
+        expired = []
+        for partition in await self.partitions(conn, spec):
+            has_default = has_default or partition.is_default
+            if not partition.is_default and partition.upper is not None and partition.upper <= cutoff:
+                expired.append(partition)
+
+        dropped: list[str] = []
+        for partition in sorted(expired, key=lambda p: p.upper):
+            schema, name = partition.name.split(".", 1)
+            qualified = f"{quote(schema)}.{quote(name)}"
+
+            if spec.retention_guard:
+                blocked = (await conn.execute(text(
+                    f"SELECT EXISTS (SELECT 1 FROM {qualified} WHERE {spec.retention_guard})"
+                ))).scalar_one()
+                if blocked:
+                    logger.warning(
+                        "Expired partition kept by retention guard",
+                        extra={"table": spec.table, "partition": partition.name, "guard": spec.retention_guard},
+                    )
+                    continue
+
+            if spec.archive:
+                if self.archiver is None:
+                    logger.warning(
+                        "Expired partition kept: archiving requested but no archiver configured",
+                        extra={"table": spec.table, "partition": partition.name},
+                    )
+                    continue
+                await self.archiver(spec, partition)
+
+            await self._detach(conn, parent, qualified, concurrently=not has_default)
+            await conn.execute(text(f"DROP TABLE IF EXISTS {qualified}"))
+            dropped.append(partition.name)
+            get_metrics().increment_counter("partitions_dropped_total", table=spec.table)
+            logger.info("Partition dropped", extra={"table": spec.table, "partition": partition.name})
+
+        return dropped
+
+    async def _detach(self, conn: AsyncConnection, parent: str, partition: str, concurrently: bool) -> None:
+        """
+        Detach a partition, without blocking writers where possible.
+
+        DETACH ... CONCURRENTLY is unavailable with a default partition;
+        an interrupted concurrent detach is completed with FINALIZE.
+        """
+        if not concurrently:
+            await conn.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {partition}"))
+            return
+        try:
+            await conn.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {partition} CONCURRENTLY"))
+        except Exception as e:
+            if "FINALIZE" not in str(e):
+                raise
+            await conn.execute(text(f"ALTER TABLE {parent} DETACH PARTITION {partition} FINALIZE"))
@@ -4,29 +4,65 @@ Sets GUC (Grand Unified Configuration) variables for PostgreSQL RLS
 """
 from __future__ import annotations
 
+import json
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
 
 logger = get_logger(__name__)
 
 
+# GUC names per context field. Identity policies read app.current_*,
+# the config/messaging schema reads app.jwt_tenant via jwt_tenant();
+# both are set together so either family of policies sees the context.
+_ORG_GUCS = ("app.current_org_id", "app.jwt_tenant")
+_USER_GUCS = ("app.current_user_id", "app.user_id")
+_ROLES_JSON_GUC = "app.current_roles"
+_ROLES_CSV_GUC = "app.roles"
+
+# session.info key holding (transaction, savepoint, applied context)
+_APPLIED_KEY = "rls_context"
+
+
 class RLSManager:
     """
     Centralized manager for Row-Level Security enforcement.
     
-    Sets PostgreSQL session variables (GUC) for RLS policies:
-    - app.current_org_id: Organization/tenant ID
-    - app.current_user_id: User ID
-    - app.current_roles: JSON array of roles
+    Sets PostgreSQL transaction-local variables (GUC) for RLS policies:
+    - app.current_org_id / app.jwt_tenant: Organization/tenant ID
+    - app.current_user_id / app.user_id: User ID
+    - app.current_roles (JSON array) / app.roles (comma-separated): Roles
+    
+    All variables are applied in a single SELECT set_config(...) round
+    trip, and the applied context is remembered on the session for the
+    current transaction, so repeated calls from repositories within one
+    transaction cost nothing.
     
     CRITICAL: This is the ONLY place where RLS/GUC should be set.
     Do NOT duplicate this logic in repositories or modules.
     """
     
+    @staticmethod
+    def _applied(session: AsyncSession) -> dict[str, Any] | None:
+        """Context already applied in the session's current transaction."""
+        state = session.info.get(_APPLIED_KEY)
+        if state is None:
+            return None
+        
+        transaction, savepoint, context = state
+        if transaction is None or transaction is not session.get_transaction():
+            return None
+        if savepoint is not None and not savepoint.is_active:
+            # SET LOCAL issued inside a rolled back savepoint is undone
+            return None
+        
+        return context
+    
     @staticmethod
     async def set_tenant_context(
         session: AsyncSession,
@@ -37,7 +73,9 @@ class RLSManager:
         """
         Set tenant context for RLS enforcement.
         
-        Must be called at the start of every request that requires tenant isolation.
+        Cheap to call before every query: a no-op when the same context is
+        already in effect for the session's current transaction, otherwise
+        one round trip regardless of how many variables change.
         
         Args:
             session: Active async database session
@@ -51,37 +89,58 @@ class RLSManager:
         if organization_id is None:
             raise ValueError("organization_id is required for RLS context")
         
+        applied = RLSManager._applied(session) or {}
+        requested = {
+            "organization_id": str(organization_id),
+            "user_id": str(user_id) if user_id is not None else None,
+            "roles": list(roles) if roles else None,
+        }
+        context = {
+            key: value if value is not None else applied.get(key)
+            for key, value in requested.items()
+        }
+        
+        metrics = get_metrics()
+        if context == applied:
+            metrics.increment_counter("rls_context_total", result="reused")
+            return
+        
+        params: dict[str, str] = {}
+        for name in _ORG_GUCS:
+            params[name] = context["organization_id"]
+        if requested["user_id"] is not None:
+            for name in _USER_GUCS:
+                params[name] = requested["user_id"]
+        if requested["roles"] is not None:
+            params[_ROLES_JSON_GUC] = json.dumps(requested["roles"])
+            params[_ROLES_CSV_GUC] = ",".join(requested["roles"])
+        
+        calls = ", ".join(
+            f"set_config('{name}', :p{i}, true)" for i, name in enumerate(params)
+        )
+        
         try:
-            # Set organization ID (required for all RLS policies)
             await session.execute(
-                text("SET LOCAL app.current_org_id = :org_id"),
-                {"org_id": str(organization_id)}
+                text(f"SELECT {calls}"),
+                {f"p{i}": value for i, value in enumerate(params.values())},
             )
-            
-            # Set user ID if provided
-            if user_id is not None:
-                await session.execute(
-                    text("SET LOCAL app.current_user_id = :user_id"),
-                    {"user_id": str(user_id)}
-                )
-            
-            # Set roles if provided (as JSON array)
-            if roles:
-                roles_json = str(roles).replace("'", '"')  # Convert to JSON format
-                await session.execute(
-                    text("SET LOCAL app.current_roles = :roles"),
-                    {"roles": roles_json}
-                )
+            session.info[_APPLIED_KEY] = (
+                session.get_transaction(),
+                session.get_nested_transaction(),
+                context,
+            )
+            metrics.increment_counter("rls_context_total", result="applied")
             
             logger.debug(
                 "RLS context set",
                 extra={
-                    "organization_id": str(organization_id),
-                    "user_id": str(user_id) if user_id else None,
-                    "roles": roles,
+                    "organization_id": context["organization_id"],
+                    "user_id": context["user_id"],
+                    "roles": context["roles"],
                 },
             )
         except Exception as e:
+            session.info.pop(_APPLIED_KEY, None)
             logger.error(
                 "Failed to set RLS context",
                 extra={
@@ -96,15 +155,20 @@ class RLSManager:
         """
         Clear tenant context (reset GUC variables).
         
-        Should be called at the end of request processing.
+        Should be called at the end of request processing. Uses RESET
+        rather than setting empty strings, so a pooled connection carries
+        no session-level tenant value for jwt_tenant() to cast; the DO
+        block keeps it to one round trip.
         
         Args:
             session: Active async database session
         """
+        names = (*_ORG_GUCS, *_USER_GUCS, _ROLES_JSON_GUC, _ROLES_CSV_GUC)
+        resets = " ".join(f"RESET {name};" for name in names)
+        
         try:
-            await session.execute(text("RESET app.current_org_id"))
-            await session.execute(text("RESET app.current_user_id"))
-            await session.execute(text("RESET app.current_roles"))
+            session.info.pop(_APPLIED_KEY, None)
+            await session.execute(text(f"DO $$ BEGIN {resets} END $$"))
             
             logger.debug("RLS context cleared")
         except Exception as e:
@@ -26,7 +26,14 @@ class DatabaseSessionFactory:
     Supports connection pooling and proper lifecycle management.
     """
     
-    def __init__(self, database_url: str, echo: bool = False, pool_size: int = 20, max_overflow: int = 10) -> None:
+    def __init__(
+        self,
+        database_url: str,
+        echo: bool = False,
+        pool_size: int = 20,
+        max_overflow: int = 10,
+        engine: AsyncEngine | None = None,
+    ) -> None:
         """
         Initialize session factory with database connection.
         
@@ -35,12 +42,15 @@ class DatabaseSessionFactory:
             echo: Whether to log SQL statements (debug mode)
             pool_size: Connection pool size
             max_overflow: Max overflow connections beyond pool_size
+            engine: Existing engine to share (e.g. a pool of the engine
+                registry); it is not disposed by this factory
         """
         self.database_url = database_url
         self.echo = echo
+        self._owns_engine = engine is None
         
-        # Create async engine
-        self.engine: AsyncEngine = create_async_engine(
+        # Create async engine (standalone use only)
+        self.engine: AsyncEngine = engine or create_async_engine(
             database_url,
             echo=echo,
             pool_size=pool_size,
@@ -60,7 +70,7 @@ class DatabaseSessionFactory:
         
         logger.info(
             "Database session factory initialized",
-            extra={"pool_size": pool_size, "max_overflow": max_overflow},
+            extra={"shared_engine": not self._owns_engine, "pool_size": pool_size, "max_overflow": max_overflow},
         )
     
     async def create_session(self) -> AsyncSession:
@@ -94,6 +104,8 @@ class DatabaseSessionFactory:
                 await session.close()
     
     async def dispose(self) -> None:
-        """Close all connections and dispose of the engine."""
+        """Close all connections and dispose of the engine (if owned)."""
+        if not self._owns_engine:
+            return
         await self.engine.dispose()
         logger.info("Database engine disposed")
\ No newline at end of file
@@ -4,14 +4,18 @@ Concrete async repository using SQLAlchemy 2.x
 """
 from __future__ import annotations
 
-from typing import Any, Generic, Sequence, Type, TypeVar
+from typing import Any, AsyncIterator, Generic, Sequence, Type, TypeVar
 from uuid import UUID
 
-from sqlalchemy import delete, func, select, text, update
+from sqlalchemy import ARRAY, Select, bindparam, delete, func, select, text, tuple_, update
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.domain.base_entity import BaseEntity
 from shared.infrastructure.database.base_model import Base
+from shared.infrastructure.database.pagination import CursorPage, decode_cursor, encode_cursor
 from shared.infrastructure.observability.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,6 +23,9 @@ logger = get_logger(__name__)
 TEntity = TypeVar("TEntity", bound=BaseEntity)
 TModel = TypeVar("TModel", bound=Base)
 
+# PostgreSQL wire protocol limit on bind parameters per statement
+MAX_BIND_PARAMS = 32767
+
 
 class SQLAlchemyRepository(Generic[TEntity, TModel]):
     """
@@ -111,6 +118,229 @@ class SQLAlchemyRepository(Generic[TEntity, TModel]):
             )
             raise
     
+    # ========================================================================
+    # BULK OPERATIONS
+    # ========================================================================
+    
+    def _to_rows(self, entities: Sequence[TEntity]) -> list[dict[str, Any]]:
+        """
+        Convert entities to column dicts for bulk statements.
+        
+        Every row carries the same keys (multi-row VALUES requires it).
+        Defaulted columns left None on every entity are omitted so the
+        ORM/server default applies, exactly as with session.add().
+        """
+        attrs = [
+            (attr.key, attr.columns[0])
+            for attr in sa_inspect(self.model_class).column_attrs
+        ]
+        models = [self._to_model(entity) for entity in entities]
+        rows = [{column.key: getattr(model, key) for key, column in attrs} for model in models]
+        
+        defaulted = [
+            column.key
+            for _, column in attrs
+            if column.default is not None or column.server_default is not None
+        ]
+        unset = [key for key in defaulted if all(row[key] is None for row in rows)]
+        for row in rows:
+            for key in unset:
+                del row[key]
+        
+        return rows
+    
+    @staticmethod
+    def _chunks(rows: list[dict[str, Any]], chunk_size: int) -> list[list[dict[str, Any]]]:
+        """Split rows so no statement exceeds the bind parameter limit."""
+        if not rows:
+            return []
+        size = max(1, min(chunk_size, MAX_BIND_PARAMS // max(len(rows[0]), 1)))
+        return [rows[i:i + size] for i in range(0, len(rows), size)]
+    
+    async def add_many(
+        self,
+        entities: Sequence[TEntity],
+        chunk_size: int = 1000,
+    ) -> list[TEntity]:
+        """
+        Insert many entities with multi-row INSERT ... RETURNING.
+        
+        One statement per chunk instead of add/flush/refresh per entity.
+        
+        Args:
+            entities: Domain entities to persist
+            chunk_size: Maximum rows per statement (lowered automatically
+                to stay under the bind parameter limit)
+            
+        Returns:
+            Persisted entities as returned by the database
+        """
+        if not entities:
+            return []
+        
+        try:
+            added: list[TEntity] = []
+            rows = self._to_rows(entities)
+            for chunk in self._chunks(rows, chunk_size):
+                stmt = pg_insert(self.model_class).values(chunk).returning(self.model_class)
+                result = await self.session.scalars(stmt)
+                added.extend(self._to_entity(model) for model in result.all())
+            
+            logger.debug(
+                f"Added {len(added)} {self.entity_class.__name__} entities",
+                extra={"count": len(added)},
+            )
+            
+            return added
+        except Exception as e:
+            logger.error(
+                f"Failed to add multiple {self.entity_class.__name__}",
+                extra={"error": str(e), "count": len(entities)},
+            )
+            raise
+    
+    async def upsert_many(
+        self,
+        entities: Sequence[TEntity],
+        conflict_columns: Sequence[str] = ("id",),
+        update_columns: Sequence[str] | None = None,
+        chunk_size: int = 1000,
+    ) -> list[TEntity]:
+        """
+        Insert many entities, resolving conflicts with ON CONFLICT.
+        
+        Args:
+            entities: Domain entities to persist
+            conflict_columns: Unique columns forming the conflict target
+            update_columns: Columns overwritten from the incoming row on
+                conflict; None updates every inserted column except the
+                conflict target and id, an empty sequence means DO NOTHING
+            chunk_size: Maximum rows per statement
+            
+        Returns:
+            Inserted and updated entities. With DO NOTHING, rows that
+            already existed are not returned.
+        """
+        if not entities:
+            return []
+        
+        try:
+            upserted: list[TEntity] = []
+            rows = self._to_rows(entities)
+            for chunk in self._chunks(rows, chunk_size):
+                stmt = pg_insert(self.model_class).values(chunk)
+                
+                columns = update_columns
+                if columns is None:
+                    skip = set(conflict_columns) | {"id", "created_at"}
+                    columns = [key for key in chunk[0] if key not in skip]
+                
+                if columns:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=list(conflict_columns),
+                        set_={column: stmt.excluded[column] for column in columns},
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+                
+                result = await self.session.scalars(
+                    stmt.returning(self.model_class),
+                    execution_options={"populate_existing": True},
+                )
+                upserted.extend(self._to_entity(model) for model in result.all())
+            
+            logger.debug(
+                f"Upserted {len(upserted)} {self.entity_class.__name__} entities",
+                extra={"count": len(upserted), "requested": len(entities)},
+            )
+            
+            return upserted
+        except Exception as e:
+            logger.error(
+                f"Failed to upsert multiple {self.entity_class.__name__}",
+                extra={"error": str(e), "count": len(entities)},
+            )
+            raise
+    
+    async def update_many(
+        self,
+        entities: Sequence[TEntity],
+        columns: Sequence[str],
+        chunk_size: int = 5000,
+    ) -> int:
+        """
+        Update columns of many entities with one UPDATE ... FROM unnest().
+        
+        Each column is bound as a single typed array, so a chunk costs one
+        round trip and len(columns) + 1 parameters regardless of rows.
+        
+        Args:
+            entities: Entities carrying the new values (matched by id)
+            columns: Column names to update
+            chunk_size: Maximum rows per statement
+            
+        Returns:
+            Number of rows updated
+        """
+        if not entities or not columns:
+            return 0
+        
+        table = self.model_class.__table__
+        attr_keys = {
+            attr.columns[0].key: attr.key
+            for attr in sa_inspect(self.model_class).column_attrs
+        }
+        keys = ["id", *[column for column in columns if column != "id"]]
+        unknown = [key for key in keys if key not in attr_keys]
+        if unknown:
+            raise ValueError(f"Unknown columns for {table.fullname}: {unknown}")
+        
+        dialect = postgresql.dialect()
+        preparer = dialect.identifier_preparer
+        quoted = {key: preparer.quote(table.c[key].name) for key in keys}
+        # Positional bind names: column names need not be valid bind identifiers
+        params_of = {key: f"p{index}" for index, key in enumerate(keys)}
+        
+        arrays = ", ".join(
+            f"CAST(:{params_of[key]} AS {table.c[key].type.compile(dialect=dialect)}[])" for key in keys
+        )
+        assignments = ", ".join(f"{quoted[key]} = v.{quoted[key]}" for key in keys[1:])
+        stmt = text(
+            f"""
+            UPDATE {preparer.format_table(table)} AS t
+            SET {assignments}
+            FROM unnest({arrays}) AS v({", ".join(quoted[key] for key in keys)})
+            WHERE t.{quoted["id"]} = v.{quoted["id"]}
+            """
+        ).bindparams(
+            *[bindparam(params_of[key], type_=ARRAY(table.c[key].type)) for key in keys]
+        )
+        
+        try:
+            updated = 0
+            models = [self._to_model(entity) for entity in entities]
+            for start in range(0, len(models), chunk_size):
+                chunk = models[start:start + chunk_size]
+                params = {
+                    params_of[key]: [getattr(model, attr_keys[key]) for model in chunk]
+                    for key in keys
+                }
+                result = await self.session.execute(stmt, params)
+                updated += result.rowcount
+            
+            logger.debug(
+                f"Updated {updated} {self.entity_class.__name__} entities",
+                extra={"count": updated, "columns": list(columns)},
+            )
+            
+            return updated
+        except Exception as e:
+            logger.error(
+                f"Failed to update multiple {self.entity_class.__name__}",
+                extra={"error": str(e), "count": len(entities)},
+            )
+            raise
+    
     async def get_by_id(self, entity_id: UUID) -> TEntity | None:
         """
         Retrieve entity by its unique identifier.
@@ -209,6 +439,144 @@ class SQLAlchemyRepository(Generic[TEntity, TModel]):
             )
             raise
     
+    def _filtered_select(self, **filters: Any) -> Select:
+        """Build SELECT of the model with equality filters on known columns."""
+        stmt = select(self.model_class)
+        for key, value in filters.items():
+            if hasattr(self.model_class, key):
+                stmt = stmt.where(getattr(self.model_class, key) == value)
+        return stmt
+    
+    async def find_page(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        order_by: str = "created_at",
+        descending: bool = True,
+        **filters: Any,
+    ) -> CursorPage[TEntity]:
+        """
+        Find one page of entities using keyset pagination.
+        
+        Orders by (order_by, id) and continues strictly after the cursor,
+        so every page is an index range scan of `limit + 1` rows no
+        matter how deep the client has paged (unlike find_all's OFFSET).
+        
+        Args:
+            limit: Page size
+            cursor: Opaque cursor from the previous page's next_cursor
+            order_by: Sort column name (should be indexed with id)
+            descending: Newest/largest first
+            **filters: Column filters
+            
+        Returns:
+            CursorPage with items and next_cursor
+            
+        Raises:
+            InvalidCursorError: If cursor is malformed or for another ordering
+        """
+        try:
+            return await self._paginate(
+                self._filtered_select(**filters), limit, cursor, order_by, descending
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to page {self.entity_class.__name__} entities",
+                extra={"error": str(e), "filters": filters},
+            )
+            raise
+    
+    async def _paginate(
+        self,
+        stmt: Select,
+        limit: int,
+        cursor: str | None,
+        order_by: str = "created_at",
+        descending: bool = True,
+    ) -> CursorPage[TEntity]:
+        """
+        Apply keyset pagination on (order_by, id) to a model SELECT.
+        
+        Subclasses use this for listings with filters beyond equality
+        (date ranges etc.); find_page is the equality-filter shortcut.
+        
+        Args:
+            stmt: SELECT of self.model_class with filters applied
+            limit: Page size
+            cursor: Opaque cursor from the previous page
+            order_by: Sort column name
+            descending: Newest/largest first
+            
+        Returns:
+            CursorPage with items and next_cursor
+        """
+        sort_column = getattr(self.model_class, order_by)
+        id_column = self.model_class.id
+        
+        if cursor:
+            sort_value, last_id = decode_cursor(cursor, order_by)
+            position = tuple_(sort_column, id_column)
+            after = tuple_(sort_value, last_id)
+            stmt = stmt.where(position < after if descending else position > after)
+        
+        if descending:
+            stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+        else:
+            stmt = stmt.order_by(sort_column.asc(), id_column.asc())
+        
+        # One extra row tells whether another page exists
+        result = await self.session.execute(stmt.limit(limit + 1))
+        models = result.scalars().all()
+        
+        next_cursor = None
+        if len(models) > limit:
+            models = models[:limit]
+            last = models[-1]
+            next_cursor = encode_cursor(order_by, getattr(last, order_by), last.id)
+        
+        return CursorPage(
+            items=[self._to_entity(model) for model in models],
+            next_cursor=next_cursor,
+        )
+    
+    async def stream(
+        self,
+        order_by: str | None = None,
+        fetch_size: int = 1000,
+        **filters: Any,
+    ) -> AsyncIterator[TEntity]:
+        """
+        Iterate over all matching entities through a server-side cursor.
+        
+        Rows are fetched `fetch_size` at a time, so exports and batch jobs
+        run in constant memory. The session's connection is held until
+        iteration finishes.
+        
+        Args:
+            order_by: Column name to order by (id is added as tie-breaker)
+            fetch_size: Rows fetched per round trip
+            **filters: Column filters
+            
+        Yields:
+            Entities in order
+        """
+        stmt = self._filtered_select(**filters)
+        if order_by and hasattr(self.model_class, order_by):
+            stmt = stmt.order_by(getattr(self.model_class, order_by), self.model_class.id)
+        
+        try:
+            result = await self.session.stream_scalars(
+                stmt.execution_options(yield_per=fetch_size)
+            )
+            async for model in result:
+                yield self._to_entity(model)
+        except Exception as e:
+            logger.error(
+                f"Failed to stream {self.entity_class.__name__} entities",
+                extra={"error": str(e), "filters": filters},
+            )
+            raise
+    
     async def find_one(self, **filters: Any) -> TEntity | None:
         """
         Find single entity matching filters.
@@ -0,0 +1,115 @@
+"""
+Named Statement Registry
+Pre-declared raw SQL statements with stable text, built once per variant.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from sqlalchemy import TextClause, text
+
+from shared.infrastructure.observability.logger import get_logger
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = get_logger(__name__)
+
+StatementBuilder = Callable[..., str]
+
+
+class StatementRegistry:
+    """
+    Registry of named raw SQL statements.
+
+    Hot queries with optional filters used to be rebuilt with f-strings
+    and wrapped in a fresh text() on every call. Here each statement is
+    declared once as a builder; every distinct combination of variant
+    flags (which optional filters are present, granularity, ...) is
+    rendered a single time and the same TextClause object is reused.
+
+    The SQL text per variant is therefore byte-for-byte stable, which
+    lets SQLAlchemy's compiled cache and asyncpg's prepared statement
+    cache hit, and the number of variants per statement is bounded.
+
+    Variant flags must be hashable and drawn from small domains
+    (booleans, enums) - never values such as IDs or dates, which belong
+    in bind parameters.
+    """
+
+    def __init__(self) -> None:
+        self._builders: dict[str, StatementBuilder] = {}
+        self._statements: dict[tuple[str, tuple[tuple[str, Any], ...]], TextClause] = {}
+
+    def register(self, name: str, builder: StatementBuilder) -> None:
+        """
+        Declare a named statement.
+
+        Args:
+            name: Unique statement name (e.g. "messages.count")
+            builder: Function returning the SQL text for keyword variant flags
+
+        Raises:
+            ValueError: If the name is already registered
+        """
+        if name in self._builders:
+            raise ValueError(f"Statement '{name}' is already registered")
+        self._builders[name] = builder
+
+    def get(self, name: str, **variant: Any) -> TextClause:
+        """
+        Return the statement for a variant, building it on first use.
+
+        Args:
+            name: Registered statement name
+            **variant: Variant flags passed to the builder
+
+        Returns:
+            Cached TextClause
+
+        Raises:
+            KeyError: If the statement is not registered
+        """
+        key = (name, tuple(sorted(variant.items())))
+        statement = self._statements.get(key)
+        if statement is not None:
+            get_metrics().increment_counter("sql_statement_cache_total", result="hit", statement=name)
+            return statement
+
+        statement = text(self._builders[name](**variant))
+        self._statements[key] = statement
+        get_metrics().increment_counter("sql_statement_cache_total", result="miss", statement=name)
+        logger.debug(
+            "SQL statement variant built",
+            extra={"statement": name, "variant": dict(variant)},
+        )
+        return statement
+
+    def variant_count(self, name: str | None = None) -> int:
+        """Number of built variants (for one statement or all)."""
+        if name is None:
+            return len(self._statements)
+        return sum(1 for key in self._statements if key[0] == name)
+
+
+def where(*conditions: str | None) -> str:
+    """Join the present conditions with AND (builder helper)."""
+    return " AND ".join(condition for condition in conditions if condition)
+
+
+# Global registry instance
+_registry: StatementRegistry | None = None
+
+
+def get_statement_registry() -> StatementRegistry:
+    """Get global statement registry."""
+    global _registry
+    if _registry is None:
+        _registry = StatementRegistry()
+    return _registry
+
+
+def statement(name: str) -> Callable[[StatementBuilder], StatementBuilder]:
+    """Decorator registering a builder in the global registry."""
+    def decorator(builder: StatementBuilder) -> StatementBuilder:
+        get_statement_registry().register(name, builder)
+        return builder
+    return decorator
@@ -309,6 +309,9 @@ class RedisClient:
     def idempotency_key(self, tenant_id: UUID, scope: str, token: str) -> str:
         return self._k("idem", tenant_id, slugify(scope), token)
 
+    def lock_key(self, name: str) -> str:
+        return self._k("lock", slugify(name))
+
 # Global instance
 redis_client = RedisClient()
 
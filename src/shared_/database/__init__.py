@@ -2,20 +2,27 @@ from .database import (
     create_database_engine as init_database,
     close_database_engine as close_database,
     get_engine,
+    get_engine_registry,
     get_session_factory,
 )
+from .engines import EngineRegistry, PoolProfile
 from .types import TenantContext
 from .rls import tenant_context_from_ctxvars, apply_rls_locals, verify_rls_context
-from .sessions import get_session_with_rls, session_from_ctxvars
+from .sessions import get_session_with_rls, session_from_ctxvars, read_session_from_ctxvars
 from .transactions import run_in_transaction, execute_query, get_tenant_from_db_helper
 from .health import DatabaseHealthCheck
-from .deps import get_db_dependency, get_tenant_scoped_db
+from .deps import get_db_dependency, get_tenant_scoped_db, get_read_db, get_analytics_db
+from .replicas import ReplicaRouter, get_replica_router, configure_replica_router
+from .profiler import SqlProfiler, get_sql_profiler, profile_scope
 from .database import get_async_session
 __all__ = [
     "get_async_session",
     "init_database",
     "close_database",
     "get_engine",
+    "get_engine_registry",
+    "EngineRegistry",
+    "PoolProfile",
     "get_session_factory",
     "TenantContext",
     "tenant_context_from_ctxvars",
@@ -23,10 +30,19 @@ __all__ = [
     "verify_rls_context",
     "get_session_with_rls",
     "session_from_ctxvars",
+    "read_session_from_ctxvars",
     "run_in_transaction",
     "execute_query",
     "get_tenant_from_db_helper",
     "DatabaseHealthCheck",
     "get_db_dependency",
     "get_tenant_scoped_db",
+    "get_read_db",
+    "get_analytics_db",
+    "ReplicaRouter",
+    "get_replica_router",
+    "configure_replica_router",
+    "SqlProfiler",
+    "get_sql_profiler",
+    "profile_scope",
 ]
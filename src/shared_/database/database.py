@@ -3,7 +3,7 @@
 database.py — Async SQLAlchemy engine & session factory (tenant-agnostic)
 
 This module owns:
-  - Creating & caching the global AsyncEngine
+  - Creating & caching the engine registry (one pool per workload, see engines.py)
   - Exposing an async session context manager (`get_async_session`)
   - Safe engine disposal for shutdown hooks and tests
   - Minimal, *tenant-agnostic* connection/session settings
@@ -21,19 +21,21 @@ from __future__ import annotations
 
 from contextlib import asynccontextmanager
 from typing import Any, AsyncGenerator, Dict, Optional, Optional  # <-- ensure these
+from uuid import uuid4
 import sqlalchemy as sa
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 import structlog
 from src.config import get_settings
+from src.shared_.database.engines import DEFAULT_WORKLOAD, EngineRegistry, PoolProfile, build_profiles
+from src.shared_.database.profiler import configure_sql_profiler
+from src.shared_.database.replicas import ReplicaRouter, configure_replica_router, get_replica_router
 
 logger = structlog.get_logger(__name__)
 
 # ---- Globals ---------------------------------------------------------------
 
-_engine: Optional[AsyncEngine] = None
-_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+_registry: Optional[EngineRegistry] = None
 
 settings = get_settings()
 
@@ -41,109 +43,164 @@ settings = get_settings()
 
 async def create_database_engine(database_url: str) -> AsyncEngine:
     """
-    Create and configure async database engine with safe pooling and connection args.
+    Create the engine registry (one pool per workload) and return the api engine.
     """
-    global _engine, _session_factory
+    global _registry
     settings = get_settings()
 
-    # Choose pool strategy
-    if settings.IS_TESTING:
-        poolclass = NullPool
-        pool_size = 0
-        max_overflow = 0
-    else:
-        pool_size = settings.database_pool_size
-        max_overflow = settings.database_max_overflow
-
-    _engine = create_async_engine(
+    # database_pool_size/max_overflow keep sizing the api pool
+    overrides = {name: dict(values) for name, values in settings.DB_POOL_OVERRIDES.items()}
+    overrides.setdefault(DEFAULT_WORKLOAD, {})
+    overrides[DEFAULT_WORKLOAD].setdefault("pool_size", settings.database_pool_size)
+    overrides[DEFAULT_WORKLOAD].setdefault("max_overflow", settings.database_max_overflow)
+    profiles = build_profiles(overrides)
+
+    profiler = None
+    if settings.SQL_PROFILER_ENABLED:
+        profiler = configure_sql_profiler(
+            query_budget=settings.SQL_QUERY_BUDGET,
+            n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+            slow_query_ms=settings.SQL_SLOW_QUERY_MS,
+            explain_sample_rate=settings.SQL_EXPLAIN_SAMPLE_RATE,
+            history_size=settings.SQL_PROFILE_HISTORY,
+        )
+
+    _registry = EngineRegistry(
         database_url,
-        echo=settings.debug and not settings.is_production,
-        # echo_pool removed (best controlled via logging config)
-        pool_size=pool_size,
-        max_overflow=max_overflow,
-        pool_timeout=30,
-        pool_recycle=3600,
-        pool_pre_ping=True,
-        connect_args={
-            "server_settings": {
-                "application_name": f"wcp-api-{settings.ENVIRONMENT}",
-                "statement_timeout": "30000",  # 30s
-            }
+        profiles,
+        connect_args=lambda profile: _connect_args(settings, profile),
+        engine_kwargs={
+            "echo": settings.debug and not settings.is_production,
+            "query_cache_size": settings.DB_COMPILED_CACHE_SIZE,
         },
+        validate_interval=settings.DB_POOL_VALIDATE_INTERVAL_SECONDS,
+        testing=settings.IS_TESTING,
+        on_engine=profiler.install if profiler is not None else None,
     )
-
-    _session_factory = async_sessionmaker(
-        bind=_engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autoflush=True,
-        # autocommit removed for SQLAlchemy 2.x
-    )
+    await _registry.start()
+
+    # Optional read replicas for query handlers
+    replica_urls = settings.replica_urls()
+    if replica_urls and not settings.IS_TESTING:
+        router = ReplicaRouter(
+            _registry.session_factory(),
+            replica_urls,
+            max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+            check_interval=settings.REPLICA_CHECK_INTERVAL_SECONDS,
+            token_ttl_seconds=settings.READ_YOUR_WRITES_TTL_SECONDS,
+            engine_factory=lambda name, url: _registry.build_engine(name, url, profiles[DEFAULT_WORKLOAD]),
+            redis=await _pin_store(),
+        )
+        await router.start()
+        configure_replica_router(router)
+        logger.info("Read replicas configured", replicas=len(replica_urls))
 
     # Smoke test
     try:
-        async with _engine.begin() as conn:
+        async with _registry.engine().begin() as conn:
             await conn.execute(text("SELECT 1"))
-        logger.info("Database connection established")
+        logger.info("Database connection established", pools=sorted(profiles))
     except Exception as e:
         logger.error("Failed to connect to database", error=str(e))
         raise
 
-    return _engine
+    return _registry.engine()
+
+
+async def _pin_store():
+    """Redis for read-your-writes pins shared by all instances (None = per process)."""
+    from src.shared_.cache.redis import get_redis
+
+    try:
+        return await get_redis()
+    except Exception as e:
+        logger.warning("Redis unavailable, read-your-writes pins stay per process", error=str(e))
+        return None
+
+
+def _connect_args(settings, profile: Optional[PoolProfile] = None) -> Dict[str, Any]:
+    """
+    asyncpg connection arguments.
+
+    Direct connections keep a per-connection prepared statement cache, so
+    the stable statement text from the statement registry is parsed and
+    planned once per connection. Behind PgBouncer in transaction mode a
+    server connection is not pinned to our client connection, so named
+    prepared statements are disabled and every statement gets a unique
+    name; PgBouncer also rejects unknown startup parameters, so
+    statement_timeout must be set on the database role instead.
+    """
+    server_settings = {"application_name": f"wcp-api-{settings.ENVIRONMENT}"}
+
+    if settings.DB_PGBOUNCER_MODE:
+        return {
+            "server_settings": server_settings,
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    statement_timeout_ms = profile.statement_timeout_ms if profile else 30_000
+    server_settings["statement_timeout"] = str(statement_timeout_ms)
+    return {
+        "server_settings": server_settings,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
 
 
 async def close_database_engine() -> None:
-    """Dispose engine and reset factories."""
-    global _engine, _session_factory
-    if _engine:
-        await _engine.dispose()
-        logger.info("Database engine disposed")
-    _engine = None
-    _session_factory = None
-
-
-def get_engine() -> AsyncEngine:
-    """Return initialized engine or raise."""
-    if _engine is None:
+    """Dispose every pool and reset the registry."""
+    global _registry
+    router = get_replica_router()
+    if router is not None:
+        await router.stop()
+        configure_replica_router(None)
+    if _registry is not None:
+        await _registry.dispose()
+        logger.info("Database engines disposed")
+    _registry = None
+
+
+def get_engine_registry() -> EngineRegistry:
+    """Return the initialized engine registry or raise."""
+    if _registry is None:
         raise RuntimeError("Database engine not initialized. Call create_database_engine first.")
-    return _engine
+    return _registry
+
 
+def get_engine(workload: Optional[str] = None) -> AsyncEngine:
+    """Return the engine of a workload pool (default: api) or raise."""
+    return get_engine_registry().engine(workload)
 
-def get_session_factory() -> async_sessionmaker[AsyncSession]:
+
+def get_session_factory(workload: Optional[str] = None) -> async_sessionmaker[AsyncSession]:
     """
-    Return initialized session factory or lazily initialize it.
+    Return the session factory of a workload pool.
 
-    Returns:
-        async_sessionmaker[AsyncSession]: Configured session factory for async sessions.
+    Args:
+        workload: Pool name (api, dispatch, analytics, maintenance); default api
 
     Raises:
-        RuntimeError: If engine is not initialized and cannot be created.
+        RuntimeError: If the engine registry is not initialized.
     """
-    global _session_factory
-    if _session_factory is None:
-        # Lazy initialization for compatibility with provided get_session()
-        try:
-            _session_factory = async_sessionmaker(
-                bind=get_engine(),
-                class_=AsyncSession,
-                expire_on_commit=False,
-                autoflush=False,  # Explicit flush control for performance
-            )
-            logger.debug("Session factory lazily initialized")
-        except RuntimeError as e:
-            logger.error("Failed to initialize session factory: engine not ready", error=str(e))
-            raise RuntimeError("Session factory not initialized. Call create_database_engine first.")
-    return _session_factory
+    try:
+        return get_engine_registry().session_factory(workload)
+    except RuntimeError as e:
+        logger.error("Failed to get session factory: engine not ready", error=str(e))
+        raise RuntimeError("Session factory not initialized. Call create_database_engine first.")
 
 
 # ---- Sessions --------------------------------------------------------------
 
 @asynccontextmanager
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+async def get_async_session(workload: Optional[str] = None) -> AsyncGenerator[AsyncSession, None]:
     """
     Yield an AsyncSession with automatic rollback on error and proper close.
+
+    Args:
+        workload: Pool to draw the connection from (default: api)
     """
-    session_factory = get_session_factory()
+    session_factory = get_session_factory(workload)
     async with session_factory() as session:
         try:
             yield session
@@ -168,18 +225,8 @@ class DatabaseHealthCheck:
                 if not row or row.health_check != 1:
                     return {"healthy": False, "error": "health check failed"}
 
-            # pool metrics (where available)
-            payload: Dict[str, Any] = {"healthy": True}
-            pool = engine.pool
-            if hasattr(pool, "size"):
-                payload["pool_size"] = pool.size()  # type: ignore[attr-defined]
-            if hasattr(pool, "checkedin"):
-                payload["checked_in"] = pool.checkedin()  # type: ignore[attr-defined]
-            if hasattr(pool, "checkedout"):
-                payload["checked_out"] = pool.checkedout()  # type: ignore[attr-defined]
-            if hasattr(pool, "overflow"):
-                payload["overflow"] = pool.overflow()  # type: ignore[attr-defined]
-            return payload
+            # per-workload pool occupancy
+            return {"healthy": True, "pools": get_engine_registry().pool_status()}
         except Exception as e:
             logger.error("Database health check failed", error=str(e))
             return {"healthy": False, "error": str(e)}
@@ -6,7 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.shared_.http.public_paths import is_public_path
 from src.shared_.database.database import get_async_session
-from src.shared_.database.sessions import session_from_ctxvars
+from src.shared_.database.replicas import CONSISTENCY_TOKEN_HEADER
+from src.shared_.database.sessions import read_session_from_ctxvars, session_from_ctxvars
 
 
 async def get_db_dependency() -> AsyncGenerator[AsyncSession, None]:
@@ -20,4 +21,35 @@ async def get_tenant_scoped_db(request: Request):
     # Public endpoints (favicon/docs/health/webhook/auth) should not require tenant
     require_tenant = not is_public_path(request.url.path)
     async with session_from_ctxvars(require_tenant=require_tenant) as session:
+        yield session
+
+
+async def get_read_db(request: Request):
+    """
+    FastAPI: tenant-scoped read-only session for query handlers.
+
+    Routed to a replica unless replicas lag or have not yet replayed this
+    tenant's recent writes (or the client's X-Consistency-Token).
+    """
+    require_tenant = not is_public_path(request.url.path)
+    async with read_session_from_ctxvars(
+        require_tenant=require_tenant,
+        consistency_token=request.headers.get(CONSISTENCY_TOKEN_HEADER),
+    ) as session:
+        yield session
+
+
+async def get_analytics_db(request: Request):
+    """
+    FastAPI: tenant-scoped read-only session for reporting queries.
+
+    Same routing as get_read_db, but primary reads draw from the
+    analytics pool so long reports cannot exhaust the api pool.
+    """
+    require_tenant = not is_public_path(request.url.path)
+    async with read_session_from_ctxvars(
+        require_tenant=require_tenant,
+        consistency_token=request.headers.get(CONSISTENCY_TOKEN_HEADER),
+        workload="analytics",
+    ) as session:
         yield session
\ No newline at end of file
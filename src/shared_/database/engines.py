@@ -0,0 +1,298 @@
+"""
+engines.py — Named connection pools per workload (bulkheads)
+
+Every workload gets its own AsyncEngine and therefore its own pool:
+
+  - api:         request handlers (short queries, short checkout timeout)
+  - dispatch:    outbox / message sending workers
+  - analytics:   reporting queries (small pool, long statement timeout)
+  - maintenance: partition, rollup and archive jobs
+
+A slow analytics query can exhaust only the analytics pool; message
+dispatch keeps its own connections.
+
+Pools are instrumented per name (checkout wait, checkout timeouts,
+in-use and overflow gauges). Instead of `pool_pre_ping` (one extra round
+trip on every checkout), connections are validated by idle age: a
+checkout pings only a connection that sat idle longer than
+`validate_after_seconds`, and a background task cycles idle connections
+through that check so request paths rarely pay for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+import structlog
+
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_WORKLOAD = "api"
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    """
+    Pool settings of one workload.
+
+    Attributes:
+        pool_size: Connections kept open
+        max_overflow: Extra connections opened under load
+        pool_timeout: Seconds to wait for a free connection before failing
+        pool_recycle: Connections older than this are replaced (seconds)
+        statement_timeout_ms: Server-side statement timeout (0 = none)
+        validate_after_seconds: Idle time after which a connection is pinged
+    """
+
+    pool_size: int = 10
+    max_overflow: int = 5
+    pool_timeout: float = 10.0
+    pool_recycle: int = 3600
+    statement_timeout_ms: int = 30_000
+    validate_after_seconds: float = 60.0
+
+
+DEFAULT_PROFILES: Dict[str, PoolProfile] = {
+    "api": PoolProfile(pool_size=20, max_overflow=10, pool_timeout=5.0),
+    "dispatch": PoolProfile(pool_size=10, max_overflow=5, pool_timeout=10.0),
+    "analytics": PoolProfile(pool_size=5, max_overflow=0, pool_timeout=2.0, statement_timeout_ms=120_000),
+    "maintenance": PoolProfile(pool_size=2, max_overflow=1, pool_timeout=30.0, statement_timeout_ms=0),
+}
+
+
+def build_profiles(overrides: Optional[Mapping[str, Mapping[str, Any]]] = None) -> Dict[str, PoolProfile]:
+    """
+    Default profiles with per-workload overrides applied.
+
+    Args:
+        overrides: {"analytics": {"pool_size": 10}, ...}; unknown names
+            add a workload based on the default PoolProfile
+    """
+    profiles = dict(DEFAULT_PROFILES)
+    for name, values in (overrides or {}).items():
+        profiles[name] = replace(profiles.get(name, PoolProfile()), **values)
+    return profiles
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool reporting checkout wait and occupancy under its label."""
+
+    label = DEFAULT_WORKLOAD
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            get_metrics().increment_counter("db_pool_checkout_timeouts_total", pool=self.label)
+            raise
+        get_metrics().observe_histogram("db_pool_checkout_wait_seconds", time.perf_counter() - started, pool=self.label)
+        self._report()
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._report()
+
+    def _report(self) -> None:
+        metrics = get_metrics()
+        metrics.set_gauge("db_pool_in_use", float(self.checkedout()), pool=self.label)
+        metrics.set_gauge("db_pool_overflow", float(max(self.overflow(), 0)), pool=self.label)
+        metrics.set_gauge("db_pool_size", float(self.size()), pool=self.label)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.label = self.label
+        return pool
+
+
+def _install_validation(engine: AsyncEngine, validate_after_seconds: float) -> None:
+    """Ping connections that were idle too long when they are checked out."""
+    sync_engine = engine.sync_engine
+    dialect = sync_engine.dialect
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection, record):
+        record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, record):
+        record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, record, proxy):
+        idle_since = record.info.get("idle_since")
+        if idle_since is None or time.monotonic() - idle_since < validate_after_seconds:
+            return
+        try:
+            dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # The pool discards this connection and retries with a new one
+            get_metrics().increment_counter("db_pool_stale_connections_total", pool=engine.pool.label)
+            raise exc.DisconnectionError(f"Stale pooled connection: {e}")
+        record.info["idle_since"] = time.monotonic()
+
+
+class EngineRegistry:
+    """
+    Owns one engine (and session factory) per workload.
+
+    Attributes:
+        profiles: Pool profile per workload name
+        validate_interval: Seconds between background validation sweeps
+    """
+
+    def __init__(
+        self,
+        database_url: str,
+        profiles: Mapping[str, PoolProfile],
+        connect_args: Callable[[PoolProfile], Dict[str, Any]],
+        engine_kwargs: Optional[Dict[str, Any]] = None,
+        validate_interval: float = 30.0,
+        testing: bool = False,
+        on_engine: Optional[Callable[[AsyncEngine], None]] = None,
+    ) -> None:
+        """
+        Initialize registry and create every workload's engine.
+
+        Args:
+            database_url: Primary database URL
+            profiles: Pool profile per workload name
+            connect_args: Builds driver connect args for a profile
+            engine_kwargs: Extra create_async_engine arguments for all engines
+            validate_interval: Seconds between background validation sweeps
+            testing: Use NullPool (no pooling) for every workload
+            on_engine: Called with every engine built (e.g. to attach listeners)
+        """
+        if DEFAULT_WORKLOAD not in profiles:
+            raise ValueError(f"Engine registry needs a '{DEFAULT_WORKLOAD}' pool profile")
+
+        self.profiles = dict(profiles)
+        self.validate_interval = validate_interval
+        self._connect_args = connect_args
+        self._engine_kwargs = engine_kwargs or {}
+        self._testing = testing
+        self._on_engine = on_engine
+        self._engines: Dict[str, AsyncEngine] = {}
+        self._session_factories: Dict[str, async_sessionmaker[AsyncSession]] = {}
+        self._validator: Optional[asyncio.Task] = None
+
+        for name, profile in self.profiles.items():
+            engine = self.build_engine(name, database_url, profile)
+            self._engines[name] = engine
+            self._session_factories[name] = async_sessionmaker(
+                bind=engine,
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=True,
+            )
+
+    def build_engine(self, label: str, url: str, profile: PoolProfile) -> AsyncEngine:
+        """Create an instrumented engine for a profile (also used for replicas)."""
+        if self._testing:
+            engine = create_async_engine(
+                url, poolclass=NullPool, connect_args=self._connect_args(profile), **self._engine_kwargs
+            )
+        else:
+            engine = create_async_engine(
+                url,
+                poolclass=InstrumentedQueuePool,
+                pool_size=profile.pool_size,
+                max_overflow=profile.max_overflow,
+                pool_timeout=profile.pool_timeout,
+                pool_recycle=profile.pool_recycle,
+                pool_pre_ping=False,
+                connect_args=self._connect_args(profile),
+                **self._engine_kwargs,
+            )
+            engine.pool.label = label
+            _install_validation(engine, profile.validate_after_seconds)
+
+        if self._on_engine is not None:
+            self._on_engine(engine)
+        return engine
+
+    # ---- Lookup ------------------------------------------------------------
+
+    def engine(self, workload: Optional[str] = None) -> AsyncEngine:
+        """Engine of a workload (default: api)."""
+        return self._engines[self._resolve(workload)]
+
+    def session_factory(self, workload: Optional[str] = None) -> async_sessionmaker[AsyncSession]:
+        """Session factory of a workload (default: api)."""
+        return self._session_factories[self._resolve(workload)]
+
+    def _resolve(self, workload: Optional[str]) -> str:
+        name = workload or DEFAULT_WORKLOAD
+        if name not in self._engines:
+            raise KeyError(f"Unknown database workload '{name}' (configured: {', '.join(sorted(self._engines))})")
+        return name
+
+    def pool_status(self) -> Dict[str, Dict[str, int]]:
+        """Occupancy of every pool (for health checks)."""
+        status: Dict[str, Dict[str, int]] = {}
+        for name, engine in self._engines.items():
+            pool = engine.pool
+            if isinstance(pool, AsyncAdaptedQueuePool):
+                status[name] = {
+                    "size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                }
+        return status
+
+    # ---- Lifecycle ---------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start background validation of idle connections."""
+        if self._validator is None and not self._testing:
+            self._validator = asyncio.create_task(self._validate_loop())
+
+    async def dispose(self) -> None:
+        """Stop validation and close every pool."""
+        if self._validator is not None:
+            self._validator.cancel()
+            try:
+                await self._validator
+            except asyncio.CancelledError:
+                pass
+            self._validator = None
+        for engine in self._engines.values():
+            await engine.dispose()
+
+    async def _validate_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.validate_interval)
+            for name, engine in self._engines.items():
+                try:
+                    await self.validate_idle(engine)
+                except Exception as e:
+                    logger.warning("Pool validation sweep failed", pool=name, error=str(e))
+
+    @staticmethod
+    async def validate_idle(engine: AsyncEngine) -> None:
+        """
+        Cycle the idle connections of a pool through the age check.
+
+        The queue pool hands out idle connections oldest first, so
+        borrowing each idle connection once (one at a time, never more
+        than are idle) pings exactly the stale ones and replaces dead
+        ones, without ever holding a connection a workload is waiting for.
+        """
+        pool = engine.pool
+        if not isinstance(pool, AsyncAdaptedQueuePool):
+            return
+        for _ in range(pool.checkedin()):
+            if pool.checkedin() == 0:
+                break
+            async with engine.connect():
+                pass
@@ -5,7 +5,7 @@ from sqlalchemy import text
 import structlog
 
 from src.shared_.database import get_engine, get_session_factory
-from src.shared_.database.database import get_async_session
+from src.shared_.database.database import get_async_session, get_engine_registry
 
 logger = structlog.get_logger(__name__)
 
@@ -26,6 +26,7 @@ class DatabaseHealthCheck:
             for name in ("size", "checkedin", "checkedout", "overflow"):
                 if hasattr(pool, name):
                     payload[name if name != "size" else "pool_size"] = getattr(pool, name)()  # type: ignore
+            payload["pools"] = get_engine_registry().pool_status()
             return payload
         except Exception as e:
             logger.error("Database health check failed", error=str(e))
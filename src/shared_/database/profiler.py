@@ -0,0 +1,323 @@
+"""
+profiler.py — SQL profiling per request / background job
+
+Engine event listeners time every statement and attribute it to the
+current *scope* (an HTTP request or an outbox job), tracked in a
+ContextVar:
+
+  - statements are grouped by normalized SQL (literals, bind markers and
+    IN/VALUES lists collapsed), with count, total and max time
+  - a statement repeated `n_plus_one_threshold` times in one scope is
+    flagged as a probable N+1 (a lookup issued from a loop)
+  - a scope issuing more than `query_budget` statements is flagged
+  - slow SELECTs can be sampled with EXPLAIN (ANALYZE, BUFFERS) on the
+    same connection, inside a savepoint, so the plan is taken under the
+    same RLS context and a failing EXPLAIN cannot abort the transaction
+
+Each finished scope is logged as one summary line, exported as metrics
+and kept in a bounded history for the debug endpoint.
+
+Usage:
+    profiler = configure_sql_profiler(query_budget=25)
+    profiler.install(engine)
+    async with profile_scope("GET /api/messages", kind="request") as profile:
+        ...
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+import structlog
+
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = structlog.get_logger(__name__)
+
+_current: ContextVar[Optional["QueryProfile"]] = ContextVar("sql_profile", default=None)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_RE = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<![:\w]):\w+|\?")
+_LIST_RE = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_VALUES_RE = re.compile(r"(VALUES\s*\(\?\))(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+_EXPLAINABLE_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITES_RE = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE)\b|\bFOR\s+(UPDATE|SHARE)\b|nextval\(", re.IGNORECASE)
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Fingerprint text of a statement.
+
+    Statements differing only in literal values, bind markers or the
+    length of IN/VALUES lists normalize to the same text.
+    """
+    sql = _STRING_RE.sub("?", statement)
+    sql = _BIND_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    sql = _SPACE_RE.sub(" ", sql).strip()
+    sql = _LIST_RE.sub("(?)", sql)
+    return _VALUES_RE.sub(r"\1, ...", sql)
+
+
+@dataclass
+class StatementStats:
+    """Timings of one normalized statement within a scope."""
+
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "sql": self.sql,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+@dataclass
+class QueryProfile:
+    """Statements issued by one request or job."""
+
+    label: str
+    kind: str = "request"
+    started_at: float = field(default_factory=time.time)
+    queries: int = 0
+    total_ms: float = 0.0
+    statements: Dict[str, StatementStats] = field(default_factory=dict)
+    explains: Dict[str, Any] = field(default_factory=dict)
+
+    def record(self, sql: str, duration_ms: float) -> StatementStats:
+        self.queries += 1
+        self.total_ms += duration_ms
+        stats = self.statements.get(sql)
+        if stats is None:
+            stats = self.statements[sql] = StatementStats(sql)
+        stats.count += 1
+        stats.total_ms += duration_ms
+        stats.max_ms = max(stats.max_ms, duration_ms)
+        return stats
+
+    def repeated(self, threshold: int) -> List[StatementStats]:
+        """Statements issued at least threshold times (probable N+1)."""
+        return sorted(
+            (stats for stats in self.statements.values() if stats.count >= threshold),
+            key=lambda stats: stats.count,
+            reverse=True,
+        )
+
+    def summary(self, threshold: int, top: int = 10) -> Dict[str, Any]:
+        slowest = sorted(self.statements.values(), key=lambda stats: stats.total_ms, reverse=True)[:top]
+        return {
+            "label": self.label,
+            "kind": self.kind,
+            "started_at": self.started_at,
+            "queries": self.queries,
+            "distinct_statements": len(self.statements),
+            "db_ms": round(self.total_ms, 2),
+            "n_plus_one": [stats.as_dict() for stats in self.repeated(threshold)],
+            "top_statements": [stats.as_dict() for stats in slowest],
+            "explains": self.explains,
+        }
+
+
+class SqlProfiler:
+    """
+    Engine listeners plus scope bookkeeping.
+
+    Attributes:
+        query_budget: Statements per scope before a scope is flagged
+        n_plus_one_threshold: Repeats of one statement flagged as N+1
+        slow_query_ms: Statements slower than this are EXPLAIN candidates
+        explain_sample_rate: Fraction of slow SELECTs explained (0 = off)
+        explain_cooldown_seconds: Minimum gap between EXPLAINs of one statement
+        history: Recent scope summaries (for the debug endpoint)
+    """
+
+    def __init__(
+        self,
+        query_budget: int = 25,
+        n_plus_one_threshold: int = 5,
+        slow_query_ms: float = 200.0,
+        explain_sample_rate: float = 0.0,
+        explain_cooldown_seconds: float = 300.0,
+        history_size: int = 200,
+    ) -> None:
+        self.query_budget = query_budget
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.slow_query_ms = slow_query_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_cooldown_seconds = explain_cooldown_seconds
+        self.history: Deque[Dict[str, Any]] = deque(maxlen=history_size)
+        self._explained_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    # ---- Engine listeners --------------------------------------------------
+
+    def install(self, engine: AsyncEngine) -> None:
+        """Attach the timing listeners to an engine."""
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("sql_profiler_started", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = conn.info.get("sql_profiler_started")
+        if not started:
+            return
+        duration_ms = (time.perf_counter() - started.pop()) * 1000.0
+
+        profile = _current.get()
+        if profile is None:
+            return
+
+        sql = normalize_sql(statement)
+        profile.record(sql, duration_ms)
+
+        if duration_ms >= self.slow_query_ms and self._should_explain(sql, statement, context):
+            plan = self._explain(conn, statement, parameters)
+            if plan is not None:
+                profile.explains[sql] = plan
+
+    def _handle_error(self, exception_context) -> None:
+        # A failed statement never reaches after_cursor_execute; drop its
+        # start time so later statements on the connection pair correctly
+        conn = exception_context.connection
+        if conn is None or exception_context.cursor is None:
+            return
+        started = conn.info.get("sql_profiler_started")
+        if started:
+            started.pop()
+
+    def _should_explain(self, sql: str, statement: str, context: Any) -> bool:
+        if self.explain_sample_rate <= 0 or random.random() >= self.explain_sample_rate:
+            return False
+        if not _EXPLAINABLE_RE.match(statement) or _WRITES_RE.search(statement):
+            return False
+        if context is not None and context.execution_options.get("stream_results"):
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._explained_at.get(sql, float("-inf")) < self.explain_cooldown_seconds:
+                return False
+            self._explained_at[sql] = now
+        return True
+
+    def _explain(self, conn, statement: str, parameters: Any) -> Optional[Dict[str, Any]]:
+        """EXPLAIN (ANALYZE, BUFFERS) on the same connection, inside a savepoint."""
+        cursor = conn.connection.cursor()
+        in_savepoint = False
+        try:
+            cursor.execute("SAVEPOINT sql_profiler_explain")
+            in_savepoint = True
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+            raw = cursor.fetchone()[0]
+            cursor.execute("RELEASE SAVEPOINT sql_profiler_explain")
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+            get_metrics().increment_counter("db_explain_samples_total")
+            return {
+                "execution_ms": plan.get("Execution Time"),
+                "planning_ms": plan.get("Planning Time"),
+                "plan": plan.get("Plan"),
+            }
+        except Exception as e:
+            if in_savepoint:
+                try:
+                    cursor.execute("ROLLBACK TO SAVEPOINT sql_profiler_explain")
+                except Exception:
+                    pass
+            logger.debug("EXPLAIN sample skipped", error=str(e))
+            return None
+        finally:
+            cursor.close()
+
+    # ---- Scopes ------------------------------------------------------------
+
+    def finish(self, profile: QueryProfile) -> Dict[str, Any]:
+        """Log, export and remember a finished scope."""
+        summary = profile.summary(self.n_plus_one_threshold)
+        over_budget = profile.queries > self.query_budget
+        summary["over_budget"] = over_budget
+
+        metrics = get_metrics()
+        metrics.observe_histogram("db_queries_per_scope", float(profile.queries), kind=profile.kind)
+        metrics.observe_histogram("db_time_per_scope_ms", profile.total_ms, kind=profile.kind)
+        if summary["n_plus_one"]:
+            metrics.increment_counter("db_n_plus_one_total", kind=profile.kind)
+        if over_budget:
+            metrics.increment_counter("db_query_budget_exceeded_total", kind=profile.kind)
+
+        log = logger.warning if over_budget or summary["n_plus_one"] else logger.info
+        log(
+            "sql_profile",
+            scope=profile.label,
+            kind=profile.kind,
+            queries=profile.queries,
+            distinct_statements=summary["distinct_statements"],
+            db_ms=summary["db_ms"],
+            over_budget=over_budget,
+            n_plus_one=[(stats["sql"][:200], stats["count"]) for stats in summary["n_plus_one"]],
+            explained=len(profile.explains),
+        )
+
+        self.history.append(summary)
+        return summary
+
+
+_profiler: Optional[SqlProfiler] = None
+
+
+def get_sql_profiler() -> Optional[SqlProfiler]:
+    """Global profiler (None when SQL profiling is disabled)."""
+    return _profiler
+
+
+def configure_sql_profiler(**options: Any) -> SqlProfiler:
+    """Install the global profiler (options as for SqlProfiler)."""
+    global _profiler
+    _profiler = SqlProfiler(**options)
+    return _profiler
+
+
+def current_profile() -> Optional[QueryProfile]:
+    """Profile of the scope running in this context, if any."""
+    return _current.get()
+
+
+@asynccontextmanager
+async def profile_scope(label: str, kind: str = "request") -> AsyncGenerator[Optional[QueryProfile], None]:
+    """
+    Attribute statements issued inside the block to one scope.
+
+    Yields None (and costs nothing) when profiling is disabled.
+    """
+    profiler = _profiler
+    if profiler is None:
+        yield None
+        return
+
+    profile = QueryProfile(label=label, kind=kind)
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+        profiler.finish(profile)
@@ -0,0 +1,391 @@
+"""
+replicas.py — Read-replica routing with lag awareness and read-your-writes.
+
+Query handlers get sessions from `ReplicaRouter.read_session_factory()`:
+  - A replica is eligible when its last health probe succeeded, its
+    replay lag is within `max_lag_seconds`, and it has replayed at least
+    the WAL position the caller must observe (its read-your-writes token).
+  - Otherwise reads fall back to the primary.
+
+Read-your-writes:
+  - Requests run inside `track_writes()` (ConsistencyTokenMiddleware).
+    Once one commits a write on the primary, `issue_token()` captures
+    `pg_current_wal_lsn()` as a consistency token, returned to the client
+    in the X-Consistency-Token header (CONSISTENCY_TOKEN_HEADER) and
+    pinned for the tenant for `token_ttl_seconds`.
+  - Tenant pins live in Redis, so a follow-up read served by another API
+    instance still waits for the write (in process memory only when no
+    Redis is configured). Clients can also send a token back explicitly.
+
+Lag is probed in the background every `check_interval` seconds with one
+query per replica, so routing itself never adds a round trip.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import structlog
+from sqlalchemy import TextClause, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from shared.infrastructure.observability.metrics import get_metrics
+
+logger = structlog.get_logger(__name__)
+
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+
+# Highest WAL position the current request must observe
+_request_token: ContextVar[int] = ContextVar("db_consistency_token", default=0)
+
+# Raise a tenant's pinned LSN (never lower it) and refresh its TTL
+_PIN_LUA = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tonumber(ARGV[1]) > current then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+else
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+_LAG_SQL = text(
+    """
+    SELECT
+        pg_last_wal_replay_lsn()::text AS replay_lsn,
+        CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+        END AS lag_seconds
+    """
+)
+_WRITE_LSN_SQL = text("SELECT pg_current_wal_lsn()::text")
+
+
+def parse_lsn(lsn: Optional[str]) -> int:
+    """Convert a Postgres LSN ('16/B374D848') to a comparable integer (0 if invalid)."""
+    if not lsn:
+        return 0
+    try:
+        high, low = lsn.split("/", 1)
+        return (int(high, 16) << 32) | int(low, 16)
+    except ValueError:
+        return 0
+
+
+# ---- Write tracking ---------------------------------------------------------
+# The request's WriteTracker is marked once a transaction containing writes
+# commits, so only requests that wrote pay for issue_token().
+
+
+@dataclass
+class WriteTracker:
+    """Whether (and for which tenant) the current request committed a write."""
+
+    committed: bool = False
+    tenant_id: Optional[str] = None
+
+
+_request_writes: ContextVar[Optional[WriteTracker]] = ContextVar("db_request_writes", default=None)
+
+
+@contextmanager
+def track_writes() -> Iterator[WriteTracker]:
+    """Track committed writes of everything run inside (one request)."""
+    tracker = WriteTracker()
+    reset = _request_writes.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _request_writes.reset(reset)
+
+
+_WRITE_PREFIXES = ("insert", "update", "delete", "with", "merge", "copy")
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context: Any) -> None:
+    session.info["pending_write"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_execute(state: ORMExecuteState) -> None:
+    statement = state.statement
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["pending_write"] = True
+    elif isinstance(statement, TextClause) and statement.text.lstrip().lower().startswith(_WRITE_PREFIXES):
+        state.session.info["pending_write"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_commit(session: Session) -> None:
+    if not session.info.pop("pending_write", False):
+        return
+    tracker = _request_writes.get()
+    if tracker is not None:
+        from src.shared_.database.rls import tenant_context_from_ctxvars
+
+        ctx = tenant_context_from_ctxvars()
+        tracker.committed = True
+        tracker.tenant_id = (ctx.tenant_id if ctx else None) or tracker.tenant_id
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_pending(session: Session, previous_transaction: Any) -> None:
+    session.info.pop("pending_write", None)
+
+
+@dataclass
+class ReplicaState:
+    """Last probe result for one replica."""
+
+    name: str
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    replay_lsn: int = 0
+    lag_seconds: float = float("inf")
+    healthy: bool = False
+    checked_at: float = 0.0
+
+
+class ReplicaRouter:
+    """
+    Routes read sessions between the primary and streaming replicas.
+
+    Attributes:
+        primary_factory: Session factory bound to the primary
+        replicas: Probed replica states
+        max_lag_seconds: Replicas lagging more than this are skipped
+        token_ttl_seconds: How long a tenant's last write pins reads
+        redis: Shared client holding tenant pins (None = this process only)
+    """
+
+    PIN_KEY_PREFIX = "db:read_your_writes"
+
+    def __init__(
+        self,
+        primary_factory: async_sessionmaker[AsyncSession],
+        replica_urls: Sequence[str],
+        max_lag_seconds: float = 5.0,
+        check_interval: float = 1.0,
+        token_ttl_seconds: float = 30.0,
+        engine_kwargs: Optional[Dict[str, Any]] = None,
+        engine_factory: Optional[Callable[[str, str], AsyncEngine]] = None,
+        redis: Optional[Any] = None,
+    ) -> None:
+        self.primary_factory = primary_factory
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.token_ttl_seconds = token_ttl_seconds
+        self.redis = redis
+
+        self.replicas: List[ReplicaState] = []
+        for index, url in enumerate(replica_urls):
+            name = f"replica-{index}"
+            if engine_factory is not None:
+                engine = engine_factory(name, url)
+            else:
+                engine = create_async_engine(url, **(engine_kwargs or {}))
+            self.replicas.append(
+                ReplicaState(
+                    name=name,
+                    engine=engine,
+                    session_factory=async_sessionmaker(
+                        bind=engine,
+                        class_=AsyncSession,
+                        expire_on_commit=False,
+                        autoflush=False,
+                    ),
+                )
+            )
+
+        self._tenant_tokens: Dict[str, tuple[int, float]] = {}
+        self._round_robin = itertools.count()
+        self._monitor: Optional[asyncio.Task] = None
+
+    # ---- Lifecycle ---------------------------------------------------------
+
+    async def start(self) -> None:
+        """Probe replicas once, then keep probing in the background."""
+        await self.check_replicas()
+        if self._monitor is None and self.replicas:
+            self._monitor = asyncio.create_task(self._monitor_loop())
+
+    async def stop(self) -> None:
+        """Stop probing and dispose replica engines."""
+        if self._monitor is not None:
+            self._monitor.cancel()
+            try:
+                await self._monitor
+            except asyncio.CancelledError:
+                pass
+            self._monitor = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _monitor_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_replicas()
+
+    async def check_replicas(self) -> None:
+        """Refresh replay position and lag of every replica concurrently."""
+        await asyncio.gather(*(self._check(replica) for replica in self.replicas))
+
+    async def _check(self, replica: ReplicaState) -> None:
+        metrics = get_metrics()
+        try:
+            async with replica.engine.connect() as conn:
+                row = (await conn.execute(_LAG_SQL)).one()
+            replica.replay_lsn = parse_lsn(row.replay_lsn)
+            replica.lag_seconds = float(row.lag_seconds)
+            replica.healthy = replica.replay_lsn > 0  # NULL when not in recovery
+            if not replica.healthy:
+                logger.warning("Configured replica is not in recovery", replica=replica.name)
+        except Exception as e:
+            if replica.healthy:
+                logger.warning("Replica probe failed", replica=replica.name, error=str(e))
+            replica.healthy = False
+            replica.lag_seconds = float("inf")
+        replica.checked_at = time.monotonic()
+
+        metrics.set_gauge(
+            "db_replica_lag_seconds",
+            replica.lag_seconds if replica.healthy else -1,
+            replica=replica.name,
+        )
+
+    # ---- Read-your-writes tokens ------------------------------------------
+
+    async def issue_token(self, tenant_id: Optional[str]) -> str:
+        """
+        Capture the primary's WAL position after a request's committed write.
+
+        Any primary connection reports a position at or past the commit,
+        so this needs neither the writing session nor its transaction.
+
+        Args:
+            tenant_id: Tenant that wrote (its reads are pinned for a while)
+
+        Returns:
+            Consistency token (LSN string) for the client
+        """
+        async with self.primary_factory() as session:
+            lsn = (await session.execute(_WRITE_LSN_SQL)).scalar_one()
+        self.observe_token(lsn)
+        if tenant_id:
+            await self.pin_tenant(tenant_id, lsn)
+        return lsn
+
+    def observe_token(self, token: Optional[str]) -> None:
+        """Require the current request to read at least `token`."""
+        value = parse_lsn(token)
+        if value > _request_token.get():
+            _request_token.set(value)
+
+    def _pin_key(self, tenant_id: str) -> str:
+        return f"{self.PIN_KEY_PREFIX}:{tenant_id}"
+
+    async def pin_tenant(self, tenant_id: str, token: str) -> None:
+        """Make the tenant's reads observe `token` for token_ttl_seconds, on every instance."""
+        value = parse_lsn(token)
+        if not value:
+            return
+        if self.redis is None:
+            current, _ = self._tenant_tokens.get(tenant_id, (0, 0.0))
+            self._tenant_tokens[tenant_id] = (max(current, value), time.monotonic())
+            return
+        await self.redis.eval(
+            _PIN_LUA, 1, self._pin_key(tenant_id), value, int(self.token_ttl_seconds * 1000)
+        )
+
+    async def required_lsn(self, tenant_id: Optional[str]) -> Optional[int]:
+        """
+        Minimum WAL position a read for this request/tenant must observe.
+
+        Returns None when the tenant's pin cannot be read; the caller
+        must then use the primary.
+        """
+        required = _request_token.get()
+        if not tenant_id:
+            return required
+
+        if self.redis is None:
+            if tenant_id in self._tenant_tokens:
+                value, written_at = self._tenant_tokens[tenant_id]
+                if time.monotonic() - written_at <= self.token_ttl_seconds:
+                    required = max(required, value)
+                else:
+                    del self._tenant_tokens[tenant_id]
+            return required
+
+        try:
+            pinned = await self.redis.get(self._pin_key(tenant_id))
+        except Exception as e:
+            logger.warning("Read-your-writes pin lookup failed", error=str(e))
+            return None
+        return max(required, int(pinned)) if pinned else required
+
+    # ---- Routing -----------------------------------------------------------
+
+    async def choose_replica(self, tenant_id: Optional[str] = None) -> Optional[ReplicaState]:
+        """Pick an eligible replica (round-robin), or None for the primary."""
+        metrics = get_metrics()
+        required = await self.required_lsn(tenant_id)
+        if required is None:
+            metrics.increment_counter("db_read_route_total", target="primary", reason="pin_unavailable")
+            return None
+
+        eligible = [
+            replica
+            for replica in self.replicas
+            if replica.healthy
+            and replica.lag_seconds <= self.max_lag_seconds
+            and replica.replay_lsn >= required
+        ]
+
+        if not eligible:
+            reason = "no_replicas" if not self.replicas else ("read_your_writes" if required else "lag")
+            metrics.increment_counter("db_read_route_total", target="primary", reason=reason)
+            return None
+
+        replica = eligible[next(self._round_robin) % len(eligible)]
+        metrics.increment_counter("db_read_route_total", target="replica", reason="ok")
+        return replica
+
+    async def read_session_factory(
+        self,
+        tenant_id: Optional[str] = None,
+        primary_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+    ) -> async_sessionmaker[AsyncSession]:
+        """
+        Session factory to use for a read-only unit of work.
+
+        primary_factory overrides the fallback used when no replica is
+        eligible (e.g. the analytics pool of the primary).
+        """
+        replica = await self.choose_replica(tenant_id)
+        if replica:
+            return replica.session_factory
+        return primary_factory or self.primary_factory
+
+
+# Global router instance (None when no replicas are configured)
+_router: Optional[ReplicaRouter] = None
+
+
+def get_replica_router() -> Optional[ReplicaRouter]:
+    """Get global replica router (None if replicas are not configured)."""
+    return _router
+
+
+def configure_replica_router(router: Optional[ReplicaRouter]) -> None:
+    """Install (or remove) the global replica router."""
+    global _router
+    _router = router
@@ -14,7 +14,6 @@ References:
 from __future__ import annotations
 
 from typing import Dict, Optional
-import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 import structlog
@@ -22,6 +21,7 @@ import structlog
 from src.shared_.errors import RlsNotSetError
 from src.shared_.utils.tenant_ctxvars import snapshot as ctx_snapshot
 from src.shared_.database.types import TenantContext
+from shared.infrastructure.database.rls import RLSManager
 
 logger = structlog.get_logger(__name__)
 
@@ -61,12 +61,10 @@ async def set_rls_gucs(
     session: AsyncSession, *, tenant_id: Optional[str], user_id: Optional[str], roles_csv: Optional[str]
 ) -> None:
     # GUCs must be set per-transaction (SET LOCAL) — RLS contract
-    if tenant_id:
-        await session.execute(text("SELECT set_config('app.jwt_tenant', :v, true)"), {"v": tenant_id})
-    if user_id:
-        await session.execute(text("SELECT set_config('app.user_id', :v, true)"), {"v": user_id})
-    if roles_csv:
-        await session.execute(text("SELECT set_config('app.roles', :v, true)"), {"v": roles_csv})
+    if not tenant_id:
+        return
+    roles = [r for r in roles_csv.split(",") if r] if roles_csv else None
+    await RLSManager.set_tenant_context(session, tenant_id, user_id or None, roles)
 
 async def apply_rls_locals(session: AsyncSession, ctx: TenantContext) -> None:
     """
@@ -77,10 +75,9 @@ async def apply_rls_locals(session: AsyncSession, ctx: TenantContext) -> None:
         ctx: TenantContext containing tenant_id, user_id, and roles.
 
     Effect:
-        Executes SET LOCAL commands inside current transaction scope:
-            SET LOCAL app.jwt_tenant = '<tenant-uuid>';
-            SET LOCAL app.user_id = '<user-uuid>';
-            SET LOCAL app.roles = 'ROLE1,ROLE2,...';
+        Delegates to RLSManager, which sets app.jwt_tenant / app.user_id /
+        app.roles (and their app.current_* aliases) in one
+        SELECT set_config(...) per transaction.
 
     Notes:
         - GUCs are scoped to the transaction (`SET LOCAL`).
@@ -88,20 +85,8 @@ async def apply_rls_locals(session: AsyncSession, ctx: TenantContext) -> None:
     """
     try:
         if ctx.tenant_id:
-            await session.execute(
-                sa.text("SELECT set_config('app.jwt_tenant', :tenant_id, true)"),
-                {"tenant_id": ctx.tenant_id},
-            )
-        if ctx.user_id:
-            await session.execute(
-                sa.text("SELECT set_config('app.user_id', :user_id, true)"),
-                {"user_id": ctx.user_id},
-            )
-        if ctx.roles:
-            roles_csv = ",".join(ctx.roles)
-            await session.execute(
-                sa.text("SELECT set_config('app.roles', :roles, true)"),
-                {"roles": roles_csv},
+            await RLSManager.set_tenant_context(
+                session, ctx.tenant_id, ctx.user_id or None, list(ctx.roles or []) or None
             )
         logger.debug("RLS context applied", tenant_id=ctx.tenant_id, user_id=ctx.user_id, roles=ctx.roles)
     except Exception as e:
@@ -94,4 +94,51 @@ async def session_from_ctxvars(require_tenant: bool = True) -> AsyncGenerator[As
             await session.rollback()
             raise
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+@asynccontextmanager
+async def read_session_from_ctxvars(
+    require_tenant: bool = True,
+    consistency_token: Optional[str] = None,
+    workload: Optional[str] = None,
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Yield a read-only AsyncSession, routed to a replica when possible.
+
+    The replica must be within the lag threshold and have replayed this
+    request's/tenant's last write (see replicas.py); otherwise the primary
+    is used. RLS context is applied exactly as for session_from_ctxvars,
+    and the transaction is rolled back at the end.
+
+    Args:
+        require_tenant: If True (default), raise error if no tenant is found.
+        consistency_token: Client-supplied LSN token from a previous write.
+        workload: Primary pool used when no replica is eligible (default: api).
+    """
+    from src.shared_.database.database import get_session_factory
+    from src.shared_.database.replicas import get_replica_router
+
+    ctx = tenant_context_from_ctxvars()
+    if require_tenant and (ctx is None or not ctx.tenant_id):
+        raise RuntimeError("Tenant context not set")
+    tenant_id = ctx.tenant_id if ctx else None
+
+    router = get_replica_router()
+    if router is None:
+        session_factory = get_session_factory(workload)
+    else:
+        router.observe_token(consistency_token)
+        session_factory = await router.read_session_factory(
+            tenant_id, primary_factory=get_session_factory(workload) if workload else None
+        )
+
+    async with session_factory() as session:
+        try:
+            await session.begin()
+            if ctx and ctx.tenant_id:
+                await apply_rls_locals(session, ctx)
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
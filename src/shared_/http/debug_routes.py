@@ -0,0 +1,59 @@
+"""
+Debug routes (development only).
+
+GET /_debug/sql    recent SQL profiles of requests and jobs, plus the
+                   statements most often flagged as N+1 across them
+"""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from src.config import get_settings
+from src.shared_.database.profiler import get_sql_profiler
+
+router = APIRouter(prefix="/_debug", tags=["Debug"])
+
+
+def _ensure_debug() -> None:
+    settings = get_settings()
+    if not settings.debug or settings.is_production:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+
+@router.get("/sql")
+async def sql_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    kind: Optional[str] = Query(None, description="request or job"),
+    flagged_only: bool = Query(False, description="Only over-budget or N+1 profiles"),
+) -> Dict[str, Any]:
+    """Recent SQL profiles, newest first."""
+    _ensure_debug()
+
+    profiler = get_sql_profiler()
+    if profiler is None:
+        return {"enabled": False, "profiles": [], "n_plus_one": []}
+
+    profiles = [
+        summary for summary in reversed(profiler.history)
+        if (kind is None or summary["kind"] == kind)
+        and (not flagged_only or summary["over_budget"] or summary["n_plus_one"])
+    ]
+
+    offenders: Counter = Counter()
+    for summary in profiles:
+        for stats in summary["n_plus_one"]:
+            offenders[(summary["label"], stats["sql"])] += 1
+
+    return {
+        "enabled": True,
+        "query_budget": profiler.query_budget,
+        "n_plus_one_threshold": profiler.n_plus_one_threshold,
+        "n_plus_one": [
+            {"scope": label, "sql": sql, "profiles": count}
+            for (label, sql), count in offenders.most_common(20)
+        ],
+        "profiles": profiles[:limit],
+    }
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+import structlog
+
+from src.shared_.database.replicas import CONSISTENCY_TOKEN_HEADER, get_replica_router, track_writes
+
+logger = structlog.get_logger(__name__)
+
+
+class ConsistencyTokenMiddleware(BaseHTTPMiddleware):
+    """
+    Returns a read-your-writes token to clients (see shared_.database.replicas).
+    When the request committed a write on the primary, the WAL position is
+    sent in X-Consistency-Token and pinned for the tenant in Redis, so the
+    next read sees the write whichever API instance serves it.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        router = get_replica_router()
+        if router is None:
+            return await call_next(request)
+
+        with track_writes() as writes:
+            response = await call_next(request)
+
+        if writes.committed:
+            try:
+                response.headers[CONSISTENCY_TOKEN_HEADER] = await router.issue_token(writes.tenant_id)
+            except Exception as e:
+                # Worst case the next read of this tenant may hit a lagging replica
+                logger.warning("Failed to issue consistency token", error=str(e))
+        return response
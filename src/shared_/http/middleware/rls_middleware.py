@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from sqlalchemy import text
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
@@ -8,6 +7,7 @@ from src.shared_.database.database import get_session_factory
 from src.shared_.http.public_paths import is_public_path
 from src.shared_.utils.tenant_ctxvars import set_all, clear_all
 from src.shared_.errors import UnauthorizedError
+from shared.infrastructure.database.rls import RLSManager
 
 import structlog
 logger = structlog.get_logger()
@@ -71,18 +71,12 @@ class RlsMiddleware(BaseHTTPMiddleware):
         try:
             session_factory = get_session_factory()
             async with session_factory() as session:
-                # Set session-local GUC variables for RLS
-                await session.execute(
-                    text("SELECT set_config('app.jwt_tenant', :tenant, true)"),
-                    {"tenant": str(tenant_id)},
-                )
-                await session.execute(
-                    text("SELECT set_config('app.user_id', :user, true)"),
-                    {"user": str(user_id) if user_id else ""},
-                )
-                await session.execute(
-                    text("SELECT set_config('app.roles', :roles, true)"),
-                    {"roles": roles},
+                # Set transaction-local GUC variables for RLS (one round trip)
+                await RLSManager.set_tenant_context(
+                    session,
+                    str(tenant_id),
+                    str(user_id) if user_id else None,
+                    list(roles) if isinstance(roles, (list, tuple)) else [str(roles)],
                 )
                 
                 logger.info(
@@ -3,6 +3,7 @@ import os
 
 from fastapi import FastAPI
 
+from src.config import get_settings
 from .security_middleware import SecurityHeadersMiddleware, IpAllowlistMiddleware
 from .request_id_middleware import RequestIdMiddleware
 from .exception_middleware import ExceptionMiddleware
@@ -11,10 +12,16 @@ from .context_middleware import ContextMiddleware
 from .rls_middleware import RlsMiddleware
 from .rate_limit_middleware import RateLimitMiddleware
 from .logging_middleware import LoggingMiddleware
+from .sql_profiler_middleware import SqlProfilerMiddleware
+from .consistency_token_middleware import ConsistencyTokenMiddleware
+from ..debug_routes import router as debug_router
 
 def setup_http_middlewares(app: FastAPI) -> None:
     """
     Configure middleware in correct order (outermost to innermost).
+
+    With SQL_PROFILER_ENABLED the /_debug routes that expose the
+    profiles are mounted as well (they answer 404 outside debug).
     """
     
     # 1. Security (outermost) - should be first
@@ -59,4 +66,12 @@ def setup_http_middlewares(app: FastAPI) -> None:
     app.add_middleware(RateLimitMiddleware)
     
     # 8. Access logging (innermost - measures full stack)
-    app.add_middleware(LoggingMiddleware)
\ No newline at end of file
+    app.add_middleware(LoggingMiddleware)
+
+    # 9. Read-your-writes tokens (no-op without read replicas)
+    app.add_middleware(ConsistencyTokenMiddleware)
+
+    # 10. SQL profiling (per-request statement counts, N+1 detection)
+    if get_settings().SQL_PROFILER_ENABLED:
+        app.add_middleware(SqlProfilerMiddleware)
+        app.include_router(debug_router)
\ No newline at end of file
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.shared_.database.profiler import profile_scope
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+
+
+class SqlProfilerMiddleware(BaseHTTPMiddleware):
+    """
+    Profiles the SQL issued by each request (see shared_.database.profiler).
+    Labels the profile with the matched route template, not the raw path,
+    so requests to the same endpoint group together.
+    """
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        async with profile_scope(f"{request.method} {request.url.path}", kind="request") as profile:
+            response = await call_next(request)
+            if profile is not None:
+                route = request.scope.get("route")
+                if route is not None and getattr(route, "path", None):
+                    profile.label = f"{request.method} {route.path}"
+                response.headers[QUERY_COUNT_HEADER] = str(profile.queries)
+            return response
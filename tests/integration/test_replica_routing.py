@@ -0,0 +1,114 @@
+"""
+Read-replica routing against two local Postgres instances.
+
+Needs a primary and a streaming replica of it, plus Redis:
+
+    TEST_PRIMARY_DATABASE_URL=postgresql+asyncpg://...@localhost:5432/app
+    TEST_REPLICA_DATABASE_URL=postgresql+asyncpg://...@localhost:5433/app
+    TEST_REDIS_URL=redis://localhost:6379/15
+
+Skipped when they are not set.
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "src"))
+
+PRIMARY_URL = os.getenv("TEST_PRIMARY_DATABASE_URL")
+REPLICA_URL = os.getenv("TEST_REPLICA_DATABASE_URL")
+REDIS_URL = os.getenv("TEST_REDIS_URL")
+
+pytestmark = pytest.mark.skipif(
+    not (PRIMARY_URL and REPLICA_URL and REDIS_URL),
+    reason="needs TEST_PRIMARY_DATABASE_URL, TEST_REPLICA_DATABASE_URL and TEST_REDIS_URL",
+)
+
+
+def _router(primary_engine, redis):
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from src.shared_.database.replicas import ReplicaRouter
+
+    return ReplicaRouter(
+        async_sessionmaker(bind=primary_engine, class_=AsyncSession, expire_on_commit=False),
+        [REPLICA_URL],
+        max_lag_seconds=5.0,
+        check_interval=0.1,
+        token_ttl_seconds=30.0,
+        redis=redis,
+    )
+
+
+async def _wait_for_replica(router, tenant_id, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await router.check_replicas()
+        replica = await router.choose_replica(tenant_id)
+        if replica is not None:
+            return replica
+        await asyncio.sleep(0.1)
+    raise AssertionError("replica never caught up with the pinned write")
+
+
+async def _scenario():
+    import redis.asyncio as redis_asyncio
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from src.shared_.database.replicas import parse_lsn
+
+    primary_engine = create_async_engine(PRIMARY_URL)
+    redis = redis_asyncio.from_url(REDIS_URL, decode_responses=True)
+    # Two API instances: same databases and Redis, separate process state
+    writer, reader = _router(primary_engine, redis), _router(primary_engine, redis)
+    tenant_id = str(uuid4())
+    row_id = uuid4()
+
+    try:
+        await writer.check_replicas()
+        await reader.check_replicas()
+        assert reader.replicas[0].healthy, "TEST_REPLICA_DATABASE_URL is not a streaming replica"
+
+        async with primary_engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE IF NOT EXISTS ryw_probe (id uuid PRIMARY KEY)"))
+            await conn.execute(text("INSERT INTO ryw_probe (id) VALUES (:id)"), {"id": row_id})
+        # Issued in its own task (request): nothing leaks via this context
+        token = await asyncio.create_task(writer.issue_token(tenant_id))
+
+        # The other instance sees the pin through Redis, not the token header
+        assert await reader.required_lsn(tenant_id) >= parse_lsn(token)
+
+        # A replica that has not replayed the write is not eligible
+        reader.replicas[0].replay_lsn = parse_lsn(token) - 1
+        assert await reader.choose_replica(tenant_id) is None
+
+        # Once it has, the read goes to the replica and sees the write
+        replica = await _wait_for_replica(reader, tenant_id)
+        async with replica.session_factory() as session:
+            found = (
+                await session.execute(text("SELECT 1 FROM ryw_probe WHERE id = :id"), {"id": row_id})
+            ).scalar()
+        assert found == 1
+
+        # Other tenants are not pinned
+        assert await reader.required_lsn(str(uuid4())) == 0
+    finally:
+        async with primary_engine.begin() as conn:
+            await conn.execute(text("DELETE FROM ryw_probe WHERE id = :id"), {"id": row_id})
+        await redis.delete(writer._pin_key(tenant_id))
+        await writer.stop()
+        await reader.stop()
+        await primary_engine.dispose()
+        await redis.close()
+
+
+def test_read_your_writes_across_instances():
+    asyncio.run(_scenario())